@@ -0,0 +1,85 @@
+import sys
+import time
+import hashlib
+import argparse
+import importlib.util
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ethwizard.utils import CompactFIPS202
+
+# Micro-benchmark of Keccak_256 from ethwizard.utils.CompactFIPS202. Digests are checked against
+# the Keccak-256 known answers and hashlib before timing. Another implementation, like an older
+# revision of the module, can be timed alongside with --reference:
+#
+# git show <revision>:ethwizard/utils/CompactFIPS202.py > /tmp/CompactFIPS202_old.py
+# python benchmarks/bench_keccak.py --reference /tmp/CompactFIPS202_old.py
+
+KECCAK_256_KNOWN_ANSWERS = {
+    b'': 'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470',
+    b'abc': '4e03657aea45a94fc7d47ba826c8d667c0d1e6e33a64a036ec44f58fa12d6c45'
+}
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location('CompactFIPS202_reference', str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def check_module(module):
+    for data, expected in KECCAK_256_KNOWN_ANSWERS.items():
+        digest = bytes(module.Keccak_256(data)).hex()
+        if digest != expected:
+            raise SystemExit(f'Keccak_256({data!r}) returned {digest}, expected {expected}')
+
+    for size in (0, 1, 135, 136, 137, 1000, 4000):
+        data = bytes(index % 251 for index in range(size))
+        if bytes(module.SHA3_256(data)) != hashlib.sha3_256(data).digest():
+            raise SystemExit(f'SHA3_256 of {size} bytes does not match hashlib')
+
+def time_call(function, data, min_time):
+    # Return the median duration of a call, repeating calls for at least min_time seconds
+
+    durations = []
+    deadline = time.perf_counter() + min_time
+    while len(durations) < 3 or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        function(data)
+        durations.append(time.perf_counter() - start)
+
+    durations.sort()
+    return durations[len(durations) // 2]
+
+def format_duration(duration):
+    if duration < 1.0:
+        return f'{duration * 1000:.3f} ms'
+    return f'{duration:.2f} s'
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Keccak_256')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 1024, 65536, 1048576],
+        help='input sizes in bytes')
+    parser.add_argument('--min-time', type=float, default=2.0,
+        help='seconds spent timing each size')
+    parser.add_argument('--reference', type=Path,
+        help='another CompactFIPS202.py to compare with')
+    args = parser.parse_args()
+
+    implementations = [('current', CompactFIPS202)]
+    if args.reference is not None:
+        implementations.append(('reference', load_module(args.reference)))
+
+    for _, module in implementations:
+        check_module(module)
+
+    print(f'Python {sys.version.split()[0]}, median duration of Keccak_256')
+    for size in args.sizes:
+        data = bytes(index % 251 for index in range(size))
+        timings = [f'{name} {format_duration(time_call(module.Keccak_256, data, args.min_time))}'
+            for name, module in implementations]
+        print(f'  {size:>9} bytes: {", ".join(timings)}')
+
+if __name__ == '__main__':
+    main()
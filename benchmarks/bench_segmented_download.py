@@ -0,0 +1,134 @@
+import os
+import re
+import sys
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+
+from pathlib import Path
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ethwizard.platforms.common import download_file
+
+# Benchmark download_file against a local server throttled per connection, the way a release
+# CDN or a busy mirror limits each connection, for a few numbers of segments. The server
+# supports Range and If-Range and sends a strong ETag so downloads above
+# DOWNLOAD_SEGMENTED_THRESHOLD are split in segments.
+#
+# python benchmarks/bench_segmented_download.py --size 40 --rate 2 --segments 1 2 4 6
+
+SEND_CHUNK_SIZE = 64 * 1024
+
+class ThrottledHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        content = self.server.content
+        etag = self.server.etag
+
+        start = 0
+        end = len(content) - 1
+        status = 200
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header is not None and (if_range is None or if_range == etag):
+            result = re.fullmatch(r'bytes=(\d+)-(\d*)', range_header.strip())
+            if result:
+                start = int(result.group(1))
+                if result.group(2) != '':
+                    end = min(end, int(result.group(2)))
+                status = 206
+
+        self.send_response(status)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(end - start + 1))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(content)}')
+        self.end_headers()
+
+        # Pace each connection to the configured rate
+        rate = self.server.rate
+        connection_start = time.perf_counter()
+        sent = 0
+        try:
+            for offset in range(start, end + 1, SEND_CHUNK_SIZE):
+                chunk = content[offset:min(offset + SEND_CHUNK_SIZE, end + 1)]
+                self.wfile.write(chunk)
+                sent = sent + len(chunk)
+                if rate is not None:
+                    delay = connection_start + sent / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(content, rate):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottledHandler)
+    server.daemon_threads = True
+    server.content = content
+    server.etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+    server.rate = rate
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark segmented downloads')
+    parser.add_argument('--size', type=int, default=40, help='file size in MiB')
+    parser.add_argument('--rate', type=float, default=2.0,
+        help='MiB/s per connection, 0 for unthrottled')
+    parser.add_argument('--segments', type=int, nargs='+', default=[1, 2, 4, 6])
+    parser.add_argument('--rounds', type=int, default=2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    log = logging.getLogger('benchmark')
+
+    content = os.urandom(args.size * 1024 * 1024)
+    expected_digest = hashlib.sha256(content).hexdigest()
+    rate = args.rate * 1024 * 1024 if args.rate > 0 else None
+
+    server = start_server(content, rate)
+    url = f'http://127.0.0.1:{server.server_port}/artifact.bin'
+
+    rate_text = f'{args.rate:g} MiB/s per connection' if rate is not None else 'unthrottled'
+    print(f'{args.size} MiB file, {rate_text}, medians of {args.rounds} runs')
+
+    try:
+        with tempfile.TemporaryDirectory(prefix='ethwizard-bench-') as temp_directory:
+            for segments in args.segments:
+                durations = []
+                for round_index in range(args.rounds):
+                    file_path = Path(temp_directory, f'artifact-{segments}-{round_index}.bin')
+
+                    start = time.perf_counter()
+                    download_result = download_file(url, file_path, log, 'benchmark artifact',
+                        use_cache=False, segments=segments)
+                    durations.append(time.perf_counter() - start)
+
+                    if download_result['error'] is not None:
+                        raise SystemExit(f'Download failed: {download_result["error"]}')
+                    if download_result['sha256'] != expected_digest:
+                        raise SystemExit('Downloaded content does not match')
+
+                    file_path.unlink()
+
+                duration = statistics.median(durations)
+                print(f'  segments={segments}: {duration:6.2f}s '
+                    f'{args.size / duration:6.1f} MiB/s')
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
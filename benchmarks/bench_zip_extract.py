@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import random
+import shutil
+import zipfile
+import argparse
+import tempfile
+import statistics
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ethwizard.utils.archives import install_zip_archive
+
+# Compare installing a zip distribution the way the Windows installer used to, extractall into
+# the downloads directory and move every top level item into place, with install_zip_archive,
+# on a fresh target directory and on a target directory holding a previous installation.
+#
+# python benchmarks/bench_zip_extract.py --entries 10000 --rounds 5
+
+def build_archive(archive_path, entries, seed):
+    # A release like archive: one leading directory, a few levels of sub directories and files
+    # of mixed sizes, some compressible and some not
+
+    rng = random.Random(seed)
+    total_size = 0
+
+    with zipfile.ZipFile(str(archive_path), 'w', zipfile.ZIP_DEFLATED) as archive:
+        for index in range(entries):
+            directory = f'dist-1.0/lib/pkg{index % 50}/sub{index % 7}'
+            size = rng.choice((128, 1024, 4096, 8192, 32768))
+            if index % 3 == 0:
+                content = rng.randbytes(size)
+            else:
+                content = (f'entry {index} '.encode() * (size // 8 + 1))[:size]
+            archive.writestr(f'{directory}/file{index}.bin', content)
+            total_size = total_size + size
+
+    return total_size
+
+def extractall_and_move(archive_path, download_path, target_path):
+    with zipfile.ZipFile(str(archive_path), 'r') as zip_file:
+        archive_members = zip_file.namelist()
+        zip_file.extractall(download_path)
+
+    if target_path.is_dir():
+        shutil.rmtree(target_path)
+    target_path.mkdir(parents=True, exist_ok=True)
+
+    archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
+
+    with os.scandir(archive_extracted_dir) as it:
+        for diritem in it:
+            shutil.move(diritem.path, target_path)
+
+    shutil.rmtree(archive_extracted_dir)
+
+def staged_install(archive_path, download_path, target_path):
+    install_zip_archive(archive_path, target_path)
+
+def measure(method, archive_path, work_path, reinstall):
+    download_path = work_path.joinpath('downloads')
+    target_path = work_path.joinpath('install', 'dist')
+    download_path.mkdir(parents=True, exist_ok=True)
+
+    if reinstall:
+        method(archive_path, download_path, target_path)
+
+    start = time.perf_counter()
+    method(archive_path, download_path, target_path)
+    duration = time.perf_counter() - start
+
+    shutil.rmtree(work_path)
+    return duration
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark zip distribution installs')
+    parser.add_argument('--entries', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    methods = (
+        ('extractall + move', extractall_and_move),
+        ('install_zip_archive', staged_install)
+    )
+
+    with tempfile.TemporaryDirectory(prefix='ethwizard-bench-') as temp_directory:
+        temp_path = Path(temp_directory)
+        archive_path = temp_path.joinpath('dist.zip')
+
+        total_size = build_archive(archive_path, args.entries, args.seed)
+        print(f'{args.entries} entries, {total_size / 1024 / 1024:.1f} MiB uncompressed, '
+            f'{archive_path.stat().st_size / 1024 / 1024:.1f} MiB archive, '
+            f'{os.cpu_count()} CPU, medians of {args.rounds} runs')
+
+        for name, method in methods:
+            results = []
+            for reinstall in (False, True):
+                durations = [measure(method, archive_path,
+                    temp_path.joinpath(f'work-{round_index}'), reinstall)
+                    for round_index in range(args.rounds)]
+                results.append(statistics.median(durations))
+
+            print(f'  {name:<20} fresh {results[0]:.2f}s  reinstall {results[1]:.2f}s')
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,48 @@
+import argparse
+
 from ethwizard import wizard
 
+from ethwizard.constants import BUNDLE_PLATFORM_UBUNTU, BUNDLE_PLATFORM_WINDOWS
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog='ethwizard')
+    parser.add_argument('--answers', metavar='PATH',
+        help='run the installation unattended, answering dialogs from the YAML or JSON answers '
+        'file at PATH and reporting progress as JSON lines on stdout')
+    parser.add_argument('--timings', action='store_true',
+        help='show the time spent in each step of the installation and exit')
+    parser.add_argument('--timings-format', choices=('table', 'json', 'prometheus'),
+        default='table', help='format for --timings (default: table)')
+    parser.add_argument('--timings-output', metavar='PATH',
+        help='write --timings to PATH instead of the console, for example a node_exporter '
+        'textfile collector .prom file')
+    parser.add_argument('--cache', choices=('stats', 'prune'),
+        help='show the hit rate and disk usage of the downloaded artifacts cache or prune it, '
+        'then exit')
+    parser.add_argument('--cache-max-size', metavar='GB', type=float,
+        help='size to prune the artifacts cache down to with --cache prune (default: its '
+        'configured maximum size)')
+    parser.add_argument('--mirror', metavar='PATH_OR_URL',
+        help='get the release documents and artifacts from the mirror directory or HTTP URL '
+        'created with --bundle instead of their origin')
+    parser.add_argument('--bundle', metavar='PATH',
+        help='resolve the current release set into a mirror directory at PATH, or a tarball '
+        'when PATH ends with .tar, .tar.gz or .tgz, to be used with --mirror once extracted, '
+        'then exit')
+    parser.add_argument('--bundle-platform', choices=(BUNDLE_PLATFORM_UBUNTU,
+        BUNDLE_PLATFORM_WINDOWS), action='append',
+        help='platform to include in the --bundle, can be repeated (default: the current '
+        'platform)')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    wizard.run()
\ No newline at end of file
+    arguments = parse_arguments()
+
+    if arguments.timings:
+        wizard.show_timings(arguments.timings_format, arguments.timings_output)
+    elif arguments.cache is not None:
+        wizard.manage_artifact_cache(arguments.cache, arguments.cache_max_size)
+    elif arguments.bundle is not None:
+        wizard.create_bundle(arguments.bundle, arguments.bundle_platform)
+    else:
+        wizard.run(arguments.answers, arguments.mirror)
@@ -0,0 +1,271 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import tarfile
+import tempfile
+
+from datetime import datetime, timezone
+
+from fnmatch import fnmatchcase
+
+from pathlib import Path
+
+from ethwizard import __version__
+
+from ethwizard.constants import (
+    GITHUB_REST_API_URL,
+    TEKU_LATEST_RELEASE,
+    TEKU_RELEASE_ZIP_PATTERN,
+    ADOPTIUM_21_API_URL,
+    ADOPTIUM_21_API_PARAMS,
+    ETHSTAKER_RELAY_LIST_URL,
+    COMMUNITY_CHECKPOINT_SYNC_YAML,
+    PGP_KEY_SERVERS,
+    PGP_KEY_FETCH_TIMEOUT,
+    PGP_KEY_MAX_SIZE,
+    DOWNLOAD_METADATA_MAX_SIZE,
+    MIRROR_MANIFEST_FORMAT,
+    BUNDLE_PLATFORM_WINDOWS,
+    BUNDLE_RELEASE_ASSETS,
+    BUNDLE_PGP_KEYS
+)
+
+from ethwizard.platforms.common import (
+    download_file,
+    get_github_release,
+    pgp_key_lookup_url
+)
+
+from ethwizard.utils.mirror import (
+    mirror_key,
+    mirror_file_path,
+    write_mirror_manifest
+)
+
+# A bundle resolves the current release set once, the way the installers and upgraders would,
+# and stores every release document and artifact they request in a mirror directory, optionally
+# packed as a tarball. Hosts started with --mirror pointing to that directory, or to the same
+# directory served over HTTP, get them from the mirror instead of their origin.
+#
+# The bundle holds the Github release documents and the matching assets of BUNDLE_RELEASE_ASSETS
+# for each bundled platform, signatures and checksum files included, the Teku distribution and
+# the Adoptium JRE for Windows, the PGP keys signatures are verified with, the MEV relay list and
+# the checkpoint sync YAML files. The Ethereum PPA, the geth Windows builds store, Grafana and
+# GnuPG are not mirrored.
+
+class _BundleWriter:
+    # Download files into the mirror directory and keep the manifest entries
+
+    def __init__(self, directory, log):
+        self.directory = directory
+        self.log = log
+        self.files = {}
+
+    def add_url(self, url, description, params=None, file_name=None, **download_options):
+        key = mirror_key(url, params)
+        if key in self.files:
+            return self.files[key]
+
+        relative_path = mirror_file_path(key, file_name)
+        result = download_file(key, self.directory.joinpath(relative_path), self.log,
+            description, **download_options)
+        if result['error'] is not None:
+            return None
+
+        entry = {
+            'path': relative_path,
+            'size': result['size'],
+            'sha256': result['sha256']
+        }
+        self.files[key] = entry
+        return entry
+
+    def add_content(self, url, content, file_name):
+        key = mirror_key(url)
+        relative_path = mirror_file_path(key, file_name)
+
+        file_path = self.directory.joinpath(relative_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(str(file_path), 'wb') as content_file:
+            content_file.write(content)
+
+        entry = {
+            'path': relative_path,
+            'size': len(content),
+            'sha256': hashlib.sha256(content).hexdigest()
+        }
+        self.files[key] = entry
+        return entry
+
+    def add_alias(self, url, entry):
+        self.files[mirror_key(url)] = entry
+
+def _bundle_github_release(writer, release_path, patterns, log):
+    # Add a Github release document and its assets matching patterns. Return the release tag or
+    # None on failure.
+
+    release_json = get_github_release(release_path, log, ttl=0)
+    if release_json is None:
+        return None
+
+    release_url = GITHUB_REST_API_URL + release_path
+    if mirror_key(release_url) not in writer.files:
+        writer.add_content(release_url, json.dumps(release_json).encode('utf8'), 'release.json')
+
+    for asset in release_json.get('assets', []):
+        file_name = asset.get('name')
+        file_url = asset.get('browser_download_url')
+        if file_name is None or file_url is None:
+            continue
+        if not any(fnmatchcase(file_name, pattern) for pattern in patterns):
+            continue
+
+        if writer.add_url(file_url, file_name, file_name=file_name) is None:
+            return None
+
+    if release_path == TEKU_LATEST_RELEASE:
+        result = re.search(TEKU_RELEASE_ZIP_PATTERN, release_json.get('body') or '')
+        if not result:
+            log.error('Could not find the Teku binary distribution zip in its Github release.')
+            return None
+        if writer.add_url(result.group('url').strip(), 'Teku binary distribution') is None:
+            return None
+
+    return release_json.get('tag_name', 'unknown')
+
+def _bundle_adoptium_jre(writer, log):
+    # Add the Adoptium API document and the Windows x64 JRE packages it lists
+
+    entry = writer.add_url(ADOPTIUM_21_API_URL, 'JRE builds', params=ADOPTIUM_21_API_PARAMS,
+        file_name='assets.json', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    if entry is None:
+        return False
+
+    try:
+        with open(str(writer.directory.joinpath(entry['path'])), 'r',
+            encoding='utf8') as builds_file:
+            builds = json.load(builds_file)
+    except (OSError, ValueError) as exception:
+        log.error(f'Unexpected response from JRE builds URL {ADOPTIUM_21_API_URL}. {exception}')
+        return False
+
+    found = False
+    for build in builds if isinstance(builds, list) else []:
+        binary = build.get('binary') if isinstance(build, dict) else None
+        if not isinstance(binary, dict):
+            continue
+        if (
+            binary.get('os') != 'windows' or
+            binary.get('architecture') != 'x64' or
+            binary.get('image_type') != 'jre'):
+            continue
+        package = binary.get('package')
+        if not isinstance(package, dict) or 'link' not in package:
+            continue
+
+        if writer.add_url(package['link'], 'JRE archive', file_name=package.get('name')) is None:
+            return False
+        found = True
+
+    if not found:
+        log.error('No Windows x64 JRE found in the Adoptium builds.')
+        return False
+
+    return True
+
+def _bundle_pgp_key(writer, key_id, log):
+    # Add a PGP key under its lookup URL on every key server, taking it from the first key
+    # server that has it. The fingerprint is checked when the key is imported on each host.
+
+    entry = None
+    for key_server in PGP_KEY_SERVERS:
+        entry = writer.add_url(pgp_key_lookup_url(key_server, key_id), f'PGP key {key_id}',
+            file_name=f'{key_id}.asc', max_size=PGP_KEY_MAX_SIZE, timeout=PGP_KEY_FETCH_TIMEOUT,
+            max_attempts=1)
+        if entry is not None:
+            break
+
+    if entry is None:
+        log.error(f'Unable to get PGP key {key_id} from any key server.')
+        return False
+
+    for key_server in PGP_KEY_SERVERS:
+        writer.add_alias(pgp_key_lookup_url(key_server, key_id), entry)
+
+    return True
+
+def _write_tarball(directory, output_path):
+    temp_path = output_path.with_name(output_path.name + '.tmp')
+    mode = 'w:gz' if output_path.name.endswith(('.tar.gz', '.tgz')) else 'w'
+    with tarfile.open(str(temp_path), mode) as tarball:
+        for child in sorted(directory.iterdir()):
+            tarball.add(str(child), arcname=child.name)
+    os.replace(str(temp_path), str(output_path))
+
+def create_bundle(output_path, platforms, log):
+    # Resolve the current release set for platforms and store it in the mirror directory
+    # output_path, or in a tarball when output_path ends with .tar, .tar.gz or .tgz. Return the
+    # manifest or None on failure.
+
+    output_path = Path(output_path)
+    as_tarball = output_path.name.endswith(('.tar', '.tar.gz', '.tgz'))
+
+    if as_tarball:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        directory = Path(tempfile.mkdtemp(prefix='.ethwizard-bundle-',
+            dir=str(output_path.parent)))
+    else:
+        directory = output_path
+        directory.mkdir(parents=True, exist_ok=True)
+
+    writer = _BundleWriter(directory, log)
+    versions = {}
+
+    try:
+        for platform in platforms:
+            for release_path, patterns in BUNDLE_RELEASE_ASSETS[platform].items():
+                tag = _bundle_github_release(writer, release_path, patterns, log)
+                if tag is None:
+                    log.error(f'Unable to bundle the Github release {release_path}.')
+                    return None
+                versions[release_path] = tag
+
+            if platform == BUNDLE_PLATFORM_WINDOWS and not _bundle_adoptium_jre(writer, log):
+                return None
+
+            for key_id in BUNDLE_PGP_KEYS[platform]:
+                if not _bundle_pgp_key(writer, key_id, log):
+                    return None
+
+        if writer.add_url(ETHSTAKER_RELAY_LIST_URL, 'MEV relay list',
+            max_size=DOWNLOAD_METADATA_MAX_SIZE) is None:
+            return None
+
+        for checkpoint_yaml_url in COMMUNITY_CHECKPOINT_SYNC_YAML.values():
+            if writer.add_url(checkpoint_yaml_url, 'checkpoint sync YAML',
+                max_size=DOWNLOAD_METADATA_MAX_SIZE) is None:
+                return None
+
+        manifest = {
+            'format': MIRROR_MANIFEST_FORMAT,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'wizard_version': __version__,
+            'platforms': list(platforms),
+            'versions': versions,
+            'files': writer.files
+        }
+
+        try:
+            write_mirror_manifest(directory, manifest)
+            if as_tarball:
+                _write_tarball(directory, output_path)
+        except OSError as exception:
+            log.error(f'Unable to write the bundle to {output_path}. {exception}')
+            return None
+
+        return manifest
+    finally:
+        if as_tarball:
+            shutil.rmtree(str(directory), ignore_errors=True)
@@ -8,11 +8,16 @@ NIMBUS_LATEST_RELEASE = '/repos/status-im/nimbus-eth2/releases/latest'
 MEVBOOST_LATEST_RELEASE = '/repos/flashbots/mev-boost/releases/latest'
 LIGHTHOUSE_PRIME_PGP_KEY_ID = '15E66D941F697E28F49381F426416DC3F30674B0'
 TEKU_LATEST_RELEASE = '/repos/ConsenSys/teku/releases/latest'
+TEKU_RELEASE_ZIP_PATTERN = (
+    r'\[zip\]\((?P<url>[^\)]+)\)\s*\(\s*sha256\s*:?\s*`(?P<sha256>[^`]+)`\s*\)')
 PROMETHEUS_LATEST_RELEASE = '/repos/prometheus/prometheus/releases/latest'
 WINDOWS_EXPORTER_LATEST_RELEASE = '/repos/prometheus-community/windows_exporter/releases/latest'
 
 EDC_LATEST_RELEASE = '/repos/ethstaker/ethstaker-deposit-cli/releases/latest'
 
+GITHUB_RELEASE_CACHE_DIRECTORY = 'github_releases'
+GITHUB_RELEASE_CACHE_TTL = 900
+
 NETWORK_MAINNET = 'mainnet'
 NETWORK_HOODI = 'hoodi'
 NETWORK_GOERLI = 'goerli'
@@ -57,9 +62,59 @@ PGP_KEY_SERVERS = [
     'hkp://pool.sks-keyservers.net',
     'hkp://keys.gnupg.net'
 ]
+PGP_KEYRING_DIRECTORY = 'gnupg'
+PGP_KEY_FETCH_TIMEOUT = 30.0
+PGP_KEY_FETCH_ROUNDS = 3
+PGP_KEY_RETRY_DELAY = 5.0
+PGP_KEY_MAX_SIZE = 1024 * 1024
+
+HTTP_CLIENT_TIMEOUT = 15.0
+HTTP_CLIENT_CONNECT_TIMEOUT = 5.0
+HTTP_CLIENT_RETRIES = 2
+HTTP_CLIENT_MAX_CONNECTIONS = 32
+HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST = 6
+HTTP_CLIENT_KEEPALIVE_EXPIRY = 30.0
+
+DOWNLOAD_PART_SUFFIX = '.part'
+DOWNLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+DOWNLOAD_METADATA_MAX_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 3600.0
+DOWNLOAD_READ_TIMEOUT = 60.0
+DOWNLOAD_MAX_ATTEMPTS = 6
+DOWNLOAD_RETRY_DELAY = 2.0
+DOWNLOAD_RETRY_DELAY_MAX = 30.0
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_PROGRESS_INTERVAL = 0.5
+DOWNLOAD_PROGRESS_LOG_INTERVAL = 10.0
+DOWNLOAD_RETRY_STATUS_CODES = (408, 425, 429, 500, 502, 503, 504)
+DOWNLOAD_SEGMENTED_THRESHOLD = 32 * 1024 * 1024
+DOWNLOAD_SEGMENTS = 4
+
+ARCHIVE_STREAM_BUFFER_CHUNKS = 64
+ARCHIVE_EXTRACT_WORKERS = 8
+
+JOURNAL_FOLLOW_INITIAL_LINES = 25
+JOURNAL_FOLLOW_MAX_LINES = 1000
+
+EXECUTION_RPC_URL = 'http://127.0.0.1:8545'
+EXECUTION_RPC_TIMEOUT = 5.0
+
+ARTIFACT_CACHE_DIRECTORY = 'artifacts'
+ARTIFACT_CACHE_INDEX_FILE = 'index.json'
+ARTIFACT_CACHE_MAX_SIZE = 4 * 1024 * 1024 * 1024
+ARTIFACT_CACHE_REVALIDATE_AFTER = 3600
+
+MIRROR_MANIFEST_FILE = 'manifest.json'
+MIRROR_MANIFEST_FORMAT = 1
+MIRROR_FILES_DIRECTORY = 'files'
+MIRROR_DROPPED_HEADERS = ('host', 'range', 'if-range', 'if-none-match', 'if-modified-since')
 
 LINUX_SAVE_DIRECTORY = '/var/lib/ethwizard'
 STATE_FILE = 'wizardstate.json'
+STATE_JOURNAL_FILE = 'wizardstate.journal'
+STATE_JOURNAL_COMPACT_RECORDS = 64
+STATE_JOURNAL_COMPACT_BYTES = 1024 * 1024
+STEP_TIMINGS_FILE = 'wizardtimings.json'
 
 CTX_SELECTED_DIRECTORY = 'selected_directory'
 CTX_SELECTED_EXECUTION_CLIENT = 'selected_execution_client'
@@ -80,6 +135,9 @@ CTX_PUBLIC_KEYS = 'public_keys'
 CTX_MERGE_READY_NETWORK = 'merge_ready_network'
 CTX_EXECUTION_IMPROVED_SERVICE_TIMEOUT = 'execution_improved_service_timeout'
 CTX_CONSENSUS_IMPROVED_SERVICE_TIMEOUT = 'consensus_improved_service_timeout'
+CTX_ETH1_FALLBACKS_PROBES = 'eth1_fallbacks_probes'
+CTX_COMPLETED_STEPS = 'completed_steps'
+CTX_SYSTEM_TESTS_RESULTS = 'system_tests_results'
 
 EXECUTION_CLIENT_GETH = 'Geth'
 EXECUTION_CLIENT_NETHERMIND = 'Nethermind'
@@ -128,6 +186,8 @@ DEFAULT_EXECUTION_PORT = {
 
 SELECT_DIRECTORY_STEP_ID = 'select_directory_step'
 TEST_SYSTEM_STEP_ID = 'test_system_step'
+RUN_SYSTEM_TESTS_STEP_ID = 'run_system_tests_step'
+REPORT_SYSTEM_TESTS_STEP_ID = 'report_system_tests_step'
 SELECT_NETWORK_STEP_ID = 'select_network_step'
 SELECT_CUSTOM_PORTS_STEP_ID = 'select_custom_ports_step'
 CREATE_FIREWALL_RULE_STEP_ID = 'create_firewall_rule_step'
@@ -161,6 +221,8 @@ INSTALL_VALIDATOR_STEP_ID = 'install_validator_step'
 
 WIZARD_COMPLETED_STEP_ID = 'wizard_completed'
 
+STEP_SCHEDULER_MAX_WORKERS = 4
+
 MAINTENANCE_DO_NOTHING = 'do_nothing'
 MAINTENANCE_START_SERVICE = 'start_service'
 MAINTENANCE_RESTART_SERVICE = 'restart_service'
@@ -176,6 +238,11 @@ MAINTENANCE_IMPROVE_TIMEOUT = 'improve_timeout'
 MAINTENANCE_UPGRADE_JRE = 'upgrade_jre'
 MAINTENANCE_UPGRADE_JRE_CLIENT = 'upgrade_jre_client'
 
+MAINTENANCE_PROBE_TIMEOUT = 30.0
+MAINTENANCE_APT_PROBE_TIMEOUT = 300.0
+
+PROBE_BINARY_VERSION_TIMEOUT = 10.0
+
 
 UNKNOWN_VALUE = 'Unknown'
 
@@ -225,11 +292,19 @@ LINUX_JWT_TOKEN_DIRECTORY = '/var/lib/ethereum'
 LINUX_JWT_TOKEN_FILE_PATH = f'{LINUX_JWT_TOKEN_DIRECTORY}/jwttoken'
 
 BN_FINALIZED_STATE_URL = '/eth/v2/debug/beacon/states/finalized'
+BN_FINALIZED_HEADER_URL = '/eth/v1/beacon/headers/finalized'
 BN_DEPOSIT_CONTRACT_URL = '/eth/v1/config/deposit_contract'
 BN_VERSION_EP = '/eth/v1/node/version'
 BN_PEERS_EP = '/eth/v1/node/peers'
 BN_PEER_COUNT_EP = '/eth/v1/node/peer_count'
 BN_SYNCING_EP = '/eth/v1/node/syncing'
+BN_VALIDATORS_EP = '/eth/v1/beacon/states/head/validators'
+BN_VALIDATORS_BATCH_SIZE = 500
+BN_VALIDATORS_TIMEOUT = 10.0
+BN_CHECKPOINT_PROBE_TIMEOUT = 20.0
+
+ETH1_FALLBACK_PROBE_TIMEOUT = 10.0
+ETH1_FALLBACK_MAX_BLOCK_LAG = 8
 
 BN_CHAIN_IDS = {
     NETWORK_MAINNET: 1,
@@ -258,6 +333,11 @@ ETH1_NETWORK_CHAINID = {
 
 BEACONCHA_VALIDATOR_DEPOSITS_API_URL = '/api/v1/validator/{indexOrPubkey}/deposits'
 BEACONCHA_VALIDATOR_QUEUE_API_URL = '/api/v1/validators/queue'
+BEACONCHA_IN_MAX_PUBKEYS_PER_REQUEST = 50
+BEACONCHA_IN_MAX_CONCURRENT_REQUESTS = 4
+BEACONCHA_IN_MAX_ATTEMPTS = 5
+BEACONCHA_IN_BACKOFF_BASE = 2.0
+BEACONCHA_IN_BACKOFF_MAX = 60.0
 
 ETHEREUM_APT_SOURCE_URL = 'http://ppa.launchpad.net/ethereum/ethereum/ubuntu'
 NETHERMIND_APT_SOURCE_URL = 'https://ppa.launchpadcontent.net/nethermindeth/nethermind/ubuntu'
@@ -305,6 +385,9 @@ NETHERMIND_SYSTEMD_SERVICE_NAME = 'nethermind.service'
 
 MEVBOOST_SYSTEMD_SERVICE_NAME = 'mevboost.service'
 MEVBOOST_INSTALLED_DIRECTORY = '/usr/local/bin'
+MEVBOOST_ARCHIVE_MEMBERS = {
+    'mev-boost': 'mev-boost'
+}
 
 MEVBOOST_ARGUMENTS = {
     NETWORK_MAINNET: ['-mainnet', '-relay-check'],
@@ -339,13 +422,27 @@ RELAY_BUNDLES = {
   }
 }
 
+MEV_RELAY_STATUS_EP = '/eth/v1/builder/status'
+MEV_RELAY_BENCHMARK_ROUNDS = 5
+MEV_RELAY_BENCHMARK_TIMEOUT = 5.0
+MEV_RELAY_FASTEST_COUNT = 3
+
 LIGHTHOUSE_BN_SYSTEMD_SERVICE_NAME = 'lighthousebeacon.service'
 LIGHTHOUSE_VC_SYSTEMD_SERVICE_NAME = 'lighthousevalidator.service'
 LIGHTHOUSE_INSTALLED_DIRECTORY = '/usr/local/bin'
+LIGHTHOUSE_ARCHIVE_MEMBERS = {
+    'lighthouse': 'lighthouse'
+}
 LIGHTHOUSE_INSTALLED_PATH = f'{LIGHTHOUSE_INSTALLED_DIRECTORY}/lighthouse'
 
 NIMBUS_SYSTEMD_SERVICE_NAME = 'nimbus.service'
 NIMBUS_INSTALLED_DIRECTORY = '/usr/local/bin'
+NIMBUS_ARCHIVE_MEMBERS = {
+    'build/nimbus_beacon_node': 'nimbus_beacon_node',
+    '*/build/nimbus_beacon_node': 'nimbus_beacon_node',
+    'build/nimbus_validator_client': 'nimbus_validator_client',
+    '*/build/nimbus_validator_client': 'nimbus_validator_client'
+}
 NIMBUS_INSTALLED_PATH = f'{NIMBUS_INSTALLED_DIRECTORY}/nimbus_beacon_node'
 NIMBUS_VC_INSTALLED_PATH = f'{NIMBUS_INSTALLED_DIRECTORY}/nimbus_validator_client'
 
@@ -61207,4 +61304,33 @@ ExecStart={LIGHTHOUSE_INSTALLED_PATH} vc --network hoodi --datadir /var/lib/ligh
 [Install]
 WantedBy=multi-user.target
 ''')
-}
\ No newline at end of file
+}
+
+BUNDLE_PLATFORM_UBUNTU = 'ubuntu'
+BUNDLE_PLATFORM_WINDOWS = 'windows'
+BUNDLE_RELEASE_ASSETS = {
+    BUNDLE_PLATFORM_UBUNTU: {
+        GETH_LATEST_RELEASE: [],
+        NETHERMIND_LATEST_RELEASE: [],
+        MEVBOOST_LATEST_RELEASE: ['*linux_amd64.tar.gz', 'checksums.txt'],
+        LIGHTHOUSE_LATEST_RELEASE: ['*x86_64-unknown-linux-gnu.tar.gz',
+            '*x86_64-unknown-linux-gnu.tar.gz.asc'],
+        NIMBUS_LATEST_RELEASE: ['nimbus-eth2_Linux_amd64*'],
+        EDC_LATEST_RELEASE: ['*linux-amd64.tar.gz', '*linux-amd64.tar.gz.sha256']
+    },
+    BUNDLE_PLATFORM_WINDOWS: {
+        GETH_LATEST_RELEASE: [],
+        NETHERMIND_LATEST_RELEASE: [],
+        MEVBOOST_LATEST_RELEASE: ['*windows_amd64.tar.gz', 'checksums.txt'],
+        LIGHTHOUSE_LATEST_RELEASE: ['*x86_64-windows.tar.gz', '*x86_64-windows.tar.gz.asc'],
+        NIMBUS_LATEST_RELEASE: ['nimbus-eth2_Windows_amd64*'],
+        TEKU_LATEST_RELEASE: [],
+        EDC_LATEST_RELEASE: ['*windows-amd64.zip', '*windows-amd64.zip.sha256'],
+        PROMETHEUS_LATEST_RELEASE: ['*windows-amd64.zip'],
+        WINDOWS_EXPORTER_LATEST_RELEASE: ['*amd64.msi']
+    }
+}
+BUNDLE_PGP_KEYS = {
+    BUNDLE_PLATFORM_UBUNTU: [LIGHTHOUSE_PRIME_PGP_KEY_ID],
+    BUNDLE_PLATFORM_WINDOWS: [LIGHTHOUSE_PRIME_PGP_KEY_ID, GETH_WINDOWS_PGP_KEY_ID]
+}
@@ -142,6 +142,21 @@ def get_install_steps(platform):
     
     return False
 
+def use_mirror(platform, location):
+    # Get the release documents and artifacts from the mirror at location
+
+    from ethwizard.platforms.common import set_mirror
+
+    if platform == PLATFORM_UBUNTU:
+        from ethwizard.platforms.ubuntu.common import log
+        return set_mirror(location, log)
+
+    elif platform == PLATFORM_WINDOWS10:
+        from ethwizard.platforms.windows.common import log
+        return set_mirror(location, log)
+
+    return False
+
 def get_save_state(platform):
     if platform == PLATFORM_UBUNTU:
         from ethwizard.platforms.ubuntu.common import save_state as ubuntu_save_state
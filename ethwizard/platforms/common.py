@@ -1,29 +1,71 @@
 from __future__ import annotations
 
 import httpx
+import errno
+import hashlib
 import json
 import os
 import time
+from ethwizard.utils import stepsubprocess as subprocess
 import humanize
 import asyncio
 import re
+import random
+import threading
+import contextvars
+import weakref
+import logging
+import atexit
+import importlib.util
 
 from rfc3986 import urlparse, builder as urlbuilder
 
 from datetime import timedelta
 
-from dataclasses import dataclass
+from contextlib import contextmanager
+
+from dataclasses import dataclass, field
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    as_completed,
+    wait as wait_futures
+)
+
+from email.utils import parsedate_to_datetime
+
+from functools import lru_cache, partial
 
 from pathlib import Path
 
 from ethwizard.constants import *
 
 from ethwizard.utils.CompactFIPS202 import Keccak_256
+from ethwizard.utils.artifactcache import get_artifact_cache
+from ethwizard.utils.statejournal import StateContext
+from ethwizard.utils.mirror import Mirror, MirrorError, parse_mirror_manifest
+from ethwizard.utils.execution_rpc import ExecutionRPCError, get_execution_rpc_client
+from ethwizard.utils.steptimings import (
+    new_step_record,
+    run_step_instrumented,
+    record_dialog_work,
+    mark_step_satisfied,
+    load_step_timings,
+    save_step_timings,
+    get_active_step_record,
+    record_http_request,
+    count_http_bytes,
+    timed_application,
+    timed_dialog
+)
 
 from asyncio import get_running_loop
 
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import radiolist_dialog, button_dialog, input_dialog, checkboxlist_dialog
+from prompt_toolkit import shortcuts
 from prompt_toolkit.shortcuts.dialogs import _return_none, _create_app
 
 from typing import Optional, Callable, List
@@ -53,12 +95,49 @@ from prompt_toolkit.widgets import (
 from yaml import safe_load
 from secrets import choice
 
+# Dialogs used by the wizard, the time they are shown is added to the active step record
+button_dialog = timed_dialog(shortcuts.button_dialog)
+radiolist_dialog = timed_dialog(shortcuts.radiolist_dialog)
+checkboxlist_dialog = timed_dialog(shortcuts.checkboxlist_dialog)
+input_dialog = timed_dialog(shortcuts.input_dialog)
+
+
+class StepFailedError(Exception):
+    # Raised by a background step that failed, reported to the user by the step sequence
+    pass
 
 @dataclass
 class Step():
     step_id: str
     display_name: str
     exc_function: Callable[[Step, dict, StepSequence], dict]
+    # Context keys read and written by the step. A step without declared inputs is a barrier: it
+    # waits for every step before it and every step after it waits for it.
+    inputs: Optional[List[str]] = None
+    outputs: List[str] = field(default_factory=list)
+    # Interactive steps show dialogs and always run one at a time, in order, on the main thread.
+    # Other steps can run on a worker thread as soon as the steps they depend on are completed.
+    interactive: bool = True
+    # Cheap test, evaluated when resuming, returning True if the work of the step is already
+    # done. It sets the step outputs in the context when it does.
+    probe: Optional[Callable[[Step, dict], bool]] = None
+
+    def depends_on(self, other: Step) -> bool:
+        # Test if this step must wait for an earlier step to be completed
+
+        if self.inputs is None or other.inputs is None:
+            return True
+
+        if self.interactive and other.interactive:
+            return True
+
+        outputs = set(other.outputs)
+
+        return (
+            not outputs.isdisjoint(self.inputs) or
+            not outputs.isdisjoint(self.outputs) or
+            not set(self.outputs).isdisjoint(other.inputs)
+        )
 
 
 @dataclass
@@ -67,10 +146,27 @@ class StepSequence():
     save_state: Callable[[str, dict], bool]
     context_factory: Optional[Callable[[], dict]] = None
     _steps_index: Optional[dict] = None
+    max_workers: int = STEP_SCHEDULER_MAX_WORKERS
+    # Called with an event name and the step timing record when a step starts and ends
+    progress_callback: Optional[Callable[[str, dict], None]] = None
+
+    def __post_init__(self):
+        # Steps save the state with their own step id. When steps are running concurrently, the
+        # resume point must stay on the earliest step that is not completed yet.
+        self._save_state = self.save_state
+        self.save_state = self._save_resumable_state
+        self._pending = None
+        self._state_lock = threading.RLock()
+        self._timing_records = None
+        self._resuming = False
 
     def run_from_start(self, context: Optional[dict] = None) -> bool:
         if self.steps is None or len(self.steps) == 0:
             return False
+
+        # A new installation does not keep the timings of a previous one
+        self._timing_records = []
+        self._resuming = False
         
         return self._run_from_index(0, context)
 
@@ -83,6 +179,8 @@ class StepSequence():
         
         step_index = self._steps_index[step_id]
 
+        self._resuming = True
+
         return self._run_from_index(step_index, context)
     
     def get_step(self, step_id: str) -> Optional[Step]:
@@ -105,6 +203,89 @@ class StepSequence():
         for index, step in enumerate(self.steps):
             self._steps_index[step.step_id] = index
 
+    def _save_resumable_state(self, step_id: str, context: dict) -> bool:
+        with self._state_lock:
+            if self._pending is not None and step_id != WIZARD_COMPLETED_STEP_ID:
+                if len(self._pending) > 0:
+                    step_id = self._pending[0].step_id
+
+            return self._save_state(step_id, context)
+
+    def _run_step(self, step: Step, context: dict) -> dict:
+        # Run a step while recording its timings, subprocesses and HTTP usage
+
+        record = new_step_record(step)
+        with self._state_lock:
+            self._timing_records.append(record)
+
+        if not step.interactive:
+            # Background steps run while dialogs are shown
+            suppress_console_log()
+
+        if self.progress_callback is not None:
+            self.progress_callback('step_started', record)
+
+        try:
+            return run_step_instrumented(record, self._probe_or_run, step, context)
+        finally:
+            self._save_timings()
+
+            if self.progress_callback is not None:
+                self.progress_callback(f'step_{record["status"]}', record)
+
+    def _probe_or_run(self, step: Step, context: dict) -> dict:
+        if self._resuming and step.probe is not None and step.probe(step, context):
+            # The work of this step was already done before the wizard was interrupted
+            mark_step_satisfied()
+            return context
+
+        return step.exc_function(step, context, self)
+
+    def _save_timings(self):
+        try:
+            with self._state_lock:
+                save_step_timings(get_save_directory(), self._timing_records)
+        except OSError:
+            # Timings are informative only, they should never stop the installation
+            pass
+
+    def _complete_step(self, step: Step, context: dict):
+        with self._state_lock:
+            self._pending.remove(step)
+            context[CTX_COMPLETED_STEPS] = context.get(CTX_COMPLETED_STEPS, []) + [step.step_id]
+
+            if len(self._pending) > 0:
+                self._save_state(self._pending[0].step_id, context)
+
+    def _finish_background_step(self, step: Step, future: Future, context: dict):
+        # Complete a background step that is done or report its failure and quit
+
+        exception = future.exception()
+        if exception is None:
+            self._complete_step(step, context)
+            return
+
+        if not isinstance(exception, StepFailedError):
+            # Exceptions, including the SystemExit from quit_app, are raised here
+            raise exception
+
+        button_dialog(
+            title=f'{step.display_name} failed',
+            text=(
+f'''
+{step.display_name} was running in the background and failed:
+
+{exception}
+
+We cannot continue. More details can be found in the logs.
+'''         ),
+            buttons=[
+                ('Quit', False)
+            ]
+        ).run()
+
+        quit()
+
     def _run_from_index(self, step_index: int, context: Optional[dict] = None) -> bool:
         if self.steps is None or len(self.steps) == 0:
             return False
@@ -118,11 +299,75 @@ class StepSequence():
             else:
                 context = self.context_factory()
 
-        for index in range(step_index, len(self.steps)):
-            current_step = self.steps[index]
-            self.save_state(current_step.step_id, context)
+        if not isinstance(context, StateContext):
+            # Saves only serialize the keys the steps set or removed
+            context = StateContext(context)
+
+        # Steps after the resume point that were already completed by a previous run are skipped
+        completed_steps = set(context.get(CTX_COMPLETED_STEPS, []))
+        context[CTX_COMPLETED_STEPS] = [
+            step.step_id for step in self.steps[:step_index]
+            if step.step_id in completed_steps]
+
+        self._pending = [step for step in self.steps[step_index:]
+            if step.step_id not in completed_steps or step is self.steps[step_index]]
+        running = {}
+
+        # Timings from previous runs are kept so a resumed installation shows its full history
+        if self._timing_records is None:
+            self._timing_records = load_step_timings(get_save_directory())
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='step')
+
+        try:
+            while len(self._pending) > 0:
+                interactive_step = None
+
+                # A background step that is done is completed, or its failure reported, before
+                # the next interactive step
+                for step_id, (step, future) in list(running.items()):
+                    if future.done():
+                        del running[step_id]
+                        self._finish_background_step(step, future, context)
+
+                with self._state_lock:
+                    pending = list(self._pending)
+
+                for position, step in enumerate(pending):
+                    if step.step_id in running:
+                        continue
+
+                    if any(step.depends_on(earlier) for earlier in pending[:position]):
+                        continue
+
+                    if step.interactive:
+                        if interactive_step is None:
+                            interactive_step = step
+                        continue
+
+                    self.save_state(step.step_id, context)
+                    running[step.step_id] = (step, executor.submit(
+                        contextvars.copy_context().run, self._run_step, step, context))
+
+                if interactive_step is not None:
+                    self.save_state(interactive_step.step_id, context)
+                    context = self._run_step(interactive_step, context)
+                    self._complete_step(interactive_step, context)
+                    continue
+
+                if len(running) == 0:
+                    break
+
+                # Wait for a background step to be completed before scheduling again
+                futures = {future: step for (step, future) in running.values()}
+                done = next(as_completed(futures))
+                done_step = futures[done]
+                del running[done_step.step_id]
 
-            context = current_step.exc_function(current_step, context, self)
+                self._finish_background_step(done_step, done, context)
+        finally:
+            self._pending = None
+            executor.shutdown(wait=False, cancel_futures=True)
 
         self.save_state(WIZARD_COMPLETED_STEP_ID, context)
 
@@ -135,6 +380,457 @@ def is_completed_state(state):
         'context' in state and
         state['step'] == WIZARD_COMPLETED_STEP_ID)
 
+class _HostLimitedStream(httpx.SyncByteStream):
+    # Response stream that frees its host slot once the response is closed
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        # The slot is also freed when a response that was never closed is garbage collected
+        self._release = weakref.finalize(self, release)
+
+    def __iter__(self):
+        for chunk in self._stream:
+            yield chunk
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+class _InstrumentedTransport(httpx.BaseTransport):
+    # Transport wrapper enforcing a per host connection limit and keeping per host counters
+
+    def __init__(self, transport, max_per_host):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._seen_streams = {}
+        self.host_stats = {}
+
+    def _host_semaphore(self, host):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._max_per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    def _record(self, host, latency, network_stream, failed):
+        with self._lock:
+            stats = self.host_stats.get(host)
+            if stats is None:
+                stats = {
+                    'requests': 0,
+                    'errors': 0,
+                    'reused_connections': 0,
+                    'total_latency': 0.0,
+                    'max_latency': 0.0
+                }
+                self.host_stats[host] = stats
+
+            stats['requests'] += 1
+            if failed:
+                stats['errors'] += 1
+                return
+
+            stats['total_latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+
+            if network_stream is not None:
+                # Closed connections drop out of the weak set on their own
+                seen_streams = self._seen_streams.setdefault(host, weakref.WeakSet())
+                try:
+                    if network_stream in seen_streams:
+                        stats['reused_connections'] += 1
+                    else:
+                        seen_streams.add(network_stream)
+                except TypeError:
+                    pass
+
+    def handle_request(self, request):
+        host = request.url.host
+        semaphore = self._host_semaphore(host)
+
+        # Waiting for a host slot is bounded like waiting for a pooled connection
+        timeouts = request.extensions.get('timeout', {})
+        slot_timeout = timeouts.get('pool', timeouts.get('connect'))
+        if not semaphore.acquire(timeout=slot_timeout):
+            self._record(host, 0.0, None, True)
+            raise httpx.PoolTimeout(f'Timed out waiting for a connection slot to {host}',
+                request=request)
+
+        step_record = get_active_step_record()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._transport.handle_request(request)
+        finally:
+            record_http_request(step_record, time.perf_counter() - start)
+            if response is None:
+                semaphore.release()
+                self._record(host, 0.0, None, True)
+
+        self._record(host, time.perf_counter() - start,
+            response.extensions.get('network_stream'), False)
+
+        response.stream = _HostLimitedStream(count_http_bytes(response.stream, step_record),
+            semaphore.release)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+class _MirrorStream(httpx.SyncByteStream):
+    # Response stream for content served by the mirror, checked against the size and sha256
+    # digest listed in the mirror manifest once it was read completely
+
+    def __init__(self, stream, entry, url, close=None):
+        self._stream = stream
+        self._entry = entry
+        self._url = url
+        self._close = close
+
+    def __iter__(self):
+        digest = hashlib.sha256()
+        size = 0
+
+        for chunk in self._stream:
+            digest.update(chunk)
+            size = size + len(chunk)
+            yield chunk
+
+        if size != self._entry['size'] or digest.hexdigest() != self._entry['sha256']:
+            raise httpx.ReadError(f'Content served by the mirror for {self._url} does not match '
+                f'its manifest')
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+def _read_mirror_file(file_path):
+    with open(str(file_path), 'rb') as mirror_file:
+        while True:
+            data = mirror_file.read(DOWNLOAD_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+
+class _MirrorTransport(httpx.BaseTransport):
+    # Transport wrapper serving the GET requests for URLs listed in the mirror manifest from the
+    # mirror. Other requests, and every request when no mirror is used, go to the wrapped
+    # transport. The complete content is always served, conditional and range headers meant
+    # for the origin are dropped.
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request):
+        mirror = _mirror
+        entry = None
+        if mirror is not None and request.method == 'GET':
+            entry = mirror.lookup(str(request.url))
+
+        if entry is None:
+            return self._transport.handle_request(request)
+
+        if mirror.is_remote:
+            headers = [(name, value) for name, value in request.headers.multi_items()
+                if name.lower() not in MIRROR_DROPPED_HEADERS]
+            mirror_request = httpx.Request('GET', mirror.file_url(entry), headers=headers,
+                extensions=request.extensions)
+            response = self._transport.handle_request(mirror_request)
+            if response.status_code == 200:
+                # Ranges of the mirror copy are not requested
+                if 'accept-ranges' in response.headers:
+                    del response.headers['accept-ranges']
+                response.stream = _MirrorStream(response.stream, entry, request.url,
+                    response.stream.close)
+            return response
+
+        file_path = mirror.file_path(entry)
+        if not file_path.is_file():
+            raise httpx.ConnectError(f'Missing {file_path} in the mirror for {request.url}',
+                request=request)
+
+        return httpx.Response(200, headers={
+            'Content-Length': str(entry['size']),
+            'Content-Type': 'application/octet-stream'
+        }, stream=_MirrorStream(_read_mirror_file(file_path), entry, request.url),
+            request=request)
+
+    def close(self):
+        self._transport.close()
+
+_mirror = None
+
+def set_mirror(location, log):
+    # Resolve the release documents and artifacts listed in the manifest of the mirror at
+    # location, a directory or an HTTP URL, from the mirror instead of their origin. Anything
+    # not in the mirror is still requested from its origin. Return False when the mirror
+    # manifest cannot be loaded.
+
+    global _mirror
+
+    if location.lower().startswith(('http://', 'https://')):
+        manifest_url = location.rstrip('/') + '/' + MIRROR_MANIFEST_FILE
+        try:
+            response = get_http_client().get(manifest_url, follow_redirects=True)
+        except httpx.RequestError as exception:
+            log.error(f'Unable to get the mirror manifest from {manifest_url}. {exception}')
+            return False
+
+        if response.status_code != 200:
+            log.error(f'Unable to get the mirror manifest from {manifest_url}. '
+                f'Status code {response.status_code}')
+            return False
+
+        manifest_data = response.content
+    else:
+        manifest_path = Path(location, MIRROR_MANIFEST_FILE)
+        try:
+            with open(str(manifest_path), 'rb') as manifest_file:
+                manifest_data = manifest_file.read()
+        except OSError as exception:
+            log.error(f'Unable to read the mirror manifest {manifest_path}. {exception}')
+            return False
+
+    try:
+        mirror = Mirror(location, parse_mirror_manifest(manifest_data))
+    except MirrorError as exception:
+        log.error(f'Unable to use the mirror at {location}. {exception}')
+        return False
+
+    _mirror = mirror
+
+    versions = ', '.join(f'{release_path.split("/")[3]} {tag}'
+        for release_path, tag in sorted(mirror.manifest['versions'].items()))
+    log.info(f'Using the mirror at {location} for {len(mirror)} files'
+        + (f' ({versions})' if versions else '') + '.')
+
+    return True
+
+def get_mirror() -> Optional[Mirror]:
+    # Return the mirror in use, None when there is none
+
+    return _mirror
+
+_http_client = None
+_http_transport = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> httpx.Client:
+    # Return the process wide HTTP client, creating it on first use
+
+    global _http_client, _http_transport
+
+    with _http_client_lock:
+        if _http_client is None:
+            http2 = importlib.util.find_spec('h2') is not None
+
+            limits = httpx.Limits(
+                max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY
+            )
+            _http_transport = _InstrumentedTransport(
+                httpx.HTTPTransport(http2=http2, limits=limits, retries=HTTP_CLIENT_RETRIES),
+                HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST
+            )
+            _http_client = httpx.Client(
+                transport=_MirrorTransport(_http_transport),
+                timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUT, connect=HTTP_CLIENT_CONNECT_TIMEOUT)
+            )
+            atexit.register(close_http_client)
+
+        return _http_client
+
+def close_http_client():
+    # Close the process wide HTTP client and its pooled connections
+
+    global _http_client, _http_transport
+
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _http_transport = None
+
+def get_http_client_stats():
+    # Return per host request count, error count, connection reuse and latency for the process
+    # wide HTTP client
+
+    with _http_client_lock:
+        if _http_transport is None:
+            return {}
+        transport = _http_transport
+
+    with transport._lock:
+        host_stats = {}
+        for host, stats in transport.host_stats.items():
+            succeeded = stats['requests'] - stats['errors']
+            host_stats[host] = dict(stats)
+            host_stats[host]['average_latency'] = (
+                stats['total_latency'] / succeeded if succeeded > 0 else 0.0)
+
+    return host_stats
+
+def run_timed_probes(probes, log, default=UNKNOWN_VALUE):
+    # Run probes concurrently and return a dict with the result of each probe. probes is a list
+    # of (name, function, timeout) tuples. A probe that raises or that does not finish within its
+    # own timeout gets the default value. The probes run in daemon threads so a hung probe never
+    # blocks the caller or the wizard exit.
+
+    start = time.perf_counter()
+
+    futures = {}
+    timings = {}
+
+    def run_probe(name, function, future):
+        probe_start = time.perf_counter()
+        try:
+            result = function()
+        except BaseException as exception:
+            timings[name] = time.perf_counter() - probe_start
+            future.set_exception(exception)
+        else:
+            timings[name] = time.perf_counter() - probe_start
+            future.set_result(result)
+
+    for name, function, timeout in probes:
+        future = Future()
+        futures[name] = (future, timeout)
+        thread = threading.Thread(target=contextvars.copy_context().run,
+            args=(run_probe, name, function, future),
+            name=f'probe-{name}', daemon=True)
+        thread.start()
+
+    results = {}
+    breakdown = []
+
+    for name, (future, timeout) in futures.items():
+        remaining = None
+        if timeout is not None:
+            remaining = max(0.0, start + timeout - time.perf_counter())
+
+        try:
+            results[name] = future.result(timeout=remaining)
+            breakdown.append(f'{name}: {timings[name]:.3f}s')
+        except FutureTimeoutError:
+            log.warning(f'Probe {name} did not complete within {timeout} seconds.')
+            results[name] = default
+            breakdown.append(f'{name}: timed out after {timeout}s')
+        except Exception as exception:
+            log.error(f'Exception while running probe {name}. {exception}')
+            results[name] = default
+            breakdown.append(f'{name}: failed after {timings.get(name, 0.0):.3f}s')
+
+    log.info(f'Probes completed in {time.perf_counter() - start:.3f}s '
+        f'({", ".join(breakdown)})')
+
+    return results
+
+# Full screen dialogs are drawn on the console. The console handler is given ConsoleLogFilter so
+# the records logged by background work are not printed over them and the records logged by the
+# work of a progress dialog are shown in its log area instead. They still reach the other
+# handlers.
+
+_console_log_target = contextvars.ContextVar('console_log_target', default=None)
+_CONSOLE_SUPPRESSED = 'suppressed'
+
+class ConsoleLogFilter(logging.Filter):
+    def filter(self, record):
+        target = _console_log_target.get()
+        if target is None:
+            return True
+        if target is not _CONSOLE_SUPPRESSED:
+            target(record.getMessage() + '\n')
+        return False
+
+def suppress_console_log():
+    # Keep the records logged in the current context, and the threads it starts, off the console
+    _console_log_target.set(_CONSOLE_SUPPRESSED)
+
+def route_console_log(log_text):
+    # Send the records logged in the current context, and the threads it starts, to log_text
+    # instead of the console
+    _console_log_target.set(log_text)
+
+# Disk and network heavy measurements running in the background skew latency measurements.
+# Latency probes wait for them with wait_for_heavy_measurements.
+
+_heavy_measurements = threading.Condition()
+_heavy_measurements_running = 0
+
+@contextmanager
+def heavy_measurement():
+    global _heavy_measurements_running
+
+    with _heavy_measurements:
+        _heavy_measurements_running = _heavy_measurements_running + 1
+    try:
+        yield
+    finally:
+        with _heavy_measurements:
+            _heavy_measurements_running = _heavy_measurements_running - 1
+            _heavy_measurements.notify_all()
+
+def wait_for_heavy_measurements(log):
+    # Wait for the heavy measurements running in the background to be done, in a progress dialog
+    # if there are any. Return False if the user asked to quit.
+
+    with _heavy_measurements:
+        if _heavy_measurements_running == 0:
+            return True
+
+    def waiting_callback(set_percentage, log_text, change_status, set_result, get_exited):
+        with _heavy_measurements:
+            while _heavy_measurements_running > 0 and not get_exited():
+                _heavy_measurements.wait(timeout=0.5)
+        return True
+
+    log.info('Waiting for the system tests to be done before measuring latencies...')
+
+    result = progress_log_dialog(
+        title='Waiting for system tests',
+        text=(
+'''
+The disk and internet speed tests are still running in the background. We
+are waiting for them to be done before measuring the latency of remote
+endpoints so they do not skew those measurements.
+'''     ),
+        status_text='Waiting for the system tests...',
+        run_callback=waiting_callback
+    ).run()
+
+    return bool(result)
+
+def start_background_task(name, function, *args, **kwargs):
+    # Start function in a daemon thread running in a copy of the current context and return a
+    # Future for its result. Used to fetch what a step needs next while it does something else.
+
+    future = Future()
+
+    def run_task():
+        # The task may still be logging while a dialog is shown
+        if _console_log_target.get() is None:
+            suppress_console_log()
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as exception:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(run_task,),
+        name=f'task-{name}', daemon=True)
+    thread.start()
+
+    return future
+
 def select_network(log):
     # Prompt for the selection on which network to perform the installation
 
@@ -389,8 +1085,9 @@ Having a consensus checkpoint provider is highly recommended for your
 beacon node. It makes it possible to get a fully synced beacon in just a
 few minutes compared to having to wait hours or days.
 
-We can select a random community checkpoint sync endpoint for you from
-https://eth-clients.github.io/checkpoint-sync-endpoints/ .
+We can test the community checkpoint sync endpoints listed on
+https://eth-clients.github.io/checkpoint-sync-endpoints/ from this machine
+and select the fastest one for you.
 
 If you have access to a custom beacon node, you can enter your own URL to
 that beacon node with the custom option. That beacon node should be on the
@@ -416,7 +1113,7 @@ Do you want add a consensus checkpoint provider?
             checkpoint_endpoints = []
 
             try:
-                response = httpx.get(checkpoint_yaml_file, follow_redirects=True)
+                response = get_http_client().get(checkpoint_yaml_file, follow_redirects=True)
 
                 if response.status_code != 200:
                     log.error(f'Checkpoint YAML file returned an unexpected status code from {checkpoint_yaml_file}: {response.status_code}')
@@ -432,35 +1129,52 @@ Do you want add a consensus checkpoint provider?
                 log.error(f'No endpoint found in checkpoint YAML file from {checkpoint_yaml_file}')
                 return False
 
-            is_invalid = True
-
             # Filter out endpoints that do not provide verification
             checkpoint_endpoints = list(filter(lambda x: (bool(x.get('verification', False))),
                 checkpoint_endpoints))
 
             log.info(f'{len(checkpoint_endpoints)} checkpoint sync endpoints to choose from.')
 
-            # Select a random endpoint from the YAML file
-            while is_invalid:
-                if len(checkpoint_endpoints) <= 0:
-                    log.error(f'No suitable checkpoint sync endpoint left to choose from.')
-                    return False
-                endpoint_details = choice(checkpoint_endpoints)
-                checkpoint_endpoints.remove(endpoint_details)
+            if not wait_for_heavy_measurements(log):
+                # User asked to quit
+                return False
+
+            # Probe all the endpoints and select the fastest healthy one
+            ranked_endpoints, ranking_table = rank_checkpoint_endpoints(network,
+                checkpoint_endpoints, log)
 
-                endpoint_name = endpoint_details.get('name', UNKNOWN_VALUE)
-                endpoint_url = endpoint_details.get('endpoint', '')
+            if len(ranked_endpoints) <= 0:
+                log.error(f'No suitable checkpoint sync endpoint left to choose from.')
+                return False
 
-                log.info(f'Random endpoint selected: {endpoint_name} at {endpoint_url}')
+            fastest_endpoint = ranked_endpoints[0]
 
-                if endpoint_url == '':
-                    log.error(f'Endpoint does not have an URL. Skipping.')
-                    continue
+            log.info(f'Fastest endpoint selected: {fastest_endpoint["name"]} at '
+                f'{fastest_endpoint["url"]}')
+
+            result = button_dialog(
+                title='Community checkpoint sync endpoints',
+                text=(
+f'''
+We tested the community checkpoint sync endpoints from this machine. Here
+are the results, from the fastest to the slowest:
+
+{ranking_table}
+
+The fastest one will be used: {fastest_endpoint["name"]}
+'''             ),
+                buttons=[
+                    ('Use it', 1),
+                    ('Back', 2),
+                    ('Quit', False)
+                ]
+            ).run()
+
+            if not result:
+                return result
 
-                # Test if the endpoint works, select another one if not
-                is_invalid = not beacon_node_url_validator(network, endpoint_url, log)
-                if not is_invalid:
-                    initial_state_url = endpoint_url
+            if result == 1:
+                initial_state_url = fastest_endpoint['url']
 
         elif result == 2:
             # Custom
@@ -509,12 +1223,24 @@ Ethereum Beacon Node API. It should implement these endpoints:
 
     return initial_state_url
 
-def beacon_node_url_validator(network, url, log):
-    # Return true if this is a beacon chain endpoint for the network
+def probe_beacon_node(network, url, measure_finalized=False):
+    # Probe a beacon node URL for the network. Return a dict with healthy set to True if this
+    # is a beacon chain endpoint for the network, the error otherwise and the measured latencies.
+    # When measure_finalized is True, the latency of the small finalized block header request is
+    # measured as well.
+
+    probe_result = {
+        'url': url,
+        'healthy': False,
+        'error': None,
+        'deposit_contract_latency': None,
+        'finalized_latency': None
+    }
 
     if not uri_validator(url):
-        return False
-    
+        probe_result['error'] = 'Invalid URL.'
+        return probe_result
+
     base_url = urlbuilder.URIBuilder.from_uri(url)
     deposit_contract_url = base_url.add_path(BN_DEPOSIT_CONTRACT_URL).finalize().unsplit()
 
@@ -523,46 +1249,149 @@ def beacon_node_url_validator(network, url, log):
     }
 
     try:
-        response = httpx.get(deposit_contract_url, headers=headers, follow_redirects=True)
+        start = time.perf_counter()
+        response = get_http_client().get(deposit_contract_url, headers=headers,
+            follow_redirects=True)
+        probe_result['deposit_contract_latency'] = time.perf_counter() - start
 
         if response.status_code != 200:
-            log.error(f'Beacon node returned an unexpected status code: {response.status_code}')
-            return False
-        
-        response_json = response.json()
+            probe_result['error'] = (
+                f'Beacon node returned an unexpected status code: {response.status_code}')
+            return probe_result
 
-        if not response_json:
-            log.error(f'Unexpected response from beacon node.')
-            return False
+        try:
+            response_json = response.json()
+        except ValueError:
+            response_json = None
 
         if (
-            'data' not in response_json or
+            not isinstance(response_json, dict) or
+            not isinstance(response_json.get('data'), dict) or
             'chain_id' not in response_json['data'] or
             'address' not in response_json['data']
         ):
-            log.error('Unexpected response from beacon node.')
-            return False
-        
+            probe_result['error'] = 'Unexpected response from beacon node.'
+            return probe_result
+
         chain_id = response_json['data']['chain_id']
         deposit_contract = response_json['data']['address']
 
         if int(chain_id) != BN_CHAIN_IDS[network]:
-            log.error(f'Unexpected chain_id ({chain_id}) from beacon node. We expected another '
+            probe_result['error'] = (
+                f'Unexpected chain_id ({chain_id}) from beacon node. We expected another '
                 f'value ({BN_CHAIN_IDS[network]}) for this network ({network}).')
-            return False
-        
+            return probe_result
+
         if deposit_contract.lower() != BN_DEPOSIT_CONTRACTS[network].lower():
-            log.error(f'Unexpected deposit contract address ({deposit_contract}) from beacon '
+            probe_result['error'] = (
+                f'Unexpected deposit contract address ({deposit_contract}) from beacon '
                 f'node. We expected another value ({BN_DEPOSIT_CONTRACTS[network]}) for this '
                 f'network ({network}).')
-            return False
-        
+            return probe_result
+
+        if measure_finalized:
+            finalized_header_url = (urlbuilder.URIBuilder.from_uri(url)
+                .add_path(BN_FINALIZED_HEADER_URL).finalize().unsplit())
+
+            start = time.perf_counter()
+            response = get_http_client().get(finalized_header_url, headers=headers,
+                follow_redirects=True)
+            probe_result['finalized_latency'] = time.perf_counter() - start
+
+            if response.status_code != 200:
+                probe_result['error'] = (f'Beacon node returned an unexpected status code '
+                    f'for the finalized block header: {response.status_code}')
+                return probe_result
+
+            response_json = response.json()
+            if not isinstance(response_json, dict) or not isinstance(
+                response_json.get('data'), dict):
+                probe_result['error'] = 'Unexpected finalized block header from beacon node.'
+                return probe_result
+
     except httpx.RequestError as exception:
-        log.error(f'Exception during request to beacon node: {exception}')
+        probe_result['error'] = f'Exception during request to beacon node: {exception}'
+        return probe_result
+    except ValueError as exception:
+        probe_result['error'] = f'Unexpected response from beacon node: {exception}'
+        return probe_result
+
+    probe_result['healthy'] = True
+    return probe_result
+
+def beacon_node_url_validator(network, url, log):
+    # Return true if this is a beacon chain endpoint for the network
+
+    probe_result = probe_beacon_node(network, url)
+
+    if not probe_result['healthy']:
+        if probe_result['error'] is not None and uri_validator(url):
+            log.error(probe_result['error'])
         return False
 
     return True
 
+def rank_checkpoint_endpoints(network, checkpoint_endpoints, log):
+    # Probe all the checkpoint sync endpoints concurrently and return the healthy ones sorted
+    # from the fastest to the slowest along with a text table of all the probe results.
+
+    probes = []
+    probe_endpoints = {}
+    for index, endpoint_details in enumerate(checkpoint_endpoints):
+        endpoint_name = endpoint_details.get('name', UNKNOWN_VALUE)
+        endpoint_url = endpoint_details.get('endpoint', '')
+        if endpoint_url == '':
+            log.error(f'Endpoint {endpoint_name} does not have an URL. Skipping.')
+            continue
+        probe_name = f'{endpoint_name} ({index})'
+        probe_endpoints[probe_name] = endpoint_details
+        probes.append((probe_name,
+            partial(probe_beacon_node, network, endpoint_url, measure_finalized=True),
+            BN_CHECKPOINT_PROBE_TIMEOUT))
+
+    probe_results = run_timed_probes(probes, log, default=None)
+
+    ranked = []
+    failed = []
+
+    for probe_name, probe_result in probe_results.items():
+        endpoint_details = probe_endpoints[probe_name]
+        endpoint = {
+            'name': endpoint_details.get('name', UNKNOWN_VALUE),
+            'url': endpoint_details.get('endpoint', ''),
+            'probe': probe_result
+        }
+        if probe_result is None:
+            endpoint['error'] = 'Timed out'
+            failed.append(endpoint)
+        elif not probe_result['healthy']:
+            endpoint['error'] = probe_result['error']
+            failed.append(endpoint)
+        else:
+            ranked.append(endpoint)
+
+    ranked.sort(key=lambda endpoint: (
+        endpoint['probe']['finalized_latency'] + endpoint['probe']['deposit_contract_latency']))
+
+    table_lines = []
+    for position, endpoint in enumerate(ranked, start=1):
+        probe_result = endpoint['probe']
+        table_lines.append(f'{position:>2}. {endpoint["name"][:34]:<34} '
+            f'{probe_result["finalized_latency"] * 1000:>7.0f} ms '
+            f'{probe_result["deposit_contract_latency"] * 1000:>7.0f} ms')
+    for endpoint in failed:
+        table_lines.append(f' -  {endpoint["name"][:34]:<34} unreachable or invalid')
+
+    table_header = f'    {"Endpoint":<34} {"Finalized":>10} {"Config RTT":>10}'
+    table = '\n'.join([table_header] + table_lines)
+
+    log.info(f'Checkpoint sync endpoints ranking for {network}:\n{table}')
+    for endpoint in failed:
+        log.warning(f'Checkpoint sync endpoint {endpoint["name"]} at {endpoint["url"]} was '
+            f'dropped: {endpoint["error"]}')
+
+    return ranked, table
+
 def select_eth1_fallbacks(network):
     # Prompt the user for ethereum execution fallback nodes
     eth1_fallbacks = []
@@ -656,7 +1485,7 @@ you should keep secret if you used a service that requires an account.
         }
 
         try:
-            response = httpx.post(eth1_fallback, json=request_json, headers=headers,
+            response = get_http_client().post(eth1_fallback, json=request_json, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             result = button_dialog(
@@ -766,6 +1595,120 @@ selected at the beginning of this wizard.
 
     return eth1_fallbacks
 
+def probe_execution_endpoint(network, url):
+    # Probe an execution endpoint with eth_chainId and eth_blockNumber. Return a dict with
+    # healthy set to True if the endpoint is on the network, the error otherwise, the latest block
+    # number and the round trip latency of the eth_blockNumber request.
+
+    probe_result = {
+        'url': url,
+        'healthy': False,
+        'error': None,
+        'chain_id': None,
+        'block_number': None,
+        'latency': None
+    }
+
+    headers = {
+        'Content-Type': 'application/json'
+    }
+
+    def call_method(method):
+        request_json = {
+            'jsonrpc': '2.0',
+            'method': method,
+            'id': 1
+        }
+
+        start = time.perf_counter()
+        response = get_http_client().post(url, json=request_json, headers=headers,
+            follow_redirects=True, timeout=ETH1_FALLBACK_PROBE_TIMEOUT)
+        latency = time.perf_counter() - start
+
+        if response.status_code != 200:
+            raise ValueError(f'Unexpected status code {response.status_code} for {method}')
+
+        response_json = response.json()
+
+        if (
+            not isinstance(response_json, dict) or
+            not response_json.get('result') or
+            type(response_json['result']) is not str
+        ):
+            raise ValueError(f'Unexpected response for {method}: {json.dumps(response_json)}')
+
+        return int(response_json['result'], base=16), latency
+
+    try:
+        probe_result['chain_id'], _ = call_method('eth_chainId')
+
+        if probe_result['chain_id'] != ETH1_NETWORK_CHAINID[network]:
+            probe_result['error'] = (f'Unexpected chain id {probe_result["chain_id"]}, expected '
+                f'{ETH1_NETWORK_CHAINID[network]}')
+            return probe_result
+
+        probe_result['block_number'], probe_result['latency'] = call_method('eth_blockNumber')
+    except httpx.RequestError as exception:
+        probe_result['error'] = f'Exception {exception}'
+        return probe_result
+    except ValueError as exception:
+        probe_result['error'] = str(exception)
+        return probe_result
+
+    probe_result['healthy'] = True
+    return probe_result
+
+def rank_eth1_fallbacks(network, eth1_fallbacks, log):
+    # Probe the execution fallback endpoints concurrently and return them ordered with the
+    # fastest healthy ones first, followed by the unhealthy ones in their original order, along
+    # with the probe results. An endpoint lagging more than ETH1_FALLBACK_MAX_BLOCK_LAG blocks
+    # behind the most recent block seen is not considered healthy.
+
+    if len(eth1_fallbacks) == 0:
+        return [], []
+
+    probes = [(f'fallback {index}', partial(probe_execution_endpoint, network, eth1_fallback),
+        ETH1_FALLBACK_PROBE_TIMEOUT * 2) for index, eth1_fallback in enumerate(eth1_fallbacks)]
+
+    probe_results = list(run_timed_probes(probes, log, default=None).values())
+
+    for index, probe_result in enumerate(probe_results):
+        if probe_result is None:
+            probe_results[index] = {
+                'url': eth1_fallbacks[index],
+                'healthy': False,
+                'error': 'Timed out',
+                'chain_id': None,
+                'block_number': None,
+                'latency': None
+            }
+
+    block_numbers = [probe_result['block_number'] for probe_result in probe_results
+        if probe_result['healthy']]
+    highest_block = max(block_numbers) if len(block_numbers) > 0 else None
+
+    for probe_result in probe_results:
+        probe_result['block_lag'] = None
+        if probe_result['healthy']:
+            probe_result['block_lag'] = highest_block - probe_result['block_number']
+            if probe_result['block_lag'] > ETH1_FALLBACK_MAX_BLOCK_LAG:
+                probe_result['healthy'] = False
+                probe_result['error'] = f'Lagging {probe_result["block_lag"]} blocks behind'
+
+    healthy = sorted((probe_result for probe_result in probe_results if probe_result['healthy']),
+        key=lambda probe_result: probe_result['latency'])
+    unhealthy = [probe_result for probe_result in probe_results if not probe_result['healthy']]
+
+    for position, probe_result in enumerate(healthy, start=1):
+        log.info(f'Execution fallback #{position}: {probe_result["latency"] * 1000:.0f} ms, '
+            f'block {probe_result["block_number"]} (lag {probe_result["block_lag"]})')
+    for probe_result in unhealthy:
+        log.warning(f'Execution fallback is unhealthy: {probe_result["error"]}')
+
+    ordered = healthy + unhealthy
+
+    return [probe_result['url'] for probe_result in ordered], ordered
+
 def uri_validator(uri):
     try:
         result = urlparse(uri)
@@ -822,7 +1765,7 @@ def input_dialog_default(
         with_background=True,
     )
 
-    return _create_app(dialog, style)
+    return timed_application(_create_app(dialog, style))
 
 def progress_log_dialog(
     title: AnyFormattedText = "",
@@ -898,7 +1841,7 @@ def progress_log_dialog(
         buttons=buttons,
         with_background=True,
     )
-    app = _create_app(dialog, style)
+    app = timed_application(_create_app(dialog, style))
     app.result = None
     app.exited = False
 
@@ -907,7 +1850,12 @@ def progress_log_dialog(
         app.invalidate()
 
     def log_text(text: str) -> None:
-        loop.call_soon_threadsafe(text_area.buffer.insert_text, text)
+        # The application runs on its own loop, records logged after it exited are dropped
+        app_loop = app.loop if app.loop is not None else loop
+        try:
+            app_loop.call_soon_threadsafe(text_area.buffer.insert_text, text)
+        except RuntimeError:
+            return
         app.invalidate()
     
     def change_status(text: str) -> None:
@@ -924,9 +1872,12 @@ def progress_log_dialog(
     # UI, so that it quits.
     def start() -> None:
         result = None
+        callback_start = time.perf_counter()
+        route_console_log(log_text)
         try:
             result = run_callback(set_percentage, log_text, change_status, set_result, get_exited)
         finally:
+            record_dialog_work(time.perf_counter() - callback_start)
             if not app.exited:
                 app.exited = True
                 app.exit(result=result)
@@ -968,87 +1919,361 @@ def search_for_generated_keys(validator_keys_path):
         'password_paths': password_paths
     }
 
-def get_bc_validator_deposits(network, public_keys, log):
-    # Return the validator deposits from the beaconcha.in API
+def _retry_after_delay(response):
+    # Return the delay in seconds requested by a Retry-After header or None
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_date.timestamp() - time.time())
+
+def _get_bc_validator_deposits_chunk(network, public_keys, log):
+    # Query the beaconcha.in API for the deposits of a single chunk of public keys with jittered
+    # exponential backoff. Return a (deposits, error) tuple.
 
     pubkey_arg = ','.join(public_keys)
     bc_api_query_url = (BEACONCHA_IN_URLS[network] +
         BEACONCHA_VALIDATOR_DEPOSITS_API_URL.format(indexOrPubkey=pubkey_arg))
     headers = {'accept': 'application/json'}
 
-    keep_retrying = True
+    error = None
+    retry_after = None
 
-    retry_index = 0
-    retry_count = 5
-    retry_delay = 30
+    for attempt in range(BEACONCHA_IN_MAX_ATTEMPTS):
+        if attempt > 0:
+            retry_delay = random.uniform(0, min(BEACONCHA_IN_BACKOFF_MAX,
+                BEACONCHA_IN_BACKOFF_BASE * (2 ** attempt)))
+            if retry_after is not None:
+                retry_delay = max(retry_delay, min(retry_after, BEACONCHA_IN_BACKOFF_MAX))
+            log.info(f'We will retry in {retry_delay:.1f} seconds (retry index = {attempt})')
+            time.sleep(retry_delay)
+            retry_after = None
 
-    while keep_retrying and retry_index < retry_count:
         try:
-            response = httpx.get(bc_api_query_url, headers=headers, follow_redirects=True)
+            response = get_http_client().get(bc_api_query_url, headers=headers,
+                follow_redirects=True)
         except httpx.RequestError as exception:
-            log.error(f'Exception {exception} when trying to get {bc_api_query_url}')
-
-            retry_index = retry_index + 1
-            log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-            time.sleep(retry_delay)
+            error = f'Exception {exception}'
+            log.error(f'Exception {exception} when trying to get deposits for '
+                f'{len(public_keys)} validator(s) from beaconcha.in')
             continue
 
         if response.status_code != 200:
-            log.error(f'Error code {response.status_code} when trying to get {bc_api_query_url}')
-            
-            retry_index = retry_index + 1
-            log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-            time.sleep(retry_delay)
+            error = f'Status code {response.status_code}'
+            retry_after = _retry_after_delay(response)
+            log.error(f'Error code {response.status_code} when trying to get deposits for '
+                f'{len(public_keys)} validator(s) from beaconcha.in')
             continue
-        
-        response_json = response.json()
+
+        try:
+            response_json = response.json()
+        except ValueError:
+            response_json = None
 
         if (
+            not isinstance(response_json, dict) or
             'status' not in response_json or
             response_json['status'] != 'OK' or
             'data' not in response_json
             ):
+            error = 'Unexpected response'
             log.error(f'Unexpected response data or structure from {bc_api_query_url}: '
                 f'{response_json}')
-            
-            retry_index = retry_index + 1
-            log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-            time.sleep(retry_delay)
             continue
-        
-        keep_retrying = False
-    
-    if keep_retrying:
-        log.error(f'We failed to get the validator deposits from the beaconcha.in API after '
-            f'{retry_count} retries.')
-        time.sleep(5)
-        return False
-    
-    validator_deposits = response_json['data']
-    # beaconcha.in API does not return a list for a single validator so
-    # we make it a list for ease of use
-    if type(validator_deposits) is not list:
-        validator_deposits = [validator_deposits]
 
-    return validator_deposits
+        validator_deposits = response_json['data']
+        # beaconcha.in API does not return a list for a single validator so
+        # we make it a list for ease of use
+        if type(validator_deposits) is not list:
+            validator_deposits = [validator_deposits]
+
+        return validator_deposits, None
+
+    return None, error
+
+def lookup_bc_validator_deposits(network, public_keys, log, progress=None):
+    # Return the validator deposits from the beaconcha.in API keyed by public key along with the
+    # status of each chunk of public keys that was queried. Chunks are queried concurrently and a
+    # failed chunk does not prevent the results from the other chunks from being returned.
+    # progress, when given, is called with (completed chunks, total chunks) as chunks complete.
+
+    chunk_size = BEACONCHA_IN_MAX_PUBKEYS_PER_REQUEST
+    chunks = [public_keys[index:index + chunk_size]
+        for index in range(0, len(public_keys), chunk_size)]
+
+    lookup_result = {
+        'deposits': {public_key.lower(): [] for public_key in public_keys},
+        'chunks': [{
+            'public_keys': chunk,
+            'status': 'pending',
+            'error': None
+        } for chunk in chunks]
+    }
 
-def test_open_ports(ports, log):
-    # Test the selected ports to make sure they are opened and exposed to the internet
+    if len(chunks) == 0:
+        return lookup_result
 
-    params = {
-        'ports': str(ports['eth1']) + ',' + str(ports['eth2_bn'])
-    }
+    completed = 0
 
-    requested_ports = {ports['eth1'], ports['eth2_bn']}
+    with ThreadPoolExecutor(max_workers=BEACONCHA_IN_MAX_CONCURRENT_REQUESTS) as executor:
+        future_to_chunk = {
+            executor.submit(_get_bc_validator_deposits_chunk, network, chunk, log): chunk_status
+            for chunk, chunk_status in zip(chunks, lookup_result['chunks'])
+        }
 
-    all_ports_opened = False
+        for future in as_completed(future_to_chunk):
+            chunk_status = future_to_chunk[future]
+            validator_deposits, error = future.result()
 
-    log.info('Checking for open ports...')
+            if validator_deposits is None:
+                chunk_status['status'] = 'failed'
+                chunk_status['error'] = error
+            else:
+                chunk_status['status'] = 'ok'
+                for deposit in validator_deposits:
+                    public_key = str(deposit.get('publickey', '')).lower()
+                    lookup_result['deposits'].setdefault(public_key, []).append(deposit)
+
+            completed = completed + 1
+            log.info(f'Validator deposits lookup: {completed}/{len(chunks)} chunk(s) done.')
+            if progress is not None:
+                progress(completed, len(chunks))
+
+    return lookup_result
+
+def get_bc_validator_deposits(network, public_keys, log, progress=None):
+    # Return the validator deposits from the beaconcha.in API
+
+    if len(public_keys) == 0:
+        return []
+
+    lookup_result = lookup_bc_validator_deposits(network, public_keys, log, progress=progress)
+
+    failed_chunks = [chunk for chunk in lookup_result['chunks'] if chunk['status'] != 'ok']
+
+    if len(failed_chunks) == len(lookup_result['chunks']):
+        log.error(f'We failed to get the validator deposits from the beaconcha.in API after '
+            f'{BEACONCHA_IN_MAX_ATTEMPTS} attempts.')
+        return False
+
+    if len(failed_chunks) > 0:
+        failed_keys = sum(len(chunk['public_keys']) for chunk in failed_chunks)
+        log.warning(f'Deposits lookup failed for {failed_keys} of {len(public_keys)} '
+            f'validator(s). Results are partial.')
+
+    validator_deposits = []
+    for deposits in lookup_result['deposits'].values():
+        validator_deposits.extend(deposits)
+
+    validators_found = sum(
+        1 for deposits in lookup_result['deposits'].values() if len(deposits) > 0)
+    log.info(f'Deposits found for {validators_found} of {len(public_keys)} validator(s).')
+
+    return validator_deposits
+
+VALIDATOR_STATUS_DEPOSITED = 'deposited'
+VALIDATOR_STATUS_PENDING = 'pending'
+VALIDATOR_STATUS_ACTIVE = 'active'
+VALIDATOR_STATUS_EXITED = 'exited'
+
+def _validator_status_from_bn(bn_status):
+    # Reduce a beacon node API validator status to the statuses used by the wizard
+    if bn_status.startswith('pending'):
+        return VALIDATOR_STATUS_PENDING
+    if bn_status.startswith('active'):
+        return VALIDATOR_STATUS_ACTIVE
+    return VALIDATOR_STATUS_EXITED
+
+def iter_json_array_items(text_chunks, array_key):
+    # Incrementally parse a JSON document made of text chunks and yield each item of the top
+    # level array found under array_key without holding the whole document in memory.
+
+    decoder = json.JSONDecoder()
+    array_start = re.compile(r'"' + re.escape(array_key) + r'"\s*:\s*\[')
+    buffer = ''
+    position = 0
+    in_array = False
+
+    for chunk in text_chunks:
+        buffer = buffer[position:] + chunk
+        position = 0
+
+        if not in_array:
+            result = array_start.search(buffer)
+            if not result:
+                continue
+            in_array = True
+            position = result.end()
+
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position = position + 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Incomplete item, wait for more data
+                break
+            yield item
+
+    if not in_array:
+        raise ValueError(f'Unable to find {array_key} array in JSON document.')
+    raise ValueError(f'Unexpected end of JSON document while reading {array_key} array.')
+
+def get_bn_validator_statuses(bn_http_base, public_keys, log):
+    # Return the status of each validator known by the beacon node at bn_http_base keyed by
+    # public key. Public keys are sent in batches to the validators endpoint and responses are
+    # parsed as they are streamed. Return None if the beacon node cannot be queried.
+
+    bn_validators_url = bn_http_base + BN_VALIDATORS_EP
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }
+
+    validator_statuses = {}
+
+    for index in range(0, len(public_keys), BN_VALIDATORS_BATCH_SIZE):
+        batch = public_keys[index:index + BN_VALIDATORS_BATCH_SIZE]
+
+        try:
+            with get_http_client().stream('POST', bn_validators_url, json={'ids': batch},
+                headers=headers, timeout=BN_VALIDATORS_TIMEOUT) as http_stream:
+
+                if http_stream.status_code != 200:
+                    log.error(f'Unexpected status code from {bn_validators_url}. Status code: '
+                        f'{http_stream.status_code}')
+                    return None
+
+                for item in iter_json_array_items(http_stream.iter_text(), 'data'):
+                    validator = item.get('validator', {})
+                    public_key = str(validator.get('pubkey', '')).lower()
+                    bn_status = str(item.get('status', ''))
+                    validator_statuses[public_key] = {
+                        'publickey': public_key,
+                        'index': item.get('index'),
+                        'status': _validator_status_from_bn(bn_status),
+                        'bn_status': bn_status,
+                        'source': 'beacon_node'
+                    }
+        except httpx.RequestError as exception:
+            log.error(f'Cannot connect to beacon node at {bn_http_base}. Exception: {exception}')
+            return None
+        except ValueError as exception:
+            log.error(f'Unexpected response from {bn_validators_url}. {exception}')
+            return None
+
+    return validator_statuses
+
+def get_validator_deposits(network, public_keys, log, bn_http_base=None, progress=None):
+    # Return one entry for each validator that has a deposit with its status. The local beacon
+    # node is queried first. Only the validators it does not know about are looked up on
+    # beaconcha.in, which also sees deposits that the beacon chain did not process yet.
+    # Return False if neither source could be queried. progress is passed to
+    # lookup_bc_validator_deposits.
+
+    validator_statuses = None
+    if bn_http_base is not None:
+        validator_statuses = get_bn_validator_statuses(bn_http_base, public_keys, log)
+
+    bn_failed = validator_statuses is None
+
+    if bn_failed:
+        log.warning('Unable to get validator statuses from the local beacon node. Falling back '
+            'to beaconcha.in.')
+        validator_statuses = {}
+        missing_public_keys = public_keys
+    else:
+        log.info(f'The local beacon node knows about {len(validator_statuses)} of '
+            f'{len(public_keys)} validator(s).')
+        missing_public_keys = [public_key for public_key in public_keys
+            if public_key.lower() not in validator_statuses]
+
+    if len(missing_public_keys) > 0:
+        bc_deposits = get_bc_validator_deposits(network, missing_public_keys, log,
+            progress=progress)
+
+        if type(bc_deposits) is not list and not bc_deposits:
+            if bn_failed:
+                return False
+        else:
+            for deposit in bc_deposits:
+                public_key = str(deposit.get('publickey', '')).lower()
+                if public_key not in validator_statuses:
+                    validator_statuses[public_key] = {
+                        'publickey': public_key,
+                        'index': None,
+                        'status': VALIDATOR_STATUS_DEPOSITED,
+                        'bn_status': None,
+                        'source': 'beaconcha.in'
+                    }
+
+    return list(validator_statuses.values())
+
+def get_validator_deposits_with_progress(network, public_keys, log, bn_http_base=None):
+    # Return get_validator_deposits while showing the progress of the beaconcha.in lookup in a
+    # progress dialog. Quitting the dialog returns False as if no source could be queried.
+
+    def deposits_callback(set_percentage, log_text, change_status, set_result, get_exited):
+        def report_progress(completed, total):
+            set_percentage(completed * 100 // total)
+            change_status(f'beaconcha.in: {completed}/{total} chunk(s) of public keys done')
+
+        if bn_http_base is not None:
+            change_status('Querying the local beacon node...')
+        else:
+            change_status('Querying beaconcha.in...')
+
+        return get_validator_deposits(network, public_keys, log, bn_http_base=bn_http_base,
+            progress=report_progress)
+
+    validator_deposits = progress_log_dialog(
+        title='Looking up validator deposits',
+        text=(
+f'''
+We are looking up the deposits for your {len(public_keys)} validator key(s).
+'''     ),
+        status_text='Starting...',
+        run_callback=deposits_callback
+    ).run()
+
+    if validator_deposits is None:
+        log.warning('Validator deposits lookup was cancelled.')
+        return False
+
+    return validator_deposits
+
+def test_open_ports(ports, log):
+    # Test the selected ports to make sure they are opened and exposed to the internet
+
+    params = {
+        'ports': str(ports['eth1']) + ',' + str(ports['eth2_bn'])
+    }
+
+    requested_ports = {ports['eth1'], ports['eth2_bn']}
+
+    all_ports_opened = False
+
+    log.info('Checking for open ports...')
 
     while not all_ports_opened:
         try:
             log.info('Connecting to StakeHouse Port Checker...')
-            response = httpx.get(STAKEHOUSE_PORT_CHECKER_URL, params=params,
+            response = get_http_client().get(STAKEHOUSE_PORT_CHECKER_URL, params=params,
                 follow_redirects=True)
 
             if response.status_code != 200:
@@ -1344,31 +2569,58 @@ tips for your proposed blocks will go into.
     if input_canceled:
         return ''
     
-    if entered_address.lower()[:2] != '0x':
-        entered_address = '0x' + entered_address
+    return to_checksum_address(entered_address)
+
+ADDRESS_PATTERN = re.compile(r'^(0x)?[0-9a-f]{40}$', flags=re.IGNORECASE)
+LOWERCASE_ADDRESS_PATTERN = re.compile(r'^(0x)?[0-9a-f]{40}$')
+UPPERCASE_ADDRESS_PATTERN = re.compile(r'^(0x)?[0-9A-F]{40}$')
+
+# Hex digits from the address hash that require an uppercase letter in EIP-55
+CHECKSUM_UPPER_NIBBLES = frozenset('89abcdef')
+
+@lru_cache(maxsize=4096)
+def _checksum_address_body(lower_address_body):
+    # Return the EIP-55 checksummed form of a lowercase 40 hex characters address
+    address_hash = Keccak_256(lower_address_body.encode('utf-8')).hex()
+
+    return ''.join(
+        char.upper() if nibble in CHECKSUM_UPPER_NIBBLES else char
+        for char, nibble in zip(lower_address_body, address_hash))
+
+def _address_body(address):
+    address = address.strip()
+    if address[:2].lower() == '0x':
+        address = address[2:]
+    return address
+
+def to_checksum_address(address):
+    # Return the EIP-55 checksummed version of an Ethereum address or None if it is not an
+    # Ethereum address
+    address = address.strip()
+    if not ADDRESS_PATTERN.match(address):
+        return None
 
-    return entered_address
+    return '0x' + _checksum_address_body(_address_body(address).lower())
 
 def is_checksum_address(address):
     # Check for valid checksummed Ethereum address
-    address = address.replace('0x', '').strip()
-    address_hash = Keccak_256(address.lower().encode('utf-8')).hex()
-
-    for i in range(0, 40):
-        if ((int(address_hash[i], 16) > 7 and address[i].upper() != address[i]) or
-                (int(address_hash[i], 16) <= 7 and address[i].lower() != address[i])):
-            return False
-    return True
+    address = _address_body(address)
+    return _checksum_address_body(address.lower()) == address
 
 def is_address(address):
     # Check for valid Ethereum address
-    if not re.match(r'^(0x)?[0-9a-f]{40}$', address, flags=re.IGNORECASE):
+    if not ADDRESS_PATTERN.match(address):
         return False
-    elif re.match(r'^(0x)?[0-9a-f]{40}$', address) or re.match(r'^(0x)?[0-9A-F]{40}$', address):
+    elif LOWERCASE_ADDRESS_PATTERN.match(address) or UPPERCASE_ADDRESS_PATTERN.match(address):
         return True
     else:
         return is_checksum_address(address)
 
+def is_address_batch(addresses):
+    # Check a list of Ethereum addresses in a single pass. Return a list of booleans in the same
+    # order as the addresses.
+    return [is_address(address) for address in addresses]
+
 def show_whats_next(network, public_keys):
     # Show what's next including wait time
 
@@ -1426,38 +2678,1092 @@ def test_context_variable(context, variable, log):
     
     return True
 
-def get_geth_running_version(log):
-    # Get the running version for Geth
+def get_save_directory():
+    # Return the directory where the wizard keeps its persistent data for this platform
 
-    log.info('Getting Geth running version...')
+    if os.name == 'nt':
+        app_data = Path(os.getenv('LOCALAPPDATA', os.getenv('APPDATA', '')))
+        return app_data.joinpath('eth-wizard')
+
+    return Path(LINUX_SAVE_DIRECTORY)
+
+_github_release_cache_lock = threading.Lock()
+
+def _github_release_cache_path(release_path):
+    cache_key = re.sub(r'[^A-Za-z0-9_.-]+', '_', release_path.strip('/'))
+    return get_save_directory().joinpath(GITHUB_RELEASE_CACHE_DIRECTORY, f'{cache_key}.json')
+
+def _load_github_release_cache(cache_path):
+    try:
+        with open(str(cache_path), 'r', encoding='utf8') as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or not isinstance(cached.get('release'), dict):
+        return None
+
+    return cached
+
+def _store_github_release_cache(cache_path, cached, log):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(cache_path.name + '.tmp')
+        with open(str(temp_path), 'w', encoding='utf8') as cache_file:
+            json.dump(cached, cache_file)
+        os.replace(temp_path, cache_path)
+    except OSError as exception:
+        log.warning(f'Unable to write Github release cache file {cache_path}. {exception}')
+
+def github_asset_sha256(asset):
+    # Return the sha256 hexdigest Github publishes for a release asset, None when it does not
+
+    digest = asset.get('digest')
+    if isinstance(digest, str) and digest.lower().startswith('sha256:'):
+        return digest[len('sha256:'):].lower()
+    return None
+
+def get_github_release(release_path, log, ttl=GITHUB_RELEASE_CACHE_TTL):
+    # Return the Github release JSON document for release_path (e.g. LIGHTHOUSE_LATEST_RELEASE)
+    # or None if it cannot be obtained. Release documents are cached on disk along with their
+    # ETag and Last-Modified headers. A cached document younger than ttl seconds is used as is.
+    # An older one is revalidated with a conditional request, which does not count against the
+    # Github rate limit when the release did not change. A stale cached document is used if
+    # Github cannot be reached or refuses the request.
+
+    cache_path = _github_release_cache_path(release_path)
+
+    with _github_release_cache_lock:
+        cached = _load_github_release_cache(cache_path)
+
+    now = time.time()
+
+    # A mirror always provides the release it was built with
+    if (
+        cached is not None and ttl > 0 and _mirror is None and
+        0 <= now - cached.get('fetched_at', 0) < ttl):
+        return cached['release']
+
+    gh_release_url = GITHUB_REST_API_URL + release_path
+    headers = {'Accept': GITHUB_API_VERSION}
+    if cached is not None:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
 
-    local_geth_jsonrpc_url = 'http://127.0.0.1:8545'
-    request_json = {
-        'jsonrpc': '2.0',
-        'method': 'web3_clientVersion',
-        'id': 67
-    }
-    headers = {
-        'Content-Type': 'application/json'
-    }
     try:
-        response = httpx.post(local_geth_jsonrpc_url, json=request_json, headers=headers)
+        response = get_http_client().get(gh_release_url, headers=headers, follow_redirects=True)
     except httpx.RequestError as exception:
-        log.error(f'Cannot connect to Geth. Exception: {exception}')
-        return UNKNOWN_VALUE
+        log.error(f'Exception while getting Github release from {gh_release_url}. {exception}')
+        if cached is not None:
+            log.warning(f'Using cached Github release for {release_path}.')
+            return cached['release']
+        return None
+
+    if response.status_code == 304 and cached is not None:
+        log.info(f'Cached Github release for {release_path} is still current.')
+        cached['fetched_at'] = now
+        with _github_release_cache_lock:
+            _store_github_release_cache(cache_path, cached, log)
+        return cached['release']
 
     if response.status_code != 200:
-        log.error(f'Unexpected status code from {local_geth_jsonrpc_url}. Status code: '
-            f'{response.status_code}')
-        return UNKNOWN_VALUE
-    
-    response_json = response.json()
+        log.error(f'HTTP error while getting Github release from {gh_release_url}. '
+            f'Status code {response.status_code}')
+        if cached is not None:
+            log.warning(f'Using cached Github release for {release_path}.')
+            return cached['release']
+        return None
+
+    try:
+        release_json = response.json()
+    except ValueError:
+        log.error(f'Unexpected response while getting Github release from {gh_release_url}.')
+        return None
+
+    if not isinstance(release_json, dict):
+        log.error(f'Unexpected response while getting Github release from {gh_release_url}.')
+        return None
+
+    cached = {
+        'release_path': release_path,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': now,
+        'release': release_json
+    }
+    with _github_release_cache_lock:
+        _store_github_release_cache(cache_path, cached, log)
+
+    return release_json
+
+def _download_part_paths(file_path):
+    part_path = file_path.with_name(file_path.name + DOWNLOAD_PART_SUFFIX)
+    return part_path, part_path.with_name(part_path.name + '.json')
+
+def _load_download_part_state(part_state_path):
+    try:
+        with open(str(part_state_path), 'r', encoding='utf8') as part_state_file:
+            part_state = json.load(part_state_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(part_state, dict):
+        return None
+
+    return part_state
+
+def _store_download_part_state(part_state_path, part_state, log):
+    try:
+        temp_path = part_state_path.with_name(part_state_path.name + '.tmp')
+        with open(str(temp_path), 'w', encoding='utf8') as part_state_file:
+            json.dump(part_state, part_state_file)
+        os.replace(temp_path, part_state_path)
+    except OSError as exception:
+        log.warning(f'Unable to write download state file {part_state_path}. {exception}')
+
+def _download_validator(headers):
+    # Return the validator to use in If-Range for this response or None. Weak ETags cannot be
+    # used for range requests.
+
+    etag = headers.get('ETag')
+    if etag is not None and not etag.startswith('W/'):
+        return etag
+
+    return headers.get('Last-Modified')
+
+def _content_range(header):
+    # Return the (start, total) tuple from a Content-Range header, None for unknown values
+
+    if header is None:
+        return None, None
+
+    result = re.match(r'\s*bytes\s+(?:(?P<start>\d+)-\d+|\*)/(?:(?P<total>\d+)|\*)', header)
+    if not result:
+        return None, None
+
+    start = int(result.group('start')) if result.group('start') is not None else None
+    total = int(result.group('total')) if result.group('total') is not None else None
+
+    return start, total
+
+def format_download_progress(downloaded, total, rate, eta):
+    progress_text = humanize.naturalsize(downloaded, binary=True)
+    if total:
+        progress_text = (progress_text + f' of {humanize.naturalsize(total, binary=True)} '
+            f'({downloaded * 100 // total}%)')
+    progress_text = progress_text + f' at {humanize.naturalsize(rate, binary=True)}/s'
+    if eta is not None:
+        progress_text = (progress_text +
+            f', {humanize.naturaldelta(timedelta(seconds=eta))} remaining')
+
+    return progress_text
+
+def get_download_cache():
+    # Return the artifact cache shared by all downloads
+
+    return get_artifact_cache(get_save_directory().joinpath(ARTIFACT_CACHE_DIRECTORY))
+
+def get_pgp_keyring_directory():
+    # Return the GnuPG home directory where the wizard keeps the PGP keys it verifies releases
+    # with
+
+    return get_save_directory().joinpath(PGP_KEYRING_DIRECTORY)
+
+def pgp_key_lookup_url(key_server, key_id):
+    # Return the HKP lookup URL for key_id on key_server. hkp is plain HTTP on port 11371 by
+    # default, hkps is HTTPS.
+
+    parsed = urlparse(key_server)
+    scheme = 'https' if parsed.scheme == 'hkps' else 'http'
+    port = parsed.port
+    if port is None and parsed.scheme == 'hkp':
+        port = 11371
+
+    netloc = parsed.host if port is None else f'{parsed.host}:{port}'
+    return f'{scheme}://{netloc}/pks/lookup?op=get&options=mr&search=0x{key_id}'
+
+def _pgp_primary_fingerprints(colons_output):
+    # Return the fingerprints of the primary keys listed in gpg --with-colons output
+
+    fingerprints = []
+    primary = False
+
+    for line in colons_output.splitlines():
+        fields = line.split(':')
+        if fields[0] == 'pub':
+            primary = True
+        elif fields[0] == 'sub':
+            primary = False
+        elif fields[0] == 'fpr' and primary and len(fields) > 9:
+            fingerprints.append(fields[9].upper())
+            primary = False
+
+    return fingerprints
+
+def _pgp_key_matches(fingerprints, key_id):
+    # A key matches when it is the only primary key and its fingerprint is key_id or ends with
+    # the key_id long key id
+
+    return len(fingerprints) == 1 and fingerprints[0].endswith(key_id.upper())
+
+def _pgp_keyring_has_key(gpg_binary, keyring_path, key_id):
+    process_result = subprocess.run([str(gpg_binary), '--homedir', str(keyring_path), '--batch',
+        '--list-keys', '--with-colons', key_id], capture_output=True, text=True)
+    if process_result.returncode != 0:
+        return False
+
+    return _pgp_key_matches(_pgp_primary_fingerprints(process_result.stdout), key_id)
+
+def _fetch_pgp_key(gpg_binary, keyring_path, key_server, key_id):
+    # Return the key_id PGP key from key_server when it has the expected fingerprint, None
+    # otherwise. The key is inspected without being imported. Raise on HTTP errors.
+
+    url = pgp_key_lookup_url(key_server, key_id)
+
+    with get_http_client().stream('GET', url, timeout=PGP_KEY_FETCH_TIMEOUT,
+        follow_redirects=True) as response:
+        response.raise_for_status()
+
+        key_data = b''
+        for data in response.iter_bytes():
+            key_data = key_data + data
+            if len(key_data) > PGP_KEY_MAX_SIZE:
+                return None
+
+    process_result = subprocess.run([str(gpg_binary), '--homedir', str(keyring_path), '--batch',
+        '--with-colons', '--import-options', 'show-only', '--import'], input=key_data,
+        capture_output=True)
+    if process_result.returncode != 0:
+        return None
+
+    fingerprints = _pgp_primary_fingerprints(
+        process_result.stdout.decode('utf8', errors='replace'))
+    if not _pgp_key_matches(fingerprints, key_id):
+        return None
+
+    return key_data
+
+def receive_pgp_key(gpg_binary, key_id, key_description, log):
+    # Make sure the key_id PGP key is in the wizard keyring. A key already in the keyring is used
+    # without touching the network. Otherwise all PGP_KEY_SERVERS are queried at the same time
+    # and the first key received with the expected fingerprint is imported. key_id is a
+    # fingerprint or a long key id. Return True when the key is ready.
+
+    keyring_path = get_pgp_keyring_directory()
+    try:
+        keyring_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError as exception:
+        log.error(f'Unable to create the PGP keyring directory {keyring_path}. {exception}')
+        return False
+
+    if _pgp_keyring_has_key(gpg_binary, keyring_path, key_id):
+        return True
+
+    for round_index in range(PGP_KEY_FETCH_ROUNDS):
+        if round_index > 0:
+            log.warning(f'No key server returned {key_description}. We will wait '
+                f'{PGP_KEY_RETRY_DELAY} seconds and try again.')
+            time.sleep(PGP_KEY_RETRY_DELAY)
+
+        log.info(f'Downloading {key_description} from {len(PGP_KEY_SERVERS)} key servers ...')
+
+        futures = {}
+        for index, key_server in enumerate(PGP_KEY_SERVERS):
+            future = start_background_task(f'pgp-key-{index}', _fetch_pgp_key, gpg_binary,
+                keyring_path, key_server, key_id)
+            futures[future] = key_server
+
+        deadline = time.monotonic() + PGP_KEY_FETCH_TIMEOUT
+        pending = set(futures.keys())
+        key_data = None
+
+        while key_data is None and len(pending) > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, pending = wait_futures(pending, timeout=remaining,
+                return_when=FIRST_COMPLETED)
+            for future in done:
+                key_server = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exception:
+                    log.warning(f'Unable to get {key_description} from {key_server}. '
+                        f'{exception}')
+                    continue
+
+                if result is None:
+                    log.warning(f'{key_server} did not return {key_description} with the '
+                        f'expected fingerprint.')
+                    continue
+
+                key_data = result
+                break
+
+        if key_data is None:
+            continue
+
+        # The other key servers are left to finish in the background
+        log.info(f'Received {key_description} from {key_server}.')
+
+        process_result = subprocess.run([str(gpg_binary), '--homedir', str(keyring_path),
+            '--batch', '--import'], input=key_data, capture_output=True)
+        if (process_result.returncode != 0 or
+            not _pgp_keyring_has_key(gpg_binary, keyring_path, key_id)):
+            log.error(f'Unable to import {key_description} in {keyring_path}. Return code: '
+                f'{process_result.returncode}\n'
+                f'{process_result.stderr.decode("utf8", errors="replace")}')
+            return False
+
+        return True
+
+    log.error(f'We failed to download {key_description} from any key server after '
+        f'{PGP_KEY_FETCH_ROUNDS} attempts.')
+    return False
+
+def _download_from_cache(cache, url, file_path, log, description, request_headers,
+    request_timeout):
+    # Place the cached copy of url at file_path and return its index entry, or return None when
+    # there is no usable cached copy. A copy validated less than ARTIFACT_CACHE_REVALIDATE_AFTER
+    # seconds ago is used without touching the network, an older one is revalidated with a
+    # conditional request first. The cached copy is used as is when the server cannot be
+    # reached.
+
+    entry = cache.lookup(url)
+    if entry is None:
+        return None
+
+    if time.time() - entry.get('validated_at', 0) >= ARTIFACT_CACHE_REVALIDATE_AFTER:
+        conditional_headers = dict(request_headers)
+        if entry.get('etag'):
+            conditional_headers['If-None-Match'] = entry['etag']
+        elif entry.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = entry['last_modified']
+        else:
+            return None
+
+        try:
+            with get_http_client().stream('GET', url, headers=conditional_headers,
+                follow_redirects=True, timeout=request_timeout) as http_stream:
+                still_current = (
+                    http_stream.status_code == 304 or (
+                        http_stream.status_code == 200 and
+                        entry.get('etag') is not None and
+                        http_stream.headers.get('ETag') == entry['etag']))
+        except httpx.RequestError as exception:
+            log.warning(f'Unable to revalidate the cached {description}, using it as is. '
+                f'{exception}')
+            still_current = True
+
+        if not still_current:
+            log.info(f'The cached {description} is out of date.')
+            return None
+
+        cache.mark_validated(url)
+
+    if not cache.fetch(entry['digest'], file_path, url):
+        log.warning(f'The cached {description} is corrupted or unreadable, downloading it again.')
+        return None
+
+    log.info(f'Using cached {description} '
+        f'({humanize.naturalsize(entry.get("size", 0), binary=True)}).')
+
+    return entry
+
+def _hash_download_part(part_path):
+    # Return the sha256 hash object and the size of what is in a .part file
+
+    file_hash = hashlib.sha256()
+    size = 0
+    with open(str(part_path), 'rb') as part_file:
+        for data in iter(partial(part_file.read, DOWNLOAD_CHUNK_SIZE), b''):
+            file_hash.update(data)
+            size = size + len(data)
+    return file_hash, size
+
+def _download_segments(total, segments):
+    # Split total bytes into segments as [first byte, last byte, bytes downloaded] lists
+
+    segment_size = -(-total // segments)
+    return [[start, min(start + segment_size, total) - 1, 0]
+        for start in range(0, total, segment_size)]
+
+def _preallocate_download_part(part_path, total):
+    # Give the .part file its final size so each segment can be written in place. Reserve the
+    # disk space where the platform allows it to fail early when there is not enough of it.
 
-    if 'result' not in response_json:
-        log.error(f'Unexpected JSON response from {local_geth_jsonrpc_url}. result not found.')
+    with open(str(part_path), 'wb') as part_file:
+        part_file.truncate(total)
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(part_file.fileno(), 0, total)
+            except OSError as exception:
+                if exception.errno == errno.ENOSPC:
+                    raise
+
+def _download_segmented(url, part_path, part_state_path, part_state, log, description,
+    request_headers, request_timeout, deadline, timeout, max_attempts, progress, cancelled):
+    # Download the segments listed in part_state in parallel, each with its own Range request
+    # guarded by If-Range and written at its place in the preallocated .part file. A segment
+    # that fails is retried from where it stopped. Return a dict with the bytes received, the
+    # most attempts used by a segment, an error which is None when every segment completed and
+    # fallback, set when the server stopped honoring ranges or the file changed on the server.
+
+    segments = part_state['segments']
+    total = part_state['total']
+    validator = part_state['validator']
+
+    lock = threading.Lock()
+    stop_event = threading.Event()
+    segmented_result = {
+        'received': 0,
+        'attempts': 0,
+        'error': None,
+        'fallback': False
+    }
+
+    def fail(error, fallback=False):
+        with lock:
+            if segmented_result['error'] is None:
+                segmented_result['error'] = error
+                segmented_result['fallback'] = fallback
+        stop_event.set()
+
+    def download_segment(segment):
+        attempt = 0
+        error = None
+        retry_after = None
+
+        while segment[0] + segment[2] <= segment[1]:
+            if stop_event.is_set():
+                return
+
+            if attempt >= max_attempts:
+                fail(error or 'Unknown error')
+                return
+
+            if attempt > 0:
+                retry_delay = min(DOWNLOAD_RETRY_DELAY_MAX,
+                    DOWNLOAD_RETRY_DELAY * (2 ** (attempt - 1)))
+                if retry_after is not None:
+                    retry_delay = max(retry_delay, retry_after)
+                retry_after = None
+                if stop_event.wait(retry_delay):
+                    return
+
+            attempt = attempt + 1
+            with lock:
+                segmented_result['attempts'] = max(segmented_result['attempts'], attempt)
+
+            position = segment[0] + segment[2]
+            segment_headers = dict(request_headers)
+            segment_headers['Range'] = f'bytes={position}-{segment[1]}'
+            segment_headers['If-Range'] = validator
+
+            try:
+                with get_http_client().stream('GET', url, headers=segment_headers,
+                    follow_redirects=True, timeout=request_timeout) as http_stream:
+
+                    status_code = http_stream.status_code
+
+                    if status_code in DOWNLOAD_RETRY_STATUS_CODES:
+                        error = f'Status code {status_code}'
+                        retry_after = _retry_after_delay(http_stream)
+                        continue
+
+                    if status_code != 206:
+                        fail(f'Status code {status_code}', fallback=status_code == 200)
+                        return
+
+                    range_start, range_total = _content_range(
+                        http_stream.headers.get('Content-Range'))
+                    if range_start != position or range_total != total:
+                        fail('Unexpected Content-Range', fallback=True)
+                        return
+
+                    with open(str(part_path), 'r+b') as part_file:
+                        part_file.seek(position)
+
+                        for data in http_stream.iter_raw(DOWNLOAD_CHUNK_SIZE):
+                            data = data[:segment[1] + 1 - (segment[0] + segment[2])]
+                            part_file.write(data)
+                            with lock:
+                                segment[2] = segment[2] + len(data)
+                                segmented_result['received'] += len(data)
+
+                            if stop_event.is_set() or segment[0] + segment[2] > segment[1]:
+                                break
+
+            except httpx.RequestError as exception:
+                error = f'Exception {exception}'
+                log.error(f'Exception while downloading a segment of {description} from '
+                    f'{url}. {exception}')
+                continue
+            except OSError as exception:
+                log.error(f'Unable to write {description} to {part_path}. {exception}')
+                fail(str(exception))
+                return
+
+            if not stop_event.is_set() and segment[0] + segment[2] <= segment[1]:
+                error = 'Incomplete segment'
+
+    log.info(f'Downloading {description} with {len(segments)} connections...')
+
+    download_start = time.monotonic()
+    last_log = download_start
+
+    with ThreadPoolExecutor(max_workers=len(segments),
+        thread_name_prefix='download-segment') as executor:
+        futures = [executor.submit(contextvars.copy_context().run, download_segment, segment)
+            for segment in segments]
+
+        while True:
+            pending = wait_futures(futures, timeout=DOWNLOAD_PROGRESS_INTERVAL).not_done
+            if len(pending) == 0:
+                break
+
+            now = time.monotonic()
+
+            if now > deadline:
+                fail(f'Timed out after {timeout} seconds')
+            elif cancelled is not None and cancelled():
+                fail('Cancelled')
+
+            with lock:
+                downloaded = sum(segment[2] for segment in segments)
+                elapsed = now - download_start
+                rate = segmented_result['received'] / elapsed if elapsed > 0 else 0.0
+            eta = max(0.0, (total - downloaded) / rate) if rate > 0 else None
+
+            if progress is not None:
+                progress(downloaded, total, rate, eta)
+            elif now - last_log >= DOWNLOAD_PROGRESS_LOG_INTERVAL:
+                last_log = now
+                log.info(f'Downloading {description}: '
+                    f'{format_download_progress(downloaded, total, rate, eta)}')
+
+        for future in futures:
+            exception = future.exception()
+            if exception is not None:
+                fail(f'Exception {exception}')
+
+    # Every segment file is closed, what they report is on disk and safe to resume from
+    if not segmented_result['fallback']:
+        _store_download_part_state(part_state_path, part_state, log)
+
+    return segmented_result
+
+def download_file(url, file_path, log, description, headers=None, max_size=DOWNLOAD_MAX_SIZE,
+    timeout=DOWNLOAD_TIMEOUT, max_attempts=DOWNLOAD_MAX_ATTEMPTS, progress=None, cancelled=None,
+    use_cache=True, segments=DOWNLOAD_SEGMENTS, sink=None, expected_sha256=None):
+    # Download url into file_path. Return a dict with the path, the size, the sha256 hexdigest of
+    # the content and an error which is None when the download succeeded.
+    #
+    # The artifact cache is consulted first by URL and every completed download is added to it
+    # unless use_cache is False. An artifact cached under another URL is only reused when the
+    # caller gives expected_sha256 and the response has the same ETag and Content-Length, an
+    # ETag alone does not identify content across URLs. expected_sha256, when given, is also
+    # checked against the downloaded content.
+    #
+    # Data is written to a .part file next to file_path and hashed while it is received. After a
+    # failure, the download resumes where it stopped with a Range request guarded by If-Range so
+    # that a file which changed on the server is downloaded again from the start. A .part file
+    # left by a previous run is resumed the same way. The file is limited to max_size bytes and
+    # the whole download, retries included, to timeout seconds. progress, when given, is called
+    # with (downloaded bytes, total bytes or None, bytes/s, seconds remaining or None), otherwise
+    # the progress is logged periodically. cancelled, when given, is polled to stop the download,
+    # keeping the .part file for later.
+    #
+    # Files of at least DOWNLOAD_SEGMENTED_THRESHOLD bytes served with Accept-Ranges and a
+    # validator are downloaded over up to segments connections in parallel, each fetching its own
+    # range of a preallocated .part file, and hashed once complete. Without range support, or if
+    # the file changes on the server meanwhile, the download starts over as a single stream.
+    #
+    # sink, when given, receives the content with write as it arrives, as long as it arrives in
+    # order from the first byte, and is reset when the download starts over. Its position is
+    # the number of bytes it received. After a download resumed from a previous run, segmented
+    # or served from the cache, the sink did not receive everything and has to read the file.
+
+    file_path = Path(file_path)
+    part_path, part_state_path = _download_part_paths(file_path)
+
+    download_result = {
+        'url': url,
+        'path': file_path,
+        'size': 0,
+        'sha256': None,
+        'resumed': False,
+        'cached': False,
+        'attempts': 0,
+        'error': None
+    }
+
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as exception:
+        log.error(f'Unable to create directory {file_path.parent} for {description}. {exception}')
+        download_result['error'] = str(exception)
+        return download_result
+
+    # Range offsets are in encoded bytes, ask for the content as is
+    request_headers = dict(headers or {})
+    request_headers['Accept-Encoding'] = 'identity'
+    request_timeout = httpx.Timeout(DOWNLOAD_READ_TIMEOUT, connect=HTTP_CLIENT_CONNECT_TIMEOUT)
+
+    cache = get_download_cache() if use_cache else None
+
+    if cache is not None:
+        cached_entry = _download_from_cache(cache, url, file_path, log, description,
+            request_headers, request_timeout)
+        if cached_entry is not None and (
+            expected_sha256 is None or cached_entry['digest'] == expected_sha256.lower()):
+            download_result['size'] = cached_entry.get('size', 0)
+            download_result['sha256'] = cached_entry['digest']
+            download_result['cached'] = True
+            return download_result
+
+    file_hash = hashlib.sha256()
+    offset = 0
+    validator = None
+    response_etag = None
+    response_last_modified = None
+    response_host = None
+
+    total = None
+    segmented_state = None
+
+    part_state = _load_download_part_state(part_state_path)
+    if (
+        part_state is not None and
+        part_state.get('url') == url and
+        part_state.get('validator') and
+        part_path.is_file()
+        ):
+        if 'segments' in part_state:
+            # Keep going with each segment of a segmented download from where it stopped
+            if (
+                segments > 1 and
+                isinstance(part_state.get('total'), int) and
+                part_state['total'] <= max_size and
+                part_path.stat().st_size == part_state['total'] and
+                isinstance(part_state['segments'], list) and
+                all(isinstance(segment, list) and len(segment) == 3 and
+                    all(isinstance(value, int) for value in segment)
+                    for segment in part_state['segments'])
+                ):
+                segmented_state = part_state
+                total = part_state['total']
+                offset = sum(segment[2] for segment in part_state['segments'])
+        else:
+            # Hash what was already downloaded to keep going from there
+            try:
+                file_hash, offset = _hash_download_part(part_path)
+            except OSError:
+                file_hash = hashlib.sha256()
+                offset = 0
+
+        if offset > 0 or segmented_state is not None:
+            validator = part_state['validator']
+            response_etag = part_state.get('etag')
+            response_last_modified = part_state.get('last_modified')
+            response_host = part_state.get('host')
+            log.info(f'Resuming {description} download from '
+                f'{humanize.naturalsize(offset, binary=True)}...')
+
+    download_start = time.monotonic()
+    deadline = download_start + timeout
+    received = 0
+    error = None
+    retry_after = None
+    completed = False
+    segmented = segmented_state is not None
+
+    log.info(f'Downloading {description} from {url} ...')
+
+    for attempt in range(max_attempts):
+        if segmented:
+            # The segments of a previous run are requested on their own
+            break
+
+        if attempt > 0:
+            retry_delay = min(DOWNLOAD_RETRY_DELAY_MAX, DOWNLOAD_RETRY_DELAY * (2 ** (attempt - 1)))
+            if retry_after is not None:
+                retry_delay = max(retry_delay, retry_after)
+            retry_after = None
+
+            if time.monotonic() + retry_delay >= deadline:
+                error = f'Timed out after {timeout} seconds'
+                break
+
+            log.info(f'We will retry downloading {description} in {retry_delay:.1f} seconds '
+                f'(retry index = {attempt})')
+            retry_end = time.monotonic() + retry_delay
+            while time.monotonic() < retry_end:
+                if cancelled is not None and cancelled():
+                    break
+                time.sleep(min(DOWNLOAD_PROGRESS_INTERVAL, retry_end - time.monotonic()))
+
+        if cancelled is not None and cancelled():
+            error = 'Cancelled'
+            break
+
+        download_result['attempts'] = attempt + 1
+
+        attempt_headers = dict(request_headers)
+        if offset > 0 and validator is not None:
+            attempt_headers['Range'] = f'bytes={offset}-'
+            attempt_headers['If-Range'] = validator
+
+        try:
+            with get_http_client().stream('GET', url, headers=attempt_headers,
+                follow_redirects=True, timeout=request_timeout) as http_stream:
+
+                status_code = http_stream.status_code
+
+                if status_code == 416 and offset > 0:
+                    range_start, range_total = _content_range(
+                        http_stream.headers.get('Content-Range'))
+                    if range_total == offset:
+                        # The previous attempt had everything but could not tell
+                        total = offset
+                        completed = True
+                        break
+
+                    log.warning(f'Cannot resume {description} download, starting over.')
+                    error = f'Status code {status_code}'
+                    offset = 0
+                    validator = None
+                    file_hash = hashlib.sha256()
+                    continue
+
+                if status_code in DOWNLOAD_RETRY_STATUS_CODES:
+                    error = f'Status code {status_code}'
+                    retry_after = _retry_after_delay(http_stream)
+                    log.error(f'HTTP error while downloading {description} from {url}. '
+                        f'Status code {status_code}')
+                    continue
+
+                if status_code not in (200, 206):
+                    log.error(f'HTTP error while downloading {description} from {url}. '
+                        f'Status code {status_code}')
+                    download_result['error'] = f'Status code {status_code}'
+                    return download_result
+
+                if status_code == 206:
+                    range_start, range_total = _content_range(
+                        http_stream.headers.get('Content-Range'))
+                    if range_start != offset:
+                        log.warning(f'Unexpected range in response while resuming {description} '
+                            f'download, starting over.')
+                        error = 'Unexpected Content-Range'
+                        offset = 0
+                        validator = None
+                        file_hash = hashlib.sha256()
+                        continue
+
+                    total = range_total
+                    download_result['resumed'] = True
+                else:
+                    if offset > 0:
+                        log.info(f'{description} cannot be resumed or changed on the server, '
+                            f'downloading it from the start.')
+                    offset = 0
+                    file_hash = hashlib.sha256()
+                    if sink is not None and sink.position > 0:
+                        sink.reset()
+                    total = None
+                    content_length = http_stream.headers.get('Content-Length', '')
+                    if content_length.isdigit():
+                        total = int(content_length)
+                    validator = _download_validator(http_stream.headers)
+                    response_etag = http_stream.headers.get('ETag')
+                    response_last_modified = http_stream.headers.get('Last-Modified')
+                    response_host = http_stream.url.host
+
+                    if (
+                        cache is not None and
+                        expected_sha256 is not None and
+                        total is not None and
+                        response_etag is not None and
+                        not response_etag.startswith('W/')
+                        ):
+                        # The same artifact may already be cached under another URL
+                        digest = cache.lookup_etag(response_host, response_etag)
+                        cached_size = None
+                        if digest == expected_sha256.lower():
+                            try:
+                                cached_size = cache.object_path(digest).stat().st_size
+                            except OSError:
+                                pass
+                        if cached_size == total and cache.fetch(digest, file_path):
+                            size = total
+                            cache.store(url, file_path, digest, size, etag=response_etag,
+                                last_modified=response_last_modified, host=response_host)
+                            log.info(f'Using cached {description} '
+                                f'({humanize.naturalsize(size, binary=True)}).')
+                            download_result['size'] = size
+                            download_result['sha256'] = digest
+                            download_result['cached'] = True
+                            return download_result
+
+                if total is not None and total > max_size:
+                    log.error(f'{description} is too large ({total} bytes, limit is {max_size} '
+                        f'bytes). We will stop here to protect you.')
+                    download_result['error'] = f'Too large ({total} bytes)'
+                    return download_result
+
+                if (
+                    status_code == 200 and
+                    segments > 1 and
+                    total is not None and
+                    total >= DOWNLOAD_SEGMENTED_THRESHOLD and
+                    validator is not None and
+                    http_stream.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                    ):
+                    # Large enough to be worth a few more connections, drop this response
+                    segmented = True
+                    break
+
+                if validator is not None:
+                    _store_download_part_state(part_state_path, {
+                        'url': url,
+                        'validator': validator,
+                        'etag': response_etag,
+                        'last_modified': response_last_modified,
+                        'host': response_host
+                    }, log)
+
+                stop_reason = None
+                session_start = time.monotonic()
+                session_bytes = 0
+                last_progress = 0.0
+                last_log = session_start
+
+                with open(str(part_path), 'ab') as part_file:
+                    part_file.truncate(offset)
+
+                    for data in http_stream.iter_raw(DOWNLOAD_CHUNK_SIZE):
+                        part_file.write(data)
+                        file_hash.update(data)
+                        if sink is not None and sink.position == offset:
+                            sink.write(data)
+                        offset = offset + len(data)
+                        session_bytes = session_bytes + len(data)
+                        received = received + len(data)
+
+                        if offset > max_size:
+                            log.error(f'{description} is larger than {max_size} bytes. We will '
+                                f'stop here to protect you.')
+                            download_result['error'] = f'Larger than {max_size} bytes'
+                            return download_result
+
+                        now = time.monotonic()
+
+                        if now > deadline:
+                            stop_reason = f'Timed out after {timeout} seconds'
+                            break
+
+                        if cancelled is not None and cancelled():
+                            stop_reason = 'Cancelled'
+                            break
+
+                        if now - last_progress >= DOWNLOAD_PROGRESS_INTERVAL:
+                            last_progress = now
+                            elapsed = now - session_start
+                            rate = session_bytes / elapsed if elapsed > 0 else 0.0
+                            eta = None
+                            if total is not None and rate > 0:
+                                eta = max(0.0, (total - offset) / rate)
+
+                            if progress is not None:
+                                progress(offset, total, rate, eta)
+                            elif now - last_log >= DOWNLOAD_PROGRESS_LOG_INTERVAL:
+                                last_log = now
+                                log.info(f'Downloading {description}: '
+                                    f'{format_download_progress(offset, total, rate, eta)}')
+
+                if stop_reason is not None:
+                    error = stop_reason
+                    break
+
+        except httpx.RequestError as exception:
+            error = f'Exception {exception}'
+            log.error(f'Exception while downloading {description} from {url}. {exception}')
+            continue
+        except OSError as exception:
+            log.error(f'Unable to write {description} to {part_path}. {exception}')
+            download_result['error'] = str(exception)
+            return download_result
+
+        if total is not None and offset < total:
+            error = f'Incomplete download ({offset} of {total} bytes)'
+            log.error(f'Connection closed while downloading {description} ({offset} of {total} '
+                f'bytes).')
+            continue
+
+        completed = True
+        break
+
+    if segmented:
+        if segmented_state is None:
+            segmented_state = {
+                'url': url,
+                'validator': validator,
+                'etag': response_etag,
+                'last_modified': response_last_modified,
+                'host': response_host,
+                'total': total,
+                'segments': _download_segments(total, segments)
+            }
+            try:
+                _preallocate_download_part(part_path, total)
+            except OSError as exception:
+                log.error(f'Unable to allocate {total} bytes in {part_path} for {description}. '
+                    f'{exception}')
+                download_result['error'] = str(exception)
+                return download_result
+            _store_download_part_state(part_state_path, segmented_state, log)
+        else:
+            download_result['resumed'] = True
+
+        segmented_result = _download_segmented(url, part_path, part_state_path, segmented_state,
+            log, description, request_headers, request_timeout, deadline, timeout, max_attempts,
+            progress, cancelled)
+        received = received + segmented_result['received']
+        download_result['attempts'] = max(download_result['attempts'],
+            segmented_result['attempts'])
+
+        if segmented_result['fallback']:
+            log.warning(f'{description} cannot be downloaded in segments, downloading it as a '
+                f'single stream.')
+            try:
+                for path in (part_path, part_state_path):
+                    if path.is_file():
+                        path.unlink()
+            except OSError as exception:
+                log.error(f'Unable to remove {part_path}. {exception}')
+                download_result['error'] = str(exception)
+                return download_result
+
+            return download_file(url, file_path, log, description, headers=headers,
+                max_size=max_size, timeout=max(0.0, deadline - time.monotonic()),
+                max_attempts=max_attempts, progress=progress, cancelled=cancelled,
+                use_cache=use_cache, segments=1, sink=sink, expected_sha256=expected_sha256)
+
+        error = segmented_result['error']
+        if error is None:
+            # The segments arrived out of order, hash the assembled file
+            try:
+                file_hash, offset = _hash_download_part(part_path)
+            except OSError as exception:
+                log.error(f'Unable to read {description} from {part_path}. {exception}')
+                download_result['error'] = str(exception)
+                return download_result
+
+            completed = offset == total
+            if not completed:
+                error = f'Incomplete download ({offset} of {total} bytes)'
+
+    if not completed:
+        if error is None:
+            error = 'Unknown error'
+        if error == 'Cancelled':
+            log.warning(f'Download of {description} was cancelled.')
+        else:
+            log.error(f'Unable to download {description} from {url}. {error}')
+        download_result['error'] = error
+        return download_result
+
+    try:
+        os.replace(part_path, file_path)
+        if part_state_path.is_file():
+            part_state_path.unlink()
+    except OSError as exception:
+        log.error(f'Unable to move {description} to {file_path}. {exception}')
+        download_result['error'] = str(exception)
+        return download_result
+
+    download_result['size'] = offset
+    download_result['sha256'] = file_hash.hexdigest()
+
+    if expected_sha256 is not None and download_result['sha256'] != expected_sha256.lower():
+        log.error(f'SHA256 checksum failed on {description} from {url}. Expected '
+            f'{expected_sha256.lower()} but we got {download_result["sha256"]}.')
+        download_result['error'] = 'Checksum mismatch'
+        try:
+            file_path.unlink()
+        except OSError:
+            pass
+        return download_result
+
+    if cache is not None:
+        cache.record_miss()
+        if not cache.store(url, file_path, download_result['sha256'], offset,
+            etag=response_etag, last_modified=response_last_modified, host=response_host):
+            log.warning(f'Unable to add {description} to the artifact cache.')
+
+    if progress is not None:
+        elapsed = time.monotonic() - download_start
+        progress(offset, offset, received / elapsed if elapsed > 0 else 0.0, 0.0)
+
+    log.info(f'Downloaded {description} ({humanize.naturalsize(offset, binary=True)}).')
+
+    return download_result
+
+def download_file_with_progress(url, file_path, log, description, **kwargs):
+    # Download a file with download_file while showing its progress, transfer rate and remaining
+    # time in a progress dialog. Quitting the dialog stops the download and keeps what was
+    # downloaded for the next attempt.
+
+    def download_callback(set_percentage, log_text, change_status, set_result, get_exited):
+        def report_progress(downloaded, total, rate, eta):
+            if total:
+                set_percentage(min(100, downloaded * 100 // total))
+            change_status(format_download_progress(downloaded, total, rate, eta))
+
+        return download_file(url, file_path, log, description, progress=report_progress,
+            cancelled=get_exited, **kwargs)
+
+    download_result = progress_log_dialog(
+        title=f'Downloading {description}',
+        text=(
+f'''
+We are downloading {description} from:
+
+{url}
+'''     ),
+        status_text='Connecting...',
+        run_callback=download_callback
+    ).run()
+
+    if not download_result:
+        log.warning(f'Download of {description} was cancelled.')
+        return {
+            'url': url,
+            'path': Path(file_path),
+            'size': 0,
+            'sha256': None,
+            'resumed': False,
+            'cached': False,
+            'attempts': 0,
+            'error': 'Cancelled'
+        }
+
+    return download_result
+
+def get_geth_running_version(log):
+    # Get the running version for Geth
+
+    log.info('Getting Geth running version...')
+
+    try:
+        version_agent = get_execution_rpc_client().client_version()
+    except ExecutionRPCError as exception:
+        log.error(f'Cannot get Geth running version. {exception}')
         return UNKNOWN_VALUE
-    
-    version_agent = response_json['result']
 
     # Version agent should look like: Geth/v1.10.12-stable-6c4dc6c3/linux-amd64/go1.17.2
     result = re.search(r'Geth/v(?P<version>[^-/]+)(-(?P<stable>[^-/]+))?(-(?P<commit>[^-/]+))?',
@@ -1477,21 +3783,10 @@ def get_geth_latest_version(log):
 
     log.info('Getting Geth latest version...')
 
-    geth_gh_release_url = GITHUB_REST_API_URL + GETH_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(geth_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for Geth. {exception}')
-        return UNKNOWN_VALUE
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for Geth. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(GETH_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Geth.')
         return UNKNOWN_VALUE
-    
-    release_json = response.json()
 
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
@@ -1515,35 +3810,12 @@ def get_nethermind_running_version(log):
 
     log.info('Getting Nethermind running version...')
 
-    local_nethermind_jsonrpc_url = 'http://127.0.0.1:8545'
-    request_json = {
-        'jsonrpc': '2.0',
-        'method': 'web3_clientVersion',
-        'id': 67
-    }
-    headers = {
-        'Content-Type': 'application/json'
-    }
     try:
-        response = httpx.post(local_nethermind_jsonrpc_url, json=request_json, headers=headers,
-            timeout=30)
-    except httpx.RequestError as exception:
-        log.error(f'Cannot connect to Nethermind. Exception: {exception}')
+        version_agent = get_execution_rpc_client().client_version(timeout=30)
+    except ExecutionRPCError as exception:
+        log.error(f'Cannot get Nethermind running version. {exception}')
         return UNKNOWN_VALUE
 
-    if response.status_code != 200:
-        log.error(f'Unexpected status code from {local_nethermind_jsonrpc_url}. Status code: '
-            f'{response.status_code}')
-        return UNKNOWN_VALUE
-    
-    response_json = response.json()
-
-    if 'result' not in response_json:
-        log.error(f'Unexpected JSON response from {local_nethermind_jsonrpc_url}. result not found.')
-        return UNKNOWN_VALUE
-    
-    version_agent = response_json['result']
-
     # Version agent should look like: Nethermind/v1.19.3+e8ac1da4/linux-x64/dotnet7.0.8
     result = re.search(r'Nethermind/v(?P<version>[^-/\+]+)(\+(?P<commit>[^-/]+))?',
         version_agent)
@@ -1562,22 +3834,11 @@ def get_nethermind_latest_version(log):
 
     log.info('Getting Nethermind latest version...')
 
-    nethermind_gh_release_url = GITHUB_REST_API_URL + NETHERMIND_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(nethermind_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for Nethermind. {exception}')
+    release_json = get_github_release(NETHERMIND_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Nethermind.')
         return UNKNOWN_VALUE
 
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for Nethermind. '
-            f'Status code {response.status_code}')
-        return UNKNOWN_VALUE
-    
-    release_json = response.json()
-
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
             f'version for Nethermind.')
@@ -1600,21 +3861,10 @@ def get_lighthouse_latest_version(log):
 
     log.info('Getting Lighthouse latest version...')
 
-    lighthouse_gh_release_url = GITHUB_REST_API_URL + LIGHTHOUSE_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(lighthouse_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for Lighthouse. {exception}')
-        return UNKNOWN_VALUE
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for Lighthouse. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(LIGHTHOUSE_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Lighthouse.')
         return UNKNOWN_VALUE
-    
-    release_json = response.json()
 
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
@@ -1638,21 +3888,10 @@ def get_mevboost_latest_version(log):
 
     log.info('Getting MEV-Boost latest version...')
 
-    gh_release_url = GITHUB_REST_API_URL + MEVBOOST_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for MEV-Boost. {exception}')
-        return UNKNOWN_VALUE
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for MEV-Boost. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(MEVBOOST_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for MEV-Boost.')
         return UNKNOWN_VALUE
-    
-    release_json = response.json()
 
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
@@ -1676,21 +3915,10 @@ def get_nimbus_latest_version(log):
 
     log.info('Getting Nimbus latest version...')
 
-    gh_release_url = GITHUB_REST_API_URL + NIMBUS_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for Nimbus. {exception}')
-        return UNKNOWN_VALUE
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for Nimbus. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(NIMBUS_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Nimbus.')
         return UNKNOWN_VALUE
-    
-    release_json = response.json()
 
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
@@ -1790,6 +4018,160 @@ MEV-Boost.
 
     return min_bid
 
+def _percentile(values, percent):
+    # Nearest-rank percentile of a list of values
+
+    if len(values) == 0:
+        return None
+
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+def benchmark_mev_relay(relay_url, rounds=MEV_RELAY_BENCHMARK_ROUNDS, cancelled=None):
+    # Call the relay status endpoint rounds times and return the latency percentiles in seconds
+    # along with the error rate. The remaining rounds are skipped once cancelled returns True.
+
+    # The relay public key is part of the relay URL as userinfo, it should not be sent as
+    # credentials
+    status_url = urlparse(relay_url).copy_with(userinfo=None, path=MEV_RELAY_STATUS_EP,
+        query=None, fragment=None).unsplit()
+
+    latencies = []
+    errors = 0
+    samples = 0
+
+    for _ in range(rounds):
+        if cancelled is not None and cancelled():
+            break
+
+        samples = samples + 1
+        start = time.perf_counter()
+        try:
+            response = get_http_client().get(status_url, timeout=MEV_RELAY_BENCHMARK_TIMEOUT)
+            response.read()
+        except httpx.RequestError:
+            errors = errors + 1
+            continue
+        latency = time.perf_counter() - start
+
+        if response.status_code != 200:
+            errors = errors + 1
+            continue
+
+        latencies.append(latency)
+
+    return {
+        'url': relay_url,
+        'samples': samples,
+        'errors': errors,
+        'error_rate': errors / samples if samples > 0 else 1.0,
+        'p50': _percentile(latencies, 50),
+        'p95': _percentile(latencies, 95)
+    }
+
+def benchmark_mev_relays(relay_urls, log, rounds=MEV_RELAY_BENCHMARK_ROUNDS, progress=None,
+    cancelled=None):
+    # Benchmark all relays concurrently and return a dict of relay URL to benchmark result.
+    # progress, when given, is called with (relay URL, result, completed relays, total relays)
+    # as relays complete.
+
+    results = {}
+
+    if len(relay_urls) == 0:
+        return results
+
+    log.info(f'Benchmarking {len(relay_urls)} MEV relays with {rounds} status requests each...')
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=min(len(relay_urls), HTTP_CLIENT_MAX_CONNECTIONS),
+        thread_name_prefix='relay-benchmark') as executor:
+        futures = {executor.submit(benchmark_mev_relay, relay_url, rounds, cancelled): relay_url
+            for relay_url in relay_urls}
+
+        for future in as_completed(futures):
+            relay_url = futures[future]
+            try:
+                results[relay_url] = future.result()
+            except Exception as exception:
+                log.error(f'Exception while benchmarking MEV relay {relay_url}. {exception}')
+                results[relay_url] = {
+                    'url': relay_url,
+                    'samples': rounds,
+                    'errors': rounds,
+                    'error_rate': 1.0,
+                    'p50': None,
+                    'p95': None
+                }
+
+            if progress is not None:
+                progress(relay_url, results[relay_url], len(results), len(relay_urls))
+
+    log.info(f'MEV relays benchmark completed in {time.perf_counter() - start:.3f}s')
+
+    return results
+
+def benchmark_mev_relays_with_progress(relay_names, log):
+    # Benchmark the relays, given as a dict of relay URL to relay name, in a progress dialog.
+    # Return the benchmark results, an empty dict if the user skipped the benchmark or None if
+    # the user asked to quit.
+
+    def benchmark_callback(set_percentage, log_text, change_status, set_result, get_exited):
+        def report_progress(relay_url, result, completed, total):
+            set_percentage(completed * 100 // total)
+            change_status(f'{completed}/{total} relays measured')
+            log_text(f'{relay_names[relay_url]}: {format_mev_relay_benchmark(result)}\n')
+
+        return benchmark_mev_relays(list(relay_names.keys()), log, progress=report_progress,
+            cancelled=get_exited)
+
+    result = progress_log_dialog(
+        title='Measuring MEV relays latency',
+        text=(
+f'''
+We are measuring the latency of {len(relay_names)} MEV relays from this machine with
+{MEV_RELAY_BENCHMARK_ROUNDS} status requests each. It is used to suggest the fastest relays.
+You can skip this measurement.
+'''     ),
+        status_text='Starting...',
+        with_skip=True,
+        run_callback=benchmark_callback
+    ).run()
+
+    if result is None:
+        return None
+
+    if result.get('skipping', False) is True:
+        log.info('MEV relays benchmark skipped.')
+        return {}
+
+    return result
+
+def fastest_mev_relays(benchmark, count=MEV_RELAY_FASTEST_COUNT):
+    # Return the URLs of the count fastest relays that answered at least once, preferring the
+    # relays with the lowest error rate
+
+    answering = [result for result in benchmark.values() if result['p50'] is not None]
+    answering.sort(key=lambda result: (result['error_rate'], result['p50'], result['p95']))
+
+    return [result['url'] for result in answering[:count]]
+
+def format_mev_relay_benchmark(result):
+    # Short human readable description of a relay benchmark result
+
+    if result is None:
+        return 'not measured'
+
+    if result['p50'] is None:
+        return 'unreachable'
+
+    description = f'p50 {result["p50"] * 1000:.0f} ms, p95 {result["p95"] * 1000:.0f} ms'
+    if result['errors'] > 0:
+        description = description + f', {result["error_rate"] * 100:.0f}% errors'
+
+    return description
+
 def select_mev_relays(network, log):
     # Select MEV relays
 
@@ -1798,7 +4180,7 @@ def select_mev_relays(network, log):
     # Obtain relays list from EthStaker
 
     try:
-        response = httpx.get(ETHSTAKER_RELAY_LIST_URL, follow_redirects=True)
+        response = get_http_client().get(ETHSTAKER_RELAY_LIST_URL, follow_redirects=True)
     except httpx.RequestError as exception:
         log.error(f'Exception while obtaining EthStaker MEV relay list from '
             f'{ETHSTAKER_RELAY_LIST_URL}. {exception}')
@@ -1847,7 +4229,25 @@ def select_mev_relays(network, log):
             f'{ETHSTAKER_RELAY_LIST_URL}.')
         return False
     
-    relay_bundles = RELAY_BUNDLES[network]
+    benchmark = benchmark_mev_relays_with_progress(
+        {item['url']: item['name'] for item in relay_list}, log)
+    if benchmark is None:
+        # User asked to quit
+        return False
+
+    for relay_url, result in benchmark.items():
+        log.info(f'MEV relay {relay_url_to_item[relay_url]["name"]}: '
+            f'{format_mev_relay_benchmark(result)}')
+
+    relay_bundles = dict(RELAY_BUNDLES[network])
+
+    fastest_text = ''
+    fastest_relays = fastest_mev_relays(benchmark)
+    if len(fastest_relays) > 0:
+        relay_bundles[f'Fastest {len(fastest_relays)}'] = fastest_relays
+        fastest_text = (
+            f'\nThe Fastest {len(fastest_relays)} bundle contains the relays from that list with '
+            f'the lowest\nlatency from this machine.\n')
 
     bundles_description = {}
 
@@ -1891,6 +4291,7 @@ There is a good list on https://ethstaker.cc/mev-relay-list .
 
 We are suggesting these bundles if you don't know which one to choose:
 {bundles_text}
+{fastest_text}
 
 Which relays do you want to use?
 '''     ),
@@ -1906,7 +4307,8 @@ Which relays do you want to use?
     elif result == 1:
         # Custom relay selection
 
-        values = [(key, key) for key in relay_name_to_item.keys()]
+        values = [(key, f'{key} ({format_mev_relay_benchmark(benchmark.get(item["url"]))})')
+            for (key, item) in relay_name_to_item.items()]
 
         selected_relays = []
 
@@ -1916,9 +4318,9 @@ Which relays do you want to use?
                 title='MEV-Boost relays selection',
                 text=(
 '''
-Here are the relays from https://ethstaker.cc/mev-relay-list . You should
-consider only selecting relays which you trust. You need to select at
-least 1 relay.
+Here are the relays from https://ethstaker.cc/mev-relay-list with their
+latency from this machine. You should consider only selecting relays which
+you trust. You need to select at least 1 relay.
 
 * Press the tab key to switch between the controls below
 '''
@@ -1,13 +1,17 @@
 import sys
-import json
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import re
 import os
 import stat
+import json
+import threading
+import contextvars
 
 import logging
 import logging.handlers
 
+from collections import deque
+
 from pathlib import Path
 
 from secrets import token_hex
@@ -16,32 +20,24 @@ from typing import Optional
 
 from ethwizard import __version__
 
+from ethwizard.utils.statejournal import get_state_journal
+
 from ethwizard.constants import (
     LINUX_SAVE_DIRECTORY,
-    STATE_FILE,
     LINUX_JWT_TOKEN_DIRECTORY,
-    LINUX_JWT_TOKEN_FILE_PATH
+    LINUX_JWT_TOKEN_FILE_PATH,
+    JOURNAL_FOLLOW_INITIAL_LINES,
+    JOURNAL_FOLLOW_MAX_LINES
 )
 
+from ethwizard.platforms.common import ConsoleLogFilter, receive_pgp_key
+
 log = logging.getLogger(__name__)
 
 def save_state(step_id: str, context: dict) -> bool:
     # Save wizard state
 
-    data_to_save = {
-        'step': step_id,
-        'context': context
-    }
-
-    save_directory = Path(LINUX_SAVE_DIRECTORY)
-    if not save_directory.is_dir():
-        save_directory.mkdir(parents=True, exist_ok=True)
-    save_file = save_directory.joinpath(STATE_FILE)
-
-    with open(str(save_file), 'w', encoding='utf8') as output_file:
-        json.dump(data_to_save, output_file)
-
-    return True
+    return get_state_journal(LINUX_SAVE_DIRECTORY).save(step_id, context)
 
 def load_state() -> Optional[dict]:
     # Load wizard state
@@ -49,19 +45,8 @@ def load_state() -> Optional[dict]:
     save_directory = Path(LINUX_SAVE_DIRECTORY)
     if not save_directory.is_dir():
         return None
-    save_file = save_directory.joinpath(STATE_FILE)
-    if not save_file.is_file():
-        return None
-    
-    loaded_data = None
 
-    try:
-        with open(str(save_file), 'r', encoding='utf8') as input_file:
-            loaded_data = json.load(input_file)
-    except ValueError:
-        return None
-    
-    return loaded_data
+    return get_state_journal(save_directory).load()
 
 def quit_app():
     log.info(f'Quitting eth-wizard')
@@ -83,6 +68,7 @@ def init_logging():
 
     # Console handler to log into the console
     ch = logging.StreamHandler()
+    ch.addFilter(ConsoleLogFilter())
     log.addHandler(ch)
 
     # SysLog handler to log into syslog
@@ -120,6 +106,101 @@ def get_systemd_service_details(service):
 
     return service_details
 
+class JournalFollower:
+    # Follow the journal of a systemd unit with a single journalctl -f process read by a daemon
+    # thread. Messages are put in a bounded queue, the oldest ones being dropped when nobody
+    # reads them fast enough. Call start, read_text as often as needed and stop when done.
+
+    def __init__(self, unit, lines=JOURNAL_FOLLOW_INITIAL_LINES,
+        max_lines=JOURNAL_FOLLOW_MAX_LINES):
+        self.unit = unit
+        self.lines = lines
+        self._messages = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._received = 0
+        self._read = 0
+        self._process = None
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        if self._process is not None:
+            return
+
+        self._stopping = False
+        try:
+            self._process = subprocess.Popen([
+                'journalctl', '--no-pager', '-q', '-f', '-a', '-o', 'json',
+                '-n', str(self.lines), '-u', self.unit
+                ], stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL)
+        except OSError as exception:
+            self._put(f'Exception: {exception} while calling journalctl.')
+            return
+
+        self._thread = threading.Thread(target=contextvars.copy_context().run,
+            args=(self._run, self._process), name=f'journal-{self.unit}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        process = self._process
+        if process is None:
+            return
+
+        self._stopping = True
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self._thread.join()
+        self._process = None
+        self._thread = None
+
+    def read_text(self) -> str:
+        # Return the messages received since the last call, one per line
+        with self._lock:
+            messages = list(self._messages)
+            self._messages.clear()
+            skipped = self._received - self._read - len(messages)
+            self._read = self._received
+
+        if skipped > 0:
+            messages.insert(0, f'[{skipped} journal lines skipped]')
+
+        return '\n'.join(messages)
+
+    def _put(self, message):
+        with self._lock:
+            self._messages.append(message)
+            self._received = self._received + 1
+
+    def _run(self, process):
+        for line in process.stdout:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+
+            message = entry.get('MESSAGE') if isinstance(entry, dict) else None
+            if isinstance(message, list):
+                # Messages which are not valid UTF-8 are given as an array of bytes
+                try:
+                    message = bytes(message).decode('utf8', errors='replace')
+                except (TypeError, ValueError):
+                    continue
+            if not isinstance(message, str):
+                continue
+
+            self._put(message.rstrip())
+
+        process.stdout.close()
+        return_code = process.wait()
+        if not self._stopping:
+            self._put(f'Return code: {return_code} while calling journalctl.')
+
 def is_package_installed(package):
     process_result = subprocess.run(['apt', '-qq', 'list', '--installed', package],
         capture_output=True, text=True)
@@ -136,6 +217,34 @@ def is_package_installed(package):
 
     return package_is_installed
 
+def prepare_pgp_key(key_id, key_description):
+    # Make sure gpg is installed and that the key_id PGP key is in the wizard keyring, receiving
+    # it from PGP_KEY_SERVERS when it is missing. The output of the commands is captured and
+    # logged so this can run in the background while a dialog is shown. Return True when the
+    # key is ready.
+
+    try:
+        gpg_is_installed = is_package_installed('gpg')
+    except Exception:
+        return False
+
+    if not gpg_is_installed:
+        env = os.environ.copy()
+        env['DEBIAN_FRONTEND'] = 'noninteractive'
+
+        # Install gpg using APT
+        log.info('Installing gpg...')
+        subprocess.run([
+            'apt', '-y', 'update'], capture_output=True, text=True)
+        process_result = subprocess.run([
+            'apt', '-y', 'install', 'gpg'], env=env, capture_output=True, text=True)
+        if process_result.returncode != 0:
+            log.error(f'Unable to install gpg. Return code: {process_result.returncode}\n'
+                f'{process_result.stdout}{process_result.stderr}')
+            return False
+
+    return receive_pgp_key('gpg', key_id, key_description, log)
+
 def setup_jwt_token_file():
     # Create or ensure that the JWT token file exist
 
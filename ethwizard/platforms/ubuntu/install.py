@@ -1,7 +1,6 @@
 import os
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import httpx
-import hashlib
 import shutil
 import time
 import humanize
@@ -11,6 +10,8 @@ import re
 
 from datetime import timedelta
 
+from functools import partial
+
 from pathlib import Path
 
 from packaging.version import parse as parse_version
@@ -25,6 +26,7 @@ from ethwizard.platforms.common import (
     select_mev_relays,
     select_custom_ports,
     select_eth1_fallbacks,
+    rank_eth1_fallbacks,
     select_consensus_checkpoint_provider,
     progress_log_dialog,
     search_for_generated_keys,
@@ -32,13 +34,23 @@ from ethwizard.platforms.common import (
     select_execution_client,
     select_keys_directory,
     select_fee_recipient_address,
-    get_bc_validator_deposits,
+    get_validator_deposits_with_progress,
     test_open_ports,
     show_whats_next,
     show_public_keys,
     Step,
     test_context_variable,
-    format_for_terminal
+    format_for_terminal,
+    download_file,
+    download_file_with_progress,
+    github_asset_sha256,
+    start_background_task,
+    get_pgp_keyring_directory,
+    get_http_client,
+    StepFailedError,
+    heavy_measurement,
+    wait_for_heavy_measurements,
+    button_dialog
 )
 
 from ethwizard.platforms.ubuntu.common import (
@@ -46,11 +58,16 @@ from ethwizard.platforms.ubuntu.common import (
     quit_app,
     get_systemd_service_details,
     is_package_installed,
-    setup_jwt_token_file
+    setup_jwt_token_file,
+    prepare_pgp_key,
+    JournalFollower
 )
 
+from ethwizard.utils.archives import TarStreamExtractor
+
+from ethwizard.utils.execution_rpc import ExecutionRPCError, get_execution_rpc_client
+
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import button_dialog
 
 def installation_steps():
 
@@ -58,10 +75,6 @@ def installation_steps():
         # Context variables
         selected_network = CTX_SELECTED_NETWORK
         want_to_test = CTX_WANT_TO_TEST
-        disk_size_tested = CTX_DISK_SIZE_TESTED
-        disk_speed_tested = CTX_DISK_SPEED_TESTED
-        available_ram_tested = CTX_AVAILABLE_RAM_TESTED
-        internet_speed_tested = CTX_INTERNET_SPEED_TESTED
 
         if not (
             test_context_variable(context, selected_network, log)
@@ -80,45 +93,133 @@ def installation_steps():
 
             quit_app()
 
-        if context[want_to_test] == 1:
-            if not context.get(disk_size_tested, False):
-                if not test_disk_size(context[selected_network]):
-                    # User asked to quit
-                    quit_app()
-                
-                context[disk_size_tested] = True
-                step_sequence.save_state(step.step_id, context)
-
-            if not context.get(disk_speed_tested, False):
-                if not test_disk_speed():
-                    # User asked to quit
-                    quit_app()
-                
-                context[disk_speed_tested] = True
-                step_sequence.save_state(step.step_id, context)
-            
-            if not context.get(available_ram_tested, False):
-                if not test_available_ram():
-                    # User asked to quit
-                    quit_app()
-                
-                context[available_ram_tested] = True
-                step_sequence.save_state(step.step_id, context)
-
-            if not context.get(internet_speed_tested, False):
-                if not test_internet_speed():
-                    # User asked to quit
-                    quit_app()
-                
-                context[internet_speed_tested] = True
-                step_sequence.save_state(step.step_id, context)
-        
         return context
 
     test_system_step = Step(
         step_id=TEST_SYSTEM_STEP_ID,
         display_name='Testing your system',
-        exc_function=test_system_function
+        exc_function=test_system_function,
+        inputs=[CTX_SELECTED_NETWORK],
+        outputs=[CTX_WANT_TO_TEST]
+    )
+
+    def run_system_tests_function(step, context, step_sequence):
+        # Context variables
+        want_to_test = CTX_WANT_TO_TEST
+        disk_size_tested = CTX_DISK_SIZE_TESTED
+        disk_speed_tested = CTX_DISK_SPEED_TESTED
+        available_ram_tested = CTX_AVAILABLE_RAM_TESTED
+        internet_speed_tested = CTX_INTERNET_SPEED_TESTED
+        system_tests_results = CTX_SYSTEM_TESTS_RESULTS
+
+        if not (
+            test_context_variable(context, want_to_test, log)
+            ):
+            # We are missing context variables, we cannot continue
+            quit_app()
+
+        if context[want_to_test] != 1:
+            return context
+
+        # The measurements do not need any input from the user, they run in the background while
+        # the next dialogs are shown and their results are reported later. Latency probes done
+        # by those dialogs wait for them. They still run one after the other so they do not
+        # compete with each other for CPU, disk and network.
+        measurements = (
+            (disk_size_tested, measure_disk_size),
+            (disk_speed_tested, measure_disk_speed),
+            (available_ram_tested, measure_available_ram),
+            (internet_speed_tested, measure_internet_speed)
+        )
+
+        results = {}
+
+        with heavy_measurement():
+            for tested, measure_function in measurements:
+                if context.get(tested, False):
+                    continue
+
+                measure_start = time.perf_counter()
+                try:
+                    results[tested] = measure_function()
+                except Exception as exception:
+                    log.error(f'Exception while measuring {tested}. {exception}')
+                    results[tested] = False
+                log.info(f'Measured {tested} in {time.perf_counter() - measure_start:.1f}s')
+
+        failed = [tested for tested, result in results.items() if result is False]
+        if len(failed) > 0:
+            log.error(f'System tests failed: {", ".join(failed)}')
+            raise StepFailedError(f'Unable to measure {", ".join(failed)}. Make sure df, '
+                f'fio and python3 are available and that this machine can reach the internet.')
+
+        context[system_tests_results] = results
+
+        return context
+
+    run_system_tests_step = Step(
+        step_id=RUN_SYSTEM_TESTS_STEP_ID,
+        display_name='Running system tests',
+        exc_function=run_system_tests_function,
+        inputs=[CTX_WANT_TO_TEST],
+        outputs=[CTX_SYSTEM_TESTS_RESULTS],
+        interactive=False
+    )
+
+    def report_system_tests_function(step, context, step_sequence):
+        # Context variables
+        selected_network = CTX_SELECTED_NETWORK
+        want_to_test = CTX_WANT_TO_TEST
+        disk_size_tested = CTX_DISK_SIZE_TESTED
+        disk_speed_tested = CTX_DISK_SPEED_TESTED
+        available_ram_tested = CTX_AVAILABLE_RAM_TESTED
+        internet_speed_tested = CTX_INTERNET_SPEED_TESTED
+        system_tests_results = CTX_SYSTEM_TESTS_RESULTS
+
+        if not (
+            test_context_variable(context, selected_network, log) and
+            test_context_variable(context, want_to_test, log)
+            ):
+            # We are missing context variables, we cannot continue
+            quit_app()
+
+        if context[want_to_test] != 1:
+            return context
+
+        results = context.get(system_tests_results, {})
+
+        tests = (
+            (disk_size_tested, partial(test_disk_size, context[selected_network])),
+            (disk_speed_tested, test_disk_speed),
+            (available_ram_tested, test_available_ram),
+            (internet_speed_tested, test_internet_speed)
+        )
+
+        for tested, test_function in tests:
+            if context.get(tested, False):
+                continue
+
+            if not results.get(tested, False):
+                # The measurement failed
+                log.error(f'No result for {tested}. Unable to report the system tests.')
+                quit_app()
+
+            if not test_function(results[tested]):
+                # User asked to quit
+                quit_app()
+
+            context[tested] = True
+            step_sequence.save_state(step.step_id, context)
+
+        return context
+
+    report_system_tests_step = Step(
+        step_id=REPORT_SYSTEM_TESTS_STEP_ID,
+        display_name='Reporting system tests',
+        exc_function=report_system_tests_function,
+        inputs=[CTX_SELECTED_NETWORK, CTX_WANT_TO_TEST, CTX_SYSTEM_TESTS_RESULTS],
+        outputs=[CTX_DISK_SIZE_TESTED, CTX_DISK_SPEED_TESTED, CTX_AVAILABLE_RAM_TESTED,
+            CTX_INTERNET_SPEED_TESTED]
     )
 
     def select_network_function(step, context, step_sequence):
@@ -141,7 +242,9 @@ def installation_steps():
     select_network_step = Step(
         step_id=SELECT_NETWORK_STEP_ID,
         display_name='Network selection',
-        exc_function=select_network_function
+        exc_function=select_network_function,
+        inputs=[],
+        outputs=[CTX_SELECTED_NETWORK]
     )
 
     def select_custom_ports_function(step, context, step_sequence):
@@ -179,7 +282,9 @@ def installation_steps():
     select_custom_ports_step = Step(
         step_id=SELECT_CUSTOM_PORTS_STEP_ID,
         display_name='Open ports configuration',
-        exc_function=select_custom_ports_function
+        exc_function=select_custom_ports_function,
+        inputs=[CTX_SELECTED_CONSENSUS_CLIENT, CTX_SELECTED_EXECUTION_CLIENT],
+        outputs=[CTX_SELECTED_PORTS]
     )
 
     def install_execution_function(step, context, step_sequence):
@@ -212,10 +317,48 @@ def installation_steps():
         
         return context
     
+    def install_execution_probe(step, context):
+        # Context variables
+        selected_network = CTX_SELECTED_NETWORK
+        selected_ports = CTX_SELECTED_PORTS
+        selected_execution_client = CTX_SELECTED_EXECUTION_CLIENT
+
+        if not (
+            selected_network in context and
+            selected_ports in context and
+            selected_execution_client in context
+            ):
+            return False
+
+        network = context[selected_network]
+        ports = context[selected_ports]
+        execution_client = context[selected_execution_client]
+
+        if execution_client == EXECUTION_CLIENT_GETH:
+            expected_params = []
+            if ports['eth1'] != DEFAULT_GETH_PORT:
+                expected_params.append(f'--port {ports["eth1"]}')
+
+            return probe_installed_service(GETH_SYSTEMD_SERVICE_NAME,
+                GETH_SERVICE_DEFINITION[network], expected_params)
+
+        elif execution_client == EXECUTION_CLIENT_NETHERMIND:
+            expected_params = []
+            if ports['eth1'] != DEFAULT_NETHERMIND_PORT:
+                expected_params.append(f'--Network.P2PPort {ports["eth1"]}')
+
+            return probe_installed_service(NETHERMIND_SYSTEMD_SERVICE_NAME,
+                NETHERMIND_SERVICE_DEFINITION[network], expected_params)
+
+        return False
+
     install_execution_step = Step(
         step_id=INSTALL_EXECUTION_STEP_ID,
         display_name='Execution client installation',
-        exc_function=install_execution_function
+        exc_function=install_execution_function,
+        inputs=[CTX_SELECTED_NETWORK, CTX_SELECTED_PORTS, CTX_SELECTED_EXECUTION_CLIENT],
+        outputs=[],
+        probe=install_execution_probe
     )
 
     def install_mevboost_function(step, context, step_sequence):
@@ -239,10 +382,29 @@ def installation_steps():
         
         return context
     
+    def install_mevboost_probe(step, context):
+        # Context variables
+        selected_network = CTX_SELECTED_NETWORK
+        mevboost_installed = CTX_MEVBOOST_INSTALLED
+
+        network = context.get(selected_network)
+        if network not in MEVBOOST_SERVICE_DEFINITION:
+            return False
+
+        if not probe_installed_service(MEVBOOST_SYSTEMD_SERVICE_NAME,
+            MEVBOOST_SERVICE_DEFINITION[network], []):
+            return False
+
+        context[mevboost_installed] = True
+        return True
+
     install_mevboost_step = Step(
         step_id=INSTALL_MEVBOOST_STEP_ID,
         display_name='MEV-Boost installation',
-        exc_function=install_mevboost_function
+        exc_function=install_mevboost_function,
+        inputs=[CTX_SELECTED_NETWORK],
+        outputs=[CTX_MEVBOOST_INSTALLED],
+        probe=install_mevboost_probe
     )
 
     def detect_merge_ready_function(step, context, step_sequence):
@@ -271,7 +433,9 @@ def installation_steps():
     detect_merge_ready_step = Step(
         step_id=DETECT_MERGE_READY_STEP_ID,
         display_name='Detect merge ready network',
-        exc_function=detect_merge_ready_function
+        exc_function=detect_merge_ready_function,
+        inputs=[CTX_SELECTED_NETWORK],
+        outputs=[CTX_MERGE_READY_NETWORK]
     )
 
     def select_eth1_fallbacks_function(step, context, step_sequence):
@@ -279,6 +443,7 @@ def installation_steps():
         selected_network = CTX_SELECTED_NETWORK
         merge_ready_network = CTX_MERGE_READY_NETWORK
         selected_eth1_fallbacks = CTX_SELECTED_ETH1_FALLBACKS
+        eth1_fallbacks_probes = CTX_ETH1_FALLBACKS_PROBES
 
         if not (
             test_context_variable(context, selected_network, log) and
@@ -300,15 +465,29 @@ def installation_steps():
                 step_sequence.save_state(step.step_id, context)
 
                 quit_app()
+
+            if not wait_for_heavy_measurements(log):
+                # User asked to quit
+                quit_app()
+
+            # Put the fastest healthy fallbacks first
+            context[selected_eth1_fallbacks], context[eth1_fallbacks_probes] = (
+                rank_eth1_fallbacks(context[selected_network], context[selected_eth1_fallbacks],
+                    log))
         else:
+            # Merged networks do not use execution fallbacks, there is nothing to rank
             context[selected_eth1_fallbacks] = []
+            context[eth1_fallbacks_probes] = []
 
         return context
 
     select_eth1_fallbacks_step = Step(
         step_id=SELECT_ETH1_FALLBACKS_STEP_ID,
         display_name='Adding execution fallback nodes',
-        exc_function=select_eth1_fallbacks_function
+        exc_function=select_eth1_fallbacks_function,
+        inputs=[CTX_SELECTED_NETWORK, CTX_MERGE_READY_NETWORK],
+        outputs=[CTX_SELECTED_ETH1_FALLBACKS,
+            CTX_ETH1_FALLBACKS_PROBES]
     )
 
     def select_consensus_checkpoint_url_function(step, context, step_sequence):
@@ -341,7 +520,9 @@ def installation_steps():
     select_consensus_checkpoint_url_step = Step(
         step_id=SELECT_CONSENSUS_CHECKPOINT_URL_STEP_ID,
         display_name='Adding consensus checkpoint state',
-        exc_function=select_consensus_checkpoint_url_function
+        exc_function=select_consensus_checkpoint_url_function,
+        inputs=[CTX_SELECTED_NETWORK],
+        outputs=[CTX_SELECTED_CONSENSUS_CHECKPOINT_URL]
     )
 
     def install_consensus_function(step, context, step_sequence):
@@ -384,10 +565,59 @@ def installation_steps():
 
         return context
     
+    def install_consensus_probe(step, context):
+        # Context variables
+        selected_network = CTX_SELECTED_NETWORK
+        selected_ports = CTX_SELECTED_PORTS
+        selected_eth1_fallbacks = CTX_SELECTED_ETH1_FALLBACKS
+        selected_consensus_checkpoint_url = CTX_SELECTED_CONSENSUS_CHECKPOINT_URL
+        selected_consensus_client = CTX_SELECTED_CONSENSUS_CLIENT
+        mevboost_installed = CTX_MEVBOOST_INSTALLED
+
+        if not (
+            selected_network in context and
+            selected_ports in context and
+            selected_eth1_fallbacks in context and
+            selected_consensus_checkpoint_url in context and
+            selected_consensus_client in context and
+            mevboost_installed in context
+            ):
+            return False
+
+        network = context[selected_network]
+        ports = context[selected_ports]
+        consensus_client = context[selected_consensus_client]
+
+        if consensus_client == CONSENSUS_CLIENT_LIGHTHOUSE:
+            expected_params = list(context[selected_eth1_fallbacks])
+            if ports['eth2_bn'] != DEFAULT_LIGHTHOUSE_BN_PORT:
+                expected_params.append(f'--port {ports["eth2_bn"]}')
+            if context[selected_consensus_checkpoint_url] != '':
+                expected_params.append(
+                    f'--checkpoint-sync-url "{context[selected_consensus_checkpoint_url]}"')
+            if context[mevboost_installed]:
+                expected_params.append('--builder http://127.0.0.1:18550')
+
+            return probe_installed_service(LIGHTHOUSE_BN_SYSTEMD_SERVICE_NAME,
+                LIGHTHOUSE_BN_SERVICE_DEFINITION[network], expected_params)
+
+        elif consensus_client == CONSENSUS_CLIENT_NIMBUS:
+            expected_params = []
+            if ports['eth2_bn'] != DEFAULT_NIMBUS_BN_PORT:
+                expected_params.append(f'--tcp-port={ports["eth2_bn"]}')
+            if context[mevboost_installed]:
+                expected_params.append('--payload-builder=true')
+
+            return probe_installed_service(NIMBUS_SYSTEMD_SERVICE_NAME,
+                NIMBUS_SERVICE_DEFINITION[network], expected_params)
+
+        return False
+
     install_consensus_step = Step(
         step_id=INSTALL_CONSENSUS_STEP_ID,
         display_name='Consensus client installation',
-        exc_function=install_consensus_function
+        exc_function=install_consensus_function,
+        probe=install_consensus_probe
     )
 
     def test_open_ports_function(step, context, step_sequence):
@@ -629,7 +859,9 @@ def installation_steps():
     select_consensus_client_step = Step(
         step_id=SELECT_CONSENSUS_CLIENT_STEP_ID,
         display_name='Select consensus client',
-        exc_function=select_consensus_client_function
+        exc_function=select_consensus_client_function,
+        inputs=[],
+        outputs=[CTX_SELECTED_CONSENSUS_CLIENT]
     )
 
     def select_execution_client_function(step, context, step_sequence):
@@ -648,7 +880,9 @@ def installation_steps():
     select_execution_client_step = Step(
         step_id=SELECT_EXECUTION_CLIENT_STEP_ID,
         display_name='Select execution client',
-        exc_function=select_execution_client_function
+        exc_function=select_execution_client_function,
+        inputs=[],
+        outputs=[CTX_SELECTED_EXECUTION_CLIENT]
     )
 
     def check_os_requirements_function(step, context, step_sequence):
@@ -671,7 +905,9 @@ def installation_steps():
     check_os_requirements_step = Step(
         step_id=CHECK_OS_REQUIREMENTS_STEP_ID,
         display_name='Check OS requirements',
-        exc_function=check_os_requirements_function
+        exc_function=check_os_requirements_function,
+        inputs=[CTX_SELECTED_CONSENSUS_CLIENT],
+        outputs=[]
     )
 
     return [
@@ -680,11 +916,13 @@ def installation_steps():
         select_execution_client_step,
         check_os_requirements_step,
         test_system_step,
+        run_system_tests_step,
         install_mevboost_step,
         select_custom_ports_step,
         detect_merge_ready_step,
         select_consensus_checkpoint_url_step,
         select_eth1_fallbacks_step,
+        report_system_tests_step,
         install_consensus_step,
         install_execution_step,
         test_open_ports_step,
@@ -724,8 +962,8 @@ Do you want to test your system?
 
     return result
 
-def test_disk_size(network):
-    # Test disk size
+def measure_disk_size():
+    # Measure the available disk space in GB
 
     log.info('Running df to test disk size...')
     process_result = subprocess.run([
@@ -748,6 +986,11 @@ def test_disk_size(network):
             f'Output: {process_output}')
         return False
 
+    return available_space_gb
+
+def test_disk_size(network, available_space_gb):
+    # Test disk size
+
     if not available_space_gb >= MIN_AVAILABLE_DISK_SPACE_GB[network]:
         result = button_dialog(
             title=HTML('Disk size test <style bg="red" fg="black">failed</style>'),
@@ -787,8 +1030,8 @@ enough</b></style> to be a fully working validator. Here are your results:
 
     return result
 
-def test_disk_speed():
-    # Test disk speed using fio tool
+def measure_disk_speed():
+    # Measure disk speed in K IOPS using fio tool
 
     # Install fio using APT
     fio_package_installed = False
@@ -804,9 +1047,9 @@ def test_disk_speed():
         env['DEBIAN_FRONTEND'] = 'noninteractive'
 
         subprocess.run([
-            'apt', '-y', 'update'])
+            'apt', '-y', 'update'], capture_output=True)
         subprocess.run([
-            'apt', '-y', 'install', 'fio'], env=env)
+            'apt', '-y', 'install', 'fio'], env=env, capture_output=True)
     
     # Run fio test
     fio_path = Path(Path.home(), 'ethwizard', 'fio')
@@ -825,7 +1068,7 @@ def test_disk_speed():
         '--name=test', '--filename=' + fio_target_filename, '--bs=4k', '--iodepth=64',
         '--size=4G', '--readwrite=randrw', '--rwmixread=75', '--output=' + fio_output_filename,
         '--output-format=json'
-        ], cwd=fio_path)
+        ], cwd=fio_path, capture_output=True, text=True)
 
     if process_result.returncode != 0:
         log.error(f'Error while running fio disk test. Return code {process_result.returncode}\n'
@@ -878,8 +1121,16 @@ def test_disk_speed():
         log.error('Unexpected structure from fio output file. No read or write iops.')
         return False
     
-    k_read_iops = test_job['read']['iops'] / 1000.0
-    k_write_iops = test_job['write']['iops'] / 1000.0
+    return {
+        'k_read_iops': test_job['read']['iops'] / 1000.0,
+        'k_write_iops': test_job['write']['iops'] / 1000.0
+    }
+
+def test_disk_speed(disk_speed):
+    # Test disk speed
+
+    k_read_iops = disk_speed['k_read_iops']
+    k_write_iops = disk_speed['k_write_iops']
 
     # Test if disk speed is above minimal values
     if not (
@@ -926,8 +1177,8 @@ be a fully working validator. Here are your results:
 
     return result
 
-def test_internet_speed():
-    # Test for internet speed
+def measure_internet_speed():
+    # Measure internet speed using the speedtest-cli script
 
     # Downloading speedtest script
     log.info('Downloading speedtest-cli script to test internet speed...')
@@ -936,30 +1187,23 @@ def test_internet_speed():
 
     script_path = Path(download_path, 'speedtest-cli.py')
 
-    try:
-        with open(script_path, 'wb') as binary_file:
-            with httpx.stream('GET', SPEEDTEST_SCRIPT_URL, follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error('HTTP error while downloading speedtest-cli script. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading speedtest-cli script. {exception}')
+    script_download = download_file(SPEEDTEST_SCRIPT_URL, script_path, log,
+        'speedtest-cli script', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    if script_download['error'] is not None:
         return False
     
     # Setup to run the speedtest script with an unprivileged user
     ethwizardnopriv_user_exists = False
     process_result = subprocess.run([
         'id', '-u', 'ethwizardnopriv'
-    ])
+    ], capture_output=True)
     ethwizardnopriv_user_exists = (process_result.returncode == 0)
 
     # Setup ethwizardnopriv user
     if not ethwizardnopriv_user_exists:
         subprocess.run([
-            'useradd', '--no-create-home', '--shell', '/bin/false', 'ethwizardnopriv'])
+            'useradd', '--no-create-home', '--shell', '/bin/false', 'ethwizardnopriv'],
+            capture_output=True)
 
     tmp_script_path = Path('/tmp', 'speedtest-cli.py')
 
@@ -1012,6 +1256,27 @@ def test_internet_speed():
         server_lat = speedtest_server.get('lat', 'unknown')
         server_lon = speedtest_server.get('lon', 'unknown')
 
+    return {
+        'down_mbs': down_mbs,
+        'up_mbs': up_mbs,
+        'server_sponsor': server_sponsor,
+        'server_name': server_name,
+        'server_country': server_country,
+        'server_lat': server_lat,
+        'server_lon': server_lon
+    }
+
+def test_internet_speed(internet_speed):
+    # Test for internet speed
+
+    down_mbs = internet_speed['down_mbs']
+    up_mbs = internet_speed['up_mbs']
+    server_sponsor = internet_speed['server_sponsor']
+    server_name = internet_speed['server_name']
+    server_country = internet_speed['server_country']
+    server_lat = internet_speed['server_lat']
+    server_lon = internet_speed['server_lon']
+
     # Test if Internet speed is above minimal values
     if not (down_mbs >= MIN_DOWN_MBS and up_mbs >= MIN_UP_MBS):
 
@@ -1063,8 +1328,8 @@ enough</b></style> to be a fully working validator. Here are your results:
 
     return result
 
-def test_available_ram():
-    # Test available RAM
+def measure_available_ram():
+    # Measure the total RAM in GB
 
     log.info('Inspecting /proc/meminfo for available RAM...')
     process_result = subprocess.run([
@@ -1087,7 +1352,12 @@ def test_available_ram():
         log.error(f'Unable to parse the output of /proc/meminfo to get available total RAM. '
             f'Output: {process_output}')
         return False
-    
+
+    return total_available_ram_gb
+
+def test_available_ram(total_available_ram_gb):
+    # Test available RAM
+
     # Test if available RAM is above minimal values
     if not total_available_ram_gb >= MIN_AVAILABLE_RAM_GB:
 
@@ -1179,6 +1449,85 @@ sudo do-release-upgrade
 
     return True
 
+def probe_installed_service(service_name, service_definition, expected_params):
+    # Test if a systemd service is running from a unit created with service_definition that
+    # includes every expected parameter, as an existing user, with a binary that is still
+    # installed and reports its version. This is used to skip an installation that was already
+    # completed before the wizard was interrupted.
+
+    service_path = Path('/etc/systemd/system', service_name)
+
+    try:
+        with open(service_path, 'r') as service_file:
+            service_content = service_file.read()
+    except OSError:
+        log.info(f'{service_name} is not installed yet.')
+        return False
+
+    definition_head, _, definition_tail = service_definition.partition('{addparams}')
+
+    missing = [param for param in expected_params if param not in service_content]
+    if (
+        definition_head not in service_content or
+        definition_tail not in service_content or
+        len(missing) > 0
+        ):
+        log.info(f'{service_name} exists but its unit does not match the current selection. '
+            f'Missing parameters: {missing}')
+        return False
+
+    # The unit must run as an existing user
+    result = re.search(r'^User=(?P<user>\S+)', service_content, re.MULTILINE)
+    if result:
+        service_user = result.group('user')
+        process_result = subprocess.run([
+            'id', '-u', service_user
+        ], capture_output=True)
+        if process_result.returncode != 0:
+            log.info(f'{service_name} exists but its user {service_user} does not.')
+            return False
+
+    # The binary the unit runs must still be installed and report its version
+    result = re.search(r'^ExecStart=(?P<binary>\S+)', service_content, re.MULTILINE)
+    if not result:
+        log.info(f'{service_name} exists but its unit does not start any binary.')
+        return False
+
+    service_binary = result.group('binary')
+    binary_path = shutil.which(service_binary)
+    if binary_path is None:
+        log.info(f'{service_name} exists but its binary {service_binary} is missing.')
+        return False
+
+    try:
+        process_result = subprocess.run([
+            binary_path, '--version'
+        ], capture_output=True, text=True, timeout=PROBE_BINARY_VERSION_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as exception:
+        log.info(f'{service_name} exists but its binary {binary_path} does not run. '
+            f'{exception}')
+        return False
+
+    version_lines = (process_result.stdout + process_result.stderr).strip().splitlines()
+    if process_result.returncode != 0 or len(version_lines) == 0:
+        log.info(f'{service_name} exists but its binary {binary_path} does not report its '
+            f'version.')
+        return False
+
+    service_details = get_systemd_service_details(service_name)
+
+    if not (
+        service_details['LoadState'] == 'loaded' and
+        service_details['ActiveState'] == 'active' and
+        service_details['SubState'] == 'running'
+    ):
+        log.info(f'{service_name} exists but is not running properly.')
+        return False
+
+    log.info(f'{service_name} is already installed ({version_lines[0].strip()}) and running '
+        f'with the expected configuration. Skipping its installation.')
+    return True
+
 def install_mevboost(network):
     # Install mev-boost for the selected network
 
@@ -1275,6 +1624,11 @@ automatically start MEV-Boost on reboot or if it crashes.
     
     if result == 2:
         return installed_value
+
+    # The binary download and the relay benchmark would skew the system tests running in the
+    # background and be skewed by them
+    if not wait_for_heavy_measurements(log):
+        return False
     
     # Check if mev-boost is already installed
     mevboost_found = False
@@ -1336,7 +1690,7 @@ Do you want to skip installing the MEV-Boost binary?
         mevboost_gh_release_url = GITHUB_REST_API_URL + MEVBOOST_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(mevboost_gh_release_url, headers=headers,
+            response = get_http_client().get(mevboost_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading MEV-Boost binary. {exception}')
@@ -1371,7 +1725,8 @@ Do you want to skip installing the MEV-Boost binary?
             if file_name.endswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
             elif file_name == checksums_filename:
                 checksums_asset = {
@@ -1391,47 +1746,26 @@ Do you want to skip installing the MEV-Boost binary?
         download_path.mkdir(parents=True, exist_ok=True)
 
         binary_path = Path(download_path, binary_asset['file_name'])
-        binary_hash = hashlib.sha256()
+        checksums_path = Path(download_path, checksums_asset['file_name'])
 
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading MEV-Boost binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
+        # Fetch the checksums while the binary is downloading
+        checksums_future = start_background_task('mevboost-checksums', download_file,
+            checksums_asset['file_url'], checksums_path, log, 'MEV-Boost checksums',
+            max_size=DOWNLOAD_METADATA_MAX_SIZE)
 
-                    archive_filename = binary_asset['file_name']
-                    archive_url = binary_asset['file_url']
-                    log.info(f'Downloading {archive_filename} from {archive_url} ...')
+        # The binary is extracted from the archive as it arrives
+        extractor = TarStreamExtractor(MEVBOOST_INSTALLED_DIRECTORY, MEVBOOST_ARCHIVE_MEMBERS)
 
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-                        binary_hash.update(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading MEV-Boost binary from Github. {exception}')
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'MEV-Boost binary', sink=extractor,
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
+            extractor.discard()
             return False
-        
-        checksums_path = Path(download_path, checksums_asset['file_name'])
-
-        try:
-            with open(checksums_path, 'wb') as checksums_file:
-                with httpx.stream('GET', checksums_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading MEV-Boost checksums from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    
-                    archive_filename = checksums_asset['file_name']
-                    archive_url = checksums_asset['file_url']
-                    log.info(f'Downloading {archive_filename} from {archive_url} ...')
 
-                    for data in http_stream.iter_bytes():
-                        checksums_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading MEV-Boost checksums from Github. {exception}')
+        checksums_download = checksums_future.result()
+        if checksums_download['error'] is not None:
+            extractor.discard()
             return False
 
         # Verify checksum
@@ -1445,13 +1779,14 @@ Do you want to skip installing the MEV-Boost binary?
                     hash_found = True
                     checksum = result.group('hash').lower()
 
-                    binary_hexdigest = binary_hash.hexdigest().lower()
+                    binary_hexdigest = binary_download['sha256'].lower()
 
                     if checksum != binary_hexdigest:
                         # SHA256 checksum failed
                         log.error(f'SHA256 checksum failed on MEV-Boost binary from '
                             f'Github. Expected {checksum} but we got {binary_hexdigest}. We will '
                             f'stop here to protect you.')
+                        extractor.discard()
                         return False
                     
                     log.info('Good SHA256 checksum for MEV-Boost binary.')
@@ -1463,11 +1798,13 @@ Do you want to skip installing the MEV-Boost binary?
             log.error(f'We could not find the SHA256 checksum for MEV-Boost binary '
                 f'({archive_filename}) in the {checksums_filename} file. We will stop here to '
                 f'protect you.')
+            extractor.discard()
             return False
         
-        # Extracting the MEV-Boost binary archive
-        subprocess.run([
-            'tar', 'xvf', binary_path, '--directory', MEVBOOST_INSTALLED_DIRECTORY])
+        # Installing the MEV-Boost binary extracted from the verified archive
+        if extractor.install(binary_path, binary_download['size']) is None:
+            log.error(f'Unable to extract the MEV-Boost binary archive. {extractor.error}')
+            return False
         
         # Remove download leftovers
         binary_path.unlink()
@@ -2067,164 +2404,80 @@ $ sudo journalctl -ru {geth_service_name}
 
         set_percentage(10)
 
-        journalctl_cursor = None
-
-        while True:
-
-            if get_exited():
-                return {
-                    'exe_is_working': exe_is_working,
-                    'exe_is_syncing': exe_is_syncing,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers
-                }
-
-            # Output logs
-            command = []
-            first_display = True
-            if journalctl_cursor is None:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q', '-n', '25',
-                    '-o', 'cat', '-u', geth_service_name]
-            else:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q',
-                    '-o', 'cat', '--after-cursor=' + journalctl_cursor, '-u', geth_service_name]
-                first_display = False
-
-            process_result = subprocess.run(command, capture_output=True, text=True)
+        journal = JournalFollower(geth_service_name)
+        journal.start()
+        first_display = True
 
-            process_output = ''
-            if process_result.returncode == 0:
-                process_output = process_result.stdout
-            else:
-                log_text(f'Return code: {process_result.returncode} while calling journalctl.')
+        try:
+            while True:
 
-            # Parse journalctl cursor and remove it from process_output
-            log_length = len(process_output)
-            if log_length > 0:
-                result = re.search(r'-- cursor: (?P<cursor>[^\n]+)', process_output)
-                if result:
-                    journalctl_cursor = result.group('cursor')
-                    process_output = (
-                        process_output[:result.start()] +
-                        process_output[result.end():])
-                    process_output = process_output.rstrip()
-            
-                    log_length = len(process_output)
+                if get_exited():
+                    return {
+                        'exe_is_working': exe_is_working,
+                        'exe_is_syncing': exe_is_syncing,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers
+                    }
 
-            if log_length > 0:
-                if not first_display and process_output[0] != '\n':
-                    process_output = '\n' + process_output
-                log_text(process_output)
+                # Output new journal lines
+                process_output = journal.read_text()
+                if len(process_output) > 0:
+                    if not first_display:
+                        process_output = '\n' + process_output
+                    first_display = False
+                    log_text(process_output)
 
-            time.sleep(1)
+                time.sleep(1)
             
-            local_geth_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'eth_syncing',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_geth_jsonrpc_url, json=request_json, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Geth.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Geth.')
-                continue
-        
-            response_json = response.json()
-            syncing_json = response_json
-
-            local_geth_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'net_peerCount',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_geth_jsonrpc_url, json=request_json, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Geth.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Geth.')
-                continue
-
-            response_json = response.json()
-            peer_count_json = response_json
-
-            exe_starting_block = UNKNOWN_VALUE
-            exe_current_block = UNKNOWN_VALUE
-            exe_highest_block = UNKNOWN_VALUE
-            if (
-                syncing_json and
-                'result' in syncing_json and
-                syncing_json['result']
-                ):
-                exe_is_syncing = True
-                if 'startingBlock' in syncing_json['result']:
-                    exe_starting_block = int(syncing_json['result']['startingBlock'], 16)
-                if 'currentBlock' in syncing_json['result']:
-                    exe_current_block = int(syncing_json['result']['currentBlock'], 16)
-                if 'highestBlock' in syncing_json['result']:
-                    exe_highest_block = int(syncing_json['result']['highestBlock'], 16)
-            else:
-                exe_is_syncing = False
+                try:
+                    sync_status = get_execution_rpc_client().sync_status()
+                except ExecutionRPCError as exception:
+                    log_text(f'{exception} while querying Geth.')
+                    continue
 
-            exe_connected_peers = 0
-            if (
-                peer_count_json and
-                'result' in peer_count_json and
-                peer_count_json['result']
-                ):
-                exe_connected_peers = int(peer_count_json['result'], 16)
+                exe_is_syncing = sync_status['syncing']
+                exe_starting_block = sync_status['starting_block']
+                exe_current_block = sync_status['current_block']
+                exe_highest_block = sync_status['highest_block']
+                exe_connected_peers = sync_status['peer_count']
             
-            exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
+                exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
 
-            if exe_is_syncing or exe_has_few_peers:
-                set_percentage(100)
-            else:
-                set_percentage(10 +
-                    round(min(exe_connected_peers / EXE_MIN_FEW_PEERS, 1.0) * 90.0))
+                if exe_is_syncing or exe_has_few_peers:
+                    set_percentage(100)
+                else:
+                    set_percentage(10 +
+                        round(min(exe_connected_peers / EXE_MIN_FEW_PEERS, 1.0) * 90.0))
 
-            change_status((
-f'''
+                change_status((
+    f'''
 Syncing: {exe_is_syncing} (Starting: {exe_starting_block}, Current: {exe_current_block}, Highest: {exe_highest_block})
 Connected Peers: {exe_connected_peers}
 '''         ).strip())
 
-            if exe_is_syncing or exe_has_few_peers:
-                exe_is_working = True
-                return {
-                    'exe_is_working': exe_is_working,
-                    'exe_is_syncing': exe_is_syncing,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers
-                }
-            else:
-                set_result({
-                    'exe_is_working': exe_is_working,
-                    'exe_is_syncing': exe_is_syncing,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers
-                })
+                if exe_is_syncing or exe_has_few_peers:
+                    exe_is_working = True
+                    return {
+                        'exe_is_working': exe_is_working,
+                        'exe_is_syncing': exe_is_syncing,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers
+                    }
+                else:
+                    set_result({
+                        'exe_is_working': exe_is_working,
+                        'exe_is_syncing': exe_is_syncing,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers
+                    })
+        finally:
+            journal.stop()
 
     result = progress_log_dialog(
         title='Verifying proper Geth service installation',
@@ -2731,195 +2984,111 @@ $ sudo journalctl -ru {nethermind_service_name}
 
         set_percentage(10)
 
-        journalctl_cursor = None
-
-        while True:
-
-            if get_exited():
-                return {
-                    'exe_is_healthy': exe_is_healthy,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers,
-                    'exe_health_description': exe_health_description
-                }
-
-            # Output logs
-            command = []
-            first_display = True
-            if journalctl_cursor is None:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q', '-n', '25',
-                    '-o', 'cat', '-u', nethermind_service_name]
-            else:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q',
-                    '-o', 'cat', '--after-cursor=' + journalctl_cursor, '-u', nethermind_service_name]
-                first_display = False
+        journal = JournalFollower(nethermind_service_name)
+        journal.start()
+        first_display = True
 
-            process_result = subprocess.run(command, capture_output=True, text=True)
-
-            process_output = ''
-            if process_result.returncode == 0:
-                process_output = process_result.stdout
-            else:
-                log_text(f'Return code: {process_result.returncode} while calling journalctl.')
+        try:
+            while True:
 
-            # Parse journalctl cursor and remove it from process_output
-            log_length = len(process_output)
-            if log_length > 0:
-                result = re.search(r'-- cursor: (?P<cursor>[^\n]+)', process_output)
-                if result:
-                    journalctl_cursor = result.group('cursor')
-                    process_output = (
-                        process_output[:result.start()] +
-                        process_output[result.end():])
-                    process_output = process_output.rstrip()
-            
-                    log_length = len(process_output)
+                if get_exited():
+                    return {
+                        'exe_is_healthy': exe_is_healthy,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers,
+                        'exe_health_description': exe_health_description
+                    }
 
-            if log_length > 0:
-                if not first_display and process_output[0] != '\n':
-                    process_output = '\n' + process_output
-                log_text(process_output)
+                # Output new journal lines
+                process_output = journal.read_text()
+                if len(process_output) > 0:
+                    if not first_display:
+                        process_output = '\n' + process_output
+                    first_display = False
+                    log_text(process_output)
 
-            time.sleep(1)
+                time.sleep(1)
             
-            local_nethermind_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'eth_syncing',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_nethermind_jsonrpc_url, json=request_json,
-                    headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nethermind.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nethermind.')
-                continue
-        
-            response_json = response.json()
-            syncing_json = response_json
-
-            local_nethermind_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'net_peerCount',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_nethermind_jsonrpc_url, json=request_json,
-                    headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nethermind.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nethermind.')
-                continue
-
-            response_json = response.json()
-            peer_count_json = response_json
+                try:
+                    sync_status = get_execution_rpc_client().sync_status()
+                except ExecutionRPCError as exception:
+                    log_text(f'{exception} while querying Nethermind.')
+                    continue
 
-            exe_starting_block = UNKNOWN_VALUE
-            exe_current_block = UNKNOWN_VALUE
-            exe_highest_block = UNKNOWN_VALUE
-            if (
-                syncing_json and
-                'result' in syncing_json and
-                syncing_json['result']
-                ):
-                if 'startingBlock' in syncing_json['result']:
-                    exe_starting_block = int(syncing_json['result']['startingBlock'], 16)
-                if 'currentBlock' in syncing_json['result']:
-                    exe_current_block = int(syncing_json['result']['currentBlock'], 16)
-                if 'highestBlock' in syncing_json['result']:
-                    exe_highest_block = int(syncing_json['result']['highestBlock'], 16)
-
-            exe_connected_peers = 0
-            if (
-                peer_count_json and
-                'result' in peer_count_json and
-                peer_count_json['result']
-                ):
-                exe_connected_peers = int(peer_count_json['result'], 16)
+                exe_starting_block = sync_status['starting_block']
+                exe_current_block = sync_status['current_block']
+                exe_highest_block = sync_status['highest_block']
+                exe_connected_peers = sync_status['peer_count']
             
-            exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
-
-            exe_is_healthy = False
-            exe_health_description = UNKNOWN_VALUE
+                exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
 
-            # Query health endpoint
+                exe_is_healthy = False
+                exe_health_description = UNKNOWN_VALUE
 
-            local_nethermind_health_url = 'http://127.0.0.1:8545/health'
+                # Query health endpoint
 
-            try:
-                response = httpx.post(local_nethermind_health_url)
-                if response.status_code not in (200, 503):
-                    log_text(
-                        f'Status code: {response.status_code} while querying Nethermind Health.')
-                elif response.status_code == 200:
-                    response_json = response.json()
-                    health_json = response_json
+                local_nethermind_health_url = 'http://127.0.0.1:8545/health'
 
-                    if 'status' in health_json:
-                        exe_is_healthy = (health_json['status'] == 'Healthy')
+                try:
+                    response = httpx.post(local_nethermind_health_url)
+                    if response.status_code not in (200, 503):
+                        log_text(
+                            f'Status code: {response.status_code} while querying Nethermind Health.')
+                    elif response.status_code == 200:
+                        response_json = response.json()
+                        health_json = response_json
+
+                        if 'status' in health_json:
+                            exe_is_healthy = (health_json['status'] == 'Healthy')
                     
-                    if ('entries' in health_json and
-                        'node-health' in health_json['entries'] and
-                        'description' in health_json['entries']['node-health']):
-                        exe_health_description = health_json['entries']['node-health']['description']
+                        if ('entries' in health_json and
+                            'node-health' in health_json['entries'] and
+                            'description' in health_json['entries']['node-health']):
+                            exe_health_description = health_json['entries']['node-health']['description']
 
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nethermind Health.')
+                except httpx.RequestError as exception:
+                    log_text(f'Exception: {exception} while querying Nethermind Health.')
 
-            if exe_is_healthy or exe_has_few_peers:
-                set_percentage(100)
-            else:
-                set_percentage(10 +
-                    round(min(exe_connected_peers / EXE_MIN_FEW_PEERS, 1.0) * 90.0))
+                if exe_is_healthy or exe_has_few_peers:
+                    set_percentage(100)
+                else:
+                    set_percentage(10 +
+                        round(min(exe_connected_peers / EXE_MIN_FEW_PEERS, 1.0) * 90.0))
 
-            formatted_description = (
-f'''
+                formatted_description = (
+    f'''
 Healthy: Unknown
 Connected Peers: {exe_connected_peers}
 '''
-        ).strip()
+            ).strip()
 
-            if exe_health_description != UNKNOWN_VALUE:
-                formatted_description = format_for_terminal(exe_health_description)
+                if exe_health_description != UNKNOWN_VALUE:
+                    formatted_description = format_for_terminal(exe_health_description)
 
-            change_status(formatted_description)
+                change_status(formatted_description)
 
-            if exe_is_healthy or exe_has_few_peers:
-                return {
-                    'exe_is_healthy': exe_is_healthy,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers,
-                    'exe_health_description': exe_health_description
-                }
-            else:
-                set_result({
-                    'exe_is_healthy': exe_is_healthy,
-                    'exe_starting_block': exe_starting_block,
-                    'exe_current_block': exe_current_block,
-                    'exe_highest_block': exe_highest_block,
-                    'exe_connected_peers': exe_connected_peers,
-                    'exe_health_description': exe_health_description
-                })
+                if exe_is_healthy or exe_has_few_peers:
+                    return {
+                        'exe_is_healthy': exe_is_healthy,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers,
+                        'exe_health_description': exe_health_description
+                    }
+                else:
+                    set_result({
+                        'exe_is_healthy': exe_is_healthy,
+                        'exe_starting_block': exe_starting_block,
+                        'exe_current_block': exe_current_block,
+                        'exe_highest_block': exe_highest_block,
+                        'exe_connected_peers': exe_connected_peers,
+                        'exe_health_description': exe_health_description
+                    })
+        finally:
+            journal.stop()
 
     result = progress_log_dialog(
         title='Verifying proper Nethermind service installation',
@@ -3140,7 +3309,7 @@ Do you want to skip installing the lighthouse binary?
         lighthouse_gh_release_url = GITHUB_REST_API_URL + LIGHTHOUSE_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(lighthouse_gh_release_url, headers=headers,
+            response = get_http_client().get(lighthouse_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading lighthouse binary. {exception}')
@@ -3175,7 +3344,8 @@ Do you want to skip installing the lighthouse binary?
             if file_name.endswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
             elif file_name.endswith(archive_filename_sig_comp):
                 signature_asset = {
@@ -3192,106 +3362,53 @@ Do you want to skip installing the lighthouse binary?
         download_path.mkdir(parents=True, exist_ok=True)
 
         binary_path = Path(download_path, binary_asset['file_name'])
-
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Lighthouse binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Lighthouse binary from Github. {exception}')
-            return False
-        
         signature_path = Path(download_path, signature_asset['file_name'])
 
-        try:
-            with open(signature_path, 'wb') as signature_file:
-                with httpx.stream('GET', signature_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Lighthouse signature from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        signature_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Lighthouse signature from Github. {exception}')
+        # Fetch the signature and prepare gpg with Sigma Prime's PGP key while the binary is
+        # downloading
+        signature_future = start_background_task('lighthouse-signature', download_file,
+            signature_asset['file_url'], signature_path, log, 'Lighthouse signature',
+            max_size=DOWNLOAD_METADATA_MAX_SIZE)
+        pgp_key_future = start_background_task('lighthouse-pgp-key', prepare_pgp_key,
+            LIGHTHOUSE_PRIME_PGP_KEY_ID, 'Sigma Prime\'s PGP key')
+
+        # The binary is extracted from the archive as it arrives
+        extractor = TarStreamExtractor(LIGHTHOUSE_INSTALLED_DIRECTORY,
+            LIGHTHOUSE_ARCHIVE_MEMBERS)
+
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'Lighthouse binary', sink=extractor,
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
+            extractor.discard()
             return False
 
-        # Test if gpg is already installed
-        gpg_is_installed = False
-        try:
-            gpg_is_installed = is_package_installed('gpg')
-        except Exception:
+        signature_download = signature_future.result()
+        if signature_download['error'] is not None:
+            extractor.discard()
             return False
 
-        env = os.environ.copy()
-        env['DEBIAN_FRONTEND'] = 'noninteractive'
-
-        if not gpg_is_installed:
-            # Install gpg using APT
-            subprocess.run([
-                'apt', '-y', 'update'])
-            subprocess.run([
-                'apt', '-y', 'install', 'gpg'], env=env)
-
         # Verify PGP signature
 
-        command_line = ['gpg', '--list-keys', '--with-colons', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-        pgp_key_found = process_result.returncode == 0
-
-        if not pgp_key_found:
-
-            retry_index = 0
-            retry_count = 15
-
-            key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-            log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-            command_line = ['gpg', '--keyserver', key_server, '--recv-keys',
-                LIGHTHOUSE_PRIME_PGP_KEY_ID]
-            process_result = subprocess.run(command_line)
-
-            if process_result.returncode != 0:
-                # GPG failed to download Sigma Prime's PGP key, let's wait and retry a few times
-                while process_result.returncode != 0 and retry_index < retry_count:
-                    retry_index = retry_index + 1
-                    delay = 5
-                    log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                        f'and try again from a different server.')
-                    time.sleep(delay)
-
-                    key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                    log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-                    command_line = ['gpg', '--keyserver', key_server, '--recv-keys',
-                        LIGHTHOUSE_PRIME_PGP_KEY_ID]
-
-                    process_result = subprocess.run(command_line)
+        if not pgp_key_future.result():
+            log.error('We could not get Sigma Prime\'s PGP key to verify the lighthouse binary. '
+                'We will stop here to protect you.')
+            extractor.discard()
+            return False
 
-            if process_result.returncode != 0:
-                log.error(
-f'''
-We failed to download the Sigma Prime's PGP key to verify the lighthouse
-binary after {retry_count} retries.
-'''
-                )
-                return False
-        
         process_result = subprocess.run([
-            'gpg', '--verify', signature_path])
+            'gpg', '--homedir', str(get_pgp_keyring_directory()), '--verify',
+            signature_path])
         if process_result.returncode != 0:
             log.error('The lighthouse binary signature is wrong. '
                 'We will stop here to protect you.')
+            extractor.discard()
             return False
         
-        # Extracting the Lighthouse binary archive
-        subprocess.run([
-            'tar', 'xvf', binary_path, '--directory', LIGHTHOUSE_INSTALLED_DIRECTORY])
+        # Installing the Lighthouse binary extracted from the verified archive
+        if extractor.install(binary_path, binary_download['size']) is None:
+            log.error(f'Unable to extract the Lighthouse binary archive. {extractor.error}')
+            return False
         
         # Remove download leftovers
         binary_path.unlink()
@@ -3641,163 +3758,138 @@ $ sudo journalctl -ru {lighthouse_bn_service_name}
 
         set_percentage(10)
 
-        journalctl_cursor = None
-
-        while True:
-
-            if get_exited():
-                return {
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                }
-
-            # Output logs
-            command = []
-            first_display = True
-            if journalctl_cursor is None:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q', '-n', '25',
-                    '-o', 'cat', '-u', lighthouse_bn_service_name]
-            else:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q',
-                    '-o', 'cat', '--after-cursor=' + journalctl_cursor, '-u',
-                    lighthouse_bn_service_name]
-                first_display = False
-
-            process_result = subprocess.run(command, capture_output=True, text=True)
+        journal = JournalFollower(lighthouse_bn_service_name)
+        journal.start()
+        first_display = True
 
-            process_output = ''
-            if process_result.returncode == 0:
-                process_output = process_result.stdout
-            else:
-                log_text(f'Return code: {process_result.returncode} while calling journalctl.')
+        try:
+            while True:
 
-            # Parse journalctl cursor and remove it from process_output
-            log_length = len(process_output)
-            if log_length > 0:
-                result = re.search(r'-- cursor: (?P<cursor>[^\n]+)', process_output)
-                if result:
-                    journalctl_cursor = result.group('cursor')
-                    process_output = (
-                        process_output[:result.start()] +
-                        process_output[result.end():])
-                    process_output = process_output.rstrip()
-            
-                    log_length = len(process_output)
+                if get_exited():
+                    return {
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    }
 
-            if log_length > 0:
-                if not first_display and process_output[0] != '\n':
-                    process_output = '\n' + process_output
-                log_text(process_output)
+                # Output new journal lines
+                process_output = journal.read_text()
+                if len(process_output) > 0:
+                    if not first_display:
+                        process_output = '\n' + process_output
+                    first_display = False
+                    log_text(process_output)
 
-            time.sleep(1)
+                time.sleep(1)
             
-            lighthouse_bn_syncing_query = BN_SYNCING_EP
-            lighthouse_bn_query_url = local_lighthouse_bn_http_base + lighthouse_bn_syncing_query
-            headers = {
-                'accept': 'application/json'
-            }
-            try:
-                response = httpx.get(lighthouse_bn_query_url, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Lighthouse beacon node.')
-                continue
+                lighthouse_bn_syncing_query = BN_SYNCING_EP
+                lighthouse_bn_query_url = local_lighthouse_bn_http_base + lighthouse_bn_syncing_query
+                headers = {
+                    'accept': 'application/json'
+                }
+                try:
+                    response = httpx.get(lighthouse_bn_query_url, headers=headers)
+                except httpx.RequestError as exception:
+                    log_text(f'Exception: {exception} while querying Lighthouse beacon node.')
+                    continue
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Lighthouse beacon node.')
-                continue
+                if response.status_code != 200:
+                    log_text(
+                        f'Status code: {response.status_code} while querying Lighthouse beacon node.')
+                    continue
         
-            response_json = response.json()
-            syncing_json = response_json
-
-            lighthouse_bn_peer_count_query = BN_PEER_COUNT_EP
-            lighthouse_bn_query_url = (
-                local_lighthouse_bn_http_base + lighthouse_bn_peer_count_query)
-            headers = {
-                'accept': 'application/json'
-            }
-            try:
-                response = httpx.get(lighthouse_bn_query_url, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Lighthouse beacon node.')
-                continue
+                response_json = response.json()
+                syncing_json = response_json
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Lighthouse beacon node.')
-                continue
+                lighthouse_bn_peer_count_query = BN_PEER_COUNT_EP
+                lighthouse_bn_query_url = (
+                    local_lighthouse_bn_http_base + lighthouse_bn_peer_count_query)
+                headers = {
+                    'accept': 'application/json'
+                }
+                try:
+                    response = httpx.get(lighthouse_bn_query_url, headers=headers)
+                except httpx.RequestError as exception:
+                    log_text(f'Exception: {exception} while querying Lighthouse beacon node.')
+                    continue
 
-            response_json = response.json()
-            peer_count_json = response_json
+                if response.status_code != 200:
+                    log_text(
+                        f'Status code: {response.status_code} while querying Lighthouse beacon node.')
+                    continue
 
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'is_syncing' in syncing_json['data']
-                ):
-                bn_is_syncing = bool(syncing_json['data']['is_syncing'])
-            else:
-                bn_is_syncing = False
+                response_json = response.json()
+                peer_count_json = response_json
+
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'is_syncing' in syncing_json['data']
+                    ):
+                    bn_is_syncing = bool(syncing_json['data']['is_syncing'])
+                else:
+                    bn_is_syncing = False
             
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'head_slot' in syncing_json['data']
-                ):
-                bn_head_slot = syncing_json['data']['head_slot']
-            else:
-                bn_head_slot = UNKNOWN_VALUE
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'head_slot' in syncing_json['data']
+                    ):
+                    bn_head_slot = syncing_json['data']['head_slot']
+                else:
+                    bn_head_slot = UNKNOWN_VALUE
 
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'sync_distance' in syncing_json['data']
-                ):
-                bn_sync_distance = syncing_json['data']['sync_distance']
-            else:
-                bn_sync_distance = UNKNOWN_VALUE
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'sync_distance' in syncing_json['data']
+                    ):
+                    bn_sync_distance = syncing_json['data']['sync_distance']
+                else:
+                    bn_sync_distance = UNKNOWN_VALUE
 
-            bn_connected_peers = 0
-            if (
-                peer_count_json and
-                'data' in peer_count_json and
-                'connected' in peer_count_json['data']
-                ):
-                bn_connected_peers = int(peer_count_json['data']['connected'])
+                bn_connected_peers = 0
+                if (
+                    peer_count_json and
+                    'data' in peer_count_json and
+                    'connected' in peer_count_json['data']
+                    ):
+                    bn_connected_peers = int(peer_count_json['data']['connected'])
             
-            bn_has_few_peers = bn_connected_peers >= BN_MIN_FEW_PEERS
+                bn_has_few_peers = bn_connected_peers >= BN_MIN_FEW_PEERS
 
-            if bn_is_syncing or bn_has_few_peers:
-                set_percentage(100)
-            else:
-                set_percentage(10 + round(min(bn_connected_peers / BN_MIN_FEW_PEERS, 1.0) * 90.0))
+                if bn_is_syncing or bn_has_few_peers:
+                    set_percentage(100)
+                else:
+                    set_percentage(10 + round(min(bn_connected_peers / BN_MIN_FEW_PEERS, 1.0) * 90.0))
 
-            change_status((
-f'''
+                change_status((
+    f'''
 Syncing: {bn_is_syncing} (Head slot: {bn_head_slot}, Sync distance: {bn_sync_distance})
 Connected Peers: {bn_connected_peers}
 '''         ).strip())
 
-            if bn_is_syncing or bn_has_few_peers:
-                bn_is_working = True
-                return {
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                }
-            else:
-                set_result({
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                })
+                if bn_is_syncing or bn_has_few_peers:
+                    bn_is_working = True
+                    return {
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    }
+                else:
+                    set_result({
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    })
+        finally:
+            journal.stop()
 
     result = progress_log_dialog(
         title='Verifying proper Lighthouse beacon node service installation',
@@ -3996,7 +4088,7 @@ Do you want to skip installing the Nimbus binary?
         nimbus_gh_release_url = GITHUB_REST_API_URL + NIMBUS_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(nimbus_gh_release_url, headers=headers,
+            response = get_http_client().get(nimbus_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading Nimbus binary. {exception}')
@@ -4029,7 +4121,8 @@ Do you want to skip installing the Nimbus binary?
             if file_name.startswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
 
         if binary_asset is None:
@@ -4042,66 +4135,24 @@ Do you want to skip installing the Nimbus binary?
 
         binary_path = Path(download_path, binary_asset['file_name'])
 
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Nimbus binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Nimbus binary from Github. {exception}')
+        # The binaries are extracted from the archive as it arrives
+        extractor = TarStreamExtractor(NIMBUS_INSTALLED_DIRECTORY, NIMBUS_ARCHIVE_MEMBERS)
+
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'Nimbus binary', sink=extractor,
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
+            extractor.discard()
             return False
         
-        extract_directory = download_path.joinpath('nimbus')
-        if extract_directory.is_dir():
-            shutil.rmtree(extract_directory)
-        elif extract_directory.is_file():
-            os.unlink(extract_directory)
-        extract_directory.mkdir(parents=True, exist_ok=True)
-        
-        # Extracting the Lighthouse binary archive
-        subprocess.run([
-            'tar', 'xvf', binary_path, '--directory', extract_directory])
+        # Installing the Nimbus binaries extracted from the archive
+        if extractor.install(binary_path, binary_download['size']) is None:
+            log.error(f'Cannot find the Nimbus binaries in the archive. {extractor.error}')
+            return False
         
         # Remove download leftovers
         binary_path.unlink()
 
-        # Find the Nimbus binaries and copy them in their installed location
-        build_path = None
-
-        with os.scandir(extract_directory) as it:
-            for entry in it:
-                if entry.name.startswith('.'):
-                    continue
-
-                if entry.is_dir():
-                    if entry.name == 'build':
-                        build_path = entry.path
-                    else:
-                        build_path = os.path.join(entry.path, 'build')
-                    break
-        
-        if build_path is None:
-            log.error('Cannot find the correct directory in the extracted Nimbus archive.')
-            return False
-
-        src_nimbus_bn_path = Path(build_path, 'nimbus_beacon_node')
-        src_nimbus_vc_path = Path(build_path, 'nimbus_validator_client')
-
-        if not src_nimbus_bn_path.is_file() or not src_nimbus_vc_path.is_file():
-            log.error(f'Cannot find the Nimbus binaries in the extracted archive.')
-            return False
-        
-        subprocess.run(['cp', src_nimbus_bn_path, NIMBUS_INSTALLED_DIRECTORY])
-        subprocess.run(['cp', src_nimbus_vc_path, NIMBUS_INSTALLED_DIRECTORY])
-
-        # Remove extraction leftovers
-        shutil.rmtree(extract_directory)
-
         # Get Nimbus version
         try:
             process_result = subprocess.run([
@@ -4430,163 +4481,138 @@ $ sudo journalctl -ru {nimbus_service_name}
 
         set_percentage(10)
 
-        journalctl_cursor = None
-
-        while True:
-
-            if get_exited():
-                return {
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                }
-
-            # Output logs
-            command = []
-            first_display = True
-            if journalctl_cursor is None:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q', '-n', '25',
-                    '-o', 'cat', '-u', nimbus_service_name]
-            else:
-                command = ['journalctl', '--no-pager', '--show-cursor', '-q',
-                    '-o', 'cat', '--after-cursor=' + journalctl_cursor, '-u',
-                    nimbus_service_name]
-                first_display = False
-
-            process_result = subprocess.run(command, capture_output=True, text=True)
+        journal = JournalFollower(nimbus_service_name)
+        journal.start()
+        first_display = True
 
-            process_output = ''
-            if process_result.returncode == 0:
-                process_output = process_result.stdout
-            else:
-                log_text(f'Return code: {process_result.returncode} while calling journalctl.')
+        try:
+            while True:
 
-            # Parse journalctl cursor and remove it from process_output
-            log_length = len(process_output)
-            if log_length > 0:
-                result = re.search(r'-- cursor: (?P<cursor>[^\n]+)', process_output)
-                if result:
-                    journalctl_cursor = result.group('cursor')
-                    process_output = (
-                        process_output[:result.start()] +
-                        process_output[result.end():])
-                    process_output = process_output.rstrip()
-            
-                    log_length = len(process_output)
+                if get_exited():
+                    return {
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    }
 
-            if log_length > 0:
-                if not first_display and process_output[0] != '\n':
-                    process_output = '\n' + process_output
-                log_text(process_output)
+                # Output new journal lines
+                process_output = journal.read_text()
+                if len(process_output) > 0:
+                    if not first_display:
+                        process_output = '\n' + process_output
+                    first_display = False
+                    log_text(process_output)
 
-            time.sleep(1)
+                time.sleep(1)
             
-            bn_syncing_query = BN_SYNCING_EP
-            bn_query_url = local_bn_http_base + bn_syncing_query
-            headers = {
-                'accept': 'application/json'
-            }
-            try:
-                response = httpx.get(bn_query_url, headers=headers, timeout=60)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nimbus beacon node.')
-                continue
+                bn_syncing_query = BN_SYNCING_EP
+                bn_query_url = local_bn_http_base + bn_syncing_query
+                headers = {
+                    'accept': 'application/json'
+                }
+                try:
+                    response = httpx.get(bn_query_url, headers=headers, timeout=60)
+                except httpx.RequestError as exception:
+                    log_text(f'Exception: {exception} while querying Nimbus beacon node.')
+                    continue
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nimbus beacon node.')
-                continue
+                if response.status_code != 200:
+                    log_text(
+                        f'Status code: {response.status_code} while querying Nimbus beacon node.')
+                    continue
         
-            response_json = response.json()
-            syncing_json = response_json
-
-            bn_peer_count_query = BN_PEER_COUNT_EP
-            bn_query_url = (
-                local_bn_http_base + bn_peer_count_query)
-            headers = {
-                'accept': 'application/json'
-            }
-            try:
-                response = httpx.get(bn_query_url, headers=headers, timeout=60)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nimbus beacon node.')
-                continue
+                response_json = response.json()
+                syncing_json = response_json
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nimbus beacon node.')
-                continue
+                bn_peer_count_query = BN_PEER_COUNT_EP
+                bn_query_url = (
+                    local_bn_http_base + bn_peer_count_query)
+                headers = {
+                    'accept': 'application/json'
+                }
+                try:
+                    response = httpx.get(bn_query_url, headers=headers, timeout=60)
+                except httpx.RequestError as exception:
+                    log_text(f'Exception: {exception} while querying Nimbus beacon node.')
+                    continue
 
-            response_json = response.json()
-            peer_count_json = response_json
+                if response.status_code != 200:
+                    log_text(
+                        f'Status code: {response.status_code} while querying Nimbus beacon node.')
+                    continue
 
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'is_syncing' in syncing_json['data']
-                ):
-                bn_is_syncing = bool(syncing_json['data']['is_syncing'])
-            else:
-                bn_is_syncing = False
+                response_json = response.json()
+                peer_count_json = response_json
+
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'is_syncing' in syncing_json['data']
+                    ):
+                    bn_is_syncing = bool(syncing_json['data']['is_syncing'])
+                else:
+                    bn_is_syncing = False
             
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'head_slot' in syncing_json['data']
-                ):
-                bn_head_slot = syncing_json['data']['head_slot']
-            else:
-                bn_head_slot = UNKNOWN_VALUE
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'head_slot' in syncing_json['data']
+                    ):
+                    bn_head_slot = syncing_json['data']['head_slot']
+                else:
+                    bn_head_slot = UNKNOWN_VALUE
 
-            if (
-                syncing_json and
-                'data' in syncing_json and
-                'sync_distance' in syncing_json['data']
-                ):
-                bn_sync_distance = syncing_json['data']['sync_distance']
-            else:
-                bn_sync_distance = UNKNOWN_VALUE
+                if (
+                    syncing_json and
+                    'data' in syncing_json and
+                    'sync_distance' in syncing_json['data']
+                    ):
+                    bn_sync_distance = syncing_json['data']['sync_distance']
+                else:
+                    bn_sync_distance = UNKNOWN_VALUE
 
-            bn_connected_peers = 0
-            if (
-                peer_count_json and
-                'data' in peer_count_json and
-                'connected' in peer_count_json['data']
-                ):
-                bn_connected_peers = int(peer_count_json['data']['connected'])
+                bn_connected_peers = 0
+                if (
+                    peer_count_json and
+                    'data' in peer_count_json and
+                    'connected' in peer_count_json['data']
+                    ):
+                    bn_connected_peers = int(peer_count_json['data']['connected'])
             
-            bn_has_few_peers = bn_connected_peers >= BN_MIN_FEW_PEERS
+                bn_has_few_peers = bn_connected_peers >= BN_MIN_FEW_PEERS
 
-            if bn_is_syncing or bn_has_few_peers:
-                set_percentage(100)
-            else:
-                set_percentage(10 + round(min(bn_connected_peers / BN_MIN_FEW_PEERS, 1.0) * 90.0))
+                if bn_is_syncing or bn_has_few_peers:
+                    set_percentage(100)
+                else:
+                    set_percentage(10 + round(min(bn_connected_peers / BN_MIN_FEW_PEERS, 1.0) * 90.0))
 
-            change_status((
-f'''
+                change_status((
+    f'''
 Syncing: {bn_is_syncing} (Head slot: {bn_head_slot}, Sync distance: {bn_sync_distance})
 Connected Peers: {bn_connected_peers}
 '''         ).strip())
 
-            if bn_is_syncing or bn_has_few_peers:
-                bn_is_working = True
-                return {
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                }
-            else:
-                set_result({
-                    'bn_is_working': bn_is_working,
-                    'bn_is_syncing': bn_is_syncing,
-                    'bn_head_slot': bn_head_slot,
-                    'bn_sync_distance': bn_sync_distance,
-                    'bn_connected_peers': bn_connected_peers
-                })
+                if bn_is_syncing or bn_has_few_peers:
+                    bn_is_working = True
+                    return {
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    }
+                else:
+                    set_result({
+                        'bn_is_working': bn_is_working,
+                        'bn_is_syncing': bn_is_syncing,
+                        'bn_head_slot': bn_head_slot,
+                        'bn_sync_distance': bn_sync_distance,
+                        'bn_connected_peers': bn_connected_peers
+                    })
+        finally:
+            journal.stop()
 
     result = progress_log_dialog(
         title='Verifying proper Nimbus service installation',
@@ -4943,7 +4969,7 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
             edc_gh_release_url = GITHUB_REST_API_URL + EDC_LATEST_RELEASE
             headers = {'Accept': GITHUB_API_VERSION}
             try:
-                response = httpx.get(edc_gh_release_url, headers=headers,
+                response = get_http_client().get(edc_gh_release_url, headers=headers,
                     follow_redirects=True)
             except httpx.RequestError as exception:
                 log.error(f'Cannot get latest ethstaker-deposit-cli release from Github. '
@@ -4976,7 +5002,8 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
                 if file_name.endswith('linux-amd64.tar.gz'):
                     binary_asset = {
                         'file_name': file_name,
-                        'file_url': file_url
+                        'file_url': file_url,
+                        'file_sha256': github_asset_sha256(asset)
                     }
                 elif file_name.endswith('linux-amd64.tar.gz.sha256'):
                     checksum_asset = {
@@ -4998,43 +5025,21 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
             download_path.mkdir(parents=True, exist_ok=True)
 
             binary_path = Path(download_path, binary_asset['file_name'])
-            binary_hash = hashlib.sha256()
 
-            try:
-                with open(binary_path, 'wb') as binary_file:
-                    with httpx.stream('GET', binary_asset['file_url'],
-                        follow_redirects=True) as http_stream:
-                        if http_stream.status_code != 200:
-                            log.error(f'HTTP error while downloading ethstaker-deposit-cli binary '
-                                f'from Github. Status code {http_stream.status_code}')
-                            return False
-                        for data in http_stream.iter_bytes():
-                            binary_file.write(data)
-                            if checksum_asset is not None:
-                                binary_hash.update(data)
-            except httpx.RequestError as exception:
-                log.error(f'Exception while downloading ethstaker-deposit-cli binary from '
-                    f'Github. {exception}')
+            binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+                log, 'ethstaker-deposit-cli binary',
+                expected_sha256=binary_asset['file_sha256'])
+            if binary_download['error'] is not None:
                 return False
 
             if checksum_asset is not None:
-                binary_hexdigest = binary_hash.hexdigest().lower()
+                binary_hexdigest = binary_download['sha256'].lower()
 
                 checksum_path = Path(download_path, checksum_asset['file_name'])
 
-                try:
-                    with open(checksum_path, 'wb') as signature_file:
-                        with httpx.stream('GET', checksum_asset['file_url'],
-                            follow_redirects=True) as http_stream:
-                            if http_stream.status_code != 200:
-                                log.error(f'HTTP error while downloading ethstaker-deposit-cli '
-                                    f'checksum from Github. Status code {http_stream.status_code}')
-                                return False
-                            for data in http_stream.iter_bytes():
-                                signature_file.write(data)
-                except httpx.RequestError as exception:
-                    log.error(f'Exception while downloading ethstaker-deposit-cli checksum from '
-                    f'Github. {exception}')
+                checksum_download = download_file(checksum_asset['file_url'], checksum_path, log,
+                    'ethstaker-deposit-cli checksum', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+                if checksum_download['error'] is not None:
                     return False
 
                 # Verify SHA256 signature
@@ -5978,166 +5983,141 @@ $ sudo journalctl -ru {service_name}
 
             set_percentage(1)
 
-            journalctl_cursor = None
-
-            while True:
-
-                if get_exited():
-                    return {
-                        'bn_is_fully_sync': bn_is_fully_sync,
-                        'bn_is_syncing': bn_is_syncing,
-                        'bn_head_slot': bn_head_slot,
-                        'bn_sync_distance': bn_sync_distance,
-                        'bn_connected_peers': bn_connected_peers
-                    }
-
-                # Output logs
-                command = []
-                first_display = True
-                if journalctl_cursor is None:
-                    command = ['journalctl', '--no-pager', '--show-cursor', '-q', '-n', '25',
-                        '-o', 'cat', '-u', service_name]
-                else:
-                    command = ['journalctl', '--no-pager', '--show-cursor', '-q',
-                        '-o', 'cat', '--after-cursor=' + journalctl_cursor, '-u',
-                        service_name]
-                    first_display = False
-
-                process_result = subprocess.run(command, capture_output=True, text=True)
-
-                process_output = ''
-                if process_result.returncode == 0:
-                    process_output = process_result.stdout
-                else:
-                    log_text(f'Return code: {process_result.returncode} while calling journalctl.')
-
-                # Parse journalctl cursor and remove it from process_output
-                log_length = len(process_output)
-                if log_length > 0:
-                    result = re.search(r'-- cursor: (?P<cursor>[^\n]+)', process_output)
-                    if result:
-                        journalctl_cursor = result.group('cursor')
-                        process_output = (
-                            process_output[:result.start()] +
-                            process_output[result.end():])
-                        process_output = process_output.rstrip()
-                
-                        log_length = len(process_output)
+            journal = JournalFollower(service_name)
+            journal.start()
+            first_display = True
 
-                if log_length > 0:
-                    if not first_display and process_output[0] != '\n':
-                        process_output = '\n' + process_output
-                    log_text(process_output)
+            try:
+                while True:
+
+                    if get_exited():
+                        return {
+                            'bn_is_fully_sync': bn_is_fully_sync,
+                            'bn_is_syncing': bn_is_syncing,
+                            'bn_head_slot': bn_head_slot,
+                            'bn_sync_distance': bn_sync_distance,
+                            'bn_connected_peers': bn_connected_peers
+                        }
+
+                    # Output new journal lines
+                    process_output = journal.read_text()
+                    if len(process_output) > 0:
+                        if not first_display:
+                            process_output = '\n' + process_output
+                        first_display = False
+                        log_text(process_output)
                 
-                bn_syncing_query = BN_SYNCING_EP
-                bn_query_url = local_bn_http_base + bn_syncing_query
-                headers = {
-                    'accept': 'application/json'
-                }
-                try:
-                    response = httpx.get(bn_query_url, headers=headers, timeout=bn_timeout)
-                except httpx.RequestError as exception:
-                    log_text(f'Exception: {exception} while querying beacon node.')
-                    continue
+                    bn_syncing_query = BN_SYNCING_EP
+                    bn_query_url = local_bn_http_base + bn_syncing_query
+                    headers = {
+                        'accept': 'application/json'
+                    }
+                    try:
+                        response = httpx.get(bn_query_url, headers=headers, timeout=bn_timeout)
+                    except httpx.RequestError as exception:
+                        log_text(f'Exception: {exception} while querying beacon node.')
+                        continue
 
-                if response.status_code != 200:
-                    log_text(
-                        f'Status code: {response.status_code} while querying beacon node.')
-                    continue
+                    if response.status_code != 200:
+                        log_text(
+                            f'Status code: {response.status_code} while querying beacon node.')
+                        continue
             
-                response_json = response.json()
-                syncing_json = response_json
-
-                bn_peer_count_query = BN_PEER_COUNT_EP
-                bn_query_url = (
-                    local_bn_http_base + bn_peer_count_query)
-                headers = {
-                    'accept': 'application/json'
-                }
-                try:
-                    response = httpx.get(bn_query_url, headers=headers, timeout=bn_timeout)
-                except httpx.RequestError as exception:
-                    log_text(f'Exception: {exception} while querying beacon node.')
-                    continue
+                    response_json = response.json()
+                    syncing_json = response_json
 
-                if response.status_code != 200:
-                    log_text(
-                        f'Status code: {response.status_code} while querying beacon node.')
-                    continue
+                    bn_peer_count_query = BN_PEER_COUNT_EP
+                    bn_query_url = (
+                        local_bn_http_base + bn_peer_count_query)
+                    headers = {
+                        'accept': 'application/json'
+                    }
+                    try:
+                        response = httpx.get(bn_query_url, headers=headers, timeout=bn_timeout)
+                    except httpx.RequestError as exception:
+                        log_text(f'Exception: {exception} while querying beacon node.')
+                        continue
 
-                response_json = response.json()
-                peer_count_json = response_json
+                    if response.status_code != 200:
+                        log_text(
+                            f'Status code: {response.status_code} while querying beacon node.')
+                        continue
 
-                if (
-                    syncing_json and
-                    'data' in syncing_json and
-                    'is_syncing' in syncing_json['data']
-                    ):
-                    bn_is_syncing = bool(syncing_json['data']['is_syncing'])
-                else:
-                    bn_is_syncing = False
+                    response_json = response.json()
+                    peer_count_json = response_json
+
+                    if (
+                        syncing_json and
+                        'data' in syncing_json and
+                        'is_syncing' in syncing_json['data']
+                        ):
+                        bn_is_syncing = bool(syncing_json['data']['is_syncing'])
+                    else:
+                        bn_is_syncing = False
                 
-                if (
-                    syncing_json and
-                    'data' in syncing_json and
-                    'head_slot' in syncing_json['data']
-                    ):
-                    bn_head_slot = int(syncing_json['data']['head_slot'])
-                else:
-                    bn_head_slot = UNKNOWN_VALUE
-
-                if (
-                    syncing_json and
-                    'data' in syncing_json and
-                    'sync_distance' in syncing_json['data']
-                    ):
-                    bn_sync_distance = int(syncing_json['data']['sync_distance'])
-                else:
-                    bn_sync_distance = UNKNOWN_VALUE
+                    if (
+                        syncing_json and
+                        'data' in syncing_json and
+                        'head_slot' in syncing_json['data']
+                        ):
+                        bn_head_slot = int(syncing_json['data']['head_slot'])
+                    else:
+                        bn_head_slot = UNKNOWN_VALUE
+
+                    if (
+                        syncing_json and
+                        'data' in syncing_json and
+                        'sync_distance' in syncing_json['data']
+                        ):
+                        bn_sync_distance = int(syncing_json['data']['sync_distance'])
+                    else:
+                        bn_sync_distance = UNKNOWN_VALUE
 
-                bn_connected_peers = 0
-                if (
-                    peer_count_json and
-                    'data' in peer_count_json and
-                    'connected' in peer_count_json['data']
-                    ):
-                    bn_connected_peers = int(peer_count_json['data']['connected'])
+                    bn_connected_peers = 0
+                    if (
+                        peer_count_json and
+                        'data' in peer_count_json and
+                        'connected' in peer_count_json['data']
+                        ):
+                        bn_connected_peers = int(peer_count_json['data']['connected'])
 
-                bn_is_fully_sync = bn_sync_distance == 0
+                    bn_is_fully_sync = bn_sync_distance == 0
 
-                if bn_is_fully_sync:
-                    set_percentage(100)
-                else:
-                    if type(bn_sync_distance) == int and type(bn_head_slot) == int:
-                        max_head = bn_sync_distance + bn_head_slot
-                        set_percentage(round(bn_head_slot / max_head * 100.0))
+                    if bn_is_fully_sync:
+                        set_percentage(100)
                     else:
-                        set_percentage(1)
-
-                change_status((
-f'''
+                        if type(bn_sync_distance) == int and type(bn_head_slot) == int:
+                            max_head = bn_sync_distance + bn_head_slot
+                            set_percentage(round(bn_head_slot / max_head * 100.0))
+                        else:
+                            set_percentage(1)
+
+                    change_status((
+    f'''
 Syncing: {bn_is_syncing} (Head slot: {bn_head_slot}, Sync distance: {bn_sync_distance})
 Connected Peers: {bn_connected_peers}
 '''             ).strip())
 
-                if bn_is_fully_sync:
-                    return {
-                        'bn_is_fully_sync': bn_is_fully_sync,
-                        'bn_is_syncing': bn_is_syncing,
-                        'bn_head_slot': bn_head_slot,
-                        'bn_sync_distance': bn_sync_distance,
-                        'bn_connected_peers': bn_connected_peers
-                    }
-                else:
-                    set_result({
-                        'bn_is_fully_sync': bn_is_fully_sync,
-                        'bn_is_syncing': bn_is_syncing,
-                        'bn_head_slot': bn_head_slot,
-                        'bn_sync_distance': bn_sync_distance,
-                        'bn_connected_peers': bn_connected_peers
-                    })
+                    if bn_is_fully_sync:
+                        return {
+                            'bn_is_fully_sync': bn_is_fully_sync,
+                            'bn_is_syncing': bn_is_syncing,
+                            'bn_head_slot': bn_head_slot,
+                            'bn_sync_distance': bn_sync_distance,
+                            'bn_connected_peers': bn_connected_peers
+                        }
+                    else:
+                        set_result({
+                            'bn_is_fully_sync': bn_is_fully_sync,
+                            'bn_is_syncing': bn_is_syncing,
+                            'bn_head_slot': bn_head_slot,
+                            'bn_sync_distance': bn_sync_distance,
+                            'bn_connected_peers': bn_connected_peers
+                        })
                 
-                time.sleep(1)
+                    time.sleep(1)
+            finally:
+                journal.stop()
 
         unknown_joining_queue = 'no join queue information found'
 
@@ -6297,11 +6277,13 @@ When you are done with the deposit(s), click the "I'm done" button below.
         log.error('No public key(s) found in the deposit file.')
         return False
 
-    # Verify that the deposit was done correctly using beaconcha.in API
-    validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+    # Verify that the deposit was done correctly using the local beacon node or the
+    # beaconcha.in API
+    validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+        bn_http_base=local_bn_http_base)
 
     if type(validator_deposits) is not list and not validator_deposits:
-        log.warning('Unable to get validator(s) deposits from beaconcha.in')
+        log.warning('Unable to get validator(s) deposits')
         validator_deposits = []
 
     skipping_deposit_check = False
@@ -6343,10 +6325,11 @@ deposit(s).
             skipping_deposit_check = True
             break
 
-        validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+        validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+            bn_http_base=local_bn_http_base)
 
         if type(validator_deposits) is not list and not validator_deposits:
-            log.warning('Unable to get validator(s) deposits from beaconcha.in')
+            log.warning('Unable to get validator(s) deposits')
             validator_deposits = []
     
     # Check if all the deposit(s) were done for each validator
@@ -6386,10 +6369,11 @@ deposit(s).
             skipping_deposit_check = True
             break
 
-        validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+        validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+            bn_http_base=local_bn_http_base)
 
         if type(validator_deposits) is not list and not validator_deposits:
-            log.warning('Unable to get validator(s) deposits from beaconcha.in')
+            log.warning('Unable to get validator(s) deposits')
             validator_deposits = []
 
     # Clean up deposit data file
@@ -1,15 +1,11 @@
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import httpx
 import re
-import time
 import os
-import hashlib
-import shutil
 
 from packaging.version import parse as parse_version, Version
 
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import button_dialog
 
 from pathlib import Path
 
@@ -21,7 +17,15 @@ from ethwizard.platforms.common import (
     get_nethermind_latest_version,
     get_mevboost_latest_version,
     get_nimbus_latest_version,
-    get_lighthouse_latest_version
+    get_lighthouse_latest_version,
+    run_timed_probes,
+    get_github_release,
+    download_file,
+    download_file_with_progress,
+    github_asset_sha256,
+    start_background_task,
+    get_pgp_keyring_directory,
+    button_dialog
 )
 
 from ethwizard.platforms.ubuntu.common import (
@@ -31,9 +35,12 @@ from ethwizard.platforms.ubuntu.common import (
     is_package_installed,
     setup_jwt_token_file,
     is_ethereum_ppa_added,
-    is_nethermind_ppa_added
+    is_nethermind_ppa_added,
+    prepare_pgp_key
 )
 
+from ethwizard.utils.archives import TarStreamExtractor
+
 from ethwizard.constants import (
     CTX_SELECTED_EXECUTION_CLIENT,
     CTX_SELECTED_CONSENSUS_CLIENT,
@@ -46,11 +53,10 @@ from ethwizard.constants import (
     CONSENSUS_CLIENT_NIMBUS,
     WIZARD_COMPLETED_STEP_ID,
     UNKNOWN_VALUE,
-    GITHUB_REST_API_URL,
-    GITHUB_API_VERSION,
     MEVBOOST_SYSTEMD_SERVICE_NAME,
     MEVBOOST_LATEST_RELEASE,
     MEVBOOST_INSTALLED_DIRECTORY,
+    MEVBOOST_ARCHIVE_MEMBERS,
     GETH_SYSTEMD_SERVICE_NAME,
     NETHERMIND_SYSTEMD_SERVICE_NAME,
     NETHERMIND_NEW_BIN_PATH_VERSION,
@@ -68,18 +74,22 @@ from ethwizard.constants import (
     MAINTENANCE_CHECK_AGAIN_SOON,
     MAINTENANCE_START_SERVICE,
     MAINTENANCE_REINSTALL_CLIENT,
+    MAINTENANCE_PROBE_TIMEOUT,
+    MAINTENANCE_APT_PROBE_TIMEOUT,
     LIGHTHOUSE_BN_SYSTEMD_SERVICE_NAME,
     LIGHTHOUSE_VC_SYSTEMD_SERVICE_NAME,
     LIGHTHOUSE_LATEST_RELEASE,
+    DOWNLOAD_METADATA_MAX_SIZE,
     LIGHTHOUSE_INSTALLED_DIRECTORY,
+    LIGHTHOUSE_ARCHIVE_MEMBERS,
     LIGHTHOUSE_INSTALLED_PATH,
     LIGHTHOUSE_PRIME_PGP_KEY_ID,
     NIMBUS_SYSTEMD_SERVICE_NAME,
     NIMBUS_INSTALLED_PATH,
     NIMBUS_LATEST_RELEASE,
     NIMBUS_INSTALLED_DIRECTORY,
+    NIMBUS_ARCHIVE_MEMBERS,
     BN_VERSION_EP,
-    PGP_KEY_SERVERS,
 )
 
 def enter_maintenance(context):
@@ -113,9 +123,23 @@ def show_dashboard(context):
     current_network = context[selected_network]
     current_mevboost_installed = context[mevboost_installed]
 
+    # Get execution client, consensus client and MEV-Boost details concurrently. Each probe
+    # inside those details collectors has its own timeout.
+
+    details_probes = [
+        ('execution_client_details',
+            lambda: get_execution_client_details(current_execution_client), None),
+        ('consensus_client_details',
+            lambda: get_consensus_client_details(current_consensus_client), None)
+    ]
+    if current_mevboost_installed:
+        details_probes.append(('mevboost_details', get_mevboost_details, None))
+
+    collected_details = run_timed_probes(details_probes, log, default=False)
+
     # Get execution client details
 
-    execution_client_details = get_execution_client_details(current_execution_client)
+    execution_client_details = collected_details['execution_client_details']
     if not execution_client_details:
         log.error('Unable to get execution client details.')
         return False
@@ -244,7 +268,7 @@ def show_dashboard(context):
 
     # Get consensus client details
 
-    consensus_client_details = get_consensus_client_details(current_consensus_client)
+    consensus_client_details = collected_details['consensus_client_details']
     if not consensus_client_details:
         log.error('Unable to get consensus client details.')
         return False
@@ -357,7 +381,7 @@ def show_dashboard(context):
 
     if current_mevboost_installed:
 
-        mevboost_details = get_mevboost_details()
+        mevboost_details = collected_details['mevboost_details']
         if not mevboost_details:
             log.error('Unable to get MEV-Boost details.')
             return False
@@ -584,8 +608,14 @@ def get_mevboost_details():
     details['service']['sub'] = service_details['SubState']
     details['service']['running'] = is_service_running(service_details)
 
-    details['versions']['installed'] = get_mevboost_installed_version()
-    details['versions']['latest'] = get_mevboost_latest_version(log)
+    versions = run_timed_probes([
+        ('mevboost_installed', get_mevboost_installed_version, MAINTENANCE_PROBE_TIMEOUT),
+        ('mevboost_latest', lambda: get_mevboost_latest_version(log),
+            MAINTENANCE_PROBE_TIMEOUT)
+    ], log)
+
+    details['versions']['installed'] = versions['mevboost_installed']
+    details['versions']['latest'] = versions['mevboost_latest']
 
     if 'ExecStart' in service_details:
         details['exec'] = parse_exec_start(service_details['ExecStart'])
@@ -662,10 +692,17 @@ def get_execution_client_details(execution_client):
         details['service']['sub'] = service_details['SubState']
         details['service']['running'] = is_service_running(service_details)
 
-        details['versions']['installed'] = get_geth_installed_version()
-        details['versions']['running'] = get_geth_running_version(log)
-        details['versions']['available'] = get_geth_available_version()
-        details['versions']['latest'] = get_geth_latest_version(log)
+        versions = run_timed_probes([
+            ('geth_installed', get_geth_installed_version, MAINTENANCE_PROBE_TIMEOUT),
+            ('geth_running', lambda: get_geth_running_version(log), MAINTENANCE_PROBE_TIMEOUT),
+            ('geth_available', get_geth_available_version, MAINTENANCE_APT_PROBE_TIMEOUT),
+            ('geth_latest', lambda: get_geth_latest_version(log), MAINTENANCE_PROBE_TIMEOUT)
+        ], log)
+
+        details['versions']['installed'] = versions['geth_installed']
+        details['versions']['running'] = versions['geth_running']
+        details['versions']['available'] = versions['geth_available']
+        details['versions']['latest'] = versions['geth_latest']
 
         if 'ExecStart' in service_details:
             details['exec'] = parse_exec_start(service_details['ExecStart'])
@@ -724,13 +761,34 @@ def get_execution_client_details(execution_client):
         details['service']['sub'] = service_details['SubState']
         details['service']['running'] = is_service_running(service_details)
 
-        details['versions']['installed'] = get_nethermind_installed_version()
-        details['versions']['running'] = get_nethermind_running_version(log)
-        details['versions']['available'] = get_nethermind_available_version()
-        details['versions']['latest'] = get_nethermind_latest_version(log)
+        def get_nethermind_package_versions():
+            # Both use apt so they run one after the other in a single probe
+            available_version = get_nethermind_available_version()
+            installed_package_version = get_nethermind_installed_package_version()
+            return available_version, installed_package_version
+
+        versions = run_timed_probes([
+            ('nethermind_installed', get_nethermind_installed_version,
+                MAINTENANCE_PROBE_TIMEOUT),
+            ('nethermind_running', lambda: get_nethermind_running_version(log),
+                MAINTENANCE_PROBE_TIMEOUT),
+            ('nethermind_packages', get_nethermind_package_versions,
+                MAINTENANCE_APT_PROBE_TIMEOUT),
+            ('nethermind_latest', lambda: get_nethermind_latest_version(log),
+                MAINTENANCE_PROBE_TIMEOUT)
+        ], log)
+
+        package_versions = versions['nethermind_packages']
+        if package_versions == UNKNOWN_VALUE:
+            package_versions = (UNKNOWN_VALUE, (UNKNOWN_VALUE, UNKNOWN_VALUE))
+
+        details['versions']['installed'] = versions['nethermind_installed']
+        details['versions']['running'] = versions['nethermind_running']
+        details['versions']['available'] = package_versions[0]
+        details['versions']['latest'] = versions['nethermind_latest']
 
         details['versions']['installed_packaged'], details['versions']['fixed_installed_package'] = (
-            get_nethermind_installed_package_version())
+            package_versions[1])
 
         if 'ExecStart' in service_details:
             details['exec'] = parse_exec_start(service_details['ExecStart'])
@@ -1051,9 +1109,17 @@ def get_consensus_client_details(consensus_client):
             if details['is_vc_merge_configured'] == UNKNOWN_VALUE:
                 details['is_vc_merge_configured'] = False
 
-        details['versions']['installed'] = get_lighthouse_installed_version()
-        details['versions']['running'] = get_lighthouse_running_version()
-        details['versions']['latest'] = get_lighthouse_latest_version(log)
+        versions = run_timed_probes([
+            ('lighthouse_installed', get_lighthouse_installed_version,
+                MAINTENANCE_PROBE_TIMEOUT),
+            ('lighthouse_running', get_lighthouse_running_version, MAINTENANCE_PROBE_TIMEOUT),
+            ('lighthouse_latest', lambda: get_lighthouse_latest_version(log),
+                MAINTENANCE_PROBE_TIMEOUT)
+        ], log)
+
+        details['versions']['installed'] = versions['lighthouse_installed']
+        details['versions']['running'] = versions['lighthouse_running']
+        details['versions']['latest'] = versions['lighthouse_latest']
 
         return details
     
@@ -1108,9 +1174,15 @@ def get_consensus_client_details(consensus_client):
             
             details['is_merge_configured'] = execution_jwt_flag_found
 
-        details['versions']['installed'] = get_nimbus_installed_version()
-        details['versions']['running'] = get_nimbus_running_version()
-        details['versions']['latest'] = get_nimbus_latest_version(log)
+        versions = run_timed_probes([
+            ('nimbus_installed', get_nimbus_installed_version, MAINTENANCE_PROBE_TIMEOUT),
+            ('nimbus_running', get_nimbus_running_version, MAINTENANCE_PROBE_TIMEOUT),
+            ('nimbus_latest', lambda: get_nimbus_latest_version(log), MAINTENANCE_PROBE_TIMEOUT)
+        ], log)
+
+        details['versions']['installed'] = versions['nimbus_installed']
+        details['versions']['running'] = versions['nimbus_running']
+        details['versions']['latest'] = versions['nimbus_latest']
 
         return details
 
@@ -1465,22 +1537,11 @@ def upgrade_mevboost():
     log.info('Upgrading MEV-Boost...')
 
     # Getting latest mev-boost release files
-    mevboost_gh_release_url = GITHUB_REST_API_URL + MEVBOOST_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(mevboost_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost binary. {exception}')
+    release_json = get_github_release(MEVBOOST_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for MEV-Boost.')
         return False
 
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading MEV-Boost binary. '
-            f'Status code {response.status_code}')
-        return False
-    
-    release_json = response.json()
-
     if 'assets' not in release_json:
         log.error('No assets in Github release for MEV-Boost.')
         return False
@@ -1503,7 +1564,8 @@ def upgrade_mevboost():
         if file_name.endswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
         elif file_name == checksums_filename:
             checksums_asset = {
@@ -1523,47 +1585,26 @@ def upgrade_mevboost():
     download_path.mkdir(parents=True, exist_ok=True)
 
     binary_path = Path(download_path, binary_asset['file_name'])
-    binary_hash = hashlib.sha256()
+    checksums_path = Path(download_path, checksums_asset['file_name'])
 
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading MEV-Boost binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
+    # Fetch the checksums while the binary is downloading
+    checksums_future = start_background_task('mevboost-checksums', download_file,
+        checksums_asset['file_url'], checksums_path, log, 'MEV-Boost checksums',
+        max_size=DOWNLOAD_METADATA_MAX_SIZE)
 
-                archive_filename = binary_asset['file_name']
-                archive_url = binary_asset['file_url']
-                log.info(f'Downloading {archive_filename} from {archive_url} ...')
+    # The binary is extracted from the archive as it arrives
+    extractor = TarStreamExtractor(MEVBOOST_INSTALLED_DIRECTORY, MEVBOOST_ARCHIVE_MEMBERS)
 
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-                    binary_hash.update(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost binary from Github. {exception}')
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'MEV-Boost binary', sink=extractor,
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
+        extractor.discard()
         return False
-    
-    checksums_path = Path(download_path, checksums_asset['file_name'])
 
-    try:
-        with open(checksums_path, 'wb') as checksums_file:
-            with httpx.stream('GET', checksums_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading MEV-Boost checksums from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                
-                archive_filename = checksums_asset['file_name']
-                archive_url = checksums_asset['file_url']
-                log.info(f'Downloading {archive_filename} from {archive_url} ...')
-
-                for data in http_stream.iter_bytes():
-                    checksums_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost checksums from Github. {exception}')
+    checksums_download = checksums_future.result()
+    if checksums_download['error'] is not None:
+        extractor.discard()
         return False
 
     # Verify checksum
@@ -1577,13 +1618,14 @@ def upgrade_mevboost():
                 hash_found = True
                 checksum = result.group('hash').lower()
 
-                binary_hexdigest = binary_hash.hexdigest().lower()
+                binary_hexdigest = binary_download['sha256'].lower()
 
                 if checksum != binary_hexdigest:
                     # SHA256 checksum failed
                     log.error(f'SHA256 checksum failed on MEV-Boost binary from '
                         f'Github. Expected {checksum} but we got {binary_hexdigest}. We will '
                         f'stop here to protect you.')
+                    extractor.discard()
                     return False
                 
                 log.info('Good SHA256 checksum for MEV-Boost binary.')
@@ -1595,15 +1637,18 @@ def upgrade_mevboost():
         log.error(f'We could not find the SHA256 checksum for MEV-Boost binary '
             f'({archive_filename}) in the {checksums_filename} file. We will stop here to '
             f'protect you.')
+        extractor.discard()
         return False
     
-    # Stopping MEV-Boost service before updating the binary
+    # Replacing the MEV-Boost binary with the one extracted from the verified archive. The
+    # running service keeps the previous binary until it is restarted.
+    if extractor.install(binary_path, binary_download['size']) is None:
+        log.error(f'Unable to extract the MEV-Boost binary archive. {extractor.error}')
+        return False
+
+    # Stopping MEV-Boost service so it starts again with the new binary
     log.info('Stopping MEV-Boost service...')
     subprocess.run(['systemctl', 'stop', MEVBOOST_SYSTEMD_SERVICE_NAME])
-
-    # Extracting the MEV-Boost binary archive
-    subprocess.run([
-        'tar', 'xvf', binary_path, '--directory', MEVBOOST_INSTALLED_DIRECTORY])
     
     # Restarting Lighthouse services after updating the binary
     log.info('Starting MEV-Boost service...')
@@ -1809,22 +1854,11 @@ def upgrade_nimbus():
     log.info('Upgrading Nimbus client...')
 
     # Getting latest Nimbus release files
-    nimbus_gh_release_url = GITHUB_REST_API_URL + NIMBUS_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(nimbus_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Nimbus binary. {exception}')
+    release_json = get_github_release(NIMBUS_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Nimbus.')
         return False
 
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading Nimbus binary. '
-            f'Status code {response.status_code}')
-        return False
-    
-    release_json = response.json()
-
     if 'assets' not in release_json:
         log.error('No assets in Github release for Nimbus.')
         return False
@@ -1845,7 +1879,8 @@ def upgrade_nimbus():
         if file_name.startswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
 
     if binary_asset is None:
@@ -1858,76 +1893,34 @@ def upgrade_nimbus():
 
     binary_path = Path(download_path, binary_asset['file_name'])
 
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Nimbus binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Nimbus binary from Github. {exception}')
-        return False
-    
-    extract_directory = download_path.joinpath('nimbus')
-    if extract_directory.is_dir():
-        shutil.rmtree(extract_directory)
-    elif extract_directory.is_file():
-        os.unlink(extract_directory)
-    extract_directory.mkdir(parents=True, exist_ok=True)
-    
-    # Extracting the Lighthouse binary archive
-    subprocess.run([
-        'tar', 'xvf', binary_path, '--directory', extract_directory])
-    
-    # Remove download leftovers
-    binary_path.unlink()
-
-    # Find the Nimbus binaries and copy them in their installed location
-    build_path = None
+    # The binaries are extracted from the archive as it arrives
+    extractor = TarStreamExtractor(NIMBUS_INSTALLED_DIRECTORY, NIMBUS_ARCHIVE_MEMBERS)
 
-    with os.scandir(extract_directory) as it:
-        for entry in it:
-            if entry.name.startswith('.'):
-                continue
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'Nimbus binary', sink=extractor,
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
+        extractor.discard()
+        return False
 
-            if entry.is_dir():
-                if entry.name == 'build':
-                    build_path = entry.path
-                else:
-                    build_path = os.path.join(entry.path, 'build')
-                break
-    
-    if build_path is None:
-        log.error('Cannot find the correct directory in the extracted Nimbus archive.')
+    # Replacing the Nimbus binaries with the ones extracted from the archive. The running
+    # service keeps the previous binaries until it is restarted.
+    log.info('Updating Nimbus binaries...')
+    if extractor.install(binary_path, binary_download['size']) is None:
+        log.error(f'Cannot find the Nimbus binaries in the archive. {extractor.error}')
         return False
 
-    src_nimbus_bn_path = Path(build_path, 'nimbus_beacon_node')
-    src_nimbus_vc_path = Path(build_path, 'nimbus_validator_client')
+    # Remove download leftovers
+    binary_path.unlink()
 
-    if not src_nimbus_bn_path.is_file() or not src_nimbus_vc_path.is_file():
-        log.error(f'Cannot find the Nimbus binaries in the extracted archive.')
-        return False
-    
-    # Stopping Nimbus service before updating the binary
+    # Stopping Nimbus service so it starts again with the new binaries
     log.info('Stopping Nimbus services...')
     subprocess.run(['systemctl', 'stop', NIMBUS_SYSTEMD_SERVICE_NAME])
-
-    # Extracting the Lighthouse binary archive
-    log.info('Updating Nimbus binaries...')
-    subprocess.run(['cp', src_nimbus_bn_path, NIMBUS_INSTALLED_DIRECTORY])
-    subprocess.run(['cp', src_nimbus_vc_path, NIMBUS_INSTALLED_DIRECTORY])
     
     # Restarting Nimbus service after updating the binary
     log.info('Starting Nimbus services...')
     subprocess.run(['systemctl', 'start', NIMBUS_SYSTEMD_SERVICE_NAME])
 
-    # Remove extraction leftovers
-    shutil.rmtree(extract_directory)
-
     return True
 
 def upgrade_lighthouse():
@@ -1935,21 +1928,10 @@ def upgrade_lighthouse():
     log.info('Upgrading Lighthouse client...')
 
     # Getting latest Lighthouse release files
-    lighthouse_gh_release_url = GITHUB_REST_API_URL + LIGHTHOUSE_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(lighthouse_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading lighthouse binary. {exception}')
-        return False
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading lighthouse binary. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(LIGHTHOUSE_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Lighthouse.')
         return False
-    
-    release_json = response.json()
 
     if 'assets' not in release_json:
         log.error('No assets in Github release for lighthouse.')
@@ -1973,7 +1955,8 @@ def upgrade_lighthouse():
         if file_name.endswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
         elif file_name.endswith(archive_filename_sig_comp):
             signature_asset = {
@@ -1990,113 +1973,60 @@ def upgrade_lighthouse():
     download_path.mkdir(parents=True, exist_ok=True)
 
     binary_path = Path(download_path, binary_asset['file_name'])
-
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Lighthouse binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Lighthouse binary from Github. {exception}')
-        return False
-    
     signature_path = Path(download_path, signature_asset['file_name'])
 
-    try:
-        with open(signature_path, 'wb') as signature_file:
-            with httpx.stream('GET', signature_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Lighthouse signature from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    signature_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Lighthouse signature from Github. {exception}')
+    # Fetch the signature and prepare gpg with Sigma Prime's PGP key while the binary is
+    # downloading
+    signature_future = start_background_task('lighthouse-signature', download_file,
+        signature_asset['file_url'], signature_path, log, 'Lighthouse signature',
+        max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    pgp_key_future = start_background_task('lighthouse-pgp-key', prepare_pgp_key,
+        LIGHTHOUSE_PRIME_PGP_KEY_ID, 'Sigma Prime\'s PGP key')
+
+    # The binary is extracted from the archive as it arrives
+    extractor = TarStreamExtractor(LIGHTHOUSE_INSTALLED_DIRECTORY, LIGHTHOUSE_ARCHIVE_MEMBERS)
+
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'Lighthouse binary', sink=extractor,
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
+        extractor.discard()
         return False
 
-    # Test if gpg is already installed
-    gpg_is_installed = False
-    try:
-        gpg_is_installed = is_package_installed('gpg')
-    except Exception:
+    signature_download = signature_future.result()
+    if signature_download['error'] is not None:
+        extractor.discard()
         return False
 
-    if not gpg_is_installed:
-
-        env = os.environ.copy()
-        env['DEBIAN_FRONTEND'] = 'noninteractive'
-
-        # Install gpg using APT
-        subprocess.run([
-            'apt', '-y', 'update'])
-        subprocess.run([
-            'apt', '-y', 'install', 'gpg'], env=env)
-
     # Verify PGP signature
 
-    command_line = ['gpg', '--list-keys', '--with-colons', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-    process_result = subprocess.run(command_line)
-    pgp_key_found = process_result.returncode == 0
-
-    if not pgp_key_found:
-        retry_index = 0
-        retry_count = 15
-
-        key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-        log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-        command_line = ['gpg', '--keyserver', key_server, '--recv-keys',
-            LIGHTHOUSE_PRIME_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-
-        if process_result.returncode != 0:
-            # GPG failed to download Sigma Prime's PGP key, let's wait and retry a few times
-            while process_result.returncode != 0 and retry_index < retry_count:
-                retry_index = retry_index + 1
-                delay = 5
-                log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                    f'and try again from a different server.')
-                time.sleep(delay)
-
-                key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-                command_line = ['gpg', '--keyserver', key_server, '--recv-keys',
-                    LIGHTHOUSE_PRIME_PGP_KEY_ID]
-
-                process_result = subprocess.run(command_line)
-        
-        if process_result.returncode != 0:
-            log.error(
-f'''
-We failed to download the Sigma Prime's PGP key to verify the lighthouse
-binary after {retry_count} retries.
-'''
-            )
-            return False
-    
+    if not pgp_key_future.result():
+        log.error('We could not get Sigma Prime\'s PGP key to verify the lighthouse binary. '
+            'We will stop here to protect you.')
+        extractor.discard()
+        return False
+
     process_result = subprocess.run([
-        'gpg', '--verify', signature_path])
+        'gpg', '--homedir', str(get_pgp_keyring_directory()), '--verify',
+        signature_path])
     if process_result.returncode != 0:
         log.error('The lighthouse binary signature is wrong. '
             'We will stop here to protect you.')
+        extractor.discard()
         return False
     
-    # Stopping Lighthouse services before updating the binary
+    # Replacing the Lighthouse binary with the one extracted from the verified archive. The
+    # running services keep the previous binary until they are restarted.
+    log.info('Updating Lighthouse binary...')
+    if extractor.install(binary_path, binary_download['size']) is None:
+        log.error(f'Unable to extract the Lighthouse binary archive. {extractor.error}')
+        return False
+
+    # Stopping Lighthouse services so they start again with the new binary
     log.info('Stopping Lighthouse services...')
     subprocess.run(['systemctl', 'stop', LIGHTHOUSE_BN_SYSTEMD_SERVICE_NAME,
         LIGHTHOUSE_VC_SYSTEMD_SERVICE_NAME])
 
-    # Extracting the Lighthouse binary archive
-    log.info('Updating Lighthouse binary...')
-    subprocess.run([
-        'tar', 'xvf', binary_path, '--directory', LIGHTHOUSE_INSTALLED_DIRECTORY])
-    
     # Restarting Lighthouse services after updating the binary
     log.info('Starting Lighthouse services...')
     subprocess.run(['systemctl', 'start', LIGHTHOUSE_BN_SYSTEMD_SERVICE_NAME,
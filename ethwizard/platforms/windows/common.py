@@ -1,7 +1,6 @@
 import os
 import sys
-import json
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import re
 import httpx
 import shutil
@@ -20,8 +19,11 @@ from typing import Optional
 
 from ethwizard import __version__
 
+from ethwizard.utils.statejournal import get_state_journal
+
+from ethwizard.platforms.common import ConsoleLogFilter, download_file_with_progress
+
 from ethwizard.constants import (
-    STATE_FILE,
     CHOCOLATEY_DEFAULT_BIN_PATH,
     GNUPG_DOWNLOAD_URL,
     COREINFO_DOWNLOAD_URL
@@ -32,23 +34,13 @@ log = logging.getLogger(__name__)
 def save_state(step_id: str, context: dict) -> bool:
     # Save wizard state
 
-    data_to_save = {
-        'step': step_id,
-        'context': context
-    }
-
     app_data = Path(os.getenv('LOCALAPPDATA', os.getenv('APPDATA', '')))
     if not app_data.is_dir():
         return False
     
     app_dir = app_data.joinpath('eth-wizard')
-    app_dir.mkdir(parents=True, exist_ok=True)
-    save_file = app_dir.joinpath(STATE_FILE)
 
-    with open(str(save_file), 'w', encoding='utf8') as output_file:
-        json.dump(data_to_save, output_file)
-
-    return True
+    return get_state_journal(app_dir).save(step_id, context)
 
 def load_state() -> Optional[dict]:
     # Load wizard state
@@ -60,24 +52,14 @@ def load_state() -> Optional[dict]:
     app_dir = app_data.joinpath('eth-wizard')
     if not app_dir.is_dir():
         return None
-    
-    save_file = app_dir.joinpath(STATE_FILE)
-    if not save_file.is_file():
-        return None
-    
-    loaded_data = None
 
-    try:
-        with open(str(save_file), 'r', encoding='utf8') as input_file:
-            loaded_data = json.load(input_file)
-    except ValueError:
-        return None
-    
-    return loaded_data
+    return get_state_journal(app_dir).load()
 
 def quit_app():
-    print('Press enter to quit')
-    input()
+    # Keep the console window open, unless nobody is there to press enter
+    if sys.stdin is not None and sys.stdin.isatty():
+        print('Press enter to quit')
+        input()
     
     log.info(f'Quitting eth-wizard')
     sys.exit()
@@ -98,6 +80,7 @@ def init_logging():
 
     # Console handler to log into the console
     ch = logging.StreamHandler()
+    ch.addFilter(ConsoleLogFilter())
     log.addHandler(ch)
 
     # File handler to log into a file
@@ -248,18 +231,9 @@ def install_gpg(base_directory):
     if download_installer_path.is_file():
         download_installer_path.unlink()
 
-    try:
-        with open(download_installer_path, 'wb') as binary_file:
-            log.info('Downloading GNUPG installer...')
-            with httpx.stream('GET', gpg_installer_url, follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'Cannot download GNUPG installer {gpg_installer_url}.\n'
-                        f'Unexpected status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading GNUPG installer. Exception {exception}')
+    installer_download = download_file_with_progress(gpg_installer_url, download_installer_path,
+        log, 'GNUPG installer')
+    if installer_download['error'] is not None:
         return False
 
     # Run installer silently
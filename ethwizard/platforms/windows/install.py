@@ -1,4 +1,4 @@
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import time
 import httpx
 import humanize
@@ -7,7 +7,6 @@ import os
 import shlex
 import shutil
 import json
-import hashlib
 import winreg
 import io
 
@@ -42,6 +41,7 @@ from ethwizard.platforms.common import (
     select_custom_ports,
     select_consensus_checkpoint_provider,
     select_eth1_fallbacks,
+    rank_eth1_fallbacks,
     input_dialog_default,
     progress_log_dialog,
     search_for_generated_keys,
@@ -49,13 +49,21 @@ from ethwizard.platforms.common import (
     select_execution_client,
     select_keys_directory,
     select_fee_recipient_address,
-    get_bc_validator_deposits,
+    get_validator_deposits_with_progress,
     test_open_ports,
     show_whats_next,
     show_public_keys,
     Step,
     test_context_variable,
-    format_for_terminal
+    format_for_terminal,
+    download_file,
+    download_file_with_progress,
+    github_asset_sha256,
+    receive_pgp_key,
+    get_pgp_keyring_directory,
+    get_http_client,
+    button_dialog,
+    input_dialog
 )
 
 from ethwizard.platforms.windows.common import (
@@ -69,8 +77,11 @@ from ethwizard.platforms.windows.common import (
     setup_jwt_token_file
 )
 
+from ethwizard.utils.archives import ArchiveError, install_zip_archive
+
+from ethwizard.utils.execution_rpc import ExecutionRPCError, get_execution_rpc_client
+
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import button_dialog, input_dialog
 
 def installation_steps(*args, **kwargs):
 
@@ -387,6 +398,7 @@ def installation_steps(*args, **kwargs):
         selected_network = CTX_SELECTED_NETWORK
         merge_ready_network = CTX_MERGE_READY_NETWORK
         selected_eth1_fallbacks = CTX_SELECTED_ETH1_FALLBACKS
+        eth1_fallbacks_probes = CTX_ETH1_FALLBACKS_PROBES
 
         if not (
             test_context_variable(context, selected_network, log) and
@@ -408,8 +420,15 @@ def installation_steps(*args, **kwargs):
                 step_sequence.save_state(step.step_id, context)
 
                 quit_app()
+
+            # Put the fastest healthy fallbacks first
+            context[selected_eth1_fallbacks], context[eth1_fallbacks_probes] = (
+                rank_eth1_fallbacks(context[selected_network], context[selected_eth1_fallbacks],
+                    log))
         else:
+            # Merged networks do not use execution fallbacks, there is nothing to rank
             context[selected_eth1_fallbacks] = []
+            context[eth1_fallbacks_probes] = []
 
         return context
 
@@ -1202,7 +1221,7 @@ Do you want to skip installing the MEV-Boost binary?
         mevboost_gh_release_url = GITHUB_REST_API_URL + MEVBOOST_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(mevboost_gh_release_url, headers=headers,
+            response = get_http_client().get(mevboost_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading MEV-Boost binary. {exception}')
@@ -1237,7 +1256,8 @@ Do you want to skip installing the MEV-Boost binary?
             if file_name.endswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
             elif file_name == checksums_filename:
                 checksums_asset = {
@@ -1260,49 +1280,19 @@ Do you want to skip installing the MEV-Boost binary?
         if binary_path.is_file():
             binary_path.unlink()
 
-        binary_hash = hashlib.sha256()
-
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading MEV-Boost binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-
-                    archive_filename = binary_asset['file_name']
-                    archive_url = binary_asset['file_url']
-                    log.info(f'Downloading {archive_filename} from {archive_url} ...')
-
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-                        binary_hash.update(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading MEV-Boost binary from Github. {exception}')
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'MEV-Boost binary',
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
             return False
         
         checksums_path = download_path.joinpath(checksums_asset['file_name'])
         if checksums_path.is_file():
             checksums_path.unlink()
 
-        try:
-            with open(checksums_path, 'wb') as checksums_file:
-                with httpx.stream('GET', checksums_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading MEV-Boost checksums from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    
-                    archive_filename = checksums_asset['file_name']
-                    archive_url = checksums_asset['file_url']
-                    log.info(f'Downloading {archive_filename} from {archive_url} ...')
-
-                    for data in http_stream.iter_bytes():
-                        checksums_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading MEV-Boost checksums from Github. {exception}')
+        checksums_download = download_file(checksums_asset['file_url'], checksums_path, log,
+            'MEV-Boost checksums', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+        if checksums_download['error'] is not None:
             return False
 
         # Verify checksum
@@ -1316,7 +1306,7 @@ Do you want to skip installing the MEV-Boost binary?
                     hash_found = True
                     checksum = result.group('hash').lower()
 
-                    binary_hexdigest = binary_hash.hexdigest().lower()
+                    binary_hexdigest = binary_download['sha256'].lower()
 
                     if checksum != binary_hexdigest:
                         # SHA256 checksum failed
@@ -1663,18 +1653,9 @@ Do you want to skip installing the geth binary?
 
         latest_build_url = urljoin(GETH_BUILDS_BASE_URL, latest_build['name'])
 
-        try:
-            with open(geth_archive_path, 'wb') as binary_file:
-                log.info(f'Downloading geth archive {latest_build["name"]}...')
-                with httpx.stream('GET', latest_build_url, follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download geth archive {latest_build_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading geth archive. Exception {exception}')
+        geth_download = download_file_with_progress(latest_build_url, geth_archive_path, log,
+            'geth archive')
+        if geth_download['error'] is not None:
             return False
 
         geth_archive_sig_path = download_path.joinpath(latest_build['name'] + '.asc')
@@ -1683,19 +1664,9 @@ Do you want to skip installing the geth binary?
 
         latest_build_sig_url = urljoin(GETH_BUILDS_BASE_URL, latest_build['name'] + '.asc')
 
-        try:
-            with open(geth_archive_sig_path, 'wb') as binary_file:
-                log.info(f'Downloading geth archive signature {latest_build["name"]}.asc...')
-                with httpx.stream('GET', latest_build_sig_url,
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download geth archive signature {latest_build_sig_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading geth archive signature. Exception {exception}')
+        signature_download = download_file(latest_build_sig_url, geth_archive_sig_path, log,
+            'geth archive signature', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+        if signature_download['error'] is not None:
             return False
 
         if not install_gpg(base_directory):
@@ -1704,54 +1675,17 @@ Do you want to skip installing the geth binary?
         # Verify PGP signature
         gpg_binary_path = base_directory.joinpath('bin', 'gpg.exe')
 
-        command_line = [str(gpg_binary_path), '--list-keys', '--with-colons',
-            GETH_WINDOWS_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-        pgp_key_found = process_result.returncode == 0
-
-        if not pgp_key_found:
-
-            retry_index = 0
-            retry_count = 15
-
-            key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-            log.info(f'Downloading Geth Windows Builder PGP key from {key_server} ...')
-            command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                '--recv-keys', GETH_WINDOWS_PGP_KEY_ID]
-            process_result = subprocess.run(command_line)
-
-            if process_result.returncode != 0:
-                # GPG failed to download Geth Windows Builder PGP key, let's wait and retry a few times
-                while process_result.returncode != 0 and retry_index < retry_count:
-                    retry_index = retry_index + 1
-                    delay = 5
-                    log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                        f'and try again from a different server.')
-                    time.sleep(delay)
-
-                    key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                    log.info(f'Downloading Geth Windows Builder PGP key from {key_server} ...')
-                    command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                        '--recv-keys', GETH_WINDOWS_PGP_KEY_ID]
-
-                    process_result = subprocess.run(command_line)
-
-            if process_result.returncode != 0:
-                log.warning(
+        if not receive_pgp_key(gpg_binary_path, GETH_WINDOWS_PGP_KEY_ID,
+            'Geth Windows Builder PGP key', log):
+            log.warning(
 f'''
 We failed to download the Geth Windows Builder PGP key to verify the geth
-archive after {retry_count} retries. We will skip signature verification.
+archive. We will skip signature verification.
 '''
-                )
-            else:
-                process_result = subprocess.run([
-                    str(gpg_binary_path), '--verify', str(geth_archive_sig_path)])
-                if process_result.returncode != 0:
-                    log.error('The geth archive signature is wrong. We\'ll stop here to protect you.')
-                    return False
+            )
         else:
-            process_result = subprocess.run([
-                str(gpg_binary_path), '--verify', str(geth_archive_sig_path)])
+            process_result = subprocess.run([str(gpg_binary_path), '--homedir',
+                str(get_pgp_keyring_directory()), '--verify', str(geth_archive_sig_path)])
             if process_result.returncode != 0:
                 log.error('The geth archive signature is wrong. We\'ll stop here to protect you.')
                 return False
@@ -2116,77 +2050,17 @@ To examine your geth service logs, inspect the following file:
 
             time.sleep(1)
             
-            local_geth_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'eth_syncing',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_geth_jsonrpc_url, json=request_json, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Geth.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Geth.')
-                continue
-        
-            response_json = response.json()
-            syncing_json = response_json
-
-            local_geth_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'net_peerCount',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
             try:
-                response = httpx.post(local_geth_jsonrpc_url, json=request_json, headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Geth.')
+                sync_status = get_execution_rpc_client().sync_status()
+            except ExecutionRPCError as exception:
+                log_text(f'{exception} while querying Geth.')
                 continue
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Geth.')
-                continue
-
-            response_json = response.json()
-            peer_count_json = response_json
-
-            exe_starting_block = UNKNOWN_VALUE
-            exe_current_block = UNKNOWN_VALUE
-            exe_highest_block = UNKNOWN_VALUE
-            if (
-                syncing_json and
-                'result' in syncing_json and
-                syncing_json['result']
-                ):
-                exe_is_syncing = True
-                if 'startingBlock' in syncing_json['result']:
-                    exe_starting_block = int(syncing_json['result']['startingBlock'], 16)
-                if 'currentBlock' in syncing_json['result']:
-                    exe_current_block = int(syncing_json['result']['currentBlock'], 16)
-                if 'highestBlock' in syncing_json['result']:
-                    exe_highest_block = int(syncing_json['result']['highestBlock'], 16)
-            else:
-                exe_is_syncing = False
-
-            exe_connected_peers = 0
-            if (
-                peer_count_json and
-                'result' in peer_count_json and
-                peer_count_json['result']
-                ):
-                exe_connected_peers = int(peer_count_json['result'], 16)
+            exe_is_syncing = sync_status['syncing']
+            exe_starting_block = sync_status['starting_block']
+            exe_current_block = sync_status['current_block']
+            exe_highest_block = sync_status['highest_block']
+            exe_connected_peers = sync_status['peer_count']
             
             exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
 
@@ -2767,76 +2641,16 @@ To examine your Nethermind service logs, inspect the following file:
 
             time.sleep(1)
             
-            local_nethermind_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'eth_syncing',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            try:
-                response = httpx.post(local_nethermind_jsonrpc_url, json=request_json,
-                    headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nethermind.')
-                continue
-
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nethermind.')
-                continue
-        
-            response_json = response.json()
-            syncing_json = response_json
-
-            local_nethermind_jsonrpc_url = 'http://127.0.0.1:8545'
-            request_json = {
-                'jsonrpc': '2.0',
-                'method': 'net_peerCount',
-                'id': 1
-            }
-            headers = {
-                'Content-Type': 'application/json'
-            }
             try:
-                response = httpx.post(local_nethermind_jsonrpc_url, json=request_json,
-                    headers=headers)
-            except httpx.RequestError as exception:
-                log_text(f'Exception: {exception} while querying Nethermind.')
+                sync_status = get_execution_rpc_client().sync_status()
+            except ExecutionRPCError as exception:
+                log_text(f'{exception} while querying Nethermind.')
                 continue
 
-            if response.status_code != 200:
-                log_text(
-                    f'Status code: {response.status_code} while querying Nethermind.')
-                continue
-
-            response_json = response.json()
-            peer_count_json = response_json
-
-            exe_starting_block = UNKNOWN_VALUE
-            exe_current_block = UNKNOWN_VALUE
-            exe_highest_block = UNKNOWN_VALUE
-            if (
-                syncing_json and
-                'result' in syncing_json and
-                syncing_json['result']
-                ):
-                if 'startingBlock' in syncing_json['result']:
-                    exe_starting_block = int(syncing_json['result']['startingBlock'], 16)
-                if 'currentBlock' in syncing_json['result']:
-                    exe_current_block = int(syncing_json['result']['currentBlock'], 16)
-                if 'highestBlock' in syncing_json['result']:
-                    exe_highest_block = int(syncing_json['result']['highestBlock'], 16)
-
-            exe_connected_peers = 0
-            if (
-                peer_count_json and
-                'result' in peer_count_json and
-                peer_count_json['result']
-                ):
-                exe_connected_peers = int(peer_count_json['result'], 16)
+            exe_starting_block = sync_status['starting_block']
+            exe_current_block = sync_status['current_block']
+            exe_highest_block = sync_status['highest_block']
+            exe_connected_peers = sync_status['peer_count']
             
             exe_has_few_peers = exe_connected_peers >= EXE_MIN_FEW_PEERS
 
@@ -3081,7 +2895,7 @@ Do you want to skip installing the JRE?
         try:
             log.info('Getting JRE builds...')
 
-            response = httpx.get(ADOPTIUM_21_API_URL, params=ADOPTIUM_21_API_PARAMS,
+            response = get_http_client().get(ADOPTIUM_21_API_URL, params=ADOPTIUM_21_API_PARAMS,
                 follow_redirects=True)
 
             if response.status_code != 200:
@@ -3162,46 +2976,21 @@ Do you want to skip installing the JRE?
         if jre_archive_path.is_file():
             jre_archive_path.unlink()
 
-        try:
-            with open(jre_archive_path, 'wb') as binary_file:
-                log.info(f'Downloading JRE archive {latest_build["name"]}...')
-                with httpx.stream('GET', latest_build['link'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download JRE archive {latest_build["link"]}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading JRE archive. Exception {exception}')
+        jre_download = download_file_with_progress(latest_build['link'], jre_archive_path, log,
+            'JRE archive')
+        if jre_download['error'] is not None:
             return False
         
-        # Unzip JRE archive
-        archive_members = None
-
+        # Extract the JRE archive next to its final destination and swap it in
         log.info(f'Extracting JRE archive {latest_build["name"]}...')
-        with ZipFile(jre_archive_path, 'r') as zip_file:
-            archive_members = zip_file.namelist()
-            zip_file.extractall(download_path)
+        try:
+            install_zip_archive(jre_archive_path, jre_path)
+        except ArchiveError as exception:
+            log.error(f'Unable to extract the JRE archive. {exception} We cannot continue.')
+            return False
         
         # Remove download leftovers
         jre_archive_path.unlink()
-
-        if archive_members is None or len(archive_members) == 0:
-            log.error('No files found in JRE archive. We cannot continue.')
-            return False
-        
-        # Move all those extracted files into their final destination
-        if jre_path.is_dir():
-            shutil.rmtree(jre_path)
-        jre_path.mkdir(parents=True, exist_ok=True)
-
-        archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-        with os.scandir(archive_extracted_dir) as it:
-            for diritem in it:
-                shutil.move(diritem.path, jre_path)
             
         # Make sure jre was installed properly
         jre_found = False
@@ -3365,7 +3154,7 @@ Do you want to skip installing the Nimbus binary?
         nimbus_gh_release_url = GITHUB_REST_API_URL + NIMBUS_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(nimbus_gh_release_url, headers=headers,
+            response = get_http_client().get(nimbus_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading Nimbus binary. {exception}')
@@ -3398,7 +3187,8 @@ Do you want to skip installing the Nimbus binary?
             if file_name.startswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
 
         if binary_asset is None:
@@ -3411,18 +3201,10 @@ Do you want to skip installing the Nimbus binary?
 
         binary_path = Path(download_path, binary_asset['file_name'])
 
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Nimbus binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Nimbus binary from Github. {exception}')
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'Nimbus binary',
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
             return False
         
         extract_directory = download_path.joinpath('nimbus')
@@ -4291,7 +4073,8 @@ Do you want to skip installing the teku binary distribution?
         teku_gh_release_url = GITHUB_REST_API_URL + TEKU_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(teku_gh_release_url, headers=headers, follow_redirects=True)
+            response = get_http_client().get(teku_gh_release_url,
+                headers=headers, follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Cannot connect to Github. Exception {exception}')
             return False
@@ -4311,8 +4094,7 @@ Do you want to skip installing the teku binary distribution?
         zip_url = None
         zip_sha256 = None
 
-        result = re.search(r'\[zip\]\((?P<url>[^\)]+)\)\s*\(\s*sha256\s*:?\s*`(?P<sha256>[^`]+)`\s*\)',
-            release_desc)
+        result = re.search(TEKU_RELEASE_ZIP_PATTERN, release_desc)
         if result:
             zip_url = result.group('url')
             if zip_url is not None:
@@ -4335,130 +4117,55 @@ Do you want to skip installing the teku binary distribution?
         url_file_name = urlparse(zip_url).path.split('/')[-1]
 
         teku_archive_path = download_path.joinpath(url_file_name)
-        teku_archive_hash = hashlib.sha256()
         if teku_archive_path.is_file():
             teku_archive_path.unlink()
 
-        keep_retrying = True
-
-        retry_index = 0
-        retry_count = 6
-        retry_delay = 30
-        retry_delay_increase = 10
-        last_exception = None
-        last_status_code = None
-
-        while keep_retrying and retry_index < retry_count:
-            last_exception = None
-            last_status_code = None
-            try:
-                with open(teku_archive_path, 'wb') as binary_file:
-                    log.info(f'Downloading teku archive {url_file_name}...')
-                    with httpx.stream('GET', zip_url, follow_redirects=True) as http_stream:
-                        if http_stream.status_code != 200:
-                            log.error(f'Cannot download teku archive {zip_url}.\n'
-                                f'Unexpected status code {http_stream.status_code}')
-                            last_status_code = http_stream.status_code
-
-                            retry_index = retry_index + 1
-                            log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-                            time.sleep(retry_delay)
-                            retry_delay = retry_delay + retry_delay_increase
-                            continue
-
-                        for data in http_stream.iter_bytes():
-                            binary_file.write(data)
-                            teku_archive_hash.update(data)
-                    
-                    keep_retrying = False
-
-            except httpx.RequestError as exception:
-                
-                log.error(f'Exception while downloading teku archive. Exception {exception}')
-                last_exception = exception
-
-                retry_index = retry_index + 1
-                log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-                time.sleep(retry_delay)
-                retry_delay = retry_delay + retry_delay_increase
-                continue
-        
-        if keep_retrying:
-            if last_exception is not None:
-                result = button_dialog(
-                    title='Cannot download Teku archive',
-                    text=(
-f'''
-We could not download the teku archive. Here are some details for this
-last test we tried to perform:
-
-URL: {zip_url}
-Method: GET
-Exception: {last_exception}
+        teku_download = download_file_with_progress(zip_url, teku_archive_path, log,
+            'teku archive', expected_sha256=zip_sha256)
 
-We cannot proceed if we cannot download the teku archive. Make sure there
-is no network issue when we try to connect to the Internet.
-'''                 ),
-                    buttons=[
-                        ('Quit', False)
-                    ]
-                ).run()
+        if teku_download['error'] == 'Cancelled':
+            return False
 
-                return False
-            elif last_status_code is not None:
-                result = button_dialog(
-                    title='Cannot download Teku archive',
-                    text=(
+        if teku_download['error'] is not None:
+            result = button_dialog(
+                title='Cannot download Teku archive',
+                text=(
 f'''
 We could not download the teku archive. Here are some details for this
 last test we tried to perform:
 
 URL: {zip_url}
 Method: GET
-Status code: {last_status_code}
+Attempts: {teku_download['attempts']}
+Error: {teku_download['error']}
 
 We cannot proceed if we cannot download the teku archive. Make sure there
 is no network issue when we try to connect to the Internet.
-'''                 ),
-                    buttons=[
-                        ('Quit', False)
-                    ]
-                ).run()
+'''             ),
+                buttons=[
+                    ('Quit', False)
+                ]
+            ).run()
 
-                return False
+            return False
 
         # Verify checksum
         log.info('Verifying teku archive checksum...')
-        teku_archive_hexdigest = teku_archive_hash.hexdigest()
+        teku_archive_hexdigest = teku_download['sha256']
         if teku_archive_hexdigest.lower() != zip_sha256.lower():
             log.error('Teku archive checksum does not match. We will stop here to protect you.')
             return False
         
-        # Unzip teku archive
-        archive_members = None
-
+        # Extract the teku archive next to its final destination and swap it in
         log.info(f'Extracting teku archive {url_file_name}...')
-        with ZipFile(teku_archive_path, 'r') as zip_file:
-            archive_members = zip_file.namelist()
-            zip_file.extractall(download_path)
+        try:
+            install_zip_archive(teku_archive_path, teku_path)
+        except ArchiveError as exception:
+            log.error(f'Unable to extract the teku archive. {exception} We cannot continue.')
+            return False
         
         # Remove download leftovers
         teku_archive_path.unlink()
-
-        if archive_members is None or len(archive_members) == 0:
-            log.error('No files found in teku archive. We cannot continue.')
-            return False
-        
-        # Move all those extracted files into their final destination
-        if teku_path.is_dir():
-            shutil.rmtree(teku_path)
-        teku_path.mkdir(parents=True, exist_ok=True)
-
-        archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-        with os.scandir(archive_extracted_dir) as it:
-            for diritem in it:
-                shutil.move(diritem.path, teku_path)
             
         # Make sure teku was installed properly
         teku_found = False
@@ -5154,7 +4861,7 @@ Do you want to skip installing the Lighthouse binary?
         lighthouse_gh_release_url = GITHUB_REST_API_URL + LIGHTHOUSE_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(lighthouse_gh_release_url, headers=headers,
+            response = get_http_client().get(lighthouse_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Exception while downloading Lighthouse binary. {exception}')
@@ -5189,7 +4896,8 @@ Do you want to skip installing the Lighthouse binary?
             if file_name.endswith(archive_filename_comp):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
             elif file_name.endswith(archive_filename_sig_comp):
                 signature_asset = {
@@ -5207,34 +4915,17 @@ Do you want to skip installing the Lighthouse binary?
 
         binary_path = Path(download_path, binary_asset['file_name'])
 
-        try:
-            with open(binary_path, 'wb') as binary_file:
-                with httpx.stream('GET', binary_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Lighthouse binary from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Lighthouse binary from Github. {exception}')
+        binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+            log, 'Lighthouse binary',
+            expected_sha256=binary_asset['file_sha256'])
+        if binary_download['error'] is not None:
             return False
         
         signature_path = Path(download_path, signature_asset['file_name'])
 
-        try:
-            with open(signature_path, 'wb') as signature_file:
-                with httpx.stream('GET', signature_asset['file_url'],
-                    follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'HTTP error while downloading Lighthouse signature from Github. '
-                            f'Status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        signature_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading Lighthouse signature from Github. {exception}')
+        signature_download = download_file(signature_asset['file_url'], signature_path, log,
+            'Lighthouse signature', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+        if signature_download['error'] is not None:
             return False
         
         if not install_gpg(base_directory):
@@ -5243,54 +4934,17 @@ Do you want to skip installing the Lighthouse binary?
         # Verify PGP signature
         gpg_binary_path = base_directory.joinpath('bin', 'gpg.exe')
 
-        command_line = [str(gpg_binary_path), '--list-keys', '--with-colons',
-            LIGHTHOUSE_PRIME_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-        pgp_key_found = process_result.returncode == 0
-
-        if not pgp_key_found:
-
-            retry_index = 0
-            retry_count = 15
-
-            key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-            log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-            command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                '--recv-keys', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-            process_result = subprocess.run(command_line)
-
-            if process_result.returncode != 0:
-                # GPG failed to download PGP key, let's wait and retry a few times
-                while process_result.returncode != 0 and retry_index < retry_count:
-                    retry_index = retry_index + 1
-                    delay = 5
-                    log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                        f'and try again from a different server.')
-                    time.sleep(delay)
-
-                    key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                    log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-                    command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                        '--recv-keys', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-
-                    process_result = subprocess.run(command_line)
-
-            if process_result.returncode != 0:
-                log.warning(
+        if not receive_pgp_key(gpg_binary_path, LIGHTHOUSE_PRIME_PGP_KEY_ID,
+            'Sigma Prime\'s PGP key', log):
+            log.warning(
 f'''
 We failed to download the Sigma Prime's PGP key to verify the Lighthouse
-archive after {retry_count} retries. We will skip signature verification.
+archive. We will skip signature verification.
 '''
-                )
-            else:
-                process_result = subprocess.run([
-                    str(gpg_binary_path), '--verify', str(signature_path)])
-                if process_result.returncode != 0:
-                    log.error('The Lighthouse archive signature is wrong. We\'ll stop here to protect you.')
-                    return False
+            )
         else:
-            process_result = subprocess.run([
-                str(gpg_binary_path), '--verify', str(signature_path)])
+            process_result = subprocess.run([str(gpg_binary_path), '--homedir',
+                str(get_pgp_keyring_directory()), '--verify', str(signature_path)])
             if process_result.returncode != 0:
                 log.error('The Lighthouse archive signature is wrong. We\'ll stop here to protect you.')
                 return False
@@ -7302,7 +6956,8 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
             edc_gh_release_url = GITHUB_REST_API_URL + EDC_LATEST_RELEASE
             headers = {'Accept': GITHUB_API_VERSION}
             try:
-                response = httpx.get(edc_gh_release_url, headers=headers, follow_redirects=True)
+                response = get_http_client().get(edc_gh_release_url,
+                    headers=headers, follow_redirects=True)
             except httpx.RequestError as exception:
                 log.error(f'Cannot get latest ethstaker-deposit-cli release from Github. '
                     f'Exception {exception}')
@@ -7334,7 +6989,8 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
                 if file_name.endswith('windows-amd64.zip'):
                     binary_asset = {
                         'file_name': file_name,
-                        'file_url': file_url
+                        'file_url': file_url,
+                        'file_sha256': github_asset_sha256(asset)
                     }
                 elif file_name.endswith('windows-amd64.zip.sha256'):
                     checksum_asset = {
@@ -7356,55 +7012,27 @@ Do you want to skip installing the ethstaker-deposit-cli binary?
             download_path.mkdir(parents=True, exist_ok=True)
 
             binary_path = Path(download_path, binary_asset['file_name'])
-            binary_hash = hashlib.sha256()
 
             if binary_path.is_file():
                 binary_path.unlink()
 
-            try:
-                with open(binary_path, 'wb') as binary_file:
-                    log.info(f'Downloading ethstaker-deposit-cli binary '
-                        f'{binary_asset["file_name"]}...')
-                    with httpx.stream('GET', binary_asset['file_url'],
-                        follow_redirects=True) as http_stream:
-                        if http_stream.status_code != 200:
-                            log.error(f'Cannot download ethstaker-deposit-cli binary from Github '
-                                f'{binary_asset["file_url"]}.\nUnexpected status code '
-                                f'{http_stream.status_code}')
-                            return False
-                        for data in http_stream.iter_bytes():
-                            binary_file.write(data)
-                            if checksum_asset is not None:
-                                binary_hash.update(data)
-            except httpx.RequestError as exception:
-                log.error(f'Exception while downloading ethstaker-deposit-cli binary from Github. '
-                    f'Exception {exception}')
+            binary_download = download_file_with_progress(binary_asset['file_url'], binary_path,
+                log, 'ethstaker-deposit-cli binary',
+                expected_sha256=binary_asset['file_sha256'])
+            if binary_download['error'] is not None:
                 return False
 
             if checksum_asset is not None:
-                binary_hexdigest = binary_hash.hexdigest().lower()
+                binary_hexdigest = binary_download['sha256'].lower()
 
                 checksum_path = Path(download_path, checksum_asset['file_name'])
 
                 if checksum_path.is_file():
                     checksum_path.unlink()
 
-                try:
-                    with open(checksum_path, 'wb') as signature_file:
-                        log.info(f'Downloading ethstaker-deposit-cli checksum '
-                            f'{checksum_asset["file_name"]}...')
-                        with httpx.stream('GET', checksum_asset['file_url'],
-                            follow_redirects=True) as http_stream:
-                            if http_stream.status_code != 200:
-                                log.error(f'Cannot download ethstaker-deposit-cli checksum from '
-                                    f'Github {checksum_asset["file_url"]}.\nUnexpected status code '
-                                    f'{http_stream.status_code}')
-                                return False
-                            for data in http_stream.iter_bytes():
-                                signature_file.write(data)
-                except httpx.RequestError as exception:
-                    log.error(f'Exception while downloading ethstaker-deposit-cli checksum from '
-                        f'Github. Exception {exception}')
+                checksum_download = download_file(checksum_asset['file_url'], checksum_path, log,
+                    'ethstaker-deposit-cli checksum', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+                if checksum_download['error'] is not None:
                     return False
 
                 # Verify SHA256 signature
@@ -8214,11 +7842,13 @@ When you are done with the deposit(s), click the "I'm done" button below.
         log.error('No public key(s) found in the deposit file.')
         return False
 
-    # Verify that the deposit was done correctly using beaconcha.in API
-    validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+    # Verify that the deposit was done correctly using the local beacon node or the
+    # beaconcha.in API
+    validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+        bn_http_base=local_bn_http_base)
 
     if type(validator_deposits) is not list and not validator_deposits:
-        log.warning('Unable to get validator(s) deposits from beaconcha.in')
+        log.warning('Unable to get validator(s) deposits')
         validator_deposits = []
     
     skipping_deposit_check = False
@@ -8260,10 +7890,11 @@ deposit(s).
             skipping_deposit_check = True
             break
 
-        validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+        validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+            bn_http_base=local_bn_http_base)
 
         if type(validator_deposits) is not list and not validator_deposits:
-            log.warning('Unable to get validator(s) deposits from beaconcha.in')
+            log.warning('Unable to get validator(s) deposits')
             validator_deposits = []
     
     # Check if all the deposit(s) were done for each validator
@@ -8303,10 +7934,11 @@ deposit(s).
             skipping_deposit_check = True
             break
 
-        validator_deposits = get_bc_validator_deposits(network, public_keys, log)
+        validator_deposits = get_validator_deposits_with_progress(network, public_keys, log,
+            bn_http_base=local_bn_http_base)
 
         if type(validator_deposits) is not list and not validator_deposits:
-            log.warning('Unable to get validator(s) deposits from beaconcha.in')
+            log.warning('Unable to get validator(s) deposits')
             validator_deposits = []
 
     # Clean up deposit data file
@@ -8699,7 +8331,7 @@ Do you want to skip installing the prometheus binary distribution?
         prometheus_gh_release_url = GITHUB_REST_API_URL + PROMETHEUS_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(prometheus_gh_release_url, headers=headers,
+            response = get_http_client().get(prometheus_gh_release_url, headers=headers,
                 follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Cannot get latest Prometheus release from Github. '
@@ -8731,7 +8363,8 @@ Do you want to skip installing the prometheus binary distribution?
             if file_name.endswith('windows-amd64.zip'):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
                 break
         
@@ -8747,50 +8380,24 @@ Do you want to skip installing the prometheus binary distribution?
         zip_url = binary_asset['file_url']
 
         prometheus_archive_path = download_path.joinpath(url_file_name)
-        prometheus_archive_hash = hashlib.sha256()
         if prometheus_archive_path.is_file():
             prometheus_archive_path.unlink()
 
-        try:
-            with open(prometheus_archive_path, 'wb') as binary_file:
-                log.info(f'Downloading prometheus archive {url_file_name}...')
-                with httpx.stream('GET', zip_url, follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download prometheus archive {zip_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-                        prometheus_archive_hash.update(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading prometheus archive. Exception {exception}')
+        prometheus_download = download_file_with_progress(zip_url, prometheus_archive_path, log,
+            'prometheus archive', expected_sha256=binary_asset['file_sha256'])
+        if prometheus_download['error'] is not None:
             return False
         
-        # Unzip prometheus archive
-        archive_members = None
-
+        # Extract the prometheus archive next to its final destination and swap it in
         log.info(f'Extracting prometheus archive {url_file_name}...')
-        with ZipFile(prometheus_archive_path, 'r') as zip_file:
-            archive_members = zip_file.namelist()
-            zip_file.extractall(download_path)
+        try:
+            install_zip_archive(prometheus_archive_path, prometheus_path)
+        except ArchiveError as exception:
+            log.error(f'Unable to extract the prometheus archive. {exception} We cannot continue.')
+            return False
         
         # Remove download leftovers
         prometheus_archive_path.unlink()
-
-        if archive_members is None or len(archive_members) == 0:
-            log.error('No files found in prometheus archive. We cannot continue.')
-            return False
-        
-        # Move all those extracted files into their final destination
-        if prometheus_path.is_dir():
-            shutil.rmtree(prometheus_path)
-        prometheus_path.mkdir(parents=True, exist_ok=True)
-
-        archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-        with os.scandir(archive_extracted_dir) as it:
-            for diritem in it:
-                shutil.move(diritem.path, prometheus_path)
             
         # Make sure prometheus was installed properly
         prometheus_found = False
@@ -9332,7 +8939,8 @@ Do you want to skip installing windows exporter?
         we_gh_release_url = GITHUB_REST_API_URL + WINDOWS_EXPORTER_LATEST_RELEASE
         headers = {'Accept': GITHUB_API_VERSION}
         try:
-            response = httpx.get(we_gh_release_url, headers=headers, follow_redirects=True)
+            response = get_http_client().get(we_gh_release_url,
+                headers=headers, follow_redirects=True)
         except httpx.RequestError as exception:
             log.error(f'Cannot get latest Windows Exporter release from Github. '
                     f'Exception {exception}')
@@ -9363,7 +8971,8 @@ Do you want to skip installing windows exporter?
             if file_name.endswith('amd64.msi'):
                 binary_asset = {
                     'file_name': file_name,
-                    'file_url': file_url
+                    'file_url': file_url,
+                    'file_sha256': github_asset_sha256(asset)
                 }
                 break
         
@@ -9380,19 +8989,9 @@ Do you want to skip installing windows exporter?
 
         we_installer_path = download_path.joinpath(url_file_name)
 
-        try:
-            with open(we_installer_path, 'wb') as binary_file:
-                log.info(f'Downloading windows exporter installer {url_file_name}...')
-                with httpx.stream('GET', installer_url, follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download windows exporter installer {installer_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading windows exporter installer. '
-                f'Exception {exception}')
+        installer_download = download_file_with_progress(installer_url, we_installer_path, log,
+            'windows exporter installer', expected_sha256=binary_asset['file_sha256'])
+        if installer_download['error'] is not None:
             return False
 
         # Installing Windows Exporter
@@ -9827,59 +9426,33 @@ Do you want to skip installing the grafana binary distribution?
         zip_url = archive_url
 
         grafana_archive_path = download_path.joinpath(url_file_name)
-        grafana_archive_hash = hashlib.sha256()
         if grafana_archive_path.is_file():
             grafana_archive_path.unlink()
 
-        try:
-            with open(grafana_archive_path, 'wb') as binary_file:
-                log.info(f'Downloading grafana archive {url_file_name}...')
-                with httpx.stream('GET', zip_url, follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download grafana archive {zip_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        return False
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-                        grafana_archive_hash.update(data)
-        except httpx.RequestError as exception:
-            log.error(f'Exception while downloading grafana archive. Exception {exception}')
+        grafana_download = download_file_with_progress(zip_url, grafana_archive_path, log,
+            'grafana archive')
+        if grafana_download['error'] is not None:
             return False
         
         # Verify checksum
         if archive_sha256 is not None:
             log.info('Verifying grafana archive checksum...')
-            grafana_archive_hexdigest = grafana_archive_hash.hexdigest().lower()
+            grafana_archive_hexdigest = grafana_download['sha256'].lower()
             if grafana_archive_hexdigest != archive_sha256:
                 log.error(f'Grafana archive checksum does not match. Expected {archive_sha256} '
                     f'but we got {grafana_archive_hexdigest}. We will stop here to protect you.')
                 return False
 
-        # Unzip grafana archive
-        archive_members = None
-
+        # Extract the grafana archive next to its final destination and swap it in
         log.info(f'Extracting grafana archive {url_file_name}...')
-        with ZipFile(grafana_archive_path, 'r') as zip_file:
-            archive_members = zip_file.namelist()
-            zip_file.extractall(download_path)
+        try:
+            install_zip_archive(grafana_archive_path, grafana_path)
+        except ArchiveError as exception:
+            log.error(f'Unable to extract the grafana archive. {exception} We cannot continue.')
+            return False
         
         # Remove download leftovers
         grafana_archive_path.unlink()
-
-        if archive_members is None or len(archive_members) == 0:
-            log.error('No files found in grafana archive. We cannot continue.')
-            return False
-        
-        # Move all those extracted files into their final destination
-        if grafana_path.is_dir():
-            shutil.rmtree(grafana_path)
-        grafana_path.mkdir(parents=True, exist_ok=True)
-
-        archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-        with os.scandir(archive_extracted_dir) as it:
-            for diritem in it:
-                shutil.move(diritem.path, grafana_path)
             
         # Make sure grafana was installed properly
         grafana_found = False
@@ -1,10 +1,8 @@
-import subprocess
+from ethwizard.utils import stepsubprocess as subprocess
 import httpx
 import re
-import time
 import os
 import shlex
-import hashlib
 import shutil
 
 from pathlib import Path
@@ -20,7 +18,6 @@ from zipfile import ZipFile
 from packaging.version import parse as parse_version, Version
 
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import button_dialog
 
 from ethwizard.platforms.common import (
     select_fee_recipient_address,
@@ -30,7 +27,15 @@ from ethwizard.platforms.common import (
     get_nethermind_latest_version,
     get_mevboost_latest_version,
     get_nimbus_latest_version,
-    get_lighthouse_latest_version
+    get_lighthouse_latest_version,
+    get_github_release,
+    download_file,
+    download_file_with_progress,
+    github_asset_sha256,
+    receive_pgp_key,
+    get_pgp_keyring_directory,
+    get_http_client,
+    button_dialog
 )
 
 from ethwizard.platforms.windows.common import (
@@ -45,6 +50,13 @@ from ethwizard.platforms.windows.common import (
     setup_jwt_token_file
 )
 
+from ethwizard.utils.archives import (
+    ArchiveError,
+    install_zip_archive,
+    stage_zip_archive,
+    swap_staged_directory
+)
+
 from ethwizard.constants import (
     CTX_SELECTED_EXECUTION_CLIENT,
     CTX_SELECTED_CONSENSUS_CLIENT,
@@ -75,10 +87,10 @@ from ethwizard.constants import (
     MAINTENANCE_UPGRADE_JRE_CLIENT,
     WINDOWS_SERVICE_RUNNING,
     BN_VERSION_EP,
-    GITHUB_REST_API_URL,
-    GITHUB_API_VERSION,
     MEVBOOST_LATEST_RELEASE,
     TEKU_LATEST_RELEASE,
+    TEKU_RELEASE_ZIP_PATTERN,
+    DOWNLOAD_METADATA_MAX_SIZE,
     TEKU_MIN_JAVA_VERSION,
     NIMBUS_LATEST_RELEASE,
     LIGHTHOUSE_LATEST_RELEASE,
@@ -86,7 +98,6 @@ from ethwizard.constants import (
     GETH_STORE_BUILDS_PARAMS,
     GETH_STORE_BUILDS_URL,
     GETH_BUILDS_BASE_URL,
-    PGP_KEY_SERVERS,
     GETH_WINDOWS_PGP_KEY_ID,
     NETWORK_GOERLI,
     CTX_EXECUTION_IMPROVED_SERVICE_TIMEOUT,
@@ -1367,22 +1378,11 @@ def get_teku_latest_version():
 
     log.info('Getting Teku latest version...')
 
-    teku_gh_release_url = GITHUB_REST_API_URL + TEKU_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(teku_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while getting the latest stable version for Teku. {exception}')
+    release_json = get_github_release(TEKU_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Teku.')
         return UNKNOWN_VALUE
 
-    if response.status_code != 200:
-        log.error(f'HTTP error while getting the latest stable version for Teku. '
-            f'Status code {response.status_code}')
-        return UNKNOWN_VALUE
-    
-    release_json = response.json()
-
     if 'tag_name' not in release_json or not isinstance(release_json['tag_name'], str):
         log.error(f'Unable to find tag name in Github response while getting the latest stable '
             f'version for Teku.')
@@ -1757,21 +1757,10 @@ def upgrade_mevboost(base_directory, nssm_binary):
     log.info('Upgrading MEV-Boost...')
 
     # Getting latest mev-boost release files
-    mevboost_gh_release_url = GITHUB_REST_API_URL + MEVBOOST_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(mevboost_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost binary. {exception}')
-        return False
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading MEV-Boost binary. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(MEVBOOST_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for MEV-Boost.')
         return False
-    
-    release_json = response.json()
 
     if 'assets' not in release_json:
         log.error('No assets in Github release for MEV-Boost.')
@@ -1795,7 +1784,8 @@ def upgrade_mevboost(base_directory, nssm_binary):
         if file_name.endswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
         elif file_name == checksums_filename:
             checksums_asset = {
@@ -1818,49 +1808,19 @@ def upgrade_mevboost(base_directory, nssm_binary):
     if binary_path.is_file():
         binary_path.unlink()
 
-    binary_hash = hashlib.sha256()
-
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading MEV-Boost binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-
-                archive_filename = binary_asset['file_name']
-                archive_url = binary_asset['file_url']
-                log.info(f'Downloading {archive_filename} from {archive_url} ...')
-
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-                    binary_hash.update(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost binary from Github. {exception}')
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'MEV-Boost binary',
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
         return False
     
     checksums_path = download_path.joinpath(checksums_asset['file_name'])
     if checksums_path.is_file():
         checksums_path.unlink()
 
-    try:
-        with open(checksums_path, 'wb') as checksums_file:
-            with httpx.stream('GET', checksums_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading MEV-Boost checksums from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                
-                archive_filename = checksums_asset['file_name']
-                archive_url = checksums_asset['file_url']
-                log.info(f'Downloading {archive_filename} from {archive_url} ...')
-
-                for data in http_stream.iter_bytes():
-                    checksums_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading MEV-Boost checksums from Github. {exception}')
+    checksums_download = download_file(checksums_asset['file_url'], checksums_path, log,
+        'MEV-Boost checksums', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    if checksums_download['error'] is not None:
         return False
 
     # Verify checksum
@@ -1874,7 +1834,7 @@ def upgrade_mevboost(base_directory, nssm_binary):
                 hash_found = True
                 checksum = result.group('hash').lower()
 
-                binary_hexdigest = binary_hash.hexdigest().lower()
+                binary_hexdigest = binary_download['sha256'].lower()
 
                 if checksum != binary_hexdigest:
                     # SHA256 checksum failed
@@ -1983,18 +1943,9 @@ def upgrade_geth(base_directory, nssm_binary):
 
     latest_build_url = urljoin(GETH_BUILDS_BASE_URL, latest_build['name'])
 
-    try:
-        with open(geth_archive_path, 'wb') as binary_file:
-            log.info(f'Downloading geth archive {latest_build["name"]}...')
-            with httpx.stream('GET', latest_build_url, follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'Cannot download geth archive {latest_build_url}.\n'
-                        f'Unexpected status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading geth archive. Exception {exception}')
+    geth_download = download_file_with_progress(latest_build_url, geth_archive_path, log,
+        'geth archive')
+    if geth_download['error'] is not None:
         return False
 
     geth_archive_sig_path = download_path.joinpath(latest_build['name'] + '.asc')
@@ -2003,19 +1954,9 @@ def upgrade_geth(base_directory, nssm_binary):
 
     latest_build_sig_url = urljoin(GETH_BUILDS_BASE_URL, latest_build['name'] + '.asc')
 
-    try:
-        with open(geth_archive_sig_path, 'wb') as binary_file:
-            log.info(f'Downloading geth archive signature {latest_build["name"]}.asc...')
-            with httpx.stream('GET', latest_build_sig_url,
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'Cannot download geth archive signature {latest_build_sig_url}.\n'
-                        f'Unexpected status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading geth archive signature. Exception {exception}')
+    signature_download = download_file(latest_build_sig_url, geth_archive_sig_path, log,
+        'geth archive signature', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    if signature_download['error'] is not None:
         return False
 
     if not install_gpg(base_directory):
@@ -2024,48 +1965,18 @@ def upgrade_geth(base_directory, nssm_binary):
     # Verify PGP signature
     gpg_binary_path = base_directory.joinpath('bin', 'gpg.exe')
 
-    command_line = [str(gpg_binary_path), '--list-keys', '--with-colons', GETH_WINDOWS_PGP_KEY_ID]
-    process_result = subprocess.run(command_line)
-    pgp_key_found = process_result.returncode == 0
-
-    if not pgp_key_found:
-
-        retry_index = 0
-        retry_count = 15
-
-        key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-        log.info(f'Downloading Geth Windows Builder PGP key from {key_server} ...')
-        command_line = [str(gpg_binary_path), '--keyserver', key_server,
-            '--recv-keys', GETH_WINDOWS_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-
-        if process_result.returncode != 0:
-            # GPG failed to download Geth Windows Builder PGP key, let's wait and retry a few times
-            while process_result.returncode != 0 and retry_index < retry_count:
-                retry_index = retry_index + 1
-                delay = 5
-                log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                    f'and try again from a different server.')
-                time.sleep(delay)
-
-                key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                log.info(f'Downloading Geth Windows Builder PGP key from {key_server} ...')
-                command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                    '--recv-keys', GETH_WINDOWS_PGP_KEY_ID]
-
-                process_result = subprocess.run(command_line)
-        
-        if process_result.returncode != 0:
-            log.error(
+    if not receive_pgp_key(gpg_binary_path, GETH_WINDOWS_PGP_KEY_ID,
+        'Geth Windows Builder PGP key', log):
+        log.error(
 f'''
 We failed to download the Geth Windows Builder PGP key to verify the geth
-archive after {retry_count} retries.
+archive.
 '''
-            )
-            return False
-    
-    process_result = subprocess.run([
-        str(gpg_binary_path), '--verify', str(geth_archive_sig_path)])
+        )
+        return False
+
+    process_result = subprocess.run([str(gpg_binary_path), '--homedir',
+        str(get_pgp_keyring_directory()), '--verify', str(geth_archive_sig_path)])
     if process_result.returncode != 0:
         log.error('The geth archive signature is wrong. We\'ll stop here to protect you.')
         return False
@@ -2219,22 +2130,11 @@ def upgrade_nimbus(base_directory, nssm_binary):
     # Upgrade the Nimbus client
     log.info('Upgrading Nimbus client...')
 
-    nimbus_gh_release_url = GITHUB_REST_API_URL + NIMBUS_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(nimbus_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Nimbus binary. {exception}')
+    release_json = get_github_release(NIMBUS_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Nimbus.')
         return False
 
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading Nimbus binary. '
-            f'Status code {response.status_code}')
-        return False
-    
-    release_json = response.json()
-
     if 'assets' not in release_json:
         log.error('No assets in Github release for Nimbus.')
         return False
@@ -2255,7 +2155,8 @@ def upgrade_nimbus(base_directory, nssm_binary):
         if file_name.startswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
 
     if binary_asset is None:
@@ -2268,18 +2169,10 @@ def upgrade_nimbus(base_directory, nssm_binary):
 
     binary_path = Path(download_path, binary_asset['file_name'])
 
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Nimbus binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Nimbus binary from Github. {exception}')
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'Nimbus binary',
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
         return False
     
     extract_directory = download_path.joinpath('nimbus')
@@ -2369,21 +2262,10 @@ def upgrade_lighthouse(base_directory, nssm_binary):
     # Upgrade the Lighthouse client
     log.info('Upgrading Lighthouse client...')
 
-    lighthouse_gh_release_url = GITHUB_REST_API_URL + LIGHTHOUSE_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(lighthouse_gh_release_url, headers=headers,
-            follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Lighthouse binary. {exception}')
-        return False
-
-    if response.status_code != 200:
-        log.error(f'HTTP error while downloading Lighthouse binary. '
-            f'Status code {response.status_code}')
+    release_json = get_github_release(LIGHTHOUSE_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Lighthouse.')
         return False
-    
-    release_json = response.json()
 
     if 'assets' not in release_json:
         log.error('No assets in Github release for Lighthouse.')
@@ -2407,7 +2289,8 @@ def upgrade_lighthouse(base_directory, nssm_binary):
         if file_name.endswith(archive_filename_comp):
             binary_asset = {
                 'file_name': file_name,
-                'file_url': file_url
+                'file_url': file_url,
+                'file_sha256': github_asset_sha256(asset)
             }
         elif file_name.endswith(archive_filename_sig_comp):
             signature_asset = {
@@ -2425,34 +2308,17 @@ def upgrade_lighthouse(base_directory, nssm_binary):
 
     binary_path = Path(download_path, binary_asset['file_name'])
 
-    try:
-        with open(binary_path, 'wb') as binary_file:
-            with httpx.stream('GET', binary_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Lighthouse binary from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Lighthouse binary from Github. {exception}')
+    binary_download = download_file_with_progress(binary_asset['file_url'], binary_path, log,
+        'Lighthouse binary',
+        expected_sha256=binary_asset['file_sha256'])
+    if binary_download['error'] is not None:
         return False
     
     signature_path = Path(download_path, signature_asset['file_name'])
 
-    try:
-        with open(signature_path, 'wb') as signature_file:
-            with httpx.stream('GET', signature_asset['file_url'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'HTTP error while downloading Lighthouse signature from Github. '
-                        f'Status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    signature_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading Lighthouse signature from Github. {exception}')
+    signature_download = download_file(signature_asset['file_url'], signature_path, log,
+        'Lighthouse signature', max_size=DOWNLOAD_METADATA_MAX_SIZE)
+    if signature_download['error'] is not None:
         return False
     
     if not install_gpg(base_directory):
@@ -2461,54 +2327,17 @@ def upgrade_lighthouse(base_directory, nssm_binary):
     # Verify PGP signature
     gpg_binary_path = base_directory.joinpath('bin', 'gpg.exe')
 
-    command_line = [str(gpg_binary_path), '--list-keys', '--with-colons',
-        LIGHTHOUSE_PRIME_PGP_KEY_ID]
-    process_result = subprocess.run(command_line)
-    pgp_key_found = process_result.returncode == 0
-
-    if not pgp_key_found:
-
-        retry_index = 0
-        retry_count = 15
-
-        key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-        log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-        command_line = [str(gpg_binary_path), '--keyserver', key_server,
-            '--recv-keys', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-        process_result = subprocess.run(command_line)
-
-        if process_result.returncode != 0:
-            # GPG failed to download PGP key, let's wait and retry a few times
-            while process_result.returncode != 0 and retry_index < retry_count:
-                retry_index = retry_index + 1
-                delay = 5
-                log.warning(f'GPG failed to download the PGP key. We will wait {delay} seconds '
-                    f'and try again from a different server.')
-                time.sleep(delay)
-
-                key_server = PGP_KEY_SERVERS[retry_index % len(PGP_KEY_SERVERS)]
-                log.info(f'Downloading Sigma Prime\'s PGP key from {key_server} ...')
-                command_line = [str(gpg_binary_path), '--keyserver', key_server,
-                    '--recv-keys', LIGHTHOUSE_PRIME_PGP_KEY_ID]
-
-                process_result = subprocess.run(command_line)
-
-        if process_result.returncode != 0:
-            log.warning(
+    if not receive_pgp_key(gpg_binary_path, LIGHTHOUSE_PRIME_PGP_KEY_ID,
+        'Sigma Prime\'s PGP key', log):
+        log.warning(
 f'''
 We failed to download the Sigma Prime's PGP key to verify the Lighthouse
-archive after {retry_count} retries. We will skip signature verification.
+archive. We will skip signature verification.
 '''
-            )
-        else:
-            process_result = subprocess.run([
-                str(gpg_binary_path), '--verify', str(signature_path)])
-            if process_result.returncode != 0:
-                log.error('The Lighthouse archive signature is wrong. We\'ll stop here to protect you.')
-                return False
+        )
     else:
-        process_result = subprocess.run([
-            str(gpg_binary_path), '--verify', str(signature_path)])
+        process_result = subprocess.run([str(gpg_binary_path), '--homedir',
+            str(get_pgp_keyring_directory()), '--verify', str(signature_path)])
         if process_result.returncode != 0:
             log.error('The Lighthouse archive signature is wrong. We\'ll stop here to protect you.')
             return False
@@ -2573,20 +2402,11 @@ def upgrade_teku(base_directory, nssm_binary):
     java_home = base_directory.joinpath('bin', 'jre')
 
     # Getting latest Teku release files
-    teku_gh_release_url = GITHUB_REST_API_URL + TEKU_LATEST_RELEASE
-    headers = {'Accept': GITHUB_API_VERSION}
-    try:
-        response = httpx.get(teku_gh_release_url, headers=headers, follow_redirects=True)
-    except httpx.RequestError as exception:
-        log.error(f'Cannot connect to Github. Exception {exception}')
+    release_json = get_github_release(TEKU_LATEST_RELEASE, log)
+    if release_json is None:
+        log.error('Unable to get the latest Github release for Teku.')
         return False
 
-    if response.status_code != 200:
-        log.error(f'Github returned error code. Status code {response.status_code}')
-        return False
-    
-    release_json = response.json()
-
     if 'body' not in release_json:
         log.error('Unexpected response from github release. We cannot continue.')
         return False
@@ -2596,8 +2416,7 @@ def upgrade_teku(base_directory, nssm_binary):
     zip_url = None
     zip_sha256 = None
 
-    result = re.search(r'\[zip\]\((?P<url>[^\)]+)\)\s*\(\s*sha256\s*:?\s*`(?P<sha256>[^`]+)`\s*\)',
-        release_desc)
+    result = re.search(TEKU_RELEASE_ZIP_PATTERN, release_desc)
     if result:
         zip_url = result.group('url')
         if zip_url is not None:
@@ -2619,133 +2438,67 @@ def upgrade_teku(base_directory, nssm_binary):
     url_file_name = urlparse(zip_url).path.split('/')[-1]
 
     teku_archive_path = download_path.joinpath(url_file_name)
-    teku_archive_hash = hashlib.sha256()
     if teku_archive_path.is_file():
         teku_archive_path.unlink()
 
-    keep_retrying = True
+    teku_download = download_file_with_progress(zip_url, teku_archive_path, log, 'teku archive',
+        expected_sha256=zip_sha256)
 
-    retry_index = 0
-    retry_count = 6
-    retry_delay = 30
-    retry_delay_increase = 10
-    last_exception = None
-    last_status_code = None
-
-    while keep_retrying and retry_index < retry_count:
-        last_exception = None
-        last_status_code = None
-        try:
-            with open(teku_archive_path, 'wb') as binary_file:
-                log.info(f'Downloading teku archive {url_file_name}...')
-                with httpx.stream('GET', zip_url, follow_redirects=True) as http_stream:
-                    if http_stream.status_code != 200:
-                        log.error(f'Cannot download teku archive {zip_url}.\n'
-                            f'Unexpected status code {http_stream.status_code}')
-                        last_status_code = http_stream.status_code
-
-                        retry_index = retry_index + 1
-                        log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-                        time.sleep(retry_delay)
-                        retry_delay = retry_delay + retry_delay_increase
-                        continue
-
-                    for data in http_stream.iter_bytes():
-                        binary_file.write(data)
-                        teku_archive_hash.update(data)
-                
-                keep_retrying = False
-
-        except httpx.RequestError as exception:
-            
-            log.error(f'Exception while downloading teku archive. Exception {exception}')
-            last_exception = exception
-
-            retry_index = retry_index + 1
-            log.info(f'We will retry in {retry_delay} seconds (retry index = {retry_index})')
-            time.sleep(retry_delay)
-            retry_delay = retry_delay + retry_delay_increase
-            continue
-    
-    if keep_retrying:
-        if last_exception is not None:
-            result = button_dialog(
-                title='Cannot download Teku archive',
-                text=(
-f'''
-We could not download the teku archive. Here are some details for this
-last test we tried to perform:
-
-URL: {zip_url}
-Method: GET
-Exception: {last_exception}
-
-We cannot proceed if we cannot download the teku archive. Make sure there
-is no network issue when we try to connect to the Internet.
-'''                 ),
-                buttons=[
-                    ('Quit', False)
-                ]
-            ).run()
+    if teku_download['error'] == 'Cancelled':
+        return False
 
-            return False
-        elif last_status_code is not None:
-            result = button_dialog(
-                title='Cannot download Teku archive',
-                text=(
+    if teku_download['error'] is not None:
+        result = button_dialog(
+            title='Cannot download Teku archive',
+            text=(
 f'''
 We could not download the teku archive. Here are some details for this
 last test we tried to perform:
 
 URL: {zip_url}
 Method: GET
-Status code: {last_status_code}
+Attempts: {teku_download['attempts']}
+Error: {teku_download['error']}
 
 We cannot proceed if we cannot download the teku archive. Make sure there
 is no network issue when we try to connect to the Internet.
-'''                 ),
-                buttons=[
-                    ('Quit', False)
-                ]
-            ).run()
+'''         ),
+            buttons=[
+                ('Quit', False)
+            ]
+        ).run()
 
-            return False
+        return False
 
     # Verify checksum
     log.info('Verifying teku archive checksum...')
-    teku_archive_hexdigest = teku_archive_hash.hexdigest()
+    teku_archive_hexdigest = teku_download['sha256']
     if teku_archive_hexdigest.lower() != zip_sha256.lower():
         log.error('Teku archive checksum does not match. We will stop here to protect you.')
         return False
     
-    # Unzip teku archive
-    archive_members = None
-
+    # Extract the teku archive next to its final destination while the service is running
     log.info(f'Extracting teku archive {url_file_name}...')
-    with ZipFile(teku_archive_path, 'r') as zip_file:
-        archive_members = zip_file.namelist()
-        zip_file.extractall(download_path)
+    try:
+        staging_path = stage_zip_archive(teku_archive_path, teku_path)
+    except ArchiveError as exception:
+        log.error(f'Unable to extract the teku archive. {exception} We cannot continue.')
+        return False
     
     # Remove download leftovers
     teku_archive_path.unlink()
 
-    if archive_members is None or len(archive_members) == 0:
-        log.error('No files found in teku archive. We cannot continue.')
-        return False
-    
     teku_service_name = 'teku'
     subprocess.run([str(nssm_binary), 'stop', teku_service_name])
 
-    # Move all those extracted files into their final destination
-    if teku_path.is_dir():
-        shutil.rmtree(teku_path)
-    teku_path.mkdir(parents=True, exist_ok=True)
-
-    archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-    with os.scandir(archive_extracted_dir) as it:
-        for diritem in it:
-            shutil.move(diritem.path, teku_path)
+    # Swap the extracted files in their final destination
+    try:
+        swap_staged_directory(staging_path, teku_path)
+    except ArchiveError as exception:
+        log.error(f'Unable to install the teku files. {exception}')
+        # The previous teku files are still in place
+        subprocess.run([str(nssm_binary), 'start', teku_service_name])
+        return False
         
     # Make sure teku was installed properly
     teku_found = False
@@ -2958,7 +2711,7 @@ def upgrade_jre(base_directory, nssm_binary):
     try:
         log.info('Getting JRE builds...')
 
-        response = httpx.get(ADOPTIUM_21_API_URL, params=ADOPTIUM_21_API_PARAMS,
+        response = get_http_client().get(ADOPTIUM_21_API_URL, params=ADOPTIUM_21_API_PARAMS,
             follow_redirects=True)
 
         if response.status_code != 200:
@@ -3039,46 +2792,21 @@ def upgrade_jre(base_directory, nssm_binary):
     if jre_archive_path.is_file():
         jre_archive_path.unlink()
 
-    try:
-        with open(jre_archive_path, 'wb') as binary_file:
-            log.info(f'Downloading JRE archive {latest_build["name"]}...')
-            with httpx.stream('GET', latest_build['link'],
-                follow_redirects=True) as http_stream:
-                if http_stream.status_code != 200:
-                    log.error(f'Cannot download JRE archive {latest_build["link"]}.\n'
-                        f'Unexpected status code {http_stream.status_code}')
-                    return False
-                for data in http_stream.iter_bytes():
-                    binary_file.write(data)
-    except httpx.RequestError as exception:
-        log.error(f'Exception while downloading JRE archive. Exception {exception}')
+    jre_download = download_file_with_progress(latest_build['link'], jre_archive_path, log,
+        'JRE archive')
+    if jre_download['error'] is not None:
         return False
     
-    # Unzip JRE archive
-    archive_members = None
-
+    # Extract the JRE archive next to its final destination and swap it in
     log.info(f'Extracting JRE archive {latest_build["name"]}...')
-    with ZipFile(jre_archive_path, 'r') as zip_file:
-        archive_members = zip_file.namelist()
-        zip_file.extractall(download_path)
+    try:
+        install_zip_archive(jre_archive_path, jre_path)
+    except ArchiveError as exception:
+        log.error(f'Unable to extract the JRE archive. {exception} We cannot continue.')
+        return False
     
     # Remove download leftovers
     jre_archive_path.unlink()
-
-    if archive_members is None or len(archive_members) == 0:
-        log.error('No files found in JRE archive. We cannot continue.')
-        return False
-    
-    # Move all those extracted files into their final destination
-    if jre_path.is_dir():
-        shutil.rmtree(jre_path)
-    jre_path.mkdir(parents=True, exist_ok=True)
-
-    archive_extracted_dir = download_path.joinpath(Path(archive_members[0]).parts[0])
-
-    with os.scandir(archive_extracted_dir) as it:
-        for diritem in it:
-            shutil.move(diritem.path, jre_path)
         
     # Make sure jre was installed properly
     jre_found = False
@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import threading
+
+from pathlib import Path
+
+from yaml import safe_load, YAMLError
+
+from prompt_toolkit.document import Document
+from prompt_toolkit.formatted_text import to_plain_text
+from prompt_toolkit.validation import ValidationError
+
+from ethwizard.utils.steptimings import get_active_step_record
+
+# Unattended mode replaces every dialog shown by the wizard with an answer taken from an answers
+# file and reports its progress as JSON lines on stdout. The answers file is YAML (or JSON) with
+# two optional sections:
+#
+# context:
+#   selected_network: mainnet
+#   selected_consensus_checkpoint_url: https://beaconstate.info/
+# dialogs:
+#   Consensus client selection: lighthouse
+#   MEV-Boost relays: Uncensored
+#   Testing your system: Skip
+#
+# Context values are set before the first step runs, which skips the dialogs of steps that only
+# prompt when their value is missing. Dialog answers are matched on the dialog title: a button
+# label for button dialogs, a value or label for radio lists, a list of values or labels for
+# checkbox lists and the text for input dialogs. A dialog without an answer stops the wizard
+# with a non zero exit code. So does a dialog shown again during the same step, the wizard only
+# does that when it rejected the answer and giving it again would loop forever.
+#
+# Progress events are written as JSON lines on stdout while all other console output is sent to
+# stderr.
+
+UNATTENDED_EXIT_CODE = 2
+
+_emit_lock = threading.Lock()
+_events_stream = None
+
+class MissingAnswerError(Exception):
+    pass
+
+def emit_event(event, **fields):
+    # Write a progress event as a single JSON line on stdout
+
+    fields['event'] = event
+    fields['time'] = time.time()
+
+    with _emit_lock:
+        stream = _events_stream if _events_stream is not None else sys.stdout
+        stream.write(json.dumps(fields, default=str) + '\n')
+        stream.flush()
+
+def reserve_stdout_for_events():
+    # Keep the original stdout for progress events only. Anything else written on stdout,
+    # including the output of subprocesses, goes to stderr.
+
+    global _events_stream
+
+    if _events_stream is not None:
+        return
+
+    sys.stdout.flush()
+    _events_stream = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf8', buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+def load_answers(answers_path):
+    # Load the answers file, return None and report the error if it is not usable
+
+    try:
+        with open(str(Path(answers_path)), 'r', encoding='utf8') as answers_file:
+            answers = safe_load(answers_file)
+    except (OSError, YAMLError) as exception:
+        emit_event('error', message=f'Unable to read answers file {answers_path}. {exception}')
+        return None
+
+    if answers is None:
+        answers = {}
+
+    if (
+        not isinstance(answers, dict) or
+        not isinstance(answers.get('context', {}), dict) or
+        not isinstance(answers.get('dialogs', {}), dict)
+        ):
+        emit_event('error', message=f'Unexpected structure in answers file {answers_path}. '
+            'Expected a mapping with optional context and dialogs mappings.')
+        return None
+
+    return {
+        'context': answers.get('context') or {},
+        'dialogs': {to_plain_text(title).strip(): answer
+            for title, answer in (answers.get('dialogs') or {}).items()}
+    }
+
+def _label(text):
+    return to_plain_text(text).strip()
+
+def _matches(answer, key, label):
+    answer = str(answer).strip().lower()
+    return answer == str(key).strip().lower() or answer == _label(label).lower()
+
+class _AnsweredDialog:
+    # Stand in for a prompt_toolkit Application that returns its answer when run
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def run(self, *args, **kwargs):
+        return self._resolve()
+
+class UnattendedDialogs:
+    # Unattended replacements for the prompt_toolkit dialog shortcuts used by the wizard
+
+    def __init__(self, dialog_answers):
+        self.dialog_answers = dialog_answers
+        self._answered = set()
+        self._answered_lock = threading.Lock()
+
+    def _answer(self, title, kind):
+        title = _label(title)
+
+        if title not in self.dialog_answers:
+            emit_event('missing_answer', dialog=title, kind=kind)
+            raise MissingAnswerError(f'No answer for {kind} dialog "{title}"')
+
+        # Dialogs are told apart per step run, a step run again gets its answers again
+        record = get_active_step_record()
+        answered_key = (id(record) if record is not None else None, title)
+        with self._answered_lock:
+            if answered_key in self._answered:
+                emit_event('invalid_answer', dialog=title, answer=self.dialog_answers[title])
+                raise MissingAnswerError(f'Answer for {kind} dialog "{title}" was rejected')
+            self._answered.add(answered_key)
+
+        return title, self.dialog_answers[title]
+
+    def button_dialog(self, title='', text='', buttons=[], style=None):
+        def resolve():
+            plain_title, answer = self._answer(title, 'button')
+            for button_text, value in buttons:
+                if _matches(answer, button_text, button_text):
+                    emit_event('dialog_answered', dialog=plain_title, answer=button_text)
+                    return value
+
+            emit_event('invalid_answer', dialog=plain_title, answer=answer,
+                choices=[button_text for button_text, _ in buttons])
+            raise MissingAnswerError(f'Answer {answer} is not a button of "{plain_title}"')
+
+        return _AnsweredDialog(resolve)
+
+    def radiolist_dialog(self, title='', text='', ok_text='Ok', cancel_text='Cancel',
+        values=None, default=None, style=None):
+        def resolve():
+            plain_title, answer = self._answer(title, 'radiolist')
+            for key, label in values or []:
+                if _matches(answer, key, label):
+                    emit_event('dialog_answered', dialog=plain_title, answer=key)
+                    return key
+
+            emit_event('invalid_answer', dialog=plain_title, answer=answer,
+                choices=[key for key, _ in values or []])
+            raise MissingAnswerError(f'Answer {answer} is not a value of "{plain_title}"')
+
+        return _AnsweredDialog(resolve)
+
+    def checkboxlist_dialog(self, title='', text='', ok_text='Ok', cancel_text='Cancel',
+        values=None, default_values=None, style=None):
+        def resolve():
+            plain_title, answer = self._answer(title, 'checkboxlist')
+            if not isinstance(answer, list):
+                answer = [answer]
+
+            selected = []
+            for item in answer:
+                for key, label in values or []:
+                    if _matches(item, key, label):
+                        selected.append(key)
+                        break
+                else:
+                    emit_event('invalid_answer', dialog=plain_title, answer=item,
+                        choices=[key for key, _ in values or []])
+                    raise MissingAnswerError(f'Answer {item} is not a value of "{plain_title}"')
+
+            emit_event('dialog_answered', dialog=plain_title, answer=selected)
+            return selected
+
+        return _AnsweredDialog(resolve)
+
+    def _input_answer(self, title, validator, password):
+        plain_title, answer = self._answer(title, 'input')
+        answer = '' if answer is None else str(answer)
+
+        if validator is not None:
+            try:
+                validator.validate(Document(answer))
+            except ValidationError as exception:
+                emit_event('invalid_answer', dialog=plain_title, message=exception.message)
+                raise MissingAnswerError(
+                    f'Answer for "{plain_title}" is not valid. {exception.message}')
+
+        emit_event('dialog_answered', dialog=plain_title,
+            answer='********' if password else answer)
+        return answer
+
+    def input_dialog(self, title='', text='', ok_text='OK', cancel_text='Cancel',
+        completer=None, validator=None, password=False, style=None, default=''):
+        def resolve():
+            return self._input_answer(title, validator, password)
+
+        return _AnsweredDialog(resolve)
+
+    def input_dialog_default(self, title='', text='', default_input_text='', ok_text='OK',
+        cancel_text='Cancel', completer=None, validator=None, password=False, style=None):
+        def resolve():
+            return self._input_answer(title, validator, password)
+
+        return _AnsweredDialog(resolve)
+
+    def progress_log_dialog(self, title='', text='', wait_text='Wait', skip_text='Skip',
+        quit_text='Quit', with_skip=False, status_text='', run_callback=(lambda *a: None),
+        style=None):
+        # Progress dialogs need no answer, their work runs directly and is reported as events
+
+        plain_title = _label(title)
+        state = {
+            'result': None,
+            'percentage': None
+        }
+
+        def set_percentage(value):
+            value = int(value)
+            if value != state['percentage']:
+                state['percentage'] = value
+                emit_event('progress', dialog=plain_title, percentage=value)
+
+        def log_text(text):
+            text = text.strip()
+            if text != '':
+                emit_event('log', dialog=plain_title, text=text)
+
+        def change_status(text):
+            emit_event('status', dialog=plain_title, text=_label(text))
+
+        def set_result(new_result):
+            state['result'] = new_result
+
+        def get_exited():
+            return False
+
+        def resolve():
+            emit_event('progress_started', dialog=plain_title)
+            result = run_callback(set_percentage, log_text, change_status, set_result,
+                get_exited)
+            emit_event('progress_completed', dialog=plain_title)
+            return result
+
+        return _AnsweredDialog(resolve)
+
+    def install(self):
+        # Replace the dialog functions in every loaded ethwizard module
+
+        replacements = {
+            'button_dialog': self.button_dialog,
+            'radiolist_dialog': self.radiolist_dialog,
+            'checkboxlist_dialog': self.checkboxlist_dialog,
+            'input_dialog': self.input_dialog,
+            'input_dialog_default': self.input_dialog_default,
+            'progress_log_dialog': self.progress_log_dialog
+        }
+
+        for module_name, module in list(sys.modules.items()):
+            if module is None or not (module_name == 'ethwizard' or
+                module_name.startswith('ethwizard.')):
+                continue
+
+            for name, replacement in replacements.items():
+                if hasattr(module, name):
+                    setattr(module, name, replacement)
@@ -7,57 +7,147 @@
 # To the extent possible under law, the implementer has waived all copyright
 # and related or neighboring rights to the source code in this file.
 # http://creativecommons.org/publicdomain/zero/1.0/
+#
+# The permutation below works on a flat list of 25 lanes (lane (x, y) is at
+# index x+5*y) with the round constants and the ρ/π offsets computed once at
+# import time instead of on every call.
+
+from struct import Struct
+
+_LANE_MASK = (1 << 64) - 1
 
 def ROL64(a, n):
     return ((a >> (64-(n%64))) + (a << (n%64))) % (1 << 64)
 
-def KeccakF1600onLanes(lanes):
+def _compute_round_constants():
+    # Run the ι LFSR once for all 24 rounds
+    round_constants = []
     R = 1
     for round in range(24):
+        rc = 0
+        for j in range(7):
+            R = ((R << 1) ^ ((R >> 7)*0x71)) % 256
+            if (R & 2):
+                rc = rc ^ (1 << ((1<<j)-1))
+        round_constants.append(rc)
+    return tuple(round_constants)
+
+def _compute_rho_pi():
+    # (source lane, destination lane, rotation offset) for the combined ρ and π steps
+    rho_pi = [(0, 0, 0)]
+    (x, y) = (1, 0)
+    for t in range(24):
+        rotation = ((t+1)*(t+2)//2) % 64
+        (dest_x, dest_y) = (y, (2*x+3*y)%5)
+        rho_pi.append((x+5*y, dest_x+5*dest_y, rotation))
+        (x, y) = (dest_x, dest_y)
+    return tuple(rho_pi)
+
+_ROUND_CONSTANTS = _compute_round_constants()
+_RHO_PI = _compute_rho_pi()
+_CHI = tuple((i, 5*(i//5) + (i+1)%5, 5*(i//5) + (i+2)%5) for i in range(25))
+_LANES_STRUCT = Struct('<25Q')
+_RATE_STRUCTS = {}
+
+def _rate_struct(rateInBytes):
+    rate_struct = _RATE_STRUCTS.get(rateInBytes)
+    if rate_struct is None:
+        rate_struct = Struct('<%dQ' % (rateInBytes//8))
+        _RATE_STRUCTS[rateInBytes] = rate_struct
+    return rate_struct
+
+def _KeccakF1600onFlatLanes(A):
+    mask = _LANE_MASK
+    rho_pi = _RHO_PI
+    chi = _CHI
+    B = [0] * 25
+    for rc in _ROUND_CONSTANTS:
         # θ
-        C = [lanes[x][0] ^ lanes[x][1] ^ lanes[x][2] ^ lanes[x][3] ^ lanes[x][4] for x in range(5)]
-        D = [C[(x+4)%5] ^ ROL64(C[(x+1)%5], 1) for x in range(5)]
-        lanes = [[lanes[x][y]^D[x] for y in range(5)] for x in range(5)]
+        C0 = A[0] ^ A[5] ^ A[10] ^ A[15] ^ A[20]
+        C1 = A[1] ^ A[6] ^ A[11] ^ A[16] ^ A[21]
+        C2 = A[2] ^ A[7] ^ A[12] ^ A[17] ^ A[22]
+        C3 = A[3] ^ A[8] ^ A[13] ^ A[18] ^ A[23]
+        C4 = A[4] ^ A[9] ^ A[14] ^ A[19] ^ A[24]
+        D = (
+            C4 ^ (((C1 << 1) | (C1 >> 63)) & mask),
+            C0 ^ (((C2 << 1) | (C2 >> 63)) & mask),
+            C1 ^ (((C3 << 1) | (C3 >> 63)) & mask),
+            C2 ^ (((C4 << 1) | (C4 >> 63)) & mask),
+            C3 ^ (((C0 << 1) | (C0 >> 63)) & mask),
+        )
         # ρ and π
-        (x, y) = (1, 0)
-        current = lanes[x][y]
-        for t in range(24):
-            (x, y) = (y, (2*x+3*y)%5)
-            (current, lanes[x][y]) = (lanes[x][y], ROL64(current, (t+1)*(t+2)//2))
+        for (source, dest, rotation) in rho_pi:
+            a = A[source] ^ D[source % 5]
+            B[dest] = ((a << rotation) | (a >> (64 - rotation))) & mask
         # χ
-        for y in range(5):
-            T = [lanes[x][y] for x in range(5)]
-            for x in range(5):
-                lanes[x][y] = T[x] ^((~T[(x+1)%5]) & T[(x+2)%5])
+        A = [B[i] ^ (~B[i1] & B[i2]) for (i, i1, i2) in chi]
         # ι
-        for j in range(7):
-            R = ((R << 1) ^ ((R >> 7)*0x71)) % 256
-            if (R & 2):
-                lanes[0][0] = lanes[0][0] ^ (1 << ((1<<j)-1))
-    return lanes
+        A[0] ^= rc
+    return A
+
+def KeccakF1600onLanes(lanes):
+    flat = [lanes[i % 5][i // 5] for i in range(25)]
+    flat = _KeccakF1600onFlatLanes(flat)
+    return [[flat[x+5*y] for y in range(5)] for x in range(5)]
 
 def load64(b):
-    return sum((b[i] << (8*i)) for i in range(8))
+    return int.from_bytes(bytes(b[0:8]), 'little')
 
 def store64(a):
-    return list((a >> (8*i)) % 256 for i in range(8))
+    return list(a.to_bytes(8, 'little'))
 
 def KeccakF1600(state):
-    lanes = [[load64(state[8*(x+5*y):8*(x+5*y)+8]) for y in range(5)] for x in range(5)]
-    lanes = KeccakF1600onLanes(lanes)
-    state = bytearray(200)
-    for x in range(5):
-        for y in range(5):
-            state[8*(x+5*y):8*(x+5*y)+8] = store64(lanes[x][y])
-    return state
+    lanes = _KeccakF1600onFlatLanes(list(_LANES_STRUCT.unpack(bytes(state))))
+    return bytearray(_LANES_STRUCT.pack(*lanes))
 
 def Keccak(rate, capacity, inputBytes, delimitedSuffix, outputByteLen):
-    outputBytes = bytearray()
-    state = bytearray([0 for i in range(200)])
-    rateInBytes = rate//8
-    blockSize = 0
     if (((rate + capacity) != 1600) or ((rate % 8) != 0)):
         return
+    rateInBytes = rate//8
+    if (rateInBytes % 8) != 0:
+        return _KeccakBytewise(rateInBytes, inputBytes, delimitedSuffix, outputByteLen)
+    rateInLanes = rateInBytes//8
+    rate_struct = _rate_struct(rateInBytes)
+    inputBytes = bytes(inputBytes)
+    lanes = [0] * 25
+    # === Absorb all the full input blocks ===
+    fullBlocksLength = len(inputBytes) - (len(inputBytes) % rateInBytes)
+    for inputOffset in range(0, fullBlocksLength, rateInBytes):
+        block = rate_struct.unpack_from(inputBytes, inputOffset)
+        for i in range(rateInLanes):
+            lanes[i] ^= block[i]
+        lanes = _KeccakF1600onFlatLanes(lanes)
+    # === Do the padding and switch to the squeezing phase ===
+    lastBlock = bytearray(inputBytes[fullBlocksLength:])
+    blockSize = len(lastBlock)
+    lastBlock.extend(bytes(rateInBytes - blockSize))
+    lastBlock[blockSize] ^= delimitedSuffix
+    if (((delimitedSuffix & 0x80) != 0) and (blockSize == (rateInBytes-1))):
+        block = rate_struct.unpack(lastBlock)
+        for i in range(rateInLanes):
+            lanes[i] ^= block[i]
+        lanes = _KeccakF1600onFlatLanes(lanes)
+        lastBlock = bytearray(rateInBytes)
+    lastBlock[rateInBytes-1] ^= 0x80
+    block = rate_struct.unpack(lastBlock)
+    for i in range(rateInLanes):
+        lanes[i] ^= block[i]
+    lanes = _KeccakF1600onFlatLanes(lanes)
+    # === Squeeze out all the output blocks ===
+    outputBytes = bytearray()
+    while(outputByteLen > 0):
+        blockSize = min(outputByteLen, rateInBytes)
+        outputBytes += rate_struct.pack(*lanes[:rateInLanes])[:blockSize]
+        outputByteLen = outputByteLen - blockSize
+        if (outputByteLen > 0):
+            lanes = _KeccakF1600onFlatLanes(lanes)
+    return outputBytes
+
+def _KeccakBytewise(rateInBytes, inputBytes, delimitedSuffix, outputByteLen):
+    # Reference sponge for rates that are not a whole number of lanes
+    outputBytes = bytearray()
+    state = bytearray(200)
+    blockSize = 0
     inputOffset = 0
     # === Absorb all the input blocks ===
     while(inputOffset < len(inputBytes)):
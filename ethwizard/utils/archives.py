@@ -0,0 +1,376 @@
+import os
+import stat
+import queue
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import threading
+import contextvars
+import posixpath
+
+from concurrent.futures import ThreadPoolExecutor
+
+from fnmatch import fnmatchcase
+
+from pathlib import Path
+
+from typing import Optional
+
+from ethwizard.constants import (
+    ARCHIVE_EXTRACT_WORKERS,
+    ARCHIVE_STREAM_BUFFER_CHUNKS,
+    DOWNLOAD_CHUNK_SIZE
+)
+
+# Release archives are extracted in process. Only the members of an allow-list are extracted,
+# into a staging directory created inside the directory they are installed to, so moving them
+# in place is an atomic rename on the same file system. Nothing is moved in place until the
+# caller verified the archive and asks for it.
+#
+# The allow-list maps fnmatch patterns, matched against the normalized member names, to the
+# file name each member is installed as. Every installed name must be matched by exactly one
+# regular file. An archive with an absolute member name, a member name going up with .. or an
+# allowed member which is not a regular file is rejected.
+#
+# Zip distributions are installed as a whole directory instead. Their members are extracted in
+# parallel into a staging directory next to the target directory and the staging directory
+# takes the place of the target directory with a rename.
+
+_END_OF_STREAM = None
+_ABORT_STREAM = object()
+
+class ArchiveError(Exception):
+    pass
+
+class _StreamAborted(Exception):
+    pass
+
+def _safe_member_name(name):
+    # Return the normalized member name or raise ArchiveError if it could escape the staging
+    # directory
+
+    if name.startswith('/') or name.startswith('\\') or (len(name) > 1 and name[1] == ':'):
+        raise ArchiveError(f'Absolute member name {name} in archive')
+
+    normalized = posixpath.normpath(name.replace('\\', '/'))
+    if normalized == '..' or normalized.startswith('../') or '/../' in normalized:
+        raise ArchiveError(f'Member name {name} in archive goes outside of it')
+
+    return normalized
+
+class _QueueReader:
+    # Read only file object over the chunks put in a queue, for tarfile stream mode
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._chunk = b''
+        self._offset = 0
+        self._ended = False
+
+    def read(self, size=-1):
+        parts = []
+
+        while size != 0:
+            if self._offset >= len(self._chunk):
+                if self._ended:
+                    break
+                chunk = self._chunks.get()
+                if chunk is _ABORT_STREAM:
+                    self._ended = True
+                    raise _StreamAborted()
+                if chunk is _END_OF_STREAM:
+                    self._ended = True
+                    break
+                self._chunk = chunk
+                self._offset = 0
+                continue
+
+            end = len(self._chunk)
+            if size > 0:
+                end = min(end, self._offset + size)
+                size = size - (end - self._offset)
+            parts.append(self._chunk[self._offset:end])
+            self._offset = end
+
+        return b''.join(parts)
+
+    def drain(self):
+        # Consume what is left so the writer never blocks on a full queue
+        while not self._ended:
+            chunk = self._chunks.get()
+            if chunk is _END_OF_STREAM or chunk is _ABORT_STREAM:
+                self._ended = True
+
+class TarStreamExtractor:
+    # Extract allowed members of a tar archive while it is being downloaded. Feed the archive
+    # bytes in order with write, call reset if the download restarts from the first byte and
+    # install once the archive is verified. position is the number of bytes received.
+
+    def __init__(self, target_directory, members):
+        self.target_directory = Path(target_directory)
+        self.members = dict(members)
+        self.position = 0
+        self.error = None
+        self._chunks = None
+        self._thread = None
+        self._staging_path = None
+        self._staged = None
+
+    def write(self, data):
+        if self._thread is None:
+            self._start()
+        self._chunks.put(data)
+        self.position = self.position + len(data)
+
+    def reset(self):
+        self._stop()
+        self.position = 0
+
+    def discard(self):
+        # Drop everything staged so far
+        self.reset()
+
+    def install(self, archive_path=None, size=None) -> Optional[dict]:
+        # Move the staged members in place and return a dict of installed name to installed
+        # path. The members are extracted from archive_path first when the streamed archive
+        # was incomplete, size being the size of the verified archive. Return None and set
+        # error on failure.
+
+        if self._thread is not None and (size is None or self.position == size):
+            self._thread_finish()
+        else:
+            self._stop()
+
+        if self._staged is None:
+            if archive_path is None:
+                if self.error is None:
+                    self.error = 'The archive was not completely received'
+                return None
+
+            # The download was resumed, served from the cache or received out of order
+            self.error = None
+            try:
+                self._staging_path = self._create_staging()
+                with open(str(archive_path), 'rb') as archive_file:
+                    self._staged = self._extract(archive_file)
+            except (ArchiveError, tarfile.TarError, OSError) as exception:
+                self.error = str(exception)
+                self._remove_staging()
+                return None
+
+        installed = {}
+        try:
+            for name, staged_path in self._staged.items():
+                installed_path = self.target_directory.joinpath(name)
+                os.replace(str(staged_path), str(installed_path))
+                installed[name] = installed_path
+        except OSError as exception:
+            self.error = f'Unable to move {name} to {self.target_directory}. {exception}'
+            return None
+        finally:
+            self._remove_staging()
+
+        return installed
+
+    def _start(self):
+        self.error = None
+        self._staged = None
+        self._staging_path = self._create_staging()
+        self._chunks = queue.Queue(maxsize=ARCHIVE_STREAM_BUFFER_CHUNKS)
+        self._thread = threading.Thread(target=contextvars.copy_context().run,
+            args=(self._run, self._chunks), name='archive-extract', daemon=True)
+        self._thread.start()
+
+    def _run(self, chunks):
+        reader = _QueueReader(chunks)
+        try:
+            self._staged = self._extract(reader)
+        except _StreamAborted:
+            pass
+        except Exception as exception:
+            self.error = str(exception)
+        finally:
+            # Anything after the end of archive blocks still has to be read
+            reader.drain()
+
+    def _thread_finish(self):
+        self._chunks.put(_END_OF_STREAM)
+        self._thread.join()
+        self._thread = None
+        if self._staged is None:
+            self._remove_staging()
+
+    def _stop(self):
+        if self._thread is not None:
+            self._chunks.put(_ABORT_STREAM)
+            self._thread.join()
+            self._thread = None
+        self._staged = None
+        self._remove_staging()
+
+    def _create_staging(self):
+        self.target_directory.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(prefix='.ethwizard-', dir=str(self.target_directory)))
+
+    def _remove_staging(self):
+        if self._staging_path is not None:
+            shutil.rmtree(str(self._staging_path), ignore_errors=True)
+            self._staging_path = None
+
+    def _extract(self, fileobj):
+        # Extract the allowed members from a tar stream into the staging directory
+
+        staged = {}
+
+        with tarfile.open(fileobj=fileobj, mode='r|*') as archive:
+            for member in archive:
+                member_name = _safe_member_name(member.name)
+
+                name = None
+                for pattern, installed_name in self.members.items():
+                    if fnmatchcase(member_name, pattern):
+                        name = installed_name
+                        break
+
+                if name is None:
+                    continue
+
+                if not member.isfile():
+                    raise ArchiveError(f'Member {member.name} in archive is not a regular file')
+                if name in staged:
+                    raise ArchiveError(f'More than one member in archive for {name}')
+
+                staged_path = self._staging_path.joinpath(name)
+                source = archive.extractfile(member)
+                with open(str(staged_path), 'wb') as staged_file:
+                    shutil.copyfileobj(source, staged_file, DOWNLOAD_CHUNK_SIZE)
+                os.chmod(str(staged_path), 0o755 if member.mode & 0o111 else 0o644)
+
+                staged[name] = staged_path
+
+        missing = set(self.members.values()) - set(staged.keys())
+        if len(missing) > 0:
+            raise ArchiveError(f'Missing {", ".join(sorted(missing))} in archive')
+
+        return staged
+
+def _zip_member_is_link(info):
+    return stat.S_ISLNK(info.external_attr >> 16)
+
+def _stage_zip_members(zip_file, archive_path, target_directory, max_workers):
+    infos = zip_file.infolist()
+
+    members = []
+    for info in infos:
+        member_name = _safe_member_name(info.filename)
+        if _zip_member_is_link(info):
+            raise ArchiveError(f'Member {info.filename} in archive is a symbolic link')
+        if member_name != '.':
+            members.append((member_name, info))
+
+    if not any(not info.is_dir() for _, info in members):
+        raise ArchiveError(f'No files found in archive {archive_path}')
+
+    leading = {member_name.split('/')[0] for member_name, _ in members}
+    if len(leading) == 1 and any('/' in member_name for member_name, _ in members):
+        prefix_length = len(leading.pop()) + 1
+        members = [(member_name[prefix_length:], info) for member_name, info in members
+            if len(member_name) > prefix_length]
+
+    directories = set()
+    files = []
+    for member_name, info in members:
+        if info.is_dir():
+            directories.add(member_name)
+        else:
+            files.append((member_name, info))
+            if '/' in member_name:
+                directories.add(member_name.rsplit('/', 1)[0])
+
+    target_directory.parent.mkdir(parents=True, exist_ok=True)
+    staging_path = Path(tempfile.mkdtemp(prefix=f'.{target_directory.name}-',
+        dir=str(target_directory.parent)))
+
+    try:
+        for directory in sorted(directories):
+            staging_path.joinpath(directory).mkdir(parents=True, exist_ok=True)
+
+        # The workers share the archive handle, zipfile serializes the reads while the
+        # decompression and the writes run in parallel
+        batch_count = max(1, min(len(files), max_workers * 4))
+        batches = [files[index::batch_count] for index in range(batch_count)]
+
+        def extract_batch(batch):
+            for member_name, info in batch:
+                member_path = staging_path.joinpath(member_name)
+                with zip_file.open(info) as source, open(str(member_path), 'wb') as output:
+                    shutil.copyfileobj(source, output, DOWNLOAD_CHUNK_SIZE)
+                if (info.external_attr >> 16) & 0o111:
+                    os.chmod(str(member_path), 0o755)
+
+        with ThreadPoolExecutor(max_workers=max_workers,
+            thread_name_prefix='archive-extract') as executor:
+            for _ in executor.map(
+                lambda batch: contextvars.copy_context().run(extract_batch, batch), batches):
+                pass
+    except Exception as exception:
+        # A corrupted member can fail with zlib.error, EOFError or others, not only BadZipFile
+        shutil.rmtree(str(staging_path), ignore_errors=True)
+        raise ArchiveError(f'Unable to extract archive {archive_path}. {exception}')
+    except BaseException:
+        shutil.rmtree(str(staging_path), ignore_errors=True)
+        raise
+
+    return staging_path
+
+def stage_zip_archive(archive_path, target_directory, max_workers=None) -> Path:
+    # Extract a zip archive into a new staging directory next to target_directory and return
+    # its path. The leading directory of the archive, when all members share one, is stripped.
+    # Decompression releases the GIL, the members are extracted by up to one thread per CPU by
+    # default. Raise ArchiveError on failure.
+
+    if max_workers is None:
+        max_workers = min(ARCHIVE_EXTRACT_WORKERS, os.cpu_count() or 1)
+
+    target_directory = Path(target_directory)
+
+    try:
+        zip_file = zipfile.ZipFile(str(archive_path), 'r')
+    except (zipfile.BadZipFile, OSError) as exception:
+        raise ArchiveError(f'Unable to read archive {archive_path}. {exception}')
+
+    with zip_file:
+        return _stage_zip_members(zip_file, archive_path, target_directory, max_workers)
+
+def swap_staged_directory(staging_path, target_directory):
+    # Put a staging directory in place of target_directory. Renaming a directory over another
+    # one fails on Windows, a previous target_directory is renamed out of the way first and put
+    # back if the staging directory cannot take its place. Raise ArchiveError on failure.
+
+    staging_path = Path(staging_path)
+    target_directory = Path(target_directory)
+    previous_path = staging_path.with_name(staging_path.name + '-previous')
+
+    try:
+        if target_directory.exists():
+            os.replace(str(target_directory), str(previous_path))
+        try:
+            os.replace(str(staging_path), str(target_directory))
+        except OSError:
+            if previous_path.exists():
+                os.replace(str(previous_path), str(target_directory))
+            raise
+    except OSError as exception:
+        shutil.rmtree(str(staging_path), ignore_errors=True)
+        raise ArchiveError(f'Unable to replace {target_directory}. {exception}')
+
+    shutil.rmtree(str(previous_path), ignore_errors=True)
+
+def install_zip_archive(archive_path, target_directory, max_workers=None):
+    # Install the content of a zip archive as target_directory. A previous target_directory is
+    # replaced only once every member was extracted. Raise ArchiveError on failure, leaving any
+    # previous target_directory as it was.
+
+    staging_path = stage_zip_archive(archive_path, target_directory, max_workers)
+    swap_staged_directory(staging_path, target_directory)
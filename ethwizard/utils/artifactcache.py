@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+from functools import partial
+
+from pathlib import Path
+
+from typing import Optional
+
+from ethwizard.constants import (
+    ARTIFACT_CACHE_INDEX_FILE,
+    ARTIFACT_CACHE_MAX_SIZE,
+    DOWNLOAD_CHUNK_SIZE
+)
+
+# Downloaded artifacts are kept in a content-addressed cache inside the save directory:
+#
+# - objects/<first 2 hex digits>/<sha256> holds the content of each artifact, named after its
+#   sha256 digest. An object is checked against its name every time it is used.
+# - ARTIFACT_CACHE_INDEX_FILE maps each downloaded URL to the digest of its content along with
+#   the ETag and Last-Modified headers it was served with, maps (host, ETag) pairs to digests so
+#   the same artifact served under another URL is recognized, records the size and last access
+#   time of each object for the LRU eviction and keeps hit and miss counters.
+#
+# The cache is bounded to ARTIFACT_CACHE_MAX_SIZE bytes. The least recently used objects are
+# evicted first when a new object is stored or when the cache is pruned.
+
+def _empty_index():
+    return {
+        'urls': {},
+        'etags': {},
+        'objects': {},
+        'stats': {
+            'hits': 0,
+            'misses': 0,
+            'bytes_served': 0
+        }
+    }
+
+def _hash_file(path):
+    file_hash = hashlib.sha256()
+    with open(str(path), 'rb') as input_file:
+        for data in iter(partial(input_file.read, DOWNLOAD_CHUNK_SIZE), b''):
+            file_hash.update(data)
+    return file_hash.hexdigest()
+
+def _link_or_copy(source, target):
+    # Hard link when possible, the cache and the downloads directory are usually on the same
+    # file system. Always go through a temporary name so target is replaced atomically.
+
+    temp_path = target.with_name(f'.{target.name}.tmp')
+    if temp_path.exists():
+        temp_path.unlink()
+
+    try:
+        os.link(str(source), str(temp_path))
+    except OSError:
+        shutil.copyfile(str(source), str(temp_path))
+
+    os.replace(str(temp_path), str(target))
+
+def etag_key(host, etag):
+    return f'{host} {etag}'
+
+class ArtifactCache:
+    # Content-addressed, size bounded cache for downloaded artifacts
+
+    def __init__(self, directory: Path, max_size: int = ARTIFACT_CACHE_MAX_SIZE):
+        self.directory = Path(directory)
+        self.objects_path = self.directory.joinpath('objects')
+        self.index_path = self.directory.joinpath(ARTIFACT_CACHE_INDEX_FILE)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_path.joinpath(digest[:2], digest)
+
+    def lookup(self, url: str) -> Optional[dict]:
+        # Return the index entry for url if its object is still in the cache
+
+        with self.lock:
+            index = self._read_index()
+            entry = index['urls'].get(url)
+            if entry is None or entry.get('digest') not in index['objects']:
+                return None
+            return dict(entry)
+
+    def lookup_etag(self, host: str, etag: str) -> Optional[str]:
+        # Return the digest of the object last served by host with this ETag
+
+        with self.lock:
+            index = self._read_index()
+            digest = index['etags'].get(etag_key(host, etag))
+            if digest not in index['objects']:
+                return None
+            return digest
+
+    def fetch(self, digest: str, target_path: Path, url: str = None) -> bool:
+        # Place the object for digest at target_path. The object is verified first and dropped
+        # from the cache if its content does not match its digest.
+
+        object_path = self.object_path(digest)
+
+        try:
+            if _hash_file(object_path) != digest:
+                self.remove(digest)
+                return False
+
+            target_path = Path(target_path)
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(object_path, target_path)
+        except OSError:
+            return False
+
+        with self.lock:
+            index = self._read_index()
+            object_entry = index['objects'].get(digest)
+            if object_entry is not None:
+                object_entry['last_access'] = time.time()
+                index['stats']['hits'] += 1
+                index['stats']['bytes_served'] += object_entry.get('size', 0)
+            if url is not None and url in index['urls']:
+                index['urls'][url]['validated_at'] = time.time()
+            self._write_index(index)
+
+        return True
+
+    def record_miss(self):
+        with self.lock:
+            index = self._read_index()
+            index['stats']['misses'] += 1
+            self._write_index(index)
+
+    def mark_validated(self, url: str):
+        with self.lock:
+            index = self._read_index()
+            if url in index['urls']:
+                index['urls'][url]['validated_at'] = time.time()
+                self._write_index(index)
+
+    def store(self, url: str, file_path: Path, digest: str, size: int, etag: str = None,
+        last_modified: str = None, host: str = None) -> bool:
+        # Add a downloaded file to the cache and index it under url and its ETag
+
+        if size > self.max_size:
+            return False
+
+        object_path = self.object_path(digest)
+
+        try:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            if not object_path.is_file():
+                _link_or_copy(Path(file_path), object_path)
+        except OSError:
+            return False
+
+        now = time.time()
+
+        with self.lock:
+            index = self._read_index()
+            index['objects'][digest] = {
+                'size': size,
+                'last_access': now
+            }
+            index['urls'][url] = {
+                'digest': digest,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': size,
+                'validated_at': now
+            }
+            if etag is not None and host is not None:
+                index['etags'][etag_key(host, etag)] = digest
+
+            self._evict(index, self.max_size, keep=digest)
+            self._write_index(index)
+
+        return True
+
+    def remove(self, digest: str):
+        with self.lock:
+            index = self._read_index()
+            self._remove_object(index, digest)
+            self._write_index(index)
+
+    def prune(self, max_size: Optional[int] = None) -> dict:
+        # Evict least recently used objects until the cache fits in max_size and clean up
+        # objects or index entries that lost their counterpart. Return what was removed.
+
+        if max_size is None:
+            max_size = self.max_size
+
+        with self.lock:
+            index = self._read_index()
+
+            removed_objects = 0
+            removed_bytes = 0
+
+            # Index entries for objects that disappeared
+            for digest in list(index['objects'].keys()):
+                if not self.object_path(digest).is_file():
+                    self._remove_object(index, digest)
+
+            # Objects that are not indexed and leftovers from interrupted writes
+            if self.objects_path.is_dir():
+                for object_path in self.objects_path.glob('*/*'):
+                    if object_path.name not in index['objects']:
+                        try:
+                            removed_bytes = removed_bytes + object_path.stat().st_size
+                            object_path.unlink()
+                            removed_objects = removed_objects + 1
+                        except OSError:
+                            pass
+
+            evicted_objects, evicted_bytes = self._evict(index, max_size)
+
+            self._write_index(index)
+
+        return {
+            'removed_objects': removed_objects + evicted_objects,
+            'removed_bytes': removed_bytes + evicted_bytes
+        }
+
+    def stats(self) -> dict:
+        with self.lock:
+            index = self._read_index()
+
+        hits = index['stats']['hits']
+        misses = index['stats']['misses']
+
+        return {
+            'directory': str(self.directory),
+            'objects': len(index['objects']),
+            'urls': len(index['urls']),
+            'size': sum(entry.get('size', 0) for entry in index['objects'].values()),
+            'max_size': self.max_size,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses > 0 else 0.0,
+            'bytes_served': index['stats']['bytes_served']
+        }
+
+    def _evict(self, index, max_size, keep=None):
+        total_size = sum(entry.get('size', 0) for entry in index['objects'].values())
+
+        evicted_objects = 0
+        evicted_bytes = 0
+
+        by_last_access = sorted(index['objects'].items(),
+            key=lambda item: item[1].get('last_access', 0))
+
+        for digest, entry in by_last_access:
+            if total_size <= max_size:
+                break
+            if digest == keep:
+                continue
+
+            total_size = total_size - entry.get('size', 0)
+            evicted_objects = evicted_objects + 1
+            evicted_bytes = evicted_bytes + entry.get('size', 0)
+            self._remove_object(index, digest)
+
+        return evicted_objects, evicted_bytes
+
+    def _remove_object(self, index, digest):
+        index['objects'].pop(digest, None)
+        for url in [url for url, entry in index['urls'].items() if entry.get('digest') == digest]:
+            del index['urls'][url]
+        for key in [key for key, value in index['etags'].items() if value == digest]:
+            del index['etags'][key]
+
+        object_path = self.object_path(digest)
+        try:
+            if object_path.is_file():
+                object_path.unlink()
+        except OSError:
+            pass
+
+    def _read_index(self):
+        try:
+            with open(str(self.index_path), 'r', encoding='utf8') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return _empty_index()
+
+        if not isinstance(index, dict):
+            return _empty_index()
+
+        empty_index = _empty_index()
+        for key, value in empty_index.items():
+            if not isinstance(index.get(key), dict):
+                index[key] = value
+        for key, value in empty_index['stats'].items():
+            if not isinstance(index['stats'].get(key), int):
+                index['stats'][key] = value
+
+        return index
+
+    def _write_index(self, index):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(f'{self.index_path.name}.tmp')
+            with open(str(temp_path), 'w', encoding='utf8') as index_file:
+                json.dump(index, index_file)
+            os.replace(str(temp_path), str(self.index_path))
+        except OSError:
+            pass
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_artifact_cache(directory) -> ArtifactCache:
+    # Return the shared artifact cache for a cache directory
+
+    key = str(Path(directory).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ArtifactCache(directory)
+            _caches[key] = cache
+        return cache
+
+def format_artifact_cache_stats(stats):
+    def mib(size):
+        return f'{size / 1024 / 1024:.1f} MiB'
+
+    return '\n'.join([
+        f'Artifact cache: {stats["directory"]}',
+        f'Objects: {stats["objects"]} ({stats["urls"]} URLs)',
+        f'Disk usage: {mib(stats["size"])} of {mib(stats["max_size"])}',
+        f'Hits: {stats["hits"]}, misses: {stats["misses"]}, '
+        f'hit rate: {stats["hit_rate"] * 100:.1f}%',
+        f'Downloads avoided: {mib(stats["bytes_served"])}'
+    ])
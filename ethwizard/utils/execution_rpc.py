@@ -0,0 +1,152 @@
+import atexit
+import threading
+
+import httpx
+
+from typing import Optional
+
+from ethwizard.constants import (
+    EXECUTION_RPC_URL,
+    EXECUTION_RPC_TIMEOUT,
+    UNKNOWN_VALUE
+)
+
+# The local execution client is queried over a single keep-alive connection. The calls needed
+# together are sent as one JSON-RPC batch and their hex quantities are decoded once here, so the
+# install verifiers and the maintenance details share the same client and the same results.
+
+_client = None
+_client_lock = threading.Lock()
+
+class ExecutionRPCError(Exception):
+    pass
+
+def _hex_quantity(value) -> Optional[int]:
+    # Return the integer value of a JSON-RPC hex quantity or None if it is not one
+
+    if not isinstance(value, str) or not value.startswith(('0x', '0X')):
+        return None
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+class ExecutionRPCClient:
+    # JSON-RPC client for the execution client listening on url
+
+    def __init__(self, url=EXECUTION_RPC_URL, timeout=EXECUTION_RPC_TIMEOUT):
+        self.url = url
+        self._client = httpx.Client(timeout=timeout, trust_env=False,
+            limits=httpx.Limits(max_keepalive_connections=1),
+            headers={'Content-Type': 'application/json'})
+        self._next_id = 1
+        self._id_lock = threading.Lock()
+
+    def close(self):
+        self._client.close()
+
+    def batch(self, calls, timeout=None) -> list:
+        # Send calls, a list of (method, params) tuples, as a single batch. Return the response
+        # object of each call in the same order, None for a call without response. Raise
+        # ExecutionRPCError if the batch itself failed.
+
+        with self._id_lock:
+            first_id = self._next_id
+            self._next_id = self._next_id + len(calls)
+
+        request_json = [{
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': params if params is not None else [],
+            'id': first_id + index
+            } for index, (method, params) in enumerate(calls)]
+
+        request_options = {}
+        if timeout is not None:
+            request_options['timeout'] = timeout
+
+        try:
+            response = self._client.post(self.url, json=request_json, **request_options)
+        except httpx.RequestError as exception:
+            raise ExecutionRPCError(f'Exception: {exception}')
+
+        if response.status_code != 200:
+            raise ExecutionRPCError(f'Status code: {response.status_code}')
+
+        try:
+            response_json = response.json()
+        except ValueError as exception:
+            raise ExecutionRPCError(f'Unexpected response: {exception}')
+
+        if isinstance(response_json, dict):
+            # Some servers answer a whole batch they reject with a single error object
+            raise ExecutionRPCError(f'Unexpected response: {response_json.get("error")}')
+        if not isinstance(response_json, list):
+            raise ExecutionRPCError('Unexpected response: not a JSON-RPC batch')
+
+        responses = {}
+        for call_response in response_json:
+            if isinstance(call_response, dict) and isinstance(call_response.get('id'), int):
+                responses[call_response['id']] = call_response
+
+        return [responses.get(first_id + index) for index in range(len(calls))]
+
+    def call(self, method, params=None, timeout=None):
+        # Return the result of a single call. Raise ExecutionRPCError on failure.
+
+        call_response = self.batch([(method, params)], timeout=timeout)[0]
+        if call_response is None or 'result' not in call_response:
+            error = call_response.get('error') if call_response is not None else None
+            raise ExecutionRPCError(f'Unexpected response for {method}: {error}')
+        return call_response['result']
+
+    def client_version(self, timeout=None) -> str:
+        result = self.call('web3_clientVersion', timeout=timeout)
+        if not isinstance(result, str):
+            raise ExecutionRPCError(f'Unexpected client version: {result}')
+        return result
+
+    def sync_status(self, timeout=None) -> dict:
+        # Return the sync status, the peer count and the client version from a single batch.
+        # Blocks are UNKNOWN_VALUE when the client is not syncing or does not report them.
+
+        syncing_response, peer_count_response, version_response = self.batch([
+            ('eth_syncing', None),
+            ('net_peerCount', None),
+            ('web3_clientVersion', None)
+            ], timeout=timeout)
+
+        syncing_result = (syncing_response or {}).get('result')
+        peer_count_result = (peer_count_response or {}).get('result')
+        version_result = (version_response or {}).get('result')
+
+        status = {
+            'syncing': bool(syncing_result),
+            'starting_block': UNKNOWN_VALUE,
+            'current_block': UNKNOWN_VALUE,
+            'highest_block': UNKNOWN_VALUE,
+            'peer_count': _hex_quantity(peer_count_result) or 0,
+            'client_version': version_result if isinstance(version_result, str) else UNKNOWN_VALUE
+        }
+
+        if isinstance(syncing_result, dict):
+            for field, key in (
+                ('startingBlock', 'starting_block'),
+                ('currentBlock', 'current_block'),
+                ('highestBlock', 'highest_block')):
+                block = _hex_quantity(syncing_result.get(field))
+                if block is not None:
+                    status[key] = block
+
+        return status
+
+def get_execution_rpc_client() -> ExecutionRPCClient:
+    # Return the client shared for the local execution client
+
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = ExecutionRPCClient()
+            atexit.register(_client.close)
+        return _client
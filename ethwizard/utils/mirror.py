@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+import posixpath
+
+import httpx
+
+from urllib.parse import quote
+
+from pathlib import Path
+
+from typing import Optional
+
+from ethwizard.constants import (
+    MIRROR_MANIFEST_FILE,
+    MIRROR_MANIFEST_FORMAT,
+    MIRROR_FILES_DIRECTORY
+)
+
+# A mirror is a directory, or the same directory served over HTTP, holding release documents
+# and artifacts along with MIRROR_MANIFEST_FILE:
+#
+# - files maps each original URL, query string included, to the path of its content relative
+#   to the mirror root along with its size and sha256 digest. The same path can be listed under
+#   more than one URL.
+# - versions maps each Github release path to the tag of the release that was mirrored.
+#
+# Content is stored under MIRROR_FILES_DIRECTORY/<first 16 hex digits of the URL sha256>/<name>
+# so the same file name from different URLs never collides.
+
+class MirrorError(Exception):
+    pass
+
+def mirror_key(url, params=None) -> str:
+    # Return the normalized URL a request is looked up with in the manifest
+
+    if params is None:
+        return str(httpx.URL(url))
+    return str(httpx.URL(url, params=params))
+
+def mirror_file_path(key, file_name=None) -> str:
+    # Return the path, relative to the mirror root, where the content of the key URL is stored
+
+    if file_name is None:
+        file_name = posixpath.basename(httpx.URL(key).path)
+    if file_name in ('', '.', '..'):
+        file_name = 'index'
+
+    url_digest = hashlib.sha256(key.encode('utf8')).hexdigest()[:16]
+    return posixpath.join(MIRROR_FILES_DIRECTORY, url_digest, file_name)
+
+def _safe_relative_path(path):
+    normalized = posixpath.normpath(path)
+    if (
+        normalized.startswith('/') or
+        normalized == '..' or
+        normalized.startswith('../') or
+        '\\' in normalized or
+        ':' in normalized):
+        raise MirrorError(f'Unsafe path {path} in mirror manifest')
+    return normalized
+
+def parse_mirror_manifest(data) -> dict:
+    # Return the manifest parsed from data or raise MirrorError if it is not a valid manifest
+
+    try:
+        manifest = json.loads(data)
+    except ValueError as exception:
+        raise MirrorError(f'Mirror manifest is not valid JSON. {exception}')
+
+    if not isinstance(manifest, dict) or manifest.get('format') != MIRROR_MANIFEST_FORMAT:
+        raise MirrorError('Unsupported mirror manifest format')
+
+    files = manifest.get('files')
+    if not isinstance(files, dict):
+        raise MirrorError('No files in mirror manifest')
+
+    for url, entry in files.items():
+        if (
+            not isinstance(entry, dict) or
+            not isinstance(entry.get('path'), str) or
+            not isinstance(entry.get('size'), int) or
+            not isinstance(entry.get('sha256'), str)):
+            raise MirrorError(f'Invalid mirror manifest entry for {url}')
+        entry['path'] = _safe_relative_path(entry['path'])
+
+    if not isinstance(manifest.get('versions'), dict):
+        manifest['versions'] = {}
+
+    return manifest
+
+def write_mirror_manifest(directory, manifest):
+    # Write manifest in the mirror directory, replacing any previous one atomically
+
+    manifest_path = Path(directory, MIRROR_MANIFEST_FILE)
+    temp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    with open(str(temp_path), 'w', encoding='utf8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(str(temp_path), str(manifest_path))
+
+class Mirror:
+    # Loaded mirror. location is the mirror directory or the base URL of an HTTP mirror.
+
+    def __init__(self, location, manifest):
+        self.is_remote = location.lower().startswith(('http://', 'https://'))
+        self.location = location.rstrip('/') + '/' if self.is_remote else Path(location)
+        self.manifest = manifest
+        self._files = {mirror_key(url): entry for url, entry in manifest['files'].items()}
+
+    def __len__(self):
+        return len(self._files)
+
+    def lookup(self, url) -> Optional[dict]:
+        return self._files.get(mirror_key(url))
+
+    def file_url(self, entry) -> str:
+        return self.location + quote(entry['path'])
+
+    def file_path(self, entry) -> Path:
+        return self.location.joinpath(*entry['path'].split('/'))
@@ -0,0 +1,350 @@
+import os
+import json
+import threading
+import zlib
+
+from pathlib import Path
+
+from typing import Optional
+
+from ethwizard.constants import (
+    STATE_FILE,
+    STATE_JOURNAL_FILE,
+    STATE_JOURNAL_COMPACT_RECORDS,
+    STATE_JOURNAL_COMPACT_BYTES
+)
+
+# The wizard state is kept in two files inside the save directory:
+#
+# - STATE_FILE is a snapshot of the full state ({'step', 'context', 'sequence'}). It is only ever
+#   replaced with an atomic rename after being written and synced to disk.
+# - STATE_JOURNAL_FILE is an append-only list of step transitions. Each line is a CRC32 followed
+#   by a JSON record holding the sequence number, the step id and only the context keys that
+#   changed or were removed since the previous record.
+#
+# Loading the state reads the snapshot and replays the journal records that follow it, stopping
+# at the first torn or corrupted record. The first save of a process and every
+# STATE_JOURNAL_COMPACT_RECORDS records (or STATE_JOURNAL_COMPACT_BYTES of journal) the journal is
+# compacted into a new snapshot.
+#
+# When the context is a StateContext, only the keys set or removed since the previous save are
+# serialized. Other mappings are serialized completely to find what changed.
+
+def _fsync_directory(directory):
+    if os.name == 'nt':
+        return
+
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _encode_record(payload):
+    return f'{zlib.crc32(payload.encode("utf8")):08x} {payload}\n'
+
+def _decode_record(line):
+    # Return the record from a journal line or None if the line is torn or corrupted
+
+    if not line.endswith('\n'):
+        return None
+
+    crc, separator, payload = line[:-1].partition(' ')
+    if separator != ' ' or len(crc) != 8:
+        return None
+
+    try:
+        if int(crc, 16) != zlib.crc32(payload.encode('utf8')):
+            return None
+        record = json.loads(payload)
+    except ValueError:
+        return None
+
+    if (
+        not isinstance(record, dict) or
+        not isinstance(record.get('sequence'), int) or
+        not isinstance(record.get('set'), dict) or
+        not isinstance(record.get('unset'), list)
+        ):
+        return None
+
+    return record
+
+class StateContext(dict):
+    # Wizard context remembering the keys set or removed since they were last saved. A value
+    # changed in place is not seen, it has to be set again for the change to be saved.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dirty_lock = threading.Lock()
+        self._dirty_keys = set(self)
+
+    def _mark_dirty(self, keys):
+        with self._dirty_lock:
+            self._dirty_keys.update(keys)
+
+    def take_dirty_keys(self) -> set:
+        # Return the keys set or removed since the last call and forget them
+
+        with self._dirty_lock:
+            dirty_keys = self._dirty_keys
+            self._dirty_keys = set()
+            return dirty_keys
+
+    def restore_dirty_keys(self, keys):
+        # Keys taken for a save that did not make it to disk
+        self._mark_dirty(keys)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._mark_dirty((key,))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._mark_dirty((key,))
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, key, *args):
+        self._mark_dirty((key,))
+        return super().pop(key, *args)
+
+    def popitem(self):
+        item = super().popitem()
+        self._mark_dirty((item[0],))
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._mark_dirty(list(self))
+        super().clear()
+
+class StateJournal:
+    # Crash-safe wizard state store for a save directory
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.snapshot_path = self.directory.joinpath(STATE_FILE)
+        self.journal_path = self.directory.joinpath(STATE_JOURNAL_FILE)
+        self.lock = threading.Lock()
+
+        # Serialized value of each context key as of the last written record and the
+        # StateContext it was taken from
+        self.encoded_context = None
+        self.saved_context = None
+        self.sequence = 0
+        self.journal_records = 0
+        self.journal_bytes = 0
+
+    def save(self, step_id: str, context: dict) -> bool:
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            if self.encoded_context is None:
+                # Sequences must keep increasing across processes for the records of a previous
+                # process to be recognized as part of the snapshot written below
+                self.sequence = max(self.sequence, self._stored_sequence())
+
+            compact = (
+                self.encoded_context is None or
+                self.journal_records >= STATE_JOURNAL_COMPACT_RECORDS or
+                self.journal_bytes >= STATE_JOURNAL_COMPACT_BYTES
+            )
+
+            dirty_keys = None
+            if isinstance(context, StateContext):
+                dirty_keys = context.take_dirty_keys()
+
+            try:
+                if compact or dirty_keys is None or context is not self.saved_context:
+                    # Steps running on worker threads can update the context while it is being
+                    # saved. Snapshots also pick up values changed in place this way.
+                    encoded_context = {key: json.dumps(value)
+                        for key, value in dict(context).items()}
+                else:
+                    encoded_context = self._encode_changes(context, dirty_keys)
+
+                if compact:
+                    self._write_snapshot(step_id, encoded_context)
+                else:
+                    self._append_record(step_id, encoded_context)
+            except BaseException:
+                if dirty_keys is not None:
+                    context.restore_dirty_keys(dirty_keys)
+                raise
+
+            self.encoded_context = encoded_context
+            self.saved_context = context if dirty_keys is not None else None
+
+        return True
+
+    def load(self) -> Optional[dict]:
+        with self.lock:
+            snapshot = self._read_snapshot()
+            if snapshot is None:
+                return None
+
+            step_id = snapshot['step']
+            context = snapshot['context']
+            sequence = snapshot.get('sequence', 0)
+
+            if not isinstance(sequence, int):
+                sequence = 0
+
+            for record in self._read_journal():
+                if record['sequence'] <= sequence:
+                    # Already part of the snapshot
+                    continue
+                if record['sequence'] != sequence + 1:
+                    # A gap means the rest of the journal cannot be trusted
+                    break
+
+                for key, value in record['set'].items():
+                    context[key] = value
+                for key in record['unset']:
+                    context.pop(key, None)
+
+                step_id = record.get('step', step_id)
+                sequence = record['sequence']
+
+            self.sequence = max(self.sequence, self._stored_sequence())
+
+            return {
+                'step': step_id,
+                'context': context
+            }
+
+    def _encode_changes(self, context, dirty_keys):
+        # Return the serialized context updated with the keys set or removed since the last save
+
+        encoded_context = dict(self.encoded_context)
+
+        for key in dirty_keys:
+            try:
+                value = context[key]
+            except KeyError:
+                encoded_context.pop(key, None)
+                continue
+
+            encoded_context[key] = json.dumps(value)
+
+        return encoded_context
+
+    def _write_snapshot(self, step_id, encoded_context):
+        self.sequence = self.sequence + 1
+
+        encoded_items = ', '.join(
+            f'{json.dumps(key)}: {value}' for key, value in encoded_context.items())
+        payload = (f'{{"step": {json.dumps(step_id)}, "context": {{{encoded_items}}}, '
+            f'"sequence": {self.sequence}}}')
+
+        temp_path = self.snapshot_path.with_name(f'{self.snapshot_path.name}.tmp')
+        with open(str(temp_path), 'w', encoding='utf8') as output_file:
+            output_file.write(payload)
+            output_file.flush()
+            os.fsync(output_file.fileno())
+
+        os.replace(str(temp_path), str(self.snapshot_path))
+        _fsync_directory(self.directory)
+
+        # The sequence of this snapshot is above every record already in the journal, those
+        # records are ignored on load even if the truncation below does not make it to disk
+        with open(str(self.journal_path), 'w', encoding='utf8') as journal_file:
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+        self.journal_records = 0
+        self.journal_bytes = 0
+
+    def _append_record(self, step_id, encoded_context):
+        previous = self.encoded_context
+
+        changed = ', '.join(
+            f'{json.dumps(key)}: {value}' for key, value in encoded_context.items()
+            if previous.get(key) != value)
+        removed = [key for key in previous if key not in encoded_context]
+
+        payload = (f'{{"sequence": {self.sequence + 1}, "step": {json.dumps(step_id)}, '
+            f'"set": {{{changed}}}, "unset": {json.dumps(removed)}}}')
+        line = _encode_record(payload)
+
+        with open(str(self.journal_path), 'a', encoding='utf8', newline='\n') as journal_file:
+            journal_file.write(line)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+        self.sequence = self.sequence + 1
+        self.journal_records = self.journal_records + 1
+        self.journal_bytes = self.journal_bytes + len(line)
+
+    def _stored_sequence(self):
+        # Return the highest sequence found in the snapshot or the journal on disk
+
+        sequence = 0
+
+        snapshot = self._read_snapshot()
+        if snapshot is not None and isinstance(snapshot.get('sequence'), int):
+            sequence = snapshot['sequence']
+
+        for record in self._read_journal():
+            sequence = max(sequence, record['sequence'])
+
+        return sequence
+
+    def _read_snapshot(self):
+        if not self.snapshot_path.is_file():
+            return None
+
+        try:
+            with open(str(self.snapshot_path), 'r', encoding='utf8') as input_file:
+                snapshot = json.load(input_file)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(snapshot, dict) or
+            'step' not in snapshot or
+            not isinstance(snapshot.get('context'), dict)
+            ):
+            return None
+
+        return snapshot
+
+    def _read_journal(self):
+        if not self.journal_path.is_file():
+            return
+
+        try:
+            with open(str(self.journal_path), 'r', encoding='utf8', newline='\n') as journal_file:
+                for line in journal_file:
+                    record = _decode_record(line)
+                    if record is None:
+                        # Torn or corrupted write, nothing after it can be trusted
+                        return
+                    yield record
+        except (OSError, UnicodeDecodeError):
+            return
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+def get_state_journal(directory) -> StateJournal:
+    # Return the shared state journal for a save directory
+
+    key = str(Path(directory).resolve())
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = StateJournal(directory)
+            _journals[key] = journal
+        return journal
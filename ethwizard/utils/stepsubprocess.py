@@ -0,0 +1,54 @@
+import time
+import subprocess
+
+from subprocess import *
+
+from ethwizard.utils.steptimings import (
+    get_active_step_record,
+    record_subprocess_started,
+    record_subprocess_finished
+)
+
+# Drop-in replacement for the subprocess module in the wizard modules. The subprocesses started
+# with run and Popen are added to the record of the step starting them.
+
+class Popen(subprocess.Popen):
+
+    def __init__(self, *args, **kwargs):
+        self._step_record = get_active_step_record()
+        self._step_start = time.perf_counter()
+        self._step_recorded = False
+        super().__init__(*args, **kwargs)
+
+        record_subprocess_started(self._step_record)
+
+    def _step_finished(self):
+        if self._step_recorded or self.returncode is None:
+            return
+        self._step_recorded = True
+
+        record_subprocess_finished(self._step_record, time.perf_counter() - self._step_start)
+
+    def wait(self, timeout=None):
+        returncode = super().wait(timeout=timeout)
+        self._step_finished()
+        return returncode
+
+    def poll(self):
+        returncode = super().poll()
+        self._step_finished()
+        return returncode
+
+def run(*args, **kwargs):
+    record = get_active_step_record()
+    start = time.perf_counter()
+
+    try:
+        return subprocess.run(*args, **kwargs)
+    except OSError:
+        # The process could not be spawned
+        record = None
+        raise
+    finally:
+        record_subprocess_started(record)
+        record_subprocess_finished(record, time.perf_counter() - start)
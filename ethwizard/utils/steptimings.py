@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import threading
+import contextvars
+
+import httpx
+
+from functools import wraps
+
+from pathlib import Path
+
+from ethwizard.constants import STEP_TIMINGS_FILE
+
+# Per step instrumentation for the wizard. While a step runs, the time spent in dialogs, the
+# subprocesses it spawns and the HTTP requests it makes are added to its record. Work done on
+# threads started by the step is attributed to it when the thread runs in a copy of the step
+# context (contextvars), otherwise it is attributed to the interactive step being shown.
+#
+# Nothing is patched, only what goes through the wizard's own helpers is recorded: the
+# subprocesses started with ethwizard.utils.stepsubprocess, the requests made with the shared
+# HTTP client and the dialogs created with timed_dialog or timed_application.
+
+_current_record = contextvars.ContextVar('ethwizard_step_record', default=None)
+_foreground_record = None
+_records_lock = threading.Lock()
+
+def _active_record():
+    record = _current_record.get()
+    if record is None:
+        record = _foreground_record
+    return record
+
+def get_active_step_record():
+    # Return the record of the step the current work is attributed to, None outside of steps
+
+    return _active_record()
+
+def _add(field, value):
+    record = _active_record()
+    if record is None:
+        return
+
+    with _records_lock:
+        record[field] = record[field] + value
+
+def record_dialog_work(duration):
+    # Time spent doing work while a progress dialog is shown is not time waiting on the user
+
+    _add('dialog_work_time', duration)
+
+def mark_step_satisfied():
+    # The step was found already satisfied by its probe and its work was skipped
+
+    record = _current_record.get()
+    if record is not None:
+        record['satisfied'] = True
+
+def record_subprocess_started(record):
+    # Add a subprocess spawned for record
+
+    if record is None:
+        return
+
+    with _records_lock:
+        record['subprocesses'] += 1
+
+def record_subprocess_finished(record, duration):
+    # Add how long a subprocess spawned for record ran
+
+    if record is None:
+        return
+
+    with _records_lock:
+        record['subprocess_time'] += duration
+
+class _CountingStream(httpx.SyncByteStream):
+    # Response stream adding the bytes received to the step record
+
+    def __init__(self, stream, record):
+        self._stream = stream
+        self._record = record
+
+    def __iter__(self):
+        for chunk in self._stream:
+            if self._record is not None:
+                with _records_lock:
+                    self._record['http_bytes'] += len(chunk)
+            yield chunk
+
+    def close(self):
+        self._stream.close()
+
+def record_http_request(record, duration):
+    # Add a request made for record and how long it took to get its response headers
+
+    if record is None:
+        return
+
+    with _records_lock:
+        record['http_requests'] += 1
+        record['http_time'] += duration
+
+def count_http_bytes(stream, record):
+    # Return the response stream adding the bytes received to record
+
+    if record is None:
+        return stream
+
+    return _CountingStream(stream, record)
+
+def timed_application(application):
+    # Add the time application runs to the dialog time of the active step
+
+    run = application.run
+
+    @wraps(run)
+    def timed_run(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return run(*args, **kwargs)
+        finally:
+            _add('dialog_time', time.perf_counter() - start)
+
+    application.run = timed_run
+    return application
+
+def timed_dialog(dialog_function):
+    # Wrap a function creating a dialog application so the time it runs is recorded
+
+    @wraps(dialog_function)
+    def create_dialog(*args, **kwargs):
+        return timed_application(dialog_function(*args, **kwargs))
+
+    return create_dialog
+
+def new_step_record(step):
+    return {
+        'step_id': step.step_id,
+        'display_name': step.display_name,
+        'interactive': step.interactive,
+        'started': time.time(),
+        'status': 'running',
+        'wall_time': 0.0,
+        'dialog_time': 0.0,
+        'dialog_work_time': 0.0,
+        'dialog_wait_time': 0.0,
+        'work_time': 0.0,
+        'subprocesses': 0,
+        'subprocess_time': 0.0,
+        'http_requests': 0,
+        'http_time': 0.0,
+        'http_bytes': 0
+    }
+
+def run_step_instrumented(record, function, *args):
+    # Run a step function with its work attributed to record
+
+    global _foreground_record
+
+    token = _current_record.set(record)
+    if record['interactive']:
+        _foreground_record = record
+
+    start = time.perf_counter()
+    try:
+        result = function(*args)
+        record['status'] = 'satisfied' if record.pop('satisfied', False) else 'completed'
+        return result
+    except SystemExit:
+        record['status'] = 'quit'
+        raise
+    except BaseException:
+        record['status'] = 'failed'
+        raise
+    finally:
+        with _records_lock:
+            record['wall_time'] = time.perf_counter() - start
+            record['dialog_wait_time'] = max(0.0,
+                record['dialog_time'] - record['dialog_work_time'])
+            record['work_time'] = max(0.0, record['wall_time'] - record['dialog_wait_time'])
+
+        if record['interactive'] and _foreground_record is record:
+            _foreground_record = None
+        _current_record.reset(token)
+
+def load_step_timings(directory):
+    timings_path = Path(directory).joinpath(STEP_TIMINGS_FILE)
+
+    try:
+        with open(str(timings_path), 'r', encoding='utf8') as timings_file:
+            timings = json.load(timings_file)
+    except (OSError, ValueError):
+        return []
+
+    if not isinstance(timings, dict) or not isinstance(timings.get('steps'), list):
+        return []
+
+    return timings['steps']
+
+def save_step_timings(directory, records):
+    # Atomically replace the timings file next to the saved state
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    timings_path = directory.joinpath(STEP_TIMINGS_FILE)
+    temp_path = timings_path.with_name(f'{timings_path.name}.tmp')
+
+    with _records_lock:
+        payload = json.dumps({'steps': records}, indent=2)
+
+    with open(str(temp_path), 'w', encoding='utf8') as timings_file:
+        timings_file.write(payload)
+        timings_file.flush()
+        os.fsync(timings_file.fileno())
+
+    os.replace(str(temp_path), str(timings_path))
+
+def summarize_step_timings(records):
+    # Aggregate the records by step id, in first run order, adding the number of attempts
+
+    summary = {}
+
+    for record in records:
+        step_summary = summary.get(record['step_id'])
+        if step_summary is None:
+            step_summary = {
+                'step_id': record['step_id'],
+                'display_name': record.get('display_name', record['step_id']),
+                'attempts': 0,
+                'status': record.get('status', 'unknown')
+            }
+            summary[record['step_id']] = step_summary
+
+        step_summary['attempts'] += 1
+        step_summary['status'] = record.get('status', 'unknown')
+
+        for field in ('wall_time', 'dialog_wait_time', 'work_time', 'subprocesses',
+            'subprocess_time', 'http_requests', 'http_time', 'http_bytes'):
+            step_summary[field] = step_summary.get(field, 0) + record.get(field, 0)
+
+    return list(summary.values())
+
+def format_step_timings_table(records):
+    summary = summarize_step_timings(records)
+
+    lines = [
+        f'{"Step":<40} {"Wall":>9} {"Dialogs":>9} {"Work":>9} {"Procs":>6} {"Proc time":>10} '
+        f'{"HTTP":>6} {"Downloaded":>12}'
+    ]
+
+    for step_summary in summary:
+        lines.append(
+            f'{step_summary["display_name"][:40]:<40} '
+            f'{step_summary["wall_time"]:>8.1f}s '
+            f'{step_summary["dialog_wait_time"]:>8.1f}s '
+            f'{step_summary["work_time"]:>8.1f}s '
+            f'{step_summary["subprocesses"]:>6} '
+            f'{step_summary["subprocess_time"]:>9.1f}s '
+            f'{step_summary["http_requests"]:>6} '
+            f'{step_summary["http_bytes"] / 1024 / 1024:>9.1f}MiB'
+        )
+
+    total_wall = sum(step_summary['wall_time'] for step_summary in summary)
+    total_wait = sum(step_summary['dialog_wait_time'] for step_summary in summary)
+    lines.append(f'Total: {total_wall:.1f}s, {total_wait:.1f}s waiting on dialogs')
+
+    return '\n'.join(lines)
+
+def format_step_timings_json(records):
+    return json.dumps({
+        'steps': records,
+        'summary': summarize_step_timings(records)
+    }, indent=2)
+
+_PROMETHEUS_METRICS = (
+    ('wall_time', 'ethwizard_step_wall_seconds_total', 'Wall time spent in a wizard step.'),
+    ('dialog_wait_time', 'ethwizard_step_dialog_wait_seconds_total',
+        'Time spent waiting on the user in dialogs during a wizard step.'),
+    ('work_time', 'ethwizard_step_work_seconds_total', 'Time spent working during a wizard step.'),
+    ('subprocesses', 'ethwizard_step_subprocesses_total', 'Subprocesses spawned by a wizard step.'),
+    ('subprocess_time', 'ethwizard_step_subprocess_seconds_total',
+        'Time spent in subprocesses spawned by a wizard step.'),
+    ('http_requests', 'ethwizard_step_http_requests_total', 'HTTP requests made by a wizard step.'),
+    ('http_bytes', 'ethwizard_step_http_bytes_total', 'Bytes received over HTTP by a wizard step.'),
+    ('attempts', 'ethwizard_step_attempts_total', 'Number of times a wizard step was run.'),
+)
+
+def format_step_timings_prometheus(records):
+    # Prometheus text exposition format for node_exporter's textfile collector. Every value is
+    # summed over all the attempts of a step and never goes down, they are all counters.
+
+    summary = summarize_step_timings(records)
+
+    lines = []
+    for field, metric, description in _PROMETHEUS_METRICS:
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} counter')
+        for step_summary in summary:
+            lines.append(f'{metric}{{step="{step_summary["step_id"]}"}} {step_summary[field]}')
+
+    return '\n'.join(lines) + '\n'
+
+def write_atomically(path, content):
+    # The textfile collector may read the file at any time, never let it see a partial file
+
+    path = Path(path)
+    temp_path = path.with_name(f'.{path.name}.tmp')
+
+    with open(str(temp_path), 'w', encoding='utf8') as output_file:
+        output_file.write(content)
+
+    os.replace(str(temp_path), str(path))
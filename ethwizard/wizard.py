@@ -1,11 +1,13 @@
 import sys
+import logging
 
 from ethwizard import __version__
 
 from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.shortcuts import button_dialog
 
 from ethwizard.platforms import (
+    PLATFORM_UBUNTU,
+    PLATFORM_WINDOWS10,
     get_install_steps,
     supported_platform,
     has_su_perm,
@@ -13,13 +15,46 @@ from ethwizard.platforms import (
     quit_app,
     get_save_state,
     get_load_state,
-    enter_maintenance
+    enter_maintenance,
+    use_mirror
 )
 
-from ethwizard.platforms.common import StepSequence, is_completed_state
+from ethwizard.platforms.common import (
+    StepSequence,
+    is_completed_state,
+    get_save_directory,
+    get_download_cache,
+    button_dialog
+)
+
+from ethwizard.unattended import (
+    UNATTENDED_EXIT_CODE,
+    MissingAnswerError,
+    UnattendedDialogs,
+    emit_event,
+    load_answers,
+    reserve_stdout_for_events
+)
+
+from ethwizard.utils.steptimings import (
+    load_step_timings,
+    format_step_timings_table,
+    format_step_timings_json,
+    format_step_timings_prometheus,
+    write_atomically
+)
+
+from ethwizard.utils.artifactcache import format_artifact_cache_stats
+
+from ethwizard.constants import BUNDLE_PLATFORM_UBUNTU, BUNDLE_PLATFORM_WINDOWS
 
-def run():
-    # Main entry point for the wizard.
+def run(answers_path=None, mirror=None):
+    # Main entry point for the wizard. With an answers file, the wizard runs unattended. With a
+    # mirror, release documents and artifacts are taken from it.
+
+    if answers_path is not None:
+        run_unattended(answers_path, mirror)
+        return
 
     platform = supported_platform()
 
@@ -34,6 +69,9 @@ def run():
         # User is not a super user
         show_not_su()
         quit_app(platform)
+
+    if mirror is not None and not use_mirror(platform, mirror):
+        quit_app(platform)
     
     if not show_welcome():
         # User asked to quit
@@ -90,6 +128,164 @@ def run():
     sequence.run_from_start()
     quit_app(platform)
 
+def run_unattended(answers_path, mirror=None):
+    # Run the installation without any user interaction, answering dialogs from answers_path and
+    # reporting progress as JSON lines on stdout
+
+    reserve_stdout_for_events()
+
+    answers = load_answers(answers_path)
+    if answers is None:
+        sys.exit(UNATTENDED_EXIT_CODE)
+
+    dialogs = UnattendedDialogs(answers['dialogs'])
+    dialogs.install()
+
+    platform = supported_platform()
+
+    if not platform:
+        emit_event('run_failed', message='This platform is not supported')
+        sys.exit(1)
+
+    init_logging(platform)
+
+    if not has_su_perm(platform):
+        emit_event('run_failed', message='eth-wizard needs super user permissions')
+        sys.exit(1)
+
+    if mirror is not None and not use_mirror(platform, mirror):
+        emit_event('run_failed', message=f'Unable to use the mirror at {mirror}')
+        sys.exit(1)
+
+    steps = get_install_steps(platform)
+    save_state = get_save_state(platform)
+    if not steps or not save_state:
+        emit_event('run_failed', message='No steps found for current platform')
+        sys.exit(1)
+
+    # The platform modules are imported now, replace their dialogs as well
+    dialogs.install()
+
+    def progress_callback(event, record):
+        emit_event(event, step=record['step_id'], display_name=record['display_name'],
+            wall_time=record['wall_time'])
+
+    sequence = StepSequence(steps=steps(), save_state=save_state,
+        progress_callback=progress_callback)
+
+    emit_event('run_started', platform=platform, version=__version__,
+        steps=[step.step_id for step in sequence.steps])
+
+    try:
+        saved_state = get_load_state(platform)()
+        if (
+            saved_state is not None and
+            'step' in saved_state and
+            'context' in saved_state
+            ):
+            if is_completed_state(saved_state):
+                emit_event('run_completed', already_installed=True)
+                return
+
+            saved_step = sequence.get_step(saved_state['step'])
+            if saved_step is not None:
+                resume_result = prompt_resume(saved_step)
+                if not resume_result:
+                    emit_event('run_failed', message='Asked to quit')
+                    sys.exit(1)
+                elif resume_result == 1:
+                    context = saved_state['context']
+                    for key, value in answers['context'].items():
+                        context.setdefault(key, value)
+
+                    sequence.run_from_step(saved_step.step_id, context)
+                    emit_event('run_completed', already_installed=False)
+                    return
+
+        sequence.run_from_start(dict(answers['context']))
+    except MissingAnswerError as exception:
+        emit_event('run_failed', message=str(exception))
+        sys.exit(UNATTENDED_EXIT_CODE)
+    except SystemExit as exception:
+        if exception.code not in (None, 0):
+            raise
+        # quit_app was called by a step, the installation is not complete
+        emit_event('run_failed', message='The installation was stopped before completion')
+        sys.exit(1)
+    except Exception as exception:
+        emit_event('run_failed', message=f'{type(exception).__name__}: {exception}')
+        sys.exit(1)
+
+    emit_event('run_completed', already_installed=False)
+
+def show_timings(output_format='table', output_path=None):
+    # Show or export the per step timings recorded during the installation
+
+    records = load_step_timings(get_save_directory())
+    if len(records) == 0:
+        print('No step timings found. Timings are recorded while the wizard installs.')
+        sys.exit(1)
+
+    if output_format == 'json':
+        content = format_step_timings_json(records)
+    elif output_format == 'prometheus':
+        content = format_step_timings_prometheus(records)
+    else:
+        content = format_step_timings_table(records)
+
+    if output_path is None:
+        print(content)
+    else:
+        write_atomically(output_path, content)
+
+def manage_artifact_cache(action='stats', max_size_gb=None):
+    # Show the artifact cache hit rate and disk usage or prune it
+
+    cache = get_download_cache()
+
+    if action == 'prune':
+        max_size = None
+        if max_size_gb is not None:
+            max_size = int(max_size_gb * 1024 * 1024 * 1024)
+
+        removed = cache.prune(max_size)
+        print(f'Removed {removed["removed_objects"]} object(s), '
+            f'{removed["removed_bytes"] / 1024 / 1024:.1f} MiB from the artifact cache.')
+
+    print(format_artifact_cache_stats(cache.stats()))
+
+def create_bundle(output_path, platforms=None):
+    # Resolve the current release set into a mirror directory or tarball for --mirror
+
+    from ethwizard.bundle import create_bundle as create_mirror_bundle
+
+    log = logging.getLogger('ethwizard.bundle')
+    log.setLevel(logging.INFO)
+    log.addHandler(logging.StreamHandler())
+
+    if not platforms:
+        platform = supported_platform()
+        if platform == PLATFORM_UBUNTU:
+            platforms = [BUNDLE_PLATFORM_UBUNTU]
+        elif platform == PLATFORM_WINDOWS10:
+            platforms = [BUNDLE_PLATFORM_WINDOWS]
+        else:
+            print('This platform is not supported, choose the platforms to bundle with '
+                '--bundle-platform.')
+            sys.exit(1)
+
+    manifest = create_mirror_bundle(output_path, list(dict.fromkeys(platforms)), log)
+    if manifest is None:
+        print(f'Unable to create the bundle {output_path}.')
+        sys.exit(1)
+
+    total_size = sum(entry['size'] for entry in
+        {entry['path']: entry for entry in manifest['files'].values()}.values())
+    print(f'Bundled {len(manifest["files"])} URL(s), {total_size / 1024 / 1024:.1f} MiB, '
+        f'into {output_path}:')
+    for release_path, tag in sorted(manifest['versions'].items()):
+        print(f'  {release_path.split("/")[2]}/{release_path.split("/")[3]} {tag}')
+
 def show_welcome():
     # Show a welcome message about this wizard
 
@@ -0,0 +1,48 @@
+import zipfile
+
+import pytest
+
+from ethwizard.utils.archives import ArchiveError, install_zip_archive
+
+def _write_archive(archive_path, files):
+    with zipfile.ZipFile(str(archive_path), 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+
+def test_install_zip_archive(tmp_path):
+    archive_path = tmp_path.joinpath('release.zip')
+    _write_archive(archive_path, {
+        'release/bin/tool': b'tool',
+        'release/lib/data.txt': b'data'
+    })
+    target_directory = tmp_path.joinpath('install', 'tool')
+
+    install_zip_archive(archive_path, target_directory)
+
+    assert target_directory.joinpath('bin', 'tool').read_bytes() == b'tool'
+    assert target_directory.joinpath('lib', 'data.txt').read_bytes() == b'data'
+
+def test_corrupted_member_leaves_previous_install(tmp_path):
+    content = bytes(range(256)) * 64
+    archive_path = tmp_path.joinpath('release.zip')
+    _write_archive(archive_path, {'release/tool': content})
+
+    # Flip bytes in the middle of the deflated data so zlib fails on it
+    archive_data = bytearray(archive_path.read_bytes())
+    with zipfile.ZipFile(str(archive_path)) as archive:
+        info = archive.getinfo('release/tool')
+    data_offset = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+    for index in range(data_offset + 2, data_offset + info.compress_size - 2):
+        archive_data[index] ^= 0xff
+    archive_path.write_bytes(bytes(archive_data))
+
+    install_directory = tmp_path.joinpath('install')
+    target_directory = install_directory.joinpath('tool')
+    target_directory.mkdir(parents=True)
+    target_directory.joinpath('tool').write_bytes(b'previous')
+
+    with pytest.raises(ArchiveError):
+        install_zip_archive(archive_path, target_directory)
+
+    assert target_directory.joinpath('tool').read_bytes() == b'previous'
+    assert [path.name for path in install_directory.iterdir()] == ['tool']
@@ -0,0 +1,146 @@
+import time
+import logging
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ethwizard.constants import MEV_RELAY_STATUS_EP, NETWORK_MAINNET
+from ethwizard.platforms import common
+from ethwizard.unattended import UnattendedDialogs
+
+RELAY_PUBKEY = '0x' + 'ab' * 48
+
+log = logging.getLogger('test_mev_relays')
+
+class _RelayHandler(BaseHTTPRequestHandler):
+    # Relay status endpoint answering after a delay, failing the first failures requests
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('Authorization')))
+
+        time.sleep(server.delay)
+
+        status = 200
+        with server.lock:
+            if server.failures > 0:
+                server.failures = server.failures - 1
+                status = 500
+
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def _start_relay(delay, failures=0):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _RelayHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    server.failures = failures
+    server.lock = threading.Lock()
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def _relay_url(port):
+    return f'http://{RELAY_PUBKEY}@127.0.0.1:{port}'
+
+@pytest.fixture
+def relays():
+    servers = {
+        'slow': _start_relay(0.12),
+        'fast': _start_relay(0.0),
+        'failing': _start_relay(0.0, failures=1),
+        'medium': _start_relay(0.06)
+    }
+
+    # Nothing listens on the port of a closed server
+    closed = ThreadingHTTPServer(('127.0.0.1', 0), _RelayHandler)
+    closed.server_close()
+
+    urls = {name: _relay_url(server.server_port) for name, server in servers.items()}
+    urls['unreachable'] = _relay_url(closed.server_port)
+
+    yield servers, urls
+
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+def test_relays_are_ranked_by_error_rate_then_latency(relays):
+    servers, urls = relays
+    progress = []
+
+    benchmark = common.benchmark_mev_relays(list(urls.values()), log, rounds=3,
+        progress=lambda url, result, completed, total: progress.append((completed, total)))
+
+    assert sorted(progress) == [(completed, 5) for completed in range(1, 6)]
+
+    # The relay public key is not sent as credentials
+    for server in servers.values():
+        assert server.requests == [(MEV_RELAY_STATUS_EP, None)] * 3
+
+    assert benchmark[urls['failing']]['errors'] == 1
+    assert benchmark[urls['unreachable']]['error_rate'] == 1.0
+    assert benchmark[urls['unreachable']]['p50'] is None
+    assert common.format_mev_relay_benchmark(benchmark[urls['unreachable']]) == 'unreachable'
+
+    assert common.fastest_mev_relays(benchmark) == [urls['fast'], urls['medium'], urls['slow']]
+    assert common.fastest_mev_relays(benchmark, count=5) == [
+        urls['fast'], urls['medium'], urls['slow'], urls['failing']]
+
+def test_fastest_bundle_is_offered_and_selected(monkeypatch):
+    relay_urls = [f'https://0x{index:02x}{"cd" * 47}@relay{index}.example.org'
+        for index in range(5)]
+    relay_list = '\n'.join(['| Relay | Address |', '| --- | --- |'] + [
+        f'| [Relay {index}](https://relay{index}.example.org) | `{url}` |'
+        for index, url in enumerate(relay_urls)]) + '\n'
+
+    # p50 latencies in ms, relay 1 is the fastest but fails half its requests and relay 4 does
+    # not answer
+    latencies = {0: 40, 1: 5, 2: 10, 3: 80, 4: None}
+
+    def benchmark_mev_relay(relay_url, rounds, cancelled):
+        index = relay_urls.index(relay_url)
+        latency = latencies[index] / 1000 if latencies[index] is not None else None
+        error_rate = 0.5 if index == 1 else (1.0 if latency is None else 0.0)
+        return {
+            'url': relay_url,
+            'samples': rounds,
+            'errors': int(rounds * error_rate),
+            'error_rate': error_rate,
+            'p50': latency,
+            'p95': latency
+        }
+
+    class _Response:
+        status_code = 200
+        text = relay_list
+
+    class _Client:
+        def get(self, url, **kwargs):
+            assert url == common.ETHSTAKER_RELAY_LIST_URL
+            return _Response()
+
+    dialogs = UnattendedDialogs({'MEV-Boost relays': 'Fastest 3'})
+    offered = []
+
+    def button_dialog(title='', text='', buttons=[], style=None):
+        offered.extend(key for key, _ in buttons)
+        return dialogs.button_dialog(title=title, text=text, buttons=buttons, style=style)
+
+    monkeypatch.setattr(common, 'get_http_client', _Client)
+    monkeypatch.setattr(common, 'benchmark_mev_relay', benchmark_mev_relay)
+    monkeypatch.setattr(common, 'progress_log_dialog', dialogs.progress_log_dialog)
+    monkeypatch.setattr(common, 'button_dialog', button_dialog)
+
+    selected = common.select_mev_relays(NETWORK_MAINNET, log)
+
+    assert 'Fastest 3' in offered
+    assert selected == [relay_urls[2], relay_urls[0], relay_urls[3]]
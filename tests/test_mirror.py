@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import threading
+
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+
+from ethwizard.constants import MIRROR_MANIFEST_FORMAT
+from ethwizard.platforms import common
+from ethwizard.utils.mirror import mirror_file_path, write_mirror_manifest
+
+ARTIFACT_URL = 'https://github.com/example/tool/releases/download/v1.0.0/tool-linux-amd64.tar.gz'
+ARTIFACT_CONTENT = b'tool release archive ' * 4096
+
+log = logging.getLogger('test_mirror')
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def mirror_directory(tmp_path):
+    relative_path = mirror_file_path(ARTIFACT_URL)
+    file_path = Path(tmp_path, *relative_path.split('/'))
+    file_path.parent.mkdir(parents=True)
+    file_path.write_bytes(ARTIFACT_CONTENT)
+
+    write_mirror_manifest(tmp_path, {
+        'format': MIRROR_MANIFEST_FORMAT,
+        'files': {
+            ARTIFACT_URL: {
+                'path': relative_path,
+                'size': len(ARTIFACT_CONTENT),
+                'sha256': hashlib.sha256(ARTIFACT_CONTENT).hexdigest()
+            }
+        },
+        'versions': {}
+    })
+
+    yield tmp_path, file_path
+
+    common._mirror = None
+
+@pytest.fixture
+def mirror_server(mirror_directory):
+    directory, file_path = mirror_directory
+    server = ThreadingHTTPServer(('127.0.0.1', 0),
+        partial(_QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f'http://127.0.0.1:{server.server_port}/', file_path
+
+    server.shutdown()
+    server.server_close()
+
+def test_http_mirror_round_trip(mirror_server):
+    mirror_url, _ = mirror_server
+
+    assert common.set_mirror(mirror_url, log)
+
+    response = common.get_http_client().get(ARTIFACT_URL)
+    assert response.status_code == 200
+    assert response.content == ARTIFACT_CONTENT
+
+def test_http_mirror_rejects_tampered_file(mirror_server):
+    mirror_url, file_path = mirror_server
+    file_path.write_bytes(ARTIFACT_CONTENT.replace(b'tool', b'evil'))
+
+    assert common.set_mirror(mirror_url, log)
+
+    with pytest.raises(httpx.ReadError):
+        common.get_http_client().get(ARTIFACT_URL)
+
+def test_directory_mirror_rejects_tampered_file(mirror_directory):
+    directory, file_path = mirror_directory
+
+    assert common.set_mirror(str(directory), log)
+    assert common.get_http_client().get(ARTIFACT_URL).content == ARTIFACT_CONTENT
+
+    file_path.write_bytes(ARTIFACT_CONTENT[:-1] + b'!')
+
+    with pytest.raises(httpx.ReadError):
+        common.get_http_client().get(ARTIFACT_URL)
@@ -0,0 +1,77 @@
+import json
+import shutil
+
+from ethwizard.utils.statejournal import StateContext, StateJournal
+
+def test_save_and_load(tmp_path):
+    journal = StateJournal(tmp_path)
+    journal.save('first', {'k': 1})
+    journal.save('second', {'k': 2, 'other': 'value'})
+    journal.save('third', {'k': 3})
+
+    assert StateJournal(tmp_path).load() == {'step': 'third', 'context': {'k': 3}}
+
+def test_torn_record_is_ignored(tmp_path):
+    journal = StateJournal(tmp_path)
+    journal.save('first', {'k': 1})
+    journal.save('second', {'k': 2})
+
+    with open(str(journal.journal_path), 'a', encoding='utf8') as journal_file:
+        journal_file.write('0000')
+
+    assert StateJournal(tmp_path).load() == {'step': 'second', 'context': {'k': 2}}
+
+def _stale_journal_is_ignored(tmp_path, load_first):
+    # A first process leaves a snapshot and journal records behind
+    journal = StateJournal(tmp_path)
+    journal.save('first', {'k': 1})
+    journal.save('second', {'k': 2})
+    journal.save('third', {'k': 3, 'old': True})
+
+    stale_journal_path = tmp_path.joinpath('stale-journal')
+    shutil.copyfile(str(journal.journal_path), str(stale_journal_path))
+
+    # A second process writes a new snapshot but the journal truncation is lost
+    journal = StateJournal(tmp_path)
+    if load_first:
+        journal.load()
+    journal.save('fourth', {'k': 100})
+    shutil.copyfile(str(stale_journal_path), str(journal.journal_path))
+
+    assert StateJournal(tmp_path).load() == {'step': 'fourth', 'context': {'k': 100}}
+
+def test_stale_journal_is_ignored_after_load(tmp_path):
+    _stale_journal_is_ignored(tmp_path, True)
+
+def test_stale_journal_is_ignored_without_load(tmp_path):
+    _stale_journal_is_ignored(tmp_path, False)
+
+def test_records_after_new_snapshot_are_replayed(tmp_path):
+    journal = StateJournal(tmp_path)
+    journal.save('first', {'k': 1})
+    journal.save('second', {'k': 2})
+
+    journal = StateJournal(tmp_path)
+    journal.load()
+    journal.save('third', {'k': 3})
+    journal.save('fourth', {'k': 4, 'new': True})
+
+    assert StateJournal(tmp_path).load() == {'step': 'fourth', 'context': {'k': 4, 'new': True}}
+
+def test_state_context_saves_changed_keys(tmp_path):
+    journal = StateJournal(tmp_path)
+    context = StateContext({'k': 1, 'kept': 'value', 'removed': True})
+    journal.save('first', context)
+
+    context['k'] = 2
+    context.update(new=[1, 2])
+    context.pop('removed')
+    journal.save('second', context)
+
+    with open(str(journal.journal_path), 'r', encoding='utf8') as journal_file:
+        records = [json.loads(line.partition(' ')[2]) for line in journal_file]
+
+    assert [(record['set'], record['unset']) for record in records] == [
+        ({'k': 2, 'new': [1, 2]}, ['removed'])]
+    assert StateJournal(tmp_path).load() == {'step': 'second',
+        'context': {'k': 2, 'kept': 'value', 'new': [1, 2]}}
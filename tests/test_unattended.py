@@ -0,0 +1,80 @@
+import sys
+import json
+import textwrap
+import subprocess
+
+from pathlib import Path
+
+from ethwizard.unattended import UNATTENDED_EXIT_CODE
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# The wizard runs in a child process, installing the unattended dialogs replaces the dialog
+# functions of every ethwizard module
+RUN_SCRIPT = textwrap.dedent('''
+    import sys
+
+    from pathlib import Path
+
+    import ethwizard.wizard as wizard
+    import ethwizard.platforms.common as common
+
+    from ethwizard.platforms.common import Step
+
+    save_directory = Path(sys.argv[2])
+
+    def select_ports_function(step, context, step_sequence):
+        ports = common.select_custom_ports({'eth1': 30303, 'eth2_bn': 9000})
+        if not ports:
+            common.quit_app()
+        context['selected_ports'] = ports
+        return context
+
+    def steps():
+        return [Step(step_id='select_ports', display_name='Ports selection',
+            exc_function=select_ports_function)]
+
+    common.get_save_directory = lambda: save_directory
+    wizard.supported_platform = lambda: 'test'
+    wizard.init_logging = lambda platform: None
+    wizard.has_su_perm = lambda platform: True
+    wizard.get_install_steps = lambda platform: steps
+    wizard.get_save_state = lambda platform: (lambda step_id, context: True)
+    wizard.get_load_state = lambda platform: (lambda: None)
+
+    wizard.run_unattended(sys.argv[1])
+''')
+
+def _run_unattended(tmp_path, dialogs):
+    answers_path = tmp_path.joinpath('answers.json')
+    answers_path.write_text(json.dumps({'dialogs': dialogs}), encoding='utf8')
+
+    process_result = subprocess.run([sys.executable, '-c', RUN_SCRIPT, str(answers_path),
+        str(tmp_path)], capture_output=True, text=True, timeout=60, cwd=str(PACKAGE_ROOT))
+
+    events = [json.loads(line) for line in process_result.stdout.splitlines()]
+    return process_result.returncode, events
+
+def test_valid_port_answer(tmp_path):
+    returncode, events = _run_unattended(tmp_path, {
+        'Open ports configuration': 'Custom',
+        'Custom port for execution node': '30304',
+        'Custom port for consensus beacon node': '9001'
+    })
+
+    assert returncode == 0
+    assert events[-1]['event'] == 'run_completed'
+
+def test_rejected_port_answer_stops_the_wizard(tmp_path):
+    returncode, events = _run_unattended(tmp_path, {
+        'Open ports configuration': 'Custom',
+        'Custom port for execution node': '80',
+        'Custom port for consensus beacon node': '9001'
+    })
+
+    assert returncode == UNATTENDED_EXIT_CODE
+    answered = [event for event in events if event['event'] == 'dialog_answered' and
+        event['dialog'] == 'Custom port for execution node']
+    assert len(answered) == 1
+    assert 'invalid_answer' in [event['event'] for event in events]
+    assert events[-1]['event'] == 'run_failed'
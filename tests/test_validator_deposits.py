@@ -0,0 +1,150 @@
+import json
+import logging
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ethwizard.constants import BN_VALIDATORS_EP, NETWORK_MAINNET
+from ethwizard.platforms import common
+
+ACTIVE_KEY = '0x' + 'a1' * 48
+PENDING_KEY = '0x' + 'b2' * 48
+EXITED_KEY = '0x' + 'c3' * 48
+DEPOSITED_KEY = '0x' + 'd4' * 48
+UNKNOWN_KEY = '0x' + 'e5' * 48
+
+BN_VALIDATORS = {
+    ACTIVE_KEY: ('12', 'active_ongoing'),
+    PENDING_KEY: ('13', 'pending_queued'),
+    EXITED_KEY: ('14', 'withdrawal_done')
+}
+
+log = logging.getLogger('test_validator_deposits')
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # Beacon node validators endpoint and beaconcha.in deposits API
+
+    protocol_version = 'HTTP/1.1'
+
+    def _send_chunked(self, status, document):
+        # Stream the document in small chunks so items are split across reads
+        body = json.dumps(document).encode('utf8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        for offset in range(0, len(body), 7):
+            chunk = body[offset:offset + 7]
+            self.wfile.write(f'{len(chunk):x}\r\n'.encode('ascii') + chunk + b'\r\n')
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.bn_requests.append(request['ids'])
+
+        if self.path != BN_VALIDATORS_EP or self.server.bn_status != 200:
+            self._send_chunked(self.server.bn_status, {'message': 'unavailable'})
+            return
+
+        data = []
+        for public_key in request['ids']:
+            if public_key.lower() in BN_VALIDATORS:
+                index, status = BN_VALIDATORS[public_key.lower()]
+                data.append({
+                    'index': index,
+                    'balance': '32000000000',
+                    'status': status,
+                    'validator': {'pubkey': public_key.lower(), 'slashed': False}
+                })
+
+        self._send_chunked(200, {'execution_optimistic': False, 'finalized': False,
+            'data': data})
+
+    def do_GET(self):
+        # /api/v1/validator/{indexOrPubkey}/deposits
+        public_keys = self.path.split('/')[4].split(',')
+        self.server.bc_requests.append(public_keys)
+
+        data = [{'publickey': public_key.lower(), 'amount': 32000000000}
+            for public_key in public_keys if public_key.lower() == DEPOSITED_KEY]
+
+        self._send_chunked(200, {'status': 'OK', 'data': data})
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.daemon_threads = True
+    server.bn_status = 200
+    server.bn_requests = []
+    server.bc_requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    monkeypatch.setattr(common, 'BN_VALIDATORS_BATCH_SIZE', 2)
+    monkeypatch.setitem(common.BEACONCHA_IN_URLS, NETWORK_MAINNET, base_url)
+
+    yield server, base_url
+
+    server.shutdown()
+    server.server_close()
+
+def test_iter_json_array_items_across_chunks():
+    document = json.dumps({'meta': {'data': 'not this one'}, 'data': [{'a': '],'}, 2, [3]]})
+
+    for size in (1, 3, len(document)):
+        chunks = [document[offset:offset + size] for offset in range(0, len(document), size)]
+        assert list(common.iter_json_array_items(chunks, 'data')) == [{'a': '],'}, 2, [3]]
+
+    with pytest.raises(ValueError):
+        list(common.iter_json_array_items(['{"data": [1, 2'], 'data'))
+
+def test_bn_validator_statuses_are_streamed_in_batches(stub_server):
+    server, base_url = stub_server
+    public_keys = [ACTIVE_KEY.upper().replace('0X', '0x'), PENDING_KEY, EXITED_KEY, UNKNOWN_KEY]
+
+    validator_statuses = common.get_bn_validator_statuses(base_url, public_keys, log)
+
+    assert server.bn_requests == [public_keys[:2], public_keys[2:]]
+    assert {public_key: (status['index'], status['status'])
+        for public_key, status in validator_statuses.items()} == {
+        ACTIVE_KEY: ('12', common.VALIDATOR_STATUS_ACTIVE),
+        PENDING_KEY: ('13', common.VALIDATOR_STATUS_PENDING),
+        EXITED_KEY: ('14', common.VALIDATOR_STATUS_EXITED)
+    }
+
+def test_validator_deposits_only_looks_up_unknown_keys(stub_server):
+    server, base_url = stub_server
+    public_keys = [ACTIVE_KEY, DEPOSITED_KEY.upper().replace('0X', '0x'), UNKNOWN_KEY]
+
+    validator_deposits = common.get_validator_deposits(NETWORK_MAINNET, public_keys, log,
+        bn_http_base=base_url)
+
+    assert server.bc_requests == [public_keys[1:]]
+    assert {deposit['publickey']: (deposit['status'], deposit['source'])
+        for deposit in validator_deposits} == {
+        ACTIVE_KEY: (common.VALIDATOR_STATUS_ACTIVE, 'beacon_node'),
+        DEPOSITED_KEY: (common.VALIDATOR_STATUS_DEPOSITED, 'beaconcha.in')
+    }
+
+def test_validator_deposits_fall_back_when_bn_fails(stub_server):
+    server, base_url = stub_server
+    server.bn_status = 503
+    public_keys = [ACTIVE_KEY, DEPOSITED_KEY]
+
+    assert common.get_bn_validator_statuses(base_url, public_keys, log) is None
+
+    validator_deposits = common.get_validator_deposits(NETWORK_MAINNET, public_keys, log,
+        bn_http_base=base_url)
+
+    assert server.bc_requests == [public_keys]
+    assert [(deposit['publickey'], deposit['source']) for deposit in validator_deposits] == [
+        (DEPOSITED_KEY, 'beaconcha.in')]